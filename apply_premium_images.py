@@ -10,7 +10,7 @@ def generate_new_game_questions():
     
     questions_code = []
     for char1, char2, img1, img2 in matchups:
-        line = f'                ("{char1}", "{char2}", "{img1}", "{img2}"),'
+        line = f'        ("{char1}", "{char2}", "{img1}", "{img2}"),'
         questions_code.append(line)
     
     return "\n".join(questions_code)
@@ -27,11 +27,11 @@ def main():
     print("✅ Aucun doublon d'anime dans les matchups")
     
     print("\n" + "="*60)
-    print("CODE GÉNÉRÉ POUR would_you_rather.py:")
+    print("CODE GÉNÉRÉ POUR question_bank.py (SEED_QUESTIONS):")
     print("="*60)
-    print('            "questions": [')
+    print('    "anime_girl": [')
     print(new_questions)
-    print('            ]')
+    print('    ]')
     print("="*60)
     
     return new_questions
@@ -0,0 +1,6 @@
+"""
+Benchmark suite for Shadow Roll Bot
+Drives DatabaseManager directly (no Discord) against a synthetic database
+
+Usage: python -m benchmarks --scenarios roll,sell --ops 2000 --concurrency 8 --output run.json
+"""
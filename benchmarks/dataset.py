@@ -0,0 +1,135 @@
+"""
+Synthetic shadow_roll.db for the benchmarks
+Schema comes from DatabaseManager itself; players, catalog, inventories and listings are bulk-loaded on top
+"""
+import json
+import logging
+import os
+import random
+import sqlite3
+from dataclasses import asdict, dataclass
+
+from core.database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# Share of the synthetic catalog per rarity (Evolve entries are the craft results)
+CATALOG_MIX = {
+    'Common': 0.30, 'Rare': 0.24, 'Epic': 0.18, 'Legendary': 0.10, 'Mythic': 0.06,
+    'Titan': 0.03, 'Fusion': 0.02, 'Secret': 0.01, 'Ultimate': 0.01,
+}
+RARITY_VALUES = {
+    'Common': 50, 'Rare': 200, 'Epic': 600, 'Legendary': 1500, 'Mythic': 4000,
+    'Titan': 10000, 'Fusion': 25000, 'Secret': 60000, 'Ultimate': 150000,
+}
+CRAFT_BASES = 20
+CRAFT_BASE_COPIES = 10
+STARTING_COINS = 10_000_000
+
+# Maintained by triggers: dropped for the bulk load, recreated and rebuilt when the database is opened
+INVENTORY_TRIGGERS = ('inventory_summary_ai', 'inventory_summary_ad', 'inventory_summary_au',
+                      'inventory_version_ai', 'inventory_version_au', 'inventory_version_ad')
+
+
+@dataclass
+class DatasetSpec:
+    players: int = 10_000
+    inventory_rows: int = 1_000_000
+    characters: int = 1_000
+    listings: int = 5_000
+    seed: int = 42
+
+
+def _read_spec(path: str):
+    try:
+        with sqlite3.connect(path) as conn:
+            row = conn.execute("SELECT value FROM benchmark_meta WHERE key = 'spec'").fetchone()
+        return json.loads(row[0]) if row else None
+    except sqlite3.Error:
+        return None
+
+
+async def build_dataset(path: str, spec: DatasetSpec, rebuild: bool = False) -> str:
+    """Create the synthetic database at path, unless one with the same spec is already there"""
+    if not rebuild and os.path.exists(path) and _read_spec(path) == asdict(spec):
+        logger.info(f"Reusing benchmark database {path}")
+        return path
+
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    # Schema, rarity tiers, shop items and titles exactly as the bot creates them
+    manager = DatabaseManager(path)
+    await manager.initialize()
+    await manager.close()
+
+    rng = random.Random(spec.seed)
+    conn = sqlite3.connect(path)
+    try:
+        for trigger in INVENTORY_TRIGGERS:
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        _load_catalog(conn, spec, rng)
+        _load_players(conn, spec, rng)
+        _load_listings(conn, spec, rng)
+        conn.execute("CREATE TABLE IF NOT EXISTS benchmark_meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("INSERT OR REPLACE INTO benchmark_meta VALUES ('spec', ?)", (json.dumps(asdict(spec)),))
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    logger.info(f"Benchmark database built at {path}")
+    return path
+
+
+def _load_catalog(conn: sqlite3.Connection, spec: DatasetSpec, rng: random.Random):
+    existing = conn.execute("SELECT COUNT(*) FROM characters").fetchone()[0]
+    missing = max(0, spec.characters - existing - 2 * CRAFT_BASES)
+    rarities = list(CATALOG_MIX)
+    weights = list(CATALOG_MIX.values())
+    rows = []
+    for i in range(missing):
+        rarity = rng.choices(rarities, weights)[0]
+        value = int(RARITY_VALUES[rarity] * rng.uniform(0.8, 1.2))
+        rows.append((f"Bench Perso {i}", f"Bench Série {i % 60}", rarity, value))
+    conn.executemany("INSERT INTO characters (name, anime, rarity, value) VALUES (?, ?, ?, ?)", rows)
+
+    # Craft recipes: "<base> Evolve" is crafted from copies of "<base>"
+    conn.executemany(
+        "INSERT INTO characters (name, anime, rarity, value) VALUES (?, ?, ?, ?)",
+        [(f"Bench Base {i} Evolve", "Bench Craft", 'Evolve', RARITY_VALUES['Epic'] * 15) for i in range(CRAFT_BASES)]
+    )
+    conn.executemany(
+        "INSERT INTO characters (name, anime, rarity, value) VALUES (?, ?, ?, ?)",
+        [(f"Bench Base {i}", "Bench Craft", 'Epic', RARITY_VALUES['Epic']) for i in range(CRAFT_BASES)]
+    )
+
+
+def _load_players(conn: sqlite3.Connection, spec: DatasetSpec, rng: random.Random):
+    conn.executemany(
+        "INSERT OR IGNORE INTO players (user_id, username, coins) VALUES (?, ?, ?)",
+        ((user_id, f"bench_{user_id}", STARTING_COINS) for user_id in range(1, spec.players + 1))
+    )
+    craft_bases = [row[0] for row in conn.execute("SELECT id FROM characters WHERE name LIKE 'Bench Base %' AND rarity != 'Evolve'")]
+    pool = [row[0] for row in conn.execute(
+        "SELECT id FROM characters WHERE rarity != 'Evolve' AND name NOT LIKE 'Bench Base %'")]
+    per_player = max(0, min(len(pool), spec.inventory_rows // spec.players - len(craft_bases)))
+
+    def rows():
+        for user_id in range(1, spec.players + 1):
+            for character_id in craft_bases:
+                yield user_id, character_id, CRAFT_BASE_COPIES
+            for character_id in rng.sample(pool, per_player):
+                yield user_id, character_id, rng.randint(1, 3)
+
+    conn.executemany("INSERT OR IGNORE INTO inventory (user_id, character_id, count) VALUES (?, ?, ?)", rows())
+
+
+def _load_listings(conn: sqlite3.Connection, spec: DatasetSpec, rng: random.Random):
+    character_ids = [row[0] for row in conn.execute("SELECT id FROM characters WHERE rarity != 'Evolve'")]
+    conn.executemany(
+        """INSERT INTO marketplace_listings (seller_id, character_id, inventory_item_id, price, expires_at)
+           VALUES (?, ?, 0, ?, datetime('now', '+7 days'))""",
+        ((rng.randint(1, spec.players), rng.choice(character_ids), rng.randint(100, 5000))
+         for _ in range(spec.listings))
+    )
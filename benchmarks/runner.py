@@ -0,0 +1,174 @@
+"""
+Benchmark runner: times each scenario at a given concurrency and reports JSON
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sqlite3
+import sys
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from core.database import DatabaseManager
+
+from benchmarks.dataset import DatasetSpec, build_dataset
+from benchmarks.scenarios import SCENARIOS, BenchContext
+
+logger = logging.getLogger(__name__)
+
+
+class StatementCounter:
+    """Counts statements run on the connection
+
+    sqlite3 reports each trigger step again under its parent statement, and BEGIN/COMMIT
+    separately: the count is the statements SQLite actually ran, not the calls in the code
+    """
+
+    def __init__(self):
+        self.statements = 0
+        self.transactions = 0
+
+    def __call__(self, statement: str):
+        # Called from the aiosqlite worker thread
+        self.statements += 1
+        if statement.startswith('COMMIT'):
+            self.transactions += 1
+
+    def reset(self):
+        self.statements = 0
+        self.transactions = 0
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_scenario(ctx: BenchContext, name: str, ops: int, concurrency: int,
+                       counter: StatementCounter) -> Dict[str, Any]:
+    operation, setup = SCENARIOS[name]
+    if setup is not None:
+        await setup(ctx, ops)
+
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    remaining = ops
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                await operation(ctx)
+            except Exception as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                logger.debug(f"{name} failed: {e}")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    counter.reset()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'ops': ops,
+        'concurrency': concurrency,
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'ops_per_sec': round(ops / elapsed, 1) if elapsed > 0 else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'max_ms': round(latencies[-1], 3) if latencies else 0.0,
+        'statements_per_op': round(counter.statements / ops, 2),
+        'commits_per_op': round(counter.transactions / ops, 2),
+    }
+
+
+async def run_benchmark(db_path: str, spec: DatasetSpec, scenarios: List[str], ops: int,
+                        concurrency: int, rebuild: bool = False) -> Dict[str, Any]:
+    await build_dataset(db_path, spec, rebuild)
+
+    db = DatabaseManager(db_path)
+    await db.initialize()
+    counter = StatementCounter()
+    await db.db.set_trace_callback(counter)
+    try:
+        ctx = BenchContext(db, spec.players, spec.seed)
+        await ctx.load()
+        results = {}
+        for name in scenarios:
+            logger.info(f"Running {name}: {ops} ops, concurrency {concurrency}")
+            results[name] = await run_scenario(ctx, name, ops, concurrency, counter)
+    finally:
+        await db.db.set_trace_callback(None)
+        await db.close()
+
+    return {
+        'dataset': asdict(spec),
+        'config': {'ops': ops, 'concurrency': concurrency, 'db_path': db_path},
+        'environment': {
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+        },
+        'scenarios': results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Dict[str, Optional[float]]]:
+    """Per scenario: current / baseline for ops/sec, p95 and statements per op"""
+    ratios = {}
+    for name, result in current['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(name)
+        if not before:
+            continue
+        ratios[name] = {
+            key: round(result[key] / before[key], 3) if before[key] else None
+            for key in ('ops_per_sec', 'p95_ms', 'statements_per_op', 'commits_per_op')
+        }
+    return ratios
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmarks des chemins économiques de Shadow Roll")
+    parser.add_argument('--db', default='benchmarks/bench.db', help="base synthétique (créée si absente)")
+    parser.add_argument('--rebuild', action='store_true', help="reconstruire la base synthétique")
+    parser.add_argument('--players', type=int, default=DatasetSpec.players)
+    parser.add_argument('--inventory-rows', type=int, default=DatasetSpec.inventory_rows)
+    parser.add_argument('--characters', type=int, default=DatasetSpec.characters)
+    parser.add_argument('--listings', type=int, default=DatasetSpec.listings)
+    parser.add_argument('--seed', type=int, default=DatasetSpec.seed)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"liste séparée par des virgules parmi: {', '.join(SCENARIOS)}")
+    parser.add_argument('--ops', type=int, default=1000, help="opérations par scénario")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--output', help="fichier JSON de résultats")
+    parser.add_argument('--baseline', help="JSON d'un run précédent à comparer")
+    args = parser.parse_args(argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"scénarios inconnus: {', '.join(unknown)}")
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s',
+                        stream=sys.stderr)
+    spec = DatasetSpec(args.players, args.inventory_rows, args.characters, args.listings, args.seed)
+    report = asyncio.run(run_benchmark(args.db, spec, scenarios, args.ops, args.concurrency, args.rebuild))
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            report['vs_baseline'] = compare(json.load(f), report)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    print(output)
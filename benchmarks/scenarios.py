@@ -0,0 +1,210 @@
+"""
+Benchmark scenarios: the DatabaseManager calls each bot action makes, in the same order
+"""
+import random
+from collections import deque
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.config import BotConfig
+from core.database import DatabaseManager
+from core.ownership import ownership_index
+from core.rarity import rarity_tiers
+
+from benchmarks.dataset import CRAFT_BASE_COPIES
+
+# Copies consumed by one craft (CraftConfirmView.required_count for the synthetic recipes)
+CRAFT_COST = CRAFT_BASE_COPIES // 2
+
+
+class BenchContext:
+    """Shared state of a benchmark run"""
+
+    def __init__(self, db: DatabaseManager, players: int, seed: int):
+        self.db = db
+        self.players = players
+        self.rng = random.Random(seed)
+        self.animes: List[str] = []
+        self.craft_recipes: List[Tuple[str, str]] = []
+        self.listings: deque = deque()
+
+    def player(self) -> int:
+        return self.rng.randint(1, self.players)
+
+    async def load(self):
+        catalog = await ownership_index.current_catalog()
+        self.animes = [anime for anime, _ in catalog.series]
+        cursor = await self.db.db.execute(
+            "SELECT name FROM characters WHERE rarity = 'Evolve' AND name LIKE 'Bench Base %'"
+        )
+        self.craft_recipes = [(row[0][:-len(' Evolve')], row[0]) for row in await cursor.fetchall()]
+
+
+async def _roll(ctx: BenchContext, amount: int):
+    """roll_characters in modules/commands.py (the in-memory cooldown is left out)"""
+    db = ctx.db
+    user_id = ctx.player()
+    player = await db.get_or_create_player(user_id, f"bench_{user_id}")
+    if await db.is_banned(user_id):
+        return
+    cost = BotConfig.REROLL_COST * amount
+    rolled = []
+    for _ in range(amount):
+        character = await db.get_character_by_rarity_weight(user_id)
+        if character:
+            rolled.append(character)
+            await db.add_character_to_inventory(user_id, character.id)
+    await db.get_active_set_bonuses(user_id)
+    await db.update_player_coins(user_id, player.coins - cost)
+    rarest = max(rolled, key=lambda c: rarity_tiers.rank(c.rarity))
+    await db.update_player_reroll_stats(user_id, datetime.now().isoformat(), rarest.rarity)
+    await db.check_and_complete_sets(user_id)
+
+
+async def roll(ctx: BenchContext):
+    await _roll(ctx, 1)
+
+
+async def multi_roll(ctx: BenchContext):
+    await _roll(ctx, BotConfig.MAX_REROLLS_PER_COMMAND)
+
+
+async def sell(ctx: BenchContext):
+    """Sell page, then confirming the first character"""
+    user_id = ctx.player()
+    items = await ctx.db.get_player_sellable_inventory(user_id, 1, 10)
+    if items:
+        await ctx.db.sell_character(user_id, items[0]['inventory_id'])
+
+
+async def daily(ctx: BenchContext):
+    """daily_slash in modules/commands.py"""
+    db = ctx.db
+    user_id = ctx.player()
+    player = await db.get_or_create_player(user_id, f"bench_{user_id}")
+    set_bonuses = await db.get_active_set_bonuses(user_id)
+    base_reward = ctx.rng.randint(BotConfig.DAILY_REWARD_MIN, BotConfig.DAILY_REWARD_MAX)
+    reward = int(base_reward * set_bonuses.get('coin_boost', 1.0))
+    reward = await db.apply_equipment_bonuses_to_coins(user_id, reward)
+    await db.update_player_coins(user_id, player.coins + reward)
+    await db.update_daily_reward(user_id, datetime.now().isoformat())
+
+
+async def trade(ctx: BenchContext):
+    """One character each way, as TradeView.execute_trade does"""
+    db = ctx.db
+    initiator, target = ctx.player(), ctx.player()
+    if initiator == target:
+        return
+    offered = await db.get_player_sellable_inventory(initiator, 1, 1)
+    requested = await db.get_player_sellable_inventory(target, 1, 1)
+    if offered:
+        await db.transfer_character(initiator, target, offered[0]['character_id'])
+    if requested:
+        await db.transfer_character(target, initiator, requested[0]['character_id'])
+
+
+async def craft(ctx: BenchContext):
+    """The statements of CraftConfirmView.confirm_craft, which runs its SQL inline"""
+    conn = ctx.db.db
+    user_id = ctx.player()
+    base_name, evolved_name = ctx.rng.choice(ctx.craft_recipes)
+    cursor = await conn.execute(
+        """SELECT i.id, c.id as char_id, i.count FROM inventory i
+           JOIN characters c ON i.character_id = c.id
+           WHERE i.user_id = ? AND c.name = ?""", (user_id, base_name))
+    inventory_items = await cursor.fetchall()
+    if sum(item[2] for item in inventory_items) < CRAFT_COST:
+        return
+    cursor = await conn.execute("SELECT id FROM characters WHERE name = ?", (evolved_name,))
+    evolved_char = await cursor.fetchone()
+
+    to_remove = CRAFT_COST
+    for inventory_id, _, count in inventory_items:
+        if to_remove <= 0:
+            break
+        cursor = await conn.execute(
+            "SELECT slot_number FROM equipment WHERE user_id = ? AND inventory_id = ?", (user_id, inventory_id))
+        if await cursor.fetchone():
+            await conn.execute("DELETE FROM equipment WHERE user_id = ? AND inventory_id = ?", (user_id, inventory_id))
+        removed = min(to_remove, count)
+        to_remove -= removed
+        if count - removed <= 0:
+            await conn.execute("DELETE FROM inventory WHERE id = ?", (inventory_id,))
+        else:
+            await conn.execute("UPDATE inventory SET count = ? WHERE id = ?", (count - removed, inventory_id))
+    # The view inserts a new row; the upsert keeps repeated crafts of one recipe from failing here
+    await conn.execute(
+        """INSERT INTO inventory (user_id, character_id, obtained_at) VALUES (?, ?, datetime('now'))
+           ON CONFLICT(user_id, character_id) DO UPDATE SET count = count + 1""",
+        (user_id, evolved_char[0]))
+    await conn.commit()
+    await ctx.db.get_or_create_player(user_id, f"bench_{user_id}")
+
+
+async def market_browse(ctx: BenchContext):
+    await ctx.db.get_marketplace_listings(ctx.rng.randint(1, 5), 10)
+
+
+async def prepare_market_buy(ctx: BenchContext, ops: int):
+    """Active listing ids to buy from, topped up so each op has one"""
+    cursor = await ctx.db.db.execute(
+        "SELECT id FROM marketplace_listings WHERE is_active = TRUE AND datetime(expires_at) > datetime('now')"
+    )
+    ids = [row[0] for row in await cursor.fetchall()]
+    if len(ids) < ops:
+        cursor = await ctx.db.db.execute("SELECT id FROM characters WHERE rarity != 'Evolve' LIMIT 100")
+        character_ids = [row[0] for row in await cursor.fetchall()]
+        await ctx.db.db.executemany(
+            """INSERT INTO marketplace_listings (seller_id, character_id, inventory_item_id, price, expires_at)
+               VALUES (?, ?, 0, ?, datetime('now', '+7 days'))""",
+            [(ctx.player(), ctx.rng.choice(character_ids), ctx.rng.randint(100, 5000)) for _ in range(ops - len(ids))]
+        )
+        await ctx.db.db.commit()
+        return await prepare_market_buy(ctx, ops)
+    ctx.rng.shuffle(ids)
+    ctx.listings = deque(ids)
+
+
+async def market_buy(ctx: BenchContext):
+    """Listing page, then buying one listing"""
+    await ctx.db.get_marketplace_listings(1, 10)
+    await ctx.db.purchase_marketplace_item(ctx.player(), ctx.listings.popleft())
+
+
+async def leaderboard(ctx: BenchContext):
+    await ctx.db.get_leaderboard('coins', 10)
+
+
+async def leaderboard_value(ctx: BenchContext):
+    await ctx.db.get_leaderboard('collection_value', 10)
+
+
+async def index_page(ctx: BenchContext):
+    """IndexView page: a few pages in, sometimes filtered by series"""
+    anime = ctx.rng.choice(ctx.animes) if ctx.animes and ctx.rng.random() < 0.5 else None
+    await ownership_index.page(ctx.player(), ctx.rng.randint(1, 5), 8, anime=anime)
+
+
+async def profile(ctx: BenchContext):
+    user_id = ctx.player()
+    await ctx.db.get_profile_snapshot(user_id, f"bench_{user_id}")
+
+
+Scenario = Callable[[BenchContext], Awaitable[None]]
+
+# Name -> (operation, optional setup run before timing with the op count)
+SCENARIOS: Dict[str, Tuple[Scenario, Optional[Callable[[BenchContext, int], Awaitable[None]]]]] = {
+    'roll': (roll, None),
+    'multi_roll': (multi_roll, None),
+    'sell': (sell, None),
+    'daily': (daily, None),
+    'trade': (trade, None),
+    'craft': (craft, None),
+    'market_browse': (market_browse, None),
+    'market_buy': (market_buy, prepare_market_buy),
+    'leaderboard': (leaderboard, None),
+    'leaderboard_value': (leaderboard_value, None),
+    'index_page': (index_page, None),
+    'profile': (profile, None),
+}
@@ -4,22 +4,37 @@ Centralise tous les personnages et garantit la persistance des créations admin
 """
 
 import aiosqlite
+import asyncio
 import logging
 import json
+import os
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 
+from core.autocomplete import name_index
+from core.catalog_journal import catalog_journal
+
 logger = logging.getLogger(__name__)
 
+def _write_json(path: str, data: Dict):
+    """Sérialisation et écriture hors de la boucle, remplacement atomique du fichier"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
 class CharacterManager:
     """Gestionnaire centralisé pour tous les personnages du système"""
     
     def __init__(self, db_path: str = "shadow_roll.db"):
         self.db_path = db_path
-        self.characters_file = "all_characters.json"
+        # Export JSON : instantané compacté + journal des modifications (core/catalog_journal.py)
+        self.characters_file = catalog_journal.snapshot_path
         
     async def initialize(self):
         """Initialiser le gestionnaire et synchroniser tous les personnages"""
+        await catalog_journal.load()
         await self.sync_all_characters()
         
     async def sync_all_characters(self):
@@ -33,36 +48,24 @@ class CharacterManager:
                 db_characters = await cursor.fetchall()
             
             # Convertir en format dictionnaire
-            all_characters = []
-            for char in db_characters:
-                character_data = {
+            rows = [
+                {
                     "id": char[0],
                     "name": char[1],
                     "anime": char[2],
                     "rarity": char[3],
                     "value": char[4],
-                    "image_url": char[5] or "",
-                    "source": "database",
-                    "created_at": datetime.now().isoformat()
-                }
-                all_characters.append(character_data)
-            
-            # Sauvegarder dans le fichier JSON
-            characters_data = {
-                "last_sync": datetime.now().isoformat(),
-                "total_characters": len(all_characters),
-                "characters": all_characters,
-                "sync_info": {
-                    "database_characters": len(all_characters),
-                    "admin_created": len([c for c in all_characters if c.get("source") == "admin"]),
-                    "base_characters": len([c for c in all_characters if c.get("source") == "database"])
+                    "image_url": char[5] or ""
                 }
-            }
+                for char in db_characters
+            ]
             
-            with open(self.characters_file, 'w', encoding='utf-8') as f:
-                json.dump(characters_data, f, indent=2, ensure_ascii=False)
+            # Journaliser uniquement les différences avec l'export
+            added, updated, removed = await catalog_journal.sync(rows)
+            all_characters = catalog_journal.all()
             
-            logger.info(f"Synchronisation complète: {len(all_characters)} personnages sauvegardés")
+            logger.info(f"Synchronisation complète: {len(all_characters)} personnages "
+                        f"({added} ajoutés, {updated} modifiés, {removed} supprimés)")
             return all_characters
             
         except Exception as e:
@@ -81,23 +84,6 @@ class CharacterManager:
                 character_id = cursor.lastrowid or 0
                 await db.commit()
             
-            # Charger le fichier JSON existant
-            try:
-                with open(self.characters_file, 'r', encoding='utf-8') as f:
-                    characters_data = json.load(f)
-            except FileNotFoundError:
-                characters_data = {
-                    "last_sync": datetime.now().isoformat(),
-                    "total_characters": 0,
-                    "characters": [],
-                    "sync_info": {
-                        "database_characters": 0,
-                        "admin_created": 0,
-                        "base_characters": 0
-                    }
-                }
-            
-            # Ajouter le nouveau personnage
             new_character = {
                 "id": character_id,
                 "name": name,
@@ -110,14 +96,9 @@ class CharacterManager:
                 "created_by": admin_id or 0
             }
             
-            characters_data["characters"].append(new_character)
-            characters_data["total_characters"] = len(characters_data["characters"])
-            characters_data["last_sync"] = datetime.now().isoformat()
-            characters_data["sync_info"]["admin_created"] += 1
-            
-            # Sauvegarder
-            with open(self.characters_file, 'w', encoding='utf-8') as f:
-                json.dump(characters_data, f, indent=2, ensure_ascii=False)
+            # Ajouter à l'export JSON (une ligne de journal)
+            await catalog_journal.put(new_character)
+            name_index.mark_stale()
             
             logger.info(f"Personnage admin ajouté: {name} ({anime}) - ID: {character_id}")
             return True
@@ -127,14 +108,13 @@ class CharacterManager:
             return False
     
     async def get_all_characters(self) -> List[Dict]:
-        """Récupérer tous les personnages depuis le fichier JSON"""
+        """Récupérer tous les personnages depuis l'export (en mémoire après le rejeu au démarrage)"""
         try:
-            with open(self.characters_file, 'r', encoding='utf-8') as f:
-                characters_data = json.load(f)
-            return characters_data.get("characters", [])
-        except FileNotFoundError:
-            # Synchroniser si le fichier n'existe pas
-            return await self.sync_all_characters()
+            await catalog_journal.load()
+            if not catalog_journal.characters and not os.path.exists(self.characters_file):
+                # Synchroniser si l'export n'existe pas
+                return await self.sync_all_characters()
+            return catalog_journal.all()
         except Exception as e:
             logger.error(f"Erreur lors de la lecture des personnages: {e}")
             return []
@@ -157,11 +137,8 @@ class CharacterManager:
     
     async def get_character_by_id(self, character_id: int) -> Optional[Dict]:
         """Récupérer un personnage par son ID"""
-        all_chars = await self.get_all_characters()
-        for char in all_chars:
-            if char["id"] == character_id:
-                return char
-        return None
+        await self.get_all_characters()
+        return catalog_journal.get(character_id)
     
     async def update_character_field(self, character_id: int, field: str, new_value) -> bool:
         """Mettre à jour un champ spécifique d'un personnage"""
@@ -184,8 +161,9 @@ class CharacterManager:
                 
                 await db.commit()
             
-            # Resynchroniser le fichier JSON
-            await self.sync_all_characters()
+            # Mettre à jour l'export JSON
+            await catalog_journal.update(character_id, {field: new_value})
+            name_index.mark_stale()
             
             logger.info(f"Character {character_id} field '{field}' updated to: {new_value}")
             return True
@@ -207,19 +185,10 @@ class CharacterManager:
             
             # Mettre à jour dans le fichier JSON
             try:
-                with open(self.characters_file, 'r', encoding='utf-8') as f:
-                    characters_data = json.load(f)
-                
-                for char in characters_data["characters"]:
-                    if char["id"] == character_id:
-                        char["image_url"] = new_image_url
-                        char["last_updated"] = datetime.now().isoformat()
-                        break
-                
-                characters_data["last_sync"] = datetime.now().isoformat()
-                
-                with open(self.characters_file, 'w', encoding='utf-8') as f:
-                    json.dump(characters_data, f, indent=2, ensure_ascii=False)
+                await catalog_journal.update(character_id, {
+                    "image_url": new_image_url,
+                    "last_updated": datetime.now().isoformat()
+                })
                 
                 logger.info(f"Image mise à jour pour le personnage ID {character_id}")
                 return True
@@ -279,8 +248,7 @@ class CharacterManager:
                 "characters": all_chars
             }
             
-            with open(backup_name, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, indent=2, ensure_ascii=False)
+            await asyncio.to_thread(_write_json, backup_name, backup_data)
             
             logger.info(f"Sauvegarde créée: {backup_name}")
             return backup_name
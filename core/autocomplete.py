@@ -0,0 +1,211 @@
+"""
+Autocomplete for Shadow Roll Bot
+In-memory sorted arrays of accent-folded character and anime names for app-command choices
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from discord import app_commands
+
+from core.cache import bot_cache
+from core.search import fold
+
+logger = logging.getLogger(__name__)
+
+# Discord shows at most 25 choices; names and values are capped at 100 characters
+MAX_CHOICES = 25
+MAX_CHOICE_LENGTH = 100
+
+
+@dataclass
+class NameEntry:
+    """One completable name"""
+    id: int
+    name: str
+    folded: str
+    label: str
+
+
+class PrefixIndex:
+    """Sorted array of folded keys; every word start of a name is a key"""
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._slots: List[int] = []  # index into entries, parallel to _keys
+        self.entries: List[NameEntry] = []
+        self._by_id: Dict[int, NameEntry] = {}
+
+    def build(self, entries: Iterable[NameEntry]):
+        self.entries = list(entries)
+        self._by_id = {entry.id: entry for entry in self.entries}
+        keyed = []
+        for slot, entry in enumerate(self.entries):
+            words = entry.folded.split()
+            for i in range(len(words)):
+                keyed.append((' '.join(words[i:]), slot))
+        keyed.sort()
+        self._keys = [key for key, _ in keyed]
+        self._slots = [slot for _, slot in keyed]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def complete(self, text: str, limit: int = MAX_CHOICES,
+                 allowed: Optional[Set[int]] = None) -> List[NameEntry]:
+        """Names starting with text (or with a word starting with it), then names containing it"""
+        query = fold(text)
+        if allowed is not None and len(allowed) * 4 < len(self.entries):
+            # Small allowed set (e.g. one player's inventory): scanning it beats the full range
+            return self._complete_scan(query, limit, allowed)
+
+        if not query:
+            return [e for e in self.entries if allowed is None or e.id in allowed][:limit]
+
+        matches = []
+        seen = set()
+        start = bisect.bisect_left(self._keys, query)
+        # Walk the matching key range; a few extra candidates leave room for ranking
+        for position in range(start, len(self._keys)):
+            key = self._keys[position]
+            if not key.startswith(query) or len(matches) >= limit * 4:
+                break
+            slot = self._slots[position]
+            if slot in seen:
+                continue
+            entry = self.entries[slot]
+            if allowed is not None and entry.id not in allowed:
+                continue
+            seen.add(slot)
+            matches.append(entry)
+
+        # Whole-name prefixes first, then word prefixes, shorter names first
+        matches.sort(key=lambda e: (not e.folded.startswith(query), len(e.folded), e.folded))
+        matches = matches[:limit]
+
+        if len(matches) < limit and len(query) >= 3:
+            for slot, entry in enumerate(self.entries):
+                if slot in seen or query not in entry.folded:
+                    continue
+                if allowed is not None and entry.id not in allowed:
+                    continue
+                matches.append(entry)
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def _complete_scan(self, query: str, limit: int, allowed: Set[int]) -> List[NameEntry]:
+        ranked = []
+        for entry_id in allowed:
+            entry = self._by_id.get(entry_id)
+            if entry is None:
+                continue
+            if not query or entry.folded.startswith(query):
+                rank = 0
+            elif any(word.startswith(query) for word in entry.folded.split()):
+                rank = 1
+            elif query in entry.folded:
+                rank = 2
+            else:
+                continue
+            ranked.append((rank, len(entry.folded), entry.folded, entry))
+        ranked.sort(key=lambda item: item[:3])
+        return [item[3] for item in ranked[:limit]]
+
+
+class NameIndex:
+    """Character and anime name indexes rebuilt from the catalog in the background"""
+
+    REFRESH_SECONDS = 300
+    OWNED_TTL = 30
+
+    def __init__(self):
+        self.characters = PrefixIndex()
+        self.animes = PrefixIndex()
+        self.loaded_at = 0.0
+        self._db_manager = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def load(self, db_manager):
+        """Build both indexes from the characters table"""
+        self._db_manager = db_manager
+        cursor = await db_manager.db.execute(
+            "SELECT id, name, anime, rarity FROM characters ORDER BY name"
+        )
+        rows = await cursor.fetchall()
+
+        self.characters.build(
+            NameEntry(row[0], row[1], fold(row[1]), f"{row[1]} — {row[2]} ({row[3]})")
+            for row in rows
+        )
+        animes = sorted({row[2] for row in rows if row[2]})
+        self.animes.build(NameEntry(i, anime, fold(anime), anime) for i, anime in enumerate(animes))
+        self.loaded_at = time.monotonic()
+        logger.info(f"Autocomplete index loaded: {len(self.characters)} characters, {len(self.animes)} animes")
+
+    def mark_stale(self):
+        """Force a rebuild on the next lookup (after catalog edits)"""
+        self.loaded_at = 0.0
+
+    async def _ensure_fresh(self, db_manager):
+        if db_manager is not None:
+            self._db_manager = db_manager
+        if self._db_manager is None:
+            return
+        if not self.loaded_at:
+            # First lookup has to wait for the catalog
+            await self.load(self._db_manager)
+        elif time.monotonic() - self.loaded_at > self.REFRESH_SECONDS:
+            if self._refresh_task is None or self._refresh_task.done():
+                # Keep answering from the current arrays while rebuilding
+                self._refresh_task = asyncio.create_task(self.load(self._db_manager))
+
+    async def owned_character_ids(self, db_manager, user_id: int) -> Set[int]:
+        """Character ids in a player's inventory (briefly cached between keystrokes)"""
+        cache_key = f"autocomplete_owned_{user_id}"
+        owned = bot_cache.get(cache_key)
+        if owned is None:
+            cursor = await db_manager.db.execute(
+                "SELECT DISTINCT character_id FROM inventory WHERE user_id = ?", (user_id,)
+            )
+            owned = {row[0] for row in await cursor.fetchall()}
+            bot_cache.set(cache_key, owned, self.OWNED_TTL)
+        return owned
+
+    async def character_choices(self, db_manager, current: str,
+                                owner_id: Optional[int] = None) -> List[app_commands.Choice[str]]:
+        """Choices for a character name parameter, optionally limited to one player's inventory"""
+        try:
+            await self._ensure_fresh(db_manager)
+            allowed = None
+            if owner_id is not None:
+                allowed = await self.owned_character_ids(db_manager, owner_id)
+            entries = self.characters.complete(current, MAX_CHOICES, allowed)
+        except Exception as e:
+            logger.error(f"Character autocomplete failed: {e}")
+            return []
+        return [
+            app_commands.Choice(name=e.label[:MAX_CHOICE_LENGTH], value=e.name[:MAX_CHOICE_LENGTH])
+            for e in entries
+        ]
+
+    async def anime_choices(self, db_manager, current: str) -> List[app_commands.Choice[str]]:
+        """Choices for an anime/series name parameter"""
+        try:
+            await self._ensure_fresh(db_manager)
+            entries = self.animes.complete(current, MAX_CHOICES)
+        except Exception as e:
+            logger.error(f"Anime autocomplete failed: {e}")
+            return []
+        return [
+            app_commands.Choice(name=e.name[:MAX_CHOICE_LENGTH], value=e.name[:MAX_CHOICE_LENGTH])
+            for e in entries
+        ]
+
+
+# Global autocomplete index
+name_index = NameIndex()
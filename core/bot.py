@@ -11,6 +11,9 @@ from typing import Optional
 from core.config import BotConfig
 from core.database import DatabaseManager
 from core.performance import initialize_performance_optimizer
+from core.metrics import metrics
+from core.tracing import tracer
+from core.watchdog import watchdog
 from modules.utils import get_display_name
 
 logger = logging.getLogger(__name__)
@@ -31,20 +34,53 @@ class ShadowRollBot(commands.Bot):
         )
         
         self.db = None
+        self._effects_sweeper: Optional[asyncio.Task] = None
+        
+    async def sweep_expired_effects(self, interval: float = 300):
+        """Background sweeper for the effects table (reads already ignore expired effects)"""
+        while True:
+            await asyncio.sleep(interval)
+            removed = await self.db.sweep_expired_effects()
+            if removed:
+                logger.info(f"Swept {removed} expired effects")
         
     async def setup_hook(self):
         """Setup hook called when bot is starting"""
         logger.info("Initializing Shadow Roll Bot...")
         
+        # Span trees per button click / slash command, before any view or command exists
+        tracer.install()
+        # Loop lag heartbeat, plus the stack of any callback that blocks the loop
+        watchdog.start()
+        # /metrics reads the bot's connection and views
+        metrics.start(self)
+        
         # Initialize database
         self.db = DatabaseManager()
         await self.db.initialize()
         logger.info("Database initialized successfully")
         
+        # Expired potion effects are deleted here, off the roll path
+        self._effects_sweeper = asyncio.create_task(self.sweep_expired_effects())
+        
         # Initialize performance optimizer
         await initialize_performance_optimizer(self.db)
         logger.info("Performance optimizer initialized successfully")
         
+        # Warm the autocomplete index so the first keystroke is served from memory
+        try:
+            from core.autocomplete import name_index
+            await name_index.load(self.db)
+        except Exception as e:
+            logger.error(f"Error loading autocomplete index: {e}")
+        
+        # Parse the patch notes once; views then serve pages from the parsed index
+        try:
+            from modules.patch_notes import patch_notes_store
+            await patch_notes_store.get()
+        except Exception as e:
+            logger.error(f"Error loading patch notes: {e}")
+        
         # Character images are now managed manually via !addimage command
         # No automatic overwriting of custom images
         
@@ -66,20 +102,14 @@ class ShadowRollBot(commands.Bot):
             async def look_card(ctx, *, character_name: str):
                 """Afficher la carte d'un personnage - Disponible pour tous"""
                 try:
-                    # Recherche du personnage - exact match first, then partial
-                    cursor = await self.db.db.execute(
-                        "SELECT id, name, anime, rarity, value, image_url FROM characters WHERE LOWER(name) = LOWER(?) ORDER BY name",
-                        (character_name,)
-                    )
-                    char_rows = await cursor.fetchall()
-                    
-                    # If no exact match, try partial match
-                    if not char_rows:
-                        cursor = await self.db.db.execute(
-                            "SELECT id, name, anime, rarity, value, image_url FROM characters WHERE LOWER(name) LIKE LOWER(?) ORDER BY name",
-                            (f"%{character_name}%",)
-                        )
-                        char_rows = await cursor.fetchall()
+                    # Recherche classée: correspondance exacte seule, sinon préfixes, sous-chaînes et fautes de frappe
+                    results = await self.db.search_characters(character_name, limit=10)
+                    if results and results[0]['match'] == 'exact':
+                        results = results[:1]
+                    char_rows = [
+                        (c['id'], c['name'], c['anime'], c['rarity'], c['value'], c['image_url'])
+                        for c in results
+                    ]
                     
                     if not char_rows:
                         await ctx.send(f"❌ Aucun personnage trouvé pour '{character_name}'")
@@ -342,6 +372,18 @@ class ShadowRollBot(commands.Bot):
     
     async def close(self):
         """Cleanup when bot is shutting down"""
+        from core.http_client import http_client
+        from core.outbound import outbound
+        from modules.games.scheduler import game_scheduler
+        await game_scheduler.stop()
+        await outbound.stop()
+        watchdog.stop()
+        if self._effects_sweeper:
+            self._effects_sweeper.cancel()
+        await http_client.close()
+        game_manager = getattr(self, 'game_manager', None)
+        if game_manager:
+            await game_manager.stats_manager.close()
         if self.db:
             await self.db.close()
         await super().close()
\ No newline at end of file
@@ -4,13 +4,30 @@ Improves performance by caching frequently accessed data
 """
 
 import asyncio
+import re
 import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 import logging
 
+from core.tracing import cache_span_name, tracer
+
 logger = logging.getLogger(__name__)
 
+_NAMESPACE = re.compile(r'^(.*?)(?:_-?\d.*)?$', re.DOTALL)
+
+
+def cache_namespace(key: str) -> str:
+    """Key prefix before its first id: profile_42 -> profile, opt_inventory_42_1_10_None -> opt_inventory"""
+    return _NAMESPACE.match(key).group(1)
+
+
+def _trace_lookup(key: str, start: float, hit: bool):
+    """Cache lookup as a span of the current interaction trace, if any"""
+    if tracer.current() is not None:
+        tracer.record('cache', cache_span_name(key), start, hit=hit)
+
+
 class BotCache:
     """High-performance cache system for Shadow Roll Bot"""
     
@@ -19,21 +36,36 @@ class BotCache:
         self._ttl: Dict[str, float] = {}  # Time to live for each cache key
         self._hit_count = 0
         self._miss_count = 0
+        # Key prefix -> [hits, misses]
+        self._namespace_counts: Dict[str, List[int]] = {}
+        
+    def _count_lookup(self, key: str, start: float, hit: bool) -> None:
+        if hit:
+            self._hit_count += 1
+        else:
+            self._miss_count += 1
+        namespace = cache_namespace(key)
+        counts = self._namespace_counts.get(namespace)
+        if counts is None:
+            counts = self._namespace_counts[namespace] = [0, 0]
+        counts[0 if hit else 1] += 1
+        _trace_lookup(key, start, hit)
         
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache if not expired"""
+        start = time.perf_counter()
         if key not in self._cache:
-            self._miss_count += 1
+            self._count_lookup(key, start, False)
             return None
             
         # Check if expired
         if key in self._ttl and time.time() > self._ttl[key]:
             del self._cache[key]
             del self._ttl[key]
-            self._miss_count += 1
+            self._count_lookup(key, start, False)
             return None
             
-        self._hit_count += 1
+        self._count_lookup(key, start, True)
         return self._cache[key]['value']
     
     def set(self, key: str, value: Any, ttl_seconds: int = 300) -> None:
@@ -74,9 +106,18 @@ class BotCache:
             'miss_count': self._miss_count,
             'hit_rate': f"{hit_rate:.2f}%",
             'cache_size': len(self._cache),
-            'memory_usage': self._estimate_memory_usage()
+            'memory_usage': self._estimate_memory_usage(),
+            'namespaces': self.namespace_stats()
         }
     
+    def namespace_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hits and misses per key namespace"""
+        return {namespace: {'hits': hits, 'misses': misses}
+                for namespace, (hits, misses) in sorted(self._namespace_counts.items())}
+    
+    def __len__(self) -> int:
+        return len(self._cache)
+    
     def _estimate_memory_usage(self) -> str:
         """Estimate cache memory usage"""
         import sys
@@ -159,37 +200,17 @@ class CachedDatabaseMixin:
         
         return None
     
-    async def get_inventory_cached(self, user_id: int, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
-        """Get user inventory with caching"""
-        cache_key = f"inventory_{user_id}_{limit}_{offset}"
+    async def get_inventory_cached(self, user_id: int, limit: int = 20, offset: int = 0,
+                                   after: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """Get user inventory with caching (pass after= to page by cursor)"""
+        cache_key = f"inventory_{user_id}_{limit}_{offset}_{after}"
         cached_data = bot_cache.get(cache_key)
         
         if cached_data is not None:
             return cached_data
         
-        # Fetch from database with optimized query
-        cursor = await self.db.execute("""
-            SELECT i.character_id, i.count, c.name, c.anime, c.rarity, c.value, c.image_url
-            FROM inventory i
-            JOIN characters c ON i.character_id = c.id
-            WHERE i.user_id = ?
-            ORDER BY c.rarity DESC, c.value DESC, c.name
-            LIMIT ? OFFSET ?
-        """, (user_id, limit, offset))
-        
-        inventory_data = await cursor.fetchall()
-        inventory_list = []
-        
-        for row in inventory_data:
-            inventory_list.append({
-                'character_id': row[0],
-                'count': row[1],
-                'name': row[2],
-                'anime': row[3],
-                'rarity': row[4],
-                'value': row[5],
-                'image_url': row[6]
-            })
+        # Same rarity_rank order and keyset cursor as the inventory views
+        inventory_list = await self.get_user_inventory(user_id, limit, offset, after=after)
         
         # Cache for 1 minute (inventory changes frequently)
         bot_cache.set(cache_key, inventory_list, 60)
@@ -198,6 +219,7 @@ class CachedDatabaseMixin:
     async def invalidate_player_cache(self, user_id: int) -> None:
         """Invalidate all cache entries for a specific player"""
         bot_cache.invalidate(f"player_{user_id}")
+        bot_cache.invalidate(f"profile_{user_id}")
         bot_cache.invalidate_pattern(f"inventory_{user_id}")
         bot_cache.invalidate_pattern(f"achievements_{user_id}")
     
@@ -0,0 +1,243 @@
+"""
+Character catalog export for Shadow Roll Bot
+Append-only JSONL journal of catalog changes over a periodically compacted JSON snapshot
+"""
+
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.config import BotConfig
+
+logger = logging.getLogger(__name__)
+
+# Fields compared against the database on a full sync (the rest is export metadata)
+SYNCED_FIELDS = ('name', 'anime', 'rarity', 'value', 'image_url')
+
+
+def _fsync_directory(path: str):
+    """Make a rename durable (not supported everywhere, best effort)"""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class CatalogJournal:
+    """In-memory catalog rebuilt from snapshot + journal, changed by appending records
+
+    Every change is one fsync'd line in the journal; the snapshot (the
+    all_characters.json export) is rewritten only on compaction, to a temp file renamed
+    over the old one. The snapshot stores the last journal seq it contains, so a crash
+    between the rename and the journal truncation replays nothing twice, and a torn last
+    line from a crash mid-append is cut off at load. The database stays the source of
+    truth: this is an export, rebuilt from it by sync().
+    """
+
+    def __init__(self, snapshot_path: str = BotConfig.CATALOG_SNAPSHOT_FILE,
+                 journal_path: str = BotConfig.CATALOG_JOURNAL_FILE,
+                 compact_every: int = BotConfig.CATALOG_COMPACT_EVERY):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.compact_every = compact_every
+        self.characters: Dict[int, Dict[str, Any]] = {}
+        self.seq = 0
+        self.last_sync: Optional[str] = None
+        self.pending = 0  # journal records not yet folded into the snapshot
+        self.loaded = False
+        self._lock = asyncio.Lock()
+        self.stats = {'appends': 0, 'records': 0, 'compactions': 0, 'replayed': 0}
+
+    # ----- boot -----
+
+    async def load(self):
+        """Replay snapshot + journal once per process"""
+        if self.loaded:
+            return
+        async with self._lock:
+            if not self.loaded:
+                await asyncio.to_thread(self._load)
+                self.loaded = True
+
+    def _load(self):
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self.characters = {char['id']: char for char in snapshot.get('characters', [])}
+            self.seq = snapshot.get('journal_seq', 0)
+            self.last_sync = snapshot.get('last_sync')
+        except FileNotFoundError:
+            self.characters, self.seq = {}, 0
+        except (OSError, ValueError) as e:
+            # Not fatal: the next sync() rebuilds everything from the database
+            logger.error(f"Unreadable catalog snapshot {self.snapshot_path}: {e}")
+            self.characters, self.seq = {}, 0
+
+        snapshot_seq = self.seq
+        good_offset = 0
+        try:
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        complete = line.endswith(b'\n')
+                    except ValueError:
+                        complete = False
+                    if not complete:
+                        logger.warning(f"Torn record at offset {good_offset} in {self.journal_path}, truncated")
+                        break
+                    good_offset += len(line)
+                    if record['seq'] > snapshot_seq:
+                        self._apply(record)
+                        self.seq = record['seq']
+                        self.pending += 1
+                        self.stats['replayed'] += 1
+            if good_offset != os.path.getsize(self.journal_path):
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(good_offset)
+                    os.fsync(f.fileno())
+        except FileNotFoundError:
+            pass
+        logger.info(f"Catalog loaded: {len(self.characters)} characters "
+                    f"(snapshot seq {snapshot_seq}, {self.stats['replayed']} journal records replayed)")
+
+    # ----- changes -----
+
+    def _apply(self, record: Dict[str, Any]):
+        op = record['op']
+        if op == 'put':
+            character = record['character']
+            self.characters[character['id']] = character
+        elif op == 'update':
+            character = self.characters.get(record['id'])
+            if character is not None:
+                character.update(record['fields'])
+        elif op == 'delete':
+            self.characters.pop(record['id'], None)
+        elif op == 'sync':
+            self.last_sync = record['ts']
+
+    async def _append(self, changes: List[Dict[str, Any]]):
+        """Write the records (one write, one fsync), then apply them in memory"""
+        now = datetime.now().isoformat()
+        records = []
+        for change in changes:
+            self.seq += 1
+            records.append({'seq': self.seq, 'ts': now, **change})
+        payload = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        await asyncio.to_thread(self._write_journal, payload)
+        for record in records:
+            self._apply(record)
+        self.pending += len(records)
+        self.stats['appends'] += 1
+        self.stats['records'] += len(records)
+        if self.pending >= self.compact_every:
+            await self._compact()
+
+    def _write_journal(self, payload: str):
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def put(self, character: Dict[str, Any]):
+        """Add or replace one character"""
+        await self.load()
+        async with self._lock:
+            await self._append([{'op': 'put', 'character': character}])
+
+    async def update(self, character_id: int, fields: Dict[str, Any]):
+        """Change some fields of one character"""
+        await self.load()
+        async with self._lock:
+            await self._append([{'op': 'update', 'id': character_id, 'fields': fields}])
+
+    async def sync(self, rows: List[Dict[str, Any]]) -> Tuple[int, int, int]:
+        """Journal the difference between the export and the database rows: (added, updated, removed)
+
+        Unchanged characters cost nothing and keep their export metadata (source,
+        created_at, created_by).
+        """
+        await self.load()
+        async with self._lock:
+            now = datetime.now().isoformat()
+            changes = []
+            added = updated = 0
+            for row in rows:
+                current = self.characters.get(row['id'])
+                if current is None:
+                    changes.append({'op': 'put', 'character': {**row, 'source': 'database', 'created_at': now}})
+                    added += 1
+                else:
+                    fields = {field: row[field] for field in SYNCED_FIELDS if current.get(field) != row[field]}
+                    if fields:
+                        changes.append({'op': 'update', 'id': row['id'], 'fields': fields})
+                        updated += 1
+            live_ids = {row['id'] for row in rows}
+            removed = [character_id for character_id in self.characters if character_id not in live_ids]
+            changes.extend({'op': 'delete', 'id': character_id} for character_id in removed)
+            changes.append({'op': 'sync'})
+            await self._append(changes)
+            if not os.path.exists(self.snapshot_path):
+                await self._compact()
+            return added, updated, len(removed)
+
+    # ----- compaction -----
+
+    async def compact(self):
+        await self.load()
+        async with self._lock:
+            await self._compact()
+
+    async def _compact(self):
+        characters = sorted(self.characters.values(), key=lambda char: (char['anime'], char['name']))
+        snapshot = {
+            'last_sync': self.last_sync or datetime.now().isoformat(),
+            'total_characters': len(characters),
+            'characters': characters,
+            'sync_info': {
+                'database_characters': len(characters),
+                'admin_created': sum(1 for char in characters if char.get('source') == 'admin'),
+                'base_characters': sum(1 for char in characters if char.get('source') == 'database'),
+            },
+            'journal_seq': self.seq,
+        }
+        await asyncio.to_thread(self._write_snapshot, snapshot)
+        self.pending = 0
+        self.stats['compactions'] += 1
+
+    def _write_snapshot(self, snapshot: Dict[str, Any]):
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        _fsync_directory(self.snapshot_path)
+        # Everything up to journal_seq is in the snapshot now
+        with open(self.journal_path, 'w', encoding='utf-8') as f:
+            os.fsync(f.fileno())
+
+    # ----- reads -----
+
+    def all(self) -> List[Dict[str, Any]]:
+        return list(self.characters.values())
+
+    def get(self, character_id: int) -> Optional[Dict[str, Any]]:
+        return self.characters.get(character_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'characters': len(self.characters), 'seq': self.seq, 'pending': self.pending}
+
+
+# Global catalog journal instance
+catalog_journal = CatalogJournal()
@@ -13,9 +13,41 @@ class BotConfig:
     DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
     COMMAND_PREFIX = '!'
     LOG_LEVEL = 'INFO'
-    LOG_FILE = 'bot.log'
+    LOG_FILE = 'logs/bot.log'
+
+    # Logging pipeline (core/log_pipeline.py)
+    LOG_JSON_FILE = 'logs/bot.jsonl'  # one JSON object per record, with the interaction context
+    LOG_FILE_MAX_BYTES = 10 * 1024 * 1024  # text log rotated beyond this
+    LOG_BACKUP_COUNT = 5
+    LOG_JSON_BACKUP_DAYS = 7  # JSON log rotated at midnight
+    LOG_QUEUE_SIZE = 10000  # records waiting for the writer thread; dropped (and counted) beyond this
+    # Per-logger levels and sampling rates (prefix match, the longest wins), overridable
+    # with LOG_LEVELS / LOG_SAMPLING="core.cache=0.1,modules.shop=0.5"; sampling never drops warnings
+    LOG_LEVELS = {'aiosqlite': 'INFO', 'discord.gateway': 'INFO', 'discord.http': 'INFO'}
+    LOG_SAMPLING: Dict[str, float] = {}
     VERSION = 'v4.6.1'
 
+    # Query instrumentation (core/query_stats.py)
+    SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 100))  # statements above this are logged with their caller
+    SLOW_QUERY_EXPLAIN = True  # keep the EXPLAIN QUERY PLAN of each slow fingerprint
+
+    # Interaction tracing (core/tracing.py)
+    TRACE_FILE = 'logs/traces.jsonl'
+    TRACE_SLOW_MS = 1000  # traces above this are always sampled
+    TRACE_SAMPLE_RATE = 0.01  # share of ordinary traces kept as a baseline
+    TRACE_MAX_PER_MINUTE = 60
+    TRACE_FILE_MAX_BYTES = 20 * 1024 * 1024  # rotated to .1 beyond this
+
+    # Event loop watchdog (core/watchdog.py)
+    LOOP_WATCHDOG_INTERVAL_MS = 100  # heartbeat period, also the lag sampling rate
+    LOOP_BLOCK_THRESHOLD_MS = float(os.getenv('LOOP_BLOCK_THRESHOLD_MS', 250))  # stack captured beyond this
+    LOOP_STALL_HISTORY = 50  # recent stalls kept for /status and !watchdog
+
+    # Character catalog export (core/catalog_journal.py)
+    CATALOG_SNAPSHOT_FILE = 'all_characters.json'
+    CATALOG_JOURNAL_FILE = 'all_characters.journal.jsonl'
+    CATALOG_COMPACT_EVERY = 500  # journal records folded into a new snapshot beyond this
+
     # Admin settings
     ADMIN_IDS = [
         921428727307567115,
@@ -80,6 +112,20 @@ class BotConfig:
         'Evolve': '🔮'  # Cristal d'évolution
     }
 
+    # Valeurs initiales de la table rarity_tiers (rang de tri: plus élevé = affiché en premier)
+    RARITY_RANKS = {
+        'Common': 1,
+        'Rare': 2,
+        'Epic': 3,
+        'Legendary': 4,
+        'Mythic': 5,
+        'Evolve': 6,
+        'Titan': 7,
+        'Fusion': 8,
+        'Secret': 9,
+        'Ultimate': 10
+    }
+
     # French messages
     MESSAGES = {
         'welcome': "Bienvenue dans les ténèbres, {username}!",
@@ -87,6 +133,8 @@ class BotConfig:
         "Fonds insuffisants! Il vous faut {cost} pièces.",
         'on_cooldown':
         "Invocation en recharge! Réessayez dans {time} secondes.",
+        'action_throttled':
+        "⏳ Doucement! Une action est déjà en cours, réessayez dans un instant.",
         'daily_claimed': "Bénédiction déjà récupérée aujourd'hui!",
         'banned': "Vous êtes banni du bot.",
         'admin_only': "Commande réservée aux administrateurs.",
@@ -0,0 +1,106 @@
+"""
+File-backed content for Shadow Roll Bot
+A file parsed once into a ready-to-serve structure, reparsed only when its content changes
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class ContentStore(Generic[T]):
+    """Parsed view of one file, revalidated by mtime/size and then by content hash
+
+    get() stats the file at most every recheck_seconds. A changed (mtime, size) makes
+    it read the bytes and hash them in a worker thread; the parser only runs when the
+    hash differs, so a touch or a checkout of identical content costs one read.
+    The parser receives the decoded text and runs in the worker thread too.
+    """
+
+    def __init__(self, path: str, parser: Callable[[str], T], default: T,
+                 recheck_seconds: float = 5.0, encoding: str = 'utf-8'):
+        self.path = path
+        self.parser = parser
+        self.default = default
+        self.recheck_seconds = recheck_seconds
+        self.encoding = encoding
+        self._value: T = default
+        self._signature: Optional[Tuple[int, int]] = None
+        self._digest: Optional[str] = None
+        self._checked_at = 0.0
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        self.stats = {'checks': 0, 'reads': 0, 'parses': 0, 'errors': 0}
+
+    async def get(self) -> T:
+        """Current parsed content (the default while the file is missing or unreadable)"""
+        if self._loaded and time.monotonic() - self._checked_at < self.recheck_seconds:
+            return self._value
+        async with self._lock:
+            if not self._loaded or time.monotonic() - self._checked_at >= self.recheck_seconds:
+                await self._revalidate()
+        return self._value
+
+    async def reload(self) -> T:
+        """Check the file now, whatever the recheck interval (refresh buttons, admin edits)"""
+        async with self._lock:
+            await self._revalidate()
+        return self._value
+
+    async def _revalidate(self):
+        self._checked_at = time.monotonic()
+        self._loaded = True
+        self.stats['checks'] += 1
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self._signature is not None:
+                logger.warning(f"{self.path} removed, serving the default content")
+            self._value, self._signature, self._digest = self.default, None, None
+            return
+        except OSError as e:
+            self.stats['errors'] += 1
+            logger.error(f"Error checking {self.path}: {e}")
+            return
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return
+        try:
+            result = await asyncio.to_thread(self._read_and_parse, self._digest)
+        except Exception as e:
+            # Keep serving the last good parse; the next check retries
+            self.stats['errors'] += 1
+            logger.error(f"Error loading {self.path}: {e}")
+            return
+        self._signature = signature
+        if result is not None:
+            self._digest, self._value = result
+            logger.info(f"{self.path} loaded ({self._digest[:12]})")
+
+    def _read_and_parse(self, previous_digest: Optional[str]) -> Optional[Tuple[str, T]]:
+        """(digest, parsed) for new content, None when the bytes are unchanged"""
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        self.stats['reads'] += 1
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest == previous_digest:
+            return None
+        parsed = self.parser(raw.decode(self.encoding))
+        self.stats['parses'] += 1
+        return digest, parsed
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'path': self.path,
+            'digest': self._digest[:12] if self._digest else None,
+            'loaded': self._signature is not None,
+        }
@@ -0,0 +1,81 @@
+"""
+Roll cooldowns for Shadow Roll Bot
+Per-user next-roll deadlines kept in memory; players.next_roll_at only persists them across restarts
+"""
+
+import logging
+import time
+from typing import Dict, Optional
+
+from core.rarity import rarity_tiers
+
+logger = logging.getLogger(__name__)
+
+
+class RollCooldowns:
+    """In-memory roll cooldown check: no database access on the hot path"""
+
+    # Expired deadlines are dropped once the table grows past this size
+    PRUNE_THRESHOLD = 10000
+
+    def __init__(self):
+        self._next_roll_at: Dict[int, float] = {}  # user_id -> epoch seconds
+        self._last_rarity: Dict[int, str] = {}
+
+    async def load(self, db):
+        """Restore cooldowns still running when the bot stopped"""
+        cursor = await db.execute(
+            "SELECT user_id, next_roll_at, last_roll_rarity FROM players WHERE next_roll_at > ?",
+            (time.time(),)
+        )
+        for user_id, next_roll_at, rarity in await cursor.fetchall():
+            self._next_roll_at[user_id] = next_roll_at
+            if rarity:
+                self._last_rarity[user_id] = rarity
+        logger.info(f"Restored {len(self._next_roll_at)} running roll cooldowns")
+
+    def remaining(self, user_id: int, now: Optional[float] = None) -> float:
+        """Seconds before the user may roll again"""
+        deadline = self._next_roll_at.get(user_id)
+        if deadline is None:
+            return 0.0
+        return max(0.0, deadline - (now or time.time()))
+
+    def try_acquire(self, user_id: int) -> float:
+        """Claim the next roll; returns 0 on success, else the seconds left
+
+        The claim blocks concurrent attempts until finish() or release() is called."""
+        now = time.time()
+        left = self.remaining(user_id, now)
+        if left > 0:
+            return left
+        # Provisional deadline from the previous rarity until the roll result is known
+        self._next_roll_at[user_id] = now + rarity_tiers.cooldown(self._last_rarity.get(user_id, ''))
+        return 0.0
+
+    def release(self, user_id: int):
+        """Give back a claim when the roll did not happen (no coins, banned, error)"""
+        self._next_roll_at.pop(user_id, None)
+
+    def finish(self, user_id: int, rarity: str) -> float:
+        """Start the cooldown of the rarity just rolled; returns the next_roll_at deadline"""
+        now = time.time()
+        deadline = now + rarity_tiers.cooldown(rarity)
+        self._next_roll_at[user_id] = deadline
+        self._last_rarity[user_id] = rarity
+        if len(self._next_roll_at) > self.PRUNE_THRESHOLD:
+            self._prune(now)
+        return deadline
+
+    def last_rarity(self, user_id: int) -> Optional[str]:
+        return self._last_rarity.get(user_id)
+
+    def _prune(self, now: float):
+        expired = [user_id for user_id, deadline in self._next_roll_at.items() if deadline <= now]
+        for user_id in expired:
+            del self._next_roll_at[user_id]
+            self._last_rarity.pop(user_id, None)
+
+
+# Global roll cooldowns instance
+roll_cooldowns = RollCooldowns()
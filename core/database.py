@@ -3,6 +3,7 @@ Database manager for Shadow Roll Bot
 Handles SQLite operations for players, characters, and inventory
 """
 import aiosqlite
+import json
 import logging
 import random
 from typing import Optional, List, Dict, Any
@@ -10,6 +11,14 @@ from datetime import datetime
 from core.models import Character, Player, Achievement
 from core.config import BotConfig
 from core.cache import CachedDatabaseMixin, bot_cache
+from core.search import CharacterSearch
+from core.rarity import rarity_tiers
+from core.cooldowns import roll_cooldowns
+from core.effects import FREE_ROLLS, GUARANTEE, effects_engine
+from core.profile import PROFILE_SNAPSHOT_QUERY, PROFILE_TTL, initialize_inventory_summary
+from core.ownership import ownership_index
+from core.query_stats import InstrumentedConnection
+from core.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -20,11 +29,12 @@ class DatabaseManager(CachedDatabaseMixin):
     def __init__(self, db_path: str = "shadow_roll.db"):
         self.db_path = db_path
         self.db = None
+        self.character_search = CharacterSearch(self)
 
     async def initialize(self):
         """Initialize database connection and create tables"""
         try:
-            self.db = await aiosqlite.connect(self.db_path)
+            self.db = InstrumentedConnection(await aiosqlite.connect(self.db_path))
             # Optimisations de performance
             await self.db.execute("PRAGMA journal_mode=WAL")
             await self.db.execute("PRAGMA synchronous=NORMAL") 
@@ -34,6 +44,7 @@ class DatabaseManager(CachedDatabaseMixin):
             
             await self.create_tables()
             await self.create_indexes()
+            await self.character_search.initialize()
             await self.populate_characters()
             await self.populate_achievements()
             await self.populate_shop_items()
@@ -56,6 +67,8 @@ class DatabaseManager(CachedDatabaseMixin):
                 is_banned BOOLEAN DEFAULT FALSE,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP,
                 selected_title_id INTEGER DEFAULT NULL,
+                last_roll_rarity TEXT DEFAULT NULL,
+                next_roll_at REAL DEFAULT 0,
                 FOREIGN KEY (selected_title_id) REFERENCES titles (id)
             )''', '''CREATE TABLE IF NOT EXISTS characters (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -63,7 +76,8 @@ class DatabaseManager(CachedDatabaseMixin):
                 anime TEXT NOT NULL,
                 rarity TEXT NOT NULL,
                 value INTEGER NOT NULL,
-                image_url TEXT
+                image_url TEXT,
+                rarity_rank INTEGER NOT NULL DEFAULT 0
             )''', '''CREATE TABLE IF NOT EXISTS inventory (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 user_id INTEGER,
@@ -139,14 +153,6 @@ class DatabaseManager(CachedDatabaseMixin):
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES players (user_id),
                 UNIQUE(user_id)
-            )''', '''CREATE TABLE IF NOT EXISTS active_effects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                effect_type TEXT NOT NULL,
-                effect_value REAL NOT NULL,
-                expires_at TEXT NOT NULL,
-                activated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES players (user_id)
             )''', '''CREATE TABLE IF NOT EXISTS character_sets (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 set_name TEXT NOT NULL UNIQUE,
@@ -178,12 +184,12 @@ class DatabaseManager(CachedDatabaseMixin):
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 user_id INTEGER NOT NULL,
                 inventory_id INTEGER NOT NULL,
-                slot INTEGER NOT NULL,
-                equipped_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                slot_number INTEGER NOT NULL CHECK (slot_number BETWEEN 1 AND 3),
+                equipped_at TEXT DEFAULT (datetime('now')),
                 FOREIGN KEY (user_id) REFERENCES players (user_id),
                 FOREIGN KEY (inventory_id) REFERENCES inventory (id),
-                UNIQUE(user_id, slot),
-                UNIQUE(user_id, inventory_id)
+                UNIQUE (user_id, slot_number),
+                UNIQUE (inventory_id)
             )''', '''CREATE TABLE IF NOT EXISTS character_hunts (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 user_id INTEGER NOT NULL,
@@ -223,6 +229,16 @@ class DatabaseManager(CachedDatabaseMixin):
         for table in tables:
             await self.db.execute(table)
         await self.db.commit()
+        await self.ensure_rarity_rank()
+        await self.ensure_columns('players', {
+            'last_roll_rarity': "TEXT DEFAULT NULL",
+            'next_roll_at': "REAL DEFAULT 0"
+        })
+        await self.db.commit()
+        await roll_cooldowns.load(self.db)
+        await effects_engine.initialize(self.db)
+        await initialize_inventory_summary(self.db)
+        await ownership_index.initialize(self.db)
         
         # Créer les index pour optimiser les performances (de manière sécurisée)
         try:
@@ -230,6 +246,19 @@ class DatabaseManager(CachedDatabaseMixin):
         except Exception as e:
             logger.warning(f"Index creation skipped due to error: {e}")
 
+    async def ensure_columns(self, table: str, columns: Dict[str, str]):
+        """Add missing columns to a table created by an older version"""
+        cursor = await self.db.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in await cursor.fetchall()}
+        for name, definition in columns.items():
+            if name not in existing:
+                await self.db.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+    async def ensure_rarity_rank(self):
+        """Add characters.rarity_rank, a copy of rarity_tiers.rank kept in sync by triggers"""
+        await self.ensure_columns('characters', {'rarity_rank': "INTEGER NOT NULL DEFAULT 0"})
+        await rarity_tiers.initialize(self.db)
+
     async def create_indexes(self):
         """Create database indexes for better performance"""
         indexes = [
@@ -240,15 +269,14 @@ class DatabaseManager(CachedDatabaseMixin):
             "CREATE INDEX IF NOT EXISTS idx_characters_name ON characters(name)",
             "CREATE INDEX IF NOT EXISTS idx_characters_anime ON characters(anime)",
             "CREATE INDEX IF NOT EXISTS idx_characters_rarity ON characters(rarity)",
+            # Clé de tri des inventaires (pagination par curseur, sans tri en mémoire)
+            "CREATE INDEX IF NOT EXISTS idx_characters_rank_sort ON characters(rarity_rank DESC, value DESC, name, id)",
             
             # Index pour l'inventaire (optimisation critique)
             "CREATE INDEX IF NOT EXISTS idx_inventory_user_id ON inventory(user_id)",
             "CREATE INDEX IF NOT EXISTS idx_inventory_character_id ON inventory(character_id)",
             "CREATE INDEX IF NOT EXISTS idx_inventory_user_char ON inventory(user_id, character_id)",
-            
-            # Index pour les effets actifs
-            "CREATE INDEX IF NOT EXISTS idx_active_effects_user_id ON active_effects(user_id)",
-            "CREATE INDEX IF NOT EXISTS idx_active_effects_expires ON active_effects(expires_at)",
+            "CREATE INDEX IF NOT EXISTS idx_inventory_user_char_count ON inventory(user_id, character_id, count)",
         ]
         
         # Créer les index de manière sécurisée
@@ -1225,6 +1253,11 @@ class DatabaseManager(CachedDatabaseMixin):
 
     async def get_title_bonuses(self, user_id: int) -> Dict:
         """Get all active title bonuses for a player"""
+        return self._title_bonuses(await self.get_selected_title(user_id))
+
+    @staticmethod
+    def _title_bonuses(selected_title: Optional[Dict]) -> Dict:
+        """Title bonuses granted by a selected title row (None = no title)"""
         bonuses = {
             'coin_boost': 1.0,
             'rarity_boost': 0.0,
@@ -1237,7 +1270,6 @@ class DatabaseManager(CachedDatabaseMixin):
             'global_boost': 1.0
         }
         
-        selected_title = await self.get_selected_title(user_id)
         if selected_title and selected_title['bonus_type']:
             bonus_type = selected_title['bonus_type']
             bonus_value = selected_title['bonus_value']
@@ -1376,25 +1408,38 @@ class DatabaseManager(CachedDatabaseMixin):
         await self.db.execute("UPDATE players SET coins = ? WHERE user_id = ?",
                               (coins, user_id))
         await self.db.commit()
+        self.invalidate_profile(user_id)
     
     async def add_player_coins(self, user_id: int, amount: int):
         """Add coins to player (for rewards)"""
         await self.db.execute("UPDATE players SET coins = coins + ? WHERE user_id = ?",
                               (amount, user_id))
         await self.db.commit()
+        self.invalidate_profile(user_id)
     
     async def subtract_player_coins(self, user_id: int, amount: int):
         """Subtract coins from player (for purchases)"""
         await self.db.execute("UPDATE players SET coins = coins - ? WHERE user_id = ?",
                               (amount, user_id))
         await self.db.commit()
+        self.invalidate_profile(user_id)
 
-    async def update_player_reroll_stats(self, user_id: int, last_reroll: str):
-        """Update player reroll statistics"""
-        await self.db.execute(
-            "UPDATE players SET total_rerolls = total_rerolls + 1, last_reroll = ? WHERE user_id = ?",
-            (last_reroll, user_id))
+    async def update_player_reroll_stats(self, user_id: int, last_reroll: str,
+                                         rarity: Optional[str] = None):
+        """Update player reroll statistics and start the roll cooldown of the rarity obtained"""
+        if rarity is None:
+            await self.db.execute(
+                "UPDATE players SET total_rerolls = total_rerolls + 1, last_reroll = ? WHERE user_id = ?",
+                (last_reroll, user_id))
+        else:
+            next_roll_at = roll_cooldowns.finish(user_id, rarity)
+            await self.db.execute(
+                """UPDATE players SET total_rerolls = total_rerolls + 1, last_reroll = ?,
+                       last_roll_rarity = ?, next_roll_at = ? WHERE user_id = ?""",
+                (last_reroll, rarity, next_roll_at, user_id))
         await self.db.commit()
+        self.invalidate_profile(user_id)
+        metrics.count_action('roll')
 
     async def update_daily_reward(self, user_id: int, last_daily: str):
         """Update player daily reward timestamp"""
@@ -1445,30 +1490,10 @@ class DatabaseManager(CachedDatabaseMixin):
         if user_id:
             base_weights = await self.apply_equipment_bonuses_to_rarity_weights(user_id, base_weights)
 
-        # Apply luck potion effects if user provided
+        # Apply luck potion effects if user provided (in-memory effect list, no query)
+        # Note: Titan, Fusion, and Secret rarities are NOT affected by potions
         if user_id:
-            active_effects = await self.get_active_effects(user_id)
-            for effect in active_effects:
-                effect_type = effect['effect_type']
-                effect_value = effect['effect_value']
-
-                if effect_type == 'rare_boost':
-                    base_weights['Rare'] *= (1 + effect_value)
-                elif effect_type == 'epic_boost':
-                    base_weights['Epic'] *= (1 + effect_value)
-                elif effect_type == 'legendary_boost':
-                    base_weights['Legendary'] *= (1 + effect_value)
-                elif effect_type == 'mythical_boost':
-                    base_weights['Mythic'] *= (1 + effect_value)
-                # Note: Titan, Fusion, and Secret rarities are NOT affected by potions
-                elif effect_type == 'all_boost':
-                    # Boost only Common to Mythic rarities (exclude ultra-rare tiers)
-                    for rarity in ['Rare', 'Epic', 'Legendary', 'Mythic']:
-                        base_weights[rarity] *= (1 + effect_value)
-                elif effect_type == 'mega_boost':
-                    # Triple only Common to Mythic rarities (exclude ultra-rare tiers)
-                    for rarity in ['Rare', 'Epic', 'Legendary', 'Mythic']:
-                        base_weights[rarity] *= effect_value
+            effects_engine.apply_to_weights(user_id, base_weights)
 
             # Apply set bonuses (these still affect all rarities including ultra-rares)
             set_bonuses = await self.get_active_set_bonuses(user_id)
@@ -1481,6 +1506,10 @@ class DatabaseManager(CachedDatabaseMixin):
                 ]:
                     base_weights[rarity] *= global_boost
 
+        # A rarity guarantee bought in the shop is spent on this roll
+        if user_id:
+            base_weights = await effects_engine.apply_guarantee(user_id, base_weights)
+
         # Calculate total weight and convert to integer scale
         total_weight = sum(base_weights.values())
         # Scale up by 100 to handle decimal weights like 0.1
@@ -1522,43 +1551,16 @@ class DatabaseManager(CachedDatabaseMixin):
 
     async def calculate_luck_bonus(self, user_id: int) -> dict:
         """Calculate current luck bonus percentages for display - showing combined multiplicative effect"""
-        active_effects = await self.get_active_effects(user_id)
-
-        # Calculate multipliers for each rarity (only affected rarities)
+        # Same multipliers as the roll sampler
         # Note: Titan, Fusion, and Secret are NOT affected by potions
+        by_rarity = effects_engine.rarity_multipliers(user_id)
         multipliers = {
-            'rare': 1.0,
-            'epic': 1.0,
-            'legendary': 1.0,
-            'mythical': 1.0
+            'rare': by_rarity['Rare'],
+            'epic': by_rarity['Epic'],
+            'legendary': by_rarity['Legendary'],
+            'mythical': by_rarity['Mythic']
         }
 
-        for effect in active_effects:
-            effect_type = effect['effect_type']
-            effect_value = effect['effect_value']
-
-            if effect_type == 'rare_boost':
-                multipliers['rare'] *= (1 + effect_value)
-            elif effect_type == 'epic_boost':
-                multipliers['epic'] *= (1 + effect_value)
-            elif effect_type == 'legendary_boost':
-                multipliers['legendary'] *= (1 + effect_value)
-            elif effect_type == 'mythical_boost':
-                multipliers['mythical'] *= (1 + effect_value)
-            elif effect_type == 'all_boost':
-                # Only boost Common to Mythic rarities
-                bonus_multiplier = (1 + effect_value)
-                multipliers['rare'] *= bonus_multiplier
-                multipliers['epic'] *= bonus_multiplier
-                multipliers['legendary'] *= bonus_multiplier
-                multipliers['mythical'] *= bonus_multiplier
-            elif effect_type == 'mega_boost':
-                # Only boost Common to Mythic rarities
-                multipliers['rare'] *= effect_value
-                multipliers['epic'] *= effect_value
-                multipliers['legendary'] *= effect_value
-                multipliers['mythical'] *= effect_value
-
         # Convert multipliers to bonus percentages for display
         # Only show bonuses for rarities affected by potions
         luck_bonuses = {
@@ -1597,77 +1599,94 @@ class DatabaseManager(CachedDatabaseMixin):
                 (user_id, character_id, current_time))
 
         await self.db.commit()
+        self.invalidate_profile(user_id)
 
-    async def get_player_inventory(self,
-                                   user_id: int,
-                                   page: int = 1,
-                                   limit: int = 10) -> List[Dict]:
-        """Get player inventory with pagination"""
-        offset = (page - 1) * limit
-        cursor = await self.db.execute(
-            '''SELECT i.id, c.name, c.anime, c.rarity, c.value, i.count, c.image_url
-               FROM inventory i
-               JOIN characters c ON i.character_id = c.id
-               WHERE i.user_id = ?
-               ORDER BY 
-                   CASE c.rarity
-                       WHEN 'Secret' THEN 8
-                       WHEN 'Fusion' THEN 7
-                       WHEN 'Titan' THEN 6
-                       WHEN 'Mythic' THEN 5
-                       WHEN 'Legendary' THEN 4
-                       WHEN 'Epic' THEN 3
-                       WHEN 'Rare' THEN 2
-                       WHEN 'Common' THEN 1
-                   END DESC,
-                   c.value DESC, c.name
-               LIMIT ? OFFSET ?''', (user_id, limit, offset))
+    # Ordre d'affichage des inventaires: rareté, valeur, nom, id (couvert par idx_characters_rank_sort)
+    INVENTORY_ORDER = "c.rarity_rank DESC, c.value DESC, c.name, c.id"
+    # Au-delà de cette taille, parcourir le catalogue dans l'ordre évite de trier tout l'inventaire
+    LARGE_INVENTORY_ROWS = 500
 
-        rows = await cursor.fetchall()
-        return [{
+    @staticmethod
+    def _inventory_item(row) -> Dict:
+        """Inventory row with every key the inventory views use"""
+        return {
+            'inventory_id': row[0],
             'inventory_item_id': row[0],
-            'character_name': row[1],
-            'anime': row[2],
-            'rarity': row[3],
-            'value': row[4],
-            'count': row[5],
-            'image_url': row[6]
-        } for row in rows]
-
-    async def get_user_inventory(self, user_id: int, limit: int = 50, offset: int = 0) -> List[Dict]:
-        """Get user inventory with pagination (alias for get_player_characters)"""
-        cursor = await self.db.execute(
-            '''SELECT i.id, i.character_id, c.name, c.anime, c.rarity, c.value, i.count, c.image_url
-               FROM inventory i
-               JOIN characters c ON i.character_id = c.id
-               WHERE i.user_id = ?
-               ORDER BY 
-                   CASE c.rarity
-                       WHEN 'Secret' THEN 8
-                       WHEN 'Fusion' THEN 7
-                       WHEN 'Titan' THEN 6
-                       WHEN 'Mythic' THEN 5
-                       WHEN 'Legendary' THEN 4
-                       WHEN 'Epic' THEN 3
-                       WHEN 'Rare' THEN 2
-                       WHEN 'Common' THEN 1
-                   END DESC,
-                   c.value DESC, c.name
-               LIMIT ? OFFSET ?''', (user_id, limit, offset))
-
-        rows = await cursor.fetchall()
-        return [{
-            'inventory_id': row[0],  # ID de la ligne d'inventaire pour les ventes
-            'id': row[1],  # Character ID as 'id' for compatibility
+            'id': row[1],
             'character_id': row[1],
             'name': row[2],
+            'character_name': row[2],
             'anime': row[3],
             'rarity': row[4],
             'value': row[5],
-            'quantity': row[6],  # Both 'quantity' and 'count' for compatibility
             'count': row[6],
-            'image_url': row[7]
-        } for row in rows]
+            'quantity': row[6],
+            'image_url': row[7] or "",
+            'cursor': (row[8], row[5], row[2], row[1])
+        }
+
+    async def _query_inventory(self, user_id: int, limit: int, after: Optional[tuple] = None,
+                               offset: int = 0, sellable_only: bool = False) -> List[Dict]:
+        """Inventory rows in display order, after a keyset cursor (rarity_rank, value, name, character_id)"""
+        conditions = ["i.user_id = ?"]
+        params: List[Any] = [user_id]
+        if sellable_only:
+            conditions.append("i.count > 0")
+        if after is not None:
+            rank, value, name, character_id = after
+            # The leading bound lets SQLite seek into the sort index
+            conditions.append(
+                "c.rarity_rank <= ? AND (c.rarity_rank < ? OR (c.rarity_rank = ? AND "
+                "(c.value < ? OR (c.value = ? AND (c.name > ? OR (c.name = ? AND c.id > ?))))))")
+            params.extend([rank, rank, rank, value, value, name, name, character_id])
+
+        # Large inventories: walk the characters index in display order and stop after one page
+        join = "characters c CROSS JOIN inventory i" if await self._is_large_inventory(user_id) \
+            else "inventory i JOIN characters c"
+        cursor = await self.db.execute(
+            f'''SELECT i.id, c.id, c.name, c.anime, c.rarity, c.value, i.count, c.image_url, c.rarity_rank
+               FROM {join} ON i.character_id = c.id
+               WHERE {' AND '.join(conditions)}
+               ORDER BY {self.INVENTORY_ORDER}
+               LIMIT ? OFFSET ?''', params + [limit, offset])
+        return [self._inventory_item(row) for row in await cursor.fetchall()]
+
+    async def _is_large_inventory(self, user_id: int) -> bool:
+        cache_key = f"inventory_large_{user_id}"
+        large = bot_cache.get(cache_key)
+        if large is None:
+            cursor = await self.db.execute(
+                "SELECT COUNT(*) FROM inventory WHERE user_id = ?", (user_id,))
+            large = (await cursor.fetchone())[0] >= self.LARGE_INVENTORY_ROWS
+            bot_cache.set(cache_key, large, 300)
+        return large
+
+    async def get_inventory_page(self, user_id: int, after: Optional[tuple] = None,
+                                 limit: int = 10, sellable_only: bool = False):
+        """One inventory page after a keyset cursor
+
+        Returns (items, next_cursor); next_cursor is None on the last page."""
+        rows = await self._query_inventory(user_id, limit + 1, after, sellable_only=sellable_only)
+        if len(rows) > limit:
+            return rows[:limit], rows[limit - 1]['cursor']
+        return rows, None
+
+    async def get_player_inventory(self,
+                                   user_id: int,
+                                   page: int = 1,
+                                   limit: int = 10,
+                                   after: Optional[tuple] = None) -> List[Dict]:
+        """Get player inventory with pagination (pass after= to page by cursor)"""
+        if after is not None or page <= 1:
+            return await self._query_inventory(user_id, limit, after)
+        return await self._query_inventory(user_id, limit, offset=(page - 1) * limit)
+
+    async def get_user_inventory(self, user_id: int, limit: int = 50, offset: int = 0,
+                                 after: Optional[tuple] = None) -> List[Dict]:
+        """Get user inventory with pagination (alias for get_player_characters)"""
+        if after is not None:
+            return await self._query_inventory(user_id, limit, after)
+        return await self._query_inventory(user_id, limit, offset=offset)
 
     async def get_player_characters(self, user_id: int) -> List[Dict]:
         """Get all characters owned by a player"""
@@ -1677,16 +1696,7 @@ class DatabaseManager(CachedDatabaseMixin):
                JOIN characters c ON i.character_id = c.id
                WHERE i.user_id = ?
                ORDER BY 
-                   CASE c.rarity
-                       WHEN 'Secret' THEN 8
-                       WHEN 'Fusion' THEN 7
-                       WHEN 'Titan' THEN 6
-                       WHEN 'Mythic' THEN 5
-                       WHEN 'Legendary' THEN 4
-                       WHEN 'Epic' THEN 3
-                       WHEN 'Rare' THEN 2
-                       WHEN 'Common' THEN 1
-                   END DESC,
+                   c.rarity_rank DESC,
                    c.value DESC, c.name''', (user_id,))
 
         rows = await cursor.fetchall()
@@ -1755,6 +1765,7 @@ class DatabaseManager(CachedDatabaseMixin):
             # Invalidate cache
             bot_cache.invalidate_pattern(f"inventory_{user_id}")
             bot_cache.invalidate_pattern(f"player_{user_id}")
+            self.invalidate_profile(user_id)
             
             return True
             
@@ -1843,6 +1854,57 @@ class DatabaseManager(CachedDatabaseMixin):
             'rarity_counts': rarity_counts
         }
 
+    async def get_profile_snapshot(self, user_id: int, username: Optional[str] = None) -> Dict[str, Any]:
+        """Everything the profile shows, read in one query and cached for PROFILE_TTL seconds"""
+        cache_key = f"profile_{user_id}"
+        snapshot = bot_cache.get(cache_key)
+        if snapshot is not None:
+            return snapshot
+
+        cursor = await self.db.execute(PROFILE_SNAPSHOT_QUERY, {'user_id': user_id})
+        row = await cursor.fetchone()
+        if row is None:
+            await self.get_or_create_player(user_id, username or f"User_{user_id}")
+            cursor = await self.db.execute(PROFILE_SNAPSHOT_QUERY, {'user_id': user_id})
+            row = await cursor.fetchone()
+
+        selected_title = None
+        if row[4] is not None:
+            selected_title = {
+                'id': row[4],
+                'name': row[5],
+                'display_name': row[6],
+                'icon': row[7],
+                'bonus_type': row[8],
+                'bonus_value': row[9],
+                'bonus_description': row[10]
+            }
+        rarity_counts = json.loads(row[13])
+        rarity_counts.pop('', None)  # copies of characters no longer in the catalog
+        equipped = sorted(json.loads(row[14]), key=lambda char: char['slot_number'])
+
+        snapshot = {
+            'user_id': row[0],
+            'username': row[1],
+            'coins': row[2],
+            'total_rerolls': row[3],
+            'selected_title': selected_title,
+            'inventory_stats': {
+                'unique_characters': row[11],
+                'total_characters': row[12],
+                'rarity_counts': rarity_counts
+            },
+            'equipped': equipped,
+            'bonuses': self._equipment_bonuses(equipped, self._title_bonuses(selected_title))
+        }
+        bot_cache.set(cache_key, snapshot, PROFILE_TTL)
+        return snapshot
+
+    def invalidate_profile(self, *user_ids: int):
+        """Drop the cached profile snapshot of players whose coins, collection or equipment changed"""
+        for user_id in user_ids:
+            bot_cache.invalidate(f"profile_{user_id}")
+
     async def get_leaderboard(self,
                               category: str = 'coins',
                               limit: int = 10) -> List[Dict]:
@@ -1927,13 +1989,7 @@ class DatabaseManager(CachedDatabaseMixin):
             '''SELECT id, name, anime, rarity, value, image_url
                FROM characters
                ORDER BY 
-                   CASE rarity 
-                       WHEN 'Mythic' THEN 1
-                       WHEN 'Legendary' THEN 2
-                       WHEN 'Epic' THEN 3
-                       WHEN 'Rare' THEN 4
-                       WHEN 'Common' THEN 5
-                   END,
+                   rarity_rank DESC,
                    value DESC, name
                LIMIT ? OFFSET ?''', (limit, offset))
 
@@ -2037,16 +2093,7 @@ class DatabaseManager(CachedDatabaseMixin):
                 FROM characters c
                 LEFT JOIN inventory i ON c.id = i.character_id AND i.user_id = ?
                 ORDER BY 
-                    CASE c.rarity
-                        WHEN 'Secret' THEN 8
-                        WHEN 'Fusion' THEN 7
-                        WHEN 'Titan' THEN 6
-                        WHEN 'Mythic' THEN 5
-                        WHEN 'Legendary' THEN 4
-                        WHEN 'Epic' THEN 3
-                        WHEN 'Rare' THEN 2
-                        WHEN 'Common' THEN 1
-                    END DESC,
+                    c.rarity_rank DESC,
                     c.value DESC,
                     c.name
             """, (user_id, ))
@@ -2075,45 +2122,8 @@ class DatabaseManager(CachedDatabaseMixin):
                                             user_id: int) -> Dict[str, Dict]:
         """Get collection completion stats by anime series"""
         try:
-            cursor = await self.db.execute(
-                """
-                SELECT 
-                    c.anime,
-                    COUNT(c.id) as total_characters,
-                    COUNT(i.character_id) as owned_characters,
-                    SUM(c.value) as total_value,
-                    SUM(CASE WHEN i.character_id IS NOT NULL THEN c.value ELSE 0 END) as owned_value
-                FROM characters c
-                LEFT JOIN inventory i ON c.id = i.character_id AND i.user_id = ?
-                GROUP BY c.anime
-                ORDER BY owned_characters DESC, c.anime
-            """, (user_id, ))
-
-            rows = await cursor.fetchall()
-            stats = {}
-
-            for row in rows:
-                anime = row[0]
-                total_chars = row[1]
-                owned_chars = row[2]
-                total_value = row[3]
-                owned_value = row[4]
-
-                completion_percentage = (owned_chars / total_chars *
-                                         100) if total_chars > 0 else 0
-                value_percentage = (owned_value / total_value *
-                                    100) if total_value > 0 else 0
-
-                stats[anime] = {
-                    'total_characters': total_chars,
-                    'owned_characters': owned_chars,
-                    'completion_percentage': completion_percentage,
-                    'total_value': total_value,
-                    'owned_value': owned_value,
-                    'value_percentage': value_percentage
-                }
-
-            return stats
+            # Catalog totals are cached per catalog version; only the player's owned mask is combined in
+            return await ownership_index.collection_stats(user_id)
         except Exception as e:
             logger.error(f"Error getting collection stats by anime: {e}")
             return {}
@@ -2500,6 +2510,7 @@ class DatabaseManager(CachedDatabaseMixin):
                 """, (inventory_item_id, ))
 
             await self.db.commit()
+            self.invalidate_profile(seller_id)
             return True
 
         except Exception as e:
@@ -2617,11 +2628,28 @@ class DatabaseManager(CachedDatabaseMixin):
             # Process transaction
             current_time = datetime.now().isoformat()
 
-            # Deduct coins from buyer
-            await self.db.execute(
+            # Claim the listing first: of two concurrent buyers only one changes the row
+            cursor = await self.db.execute(
                 """
-                UPDATE players SET coins = coins - ? WHERE user_id = ?
-            """, (price, buyer_id))
+                UPDATE marketplace_listings SET is_active = FALSE
+                WHERE id = ? AND is_active = TRUE
+            """, (listing_id, ))
+            if cursor.rowcount != 1:
+                return False
+
+            # Deduct coins from buyer, only if the balance still covers the price
+            cursor = await self.db.execute(
+                """
+                UPDATE players SET coins = coins - ? WHERE user_id = ? AND coins >= ?
+            """, (price, buyer_id, price))
+            if cursor.rowcount != 1:
+                # Spent elsewhere in the meantime: put the listing back
+                await self.db.execute(
+                    """
+                    UPDATE marketplace_listings SET is_active = TRUE WHERE id = ?
+                """, (listing_id, ))
+                await self.db.commit()
+                return False
 
             # Add coins to seller
             await self.db.execute(
@@ -2637,12 +2665,6 @@ class DatabaseManager(CachedDatabaseMixin):
                 ON CONFLICT(user_id, character_id) DO UPDATE SET count = count + 1
             """, (buyer_id, character_id, current_time))
 
-            # Mark listing as inactive
-            await self.db.execute(
-                """
-                UPDATE marketplace_listings SET is_active = FALSE WHERE id = ?
-            """, (listing_id, ))
-
             # Record transaction
             await self.db.execute(
                 """
@@ -2652,6 +2674,8 @@ class DatabaseManager(CachedDatabaseMixin):
             """, (listing_id, buyer_id, seller_id, character_id, price))
 
             await self.db.commit()
+            self.invalidate_profile(buyer_id, seller_id)
+            metrics.count_action('market_buy')
             return True
 
         except Exception as e:
@@ -2691,6 +2715,7 @@ class DatabaseManager(CachedDatabaseMixin):
             """, (listing_id, ))
 
             await self.db.commit()
+            self.invalidate_profile(user_id)
             return True
 
         except Exception as e:
@@ -2938,15 +2963,8 @@ class DatabaseManager(CachedDatabaseMixin):
 
             # Apply effect if it has duration
             if duration_minutes > 0:
-                from datetime import datetime, timedelta
-                expires_at = datetime.now() + timedelta(
-                    minutes=duration_minutes)
-
-                await self.db.execute(
-                    """INSERT INTO active_effects (user_id, effect_type, effect_value, expires_at)
-                       VALUES (?, ?, ?, ?)""",
-                    (user_id, effect_type, effect_value,
-                     expires_at.isoformat()))
+                await effects_engine.grant(user_id, effect_type, effect_value,
+                                           duration=duration_minutes * 60)
 
             # Reduce quantity
             if quantity > 1:
@@ -2965,37 +2983,41 @@ class DatabaseManager(CachedDatabaseMixin):
             return False
 
     async def get_active_effects(self, user_id: int) -> List[Dict]:
-        """Get player's active effects"""
-        try:
-            from datetime import datetime
-            current_time = datetime.now().isoformat()
+        """Get player's timed effects (served from the effects engine, no query)"""
+        effects = []
+        for effect in effects_engine.active(user_id):
+            if effect.expires_at is None:
+                continue
+            effects.append({
+                'effect_type': effect.kind,
+                'effect_value': effect.magnitude,
+                'expires_at': datetime.fromtimestamp(effect.expires_at).isoformat()
+            })
+        return effects
 
-            # Clean expired effects
-            await self.db.execute(
-                "DELETE FROM active_effects WHERE expires_at < ?",
-                (current_time, ))
+    async def sweep_expired_effects(self) -> int:
+        """Delete expired effects; run by the bot's background sweeper, never on a read"""
+        try:
+            return await effects_engine.sweep()
+        except Exception as e:
+            logger.error(f"Error sweeping expired effects: {e}")
+            return 0
 
-            # Get active effects
-            cursor = await self.db.execute(
-                """SELECT effect_type, effect_value, expires_at
-                   FROM active_effects
-                   WHERE user_id = ? AND expires_at > ?
-                   ORDER BY expires_at""", (user_id, current_time))
+    async def add_free_rolls(self, user_id: int, amount: int):
+        """Ajouter des invocations gratuites"""
+        await effects_engine.grant(user_id, FREE_ROLLS, charges=amount)
 
-            effects = []
-            for row in await cursor.fetchall():
-                effects.append({
-                    'effect_type': row[0],
-                    'effect_value': row[1],
-                    'expires_at': row[2]
-                })
+    async def get_free_rolls(self, user_id: int) -> int:
+        """Obtenir le nombre d'invocations gratuites"""
+        return effects_engine.charges(user_id, FREE_ROLLS)
 
-            await self.db.commit()
-            return effects
+    async def use_free_roll(self, user_id: int) -> bool:
+        """Utiliser une invocation gratuite"""
+        return await effects_engine.consume(user_id, FREE_ROLLS) is not None
 
-        except Exception as e:
-            logger.error(f"Error getting active effects: {e}")
-            return []
+    async def add_guaranteed_rarity(self, user_id: int, rarity: str, duration: Optional[int] = None):
+        """Ajouter une rareté garantie pour la prochaine invocation"""
+        await effects_engine.grant(user_id, GUARANTEE, charges=1, target=rarity, duration=duration)
 
     async def sell_character(self, user_id: int,
                              inventory_item_id: int) -> tuple[bool, str, int]:
@@ -3046,6 +3068,8 @@ class DatabaseManager(CachedDatabaseMixin):
                 (sell_price, user_id))
 
             await self.db.commit()
+            self.invalidate_profile(user_id)
+            metrics.count_action('sell')
 
             return True, f"Vendu {char_name} ({char_rarity}) pour {sell_price} pièces", sell_price
 
@@ -3055,40 +3079,13 @@ class DatabaseManager(CachedDatabaseMixin):
     async def get_player_sellable_inventory(self,
                                             user_id: int,
                                             page: int = 1,
-                                            limit: int = 10) -> List[Dict]:
-        """Get player's sellable inventory with pagination"""
-        offset = (page - 1) * limit
-        cursor = await self.db.execute(
-            '''SELECT i.id, c.name, c.anime, c.rarity, c.value, i.count, c.image_url
-               FROM inventory i
-               JOIN characters c ON i.character_id = c.id
-               WHERE i.user_id = ? AND i.count > 0
-               ORDER BY 
-                   CASE c.rarity 
-                       WHEN 'Mythic' THEN 1
-                       WHEN 'Legendary' THEN 2
-                       WHEN 'Epic' THEN 3
-                       WHEN 'Rare' THEN 4
-                       WHEN 'Common' THEN 5
-                   END,
-                   c.value DESC, c.name
-               LIMIT ? OFFSET ?''', (user_id, limit, offset))
-
-        rows = await cursor.fetchall()
-        
-        inventory = []
-        for row in rows:
-            inventory.append({
-                'inventory_id': row[0],
-                'character_name': row[1],
-                'anime': row[2],
-                'rarity': row[3],
-                'value': row[4],
-                'count': row[5],
-                'image_url': row[6] if row[6] else ""
-            })
-        
-        return inventory
+                                            limit: int = 10,
+                                            after: Optional[tuple] = None) -> List[Dict]:
+        """Get player's sellable inventory with pagination (pass after= to page by cursor)"""
+        if after is not None or page <= 1:
+            return await self._query_inventory(user_id, limit, after, sellable_only=True)
+        return await self._query_inventory(user_id, limit, offset=(page - 1) * limit,
+                                           sellable_only=True)
         
     # Series Rewards Persistence Methods
     async def claim_series_completion_reward(self, user_id: int, anime_series: str, reward_type: str, reward_amount: int) -> bool:
@@ -3120,6 +3117,7 @@ class DatabaseManager(CachedDatabaseMixin):
                 )
             
             await self.db.commit()
+            self.invalidate_profile(user_id)
             return True
             
         except Exception as e:
@@ -3216,11 +3214,7 @@ class DatabaseManager(CachedDatabaseMixin):
             LEFT JOIN equipment e ON i.id = e.inventory_id
             WHERE i.user_id = ? AND c.rarity IN ('Titan', 'Fusion', 'Secret') AND e.id IS NULL
             ORDER BY 
-                CASE c.rarity 
-                    WHEN 'Secret' THEN 1 
-                    WHEN 'Fusion' THEN 2 
-                    WHEN 'Titan' THEN 3 
-                END, c.name
+                c.rarity_rank DESC, c.name
         """, (user_id,))
         rows = await cursor.fetchall()
         
@@ -3270,6 +3264,7 @@ class DatabaseManager(CachedDatabaseMixin):
                 VALUES (?, ?, ?)
             """, (user_id, inventory_id, next_slot))
             await self.db.commit()
+            self.invalidate_profile(user_id)
             
             return True
             
@@ -3287,6 +3282,7 @@ class DatabaseManager(CachedDatabaseMixin):
             
             if cursor.rowcount > 0:
                 await self.db.commit()
+                self.invalidate_profile(user_id)
                 return True
             return False
             
@@ -3395,37 +3391,23 @@ class DatabaseManager(CachedDatabaseMixin):
             logger.error(f"Error resetting hunt daily bonuses: {e}")
             return False
     
-    async def search_characters_by_name(self, search_term: str) -> List[Dict[str, Any]]:
+    async def search_characters(self, query: str, filters: Optional[Dict[str, Any]] = None,
+                                limit: int = 25) -> List[Dict[str, Any]]:
+        """Ranked character search (name/anime, prefix and typo-tolerant)"""
+        return await self.character_search.search(query, filters, limit)
+
+    async def search_characters_by_name(self, search_term: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Search characters by name"""
-        try:
-            cursor = await self.db.execute("""
-                SELECT id, name, anime, rarity, value, image_url
-                FROM characters 
-                WHERE name LIKE ? OR anime LIKE ?
-                ORDER BY name
-            """, (f"%{search_term}%", f"%{search_term}%"))
-            
-            results = await cursor.fetchall()
-            return [
-                {
-                    'id': row[0],
-                    'name': row[1],
-                    'anime': row[2], 
-                    'rarity': row[3],
-                    'value': row[4],
-                    'image_url': row[5]
-                }
-                for row in results
-            ]
-            
-        except Exception as e:
-            logger.error(f"Error searching characters: {e}")
-            return []
+        return await self.search_characters(search_term, limit=limit)
 
     async def calculate_equipment_bonuses(self, user_id: int) -> Dict[str, float]:
         """Calculate total bonuses from equipped characters and titles"""
-        equipped_chars = await self.get_equipped_characters(user_id)
-        
+        return self._equipment_bonuses(await self.get_equipped_characters(user_id),
+                                       await self.get_title_bonuses(user_id))
+
+    @staticmethod
+    def _equipment_bonuses(equipped_chars: List[Dict], title_bonuses: Dict) -> Dict[str, float]:
+        """Total bonuses of equipped characters plus title bonuses"""
         bonuses = {
             'rarity_boost': 0.0,
             'coin_boost': 0.0,
@@ -3445,7 +3427,6 @@ class DatabaseManager(CachedDatabaseMixin):
                 bonuses['coin_boost'] += 3.0    # +3% coins
         
         # Title bonuses
-        title_bonuses = await self.get_title_bonuses(user_id)
         for bonus_type, bonus_value in title_bonuses.items():
             if bonus_type in bonuses:
                 bonuses[bonus_type] += bonus_value
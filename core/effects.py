@@ -0,0 +1,260 @@
+"""
+Effects engine for Shadow Roll Bot
+One effects table for potions, buffs, free rolls and rarity guarantees, mirrored per player in memory
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from core.rarity import rarity_tiers
+
+logger = logging.getLogger(__name__)
+
+# Effect kinds
+RARE_BOOST = 'rare_boost'
+EPIC_BOOST = 'epic_boost'
+LEGENDARY_BOOST = 'legendary_boost'
+MYTHICAL_BOOST = 'mythical_boost'
+ALL_BOOST = 'all_boost'
+MEGA_BOOST = 'mega_boost'
+LUCK_BOOST = 'luck_boost'
+COIN_MULTIPLIER = 'coin_multiplier'
+CRAFT_DISCOUNT = 'craft_discount'
+FREE_ROLLS = 'free_rolls'
+GUARANTEE = 'guarantee'
+
+# Potions only touch Rare to Mythic: Titan, Fusion, Secret and Ultimate stay out of reach
+POTION_RARITIES = ('Rare', 'Epic', 'Legendary', 'Mythic')
+
+# Kind -> rarities boosted by (1 + magnitude)
+ADDITIVE_BOOSTS = {
+    RARE_BOOST: ('Rare',),
+    EPIC_BOOST: ('Epic',),
+    LEGENDARY_BOOST: ('Legendary',),
+    MYTHICAL_BOOST: ('Mythic',),
+    ALL_BOOST: POTION_RARITIES,
+}
+# Kind -> rarities multiplied by magnitude
+MULTIPLIER_BOOSTS = {
+    MEGA_BOOST: POTION_RARITIES,
+    LUCK_BOOST: POTION_RARITIES,
+}
+
+EFFECTS_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS effects (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        kind TEXT NOT NULL,
+        magnitude REAL NOT NULL DEFAULT 1.0,
+        charges INTEGER DEFAULT NULL,
+        target TEXT DEFAULT NULL,
+        expires_at REAL DEFAULT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_effects_user ON effects(user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_effects_expires ON effects(expires_at)",
+]
+
+# active_effects stored local ISO timestamps, the shop tables epoch seconds
+_ISO_TO_EPOCH = "(julianday({column}, 'utc') - 2440587.5) * 86400.0"
+
+# Legacy table -> statement folding its live rows into effects
+LEGACY_MIGRATIONS = {
+    'active_effects': f"""
+        INSERT INTO effects (user_id, kind, magnitude, expires_at)
+        SELECT user_id, effect_type, effect_value, {_ISO_TO_EPOCH.format(column='expires_at')}
+        FROM active_effects WHERE {_ISO_TO_EPOCH.format(column='expires_at')} > :now""",
+    'temporary_buffs': """
+        INSERT INTO effects (user_id, kind, magnitude, expires_at)
+        SELECT user_id,
+               CASE buff_type WHEN 'luck' THEN 'luck_boost' ELSE buff_type END,
+               CASE buff_type WHEN 'coin_multiplier' THEN 2.0 WHEN 'craft_discount' THEN 0.5 ELSE 1.5 END,
+               expires_at
+        FROM temporary_buffs WHERE expires_at > :now""",
+    'temporary_buffs_fixed': """
+        INSERT INTO effects (user_id, kind, magnitude, expires_at)
+        SELECT user_id, buff_type, buff_value, expires_at
+        FROM temporary_buffs_fixed WHERE is_active = 1 AND expires_at > :now""",
+    'free_rolls': """
+        INSERT INTO effects (user_id, kind, charges)
+        SELECT user_id, 'free_rolls', amount FROM free_rolls WHERE amount > 0""",
+    'free_rolls_fixed': """
+        INSERT INTO effects (user_id, kind, charges)
+        SELECT user_id, 'free_rolls', rolls_remaining FROM free_rolls_fixed WHERE rolls_remaining > 0""",
+    'guaranteed_rarities': """
+        INSERT INTO effects (user_id, kind, charges, target, expires_at)
+        SELECT user_id, 'guarantee', 1, rarity, expires_at
+        FROM guaranteed_rarities WHERE expires_at IS NULL OR expires_at > :now""",
+    'guaranteed_rarities_fixed': """
+        INSERT INTO effects (user_id, kind, charges, target)
+        SELECT user_id, 'guarantee', uses_remaining, rarity
+        FROM guaranteed_rarities_fixed WHERE uses_remaining > 0""",
+}
+
+
+@dataclass
+class Effect:
+    """One row of effects; charges None = until expiry, expires_at None = until charges run out"""
+    id: int
+    user_id: int
+    kind: str
+    magnitude: float = 1.0
+    charges: Optional[int] = None
+    target: Optional[str] = None
+    expires_at: Optional[float] = None
+
+    def is_active(self, now: float) -> bool:
+        if self.expires_at is not None and self.expires_at <= now:
+            return False
+        return self.charges is None or self.charges > 0
+
+
+class EffectsEngine:
+    """Write-through store of player effects; rolls read the in-memory lists only"""
+
+    def __init__(self):
+        self._by_user: Dict[int, List[Effect]] = {}
+        self.db = None
+
+    async def initialize(self, db):
+        """Create the table, fold the legacy effect tables in and load live effects"""
+        self.db = db
+        for statement in EFFECTS_SCHEMA:
+            await db.execute(statement)
+        await self._migrate_legacy_tables()
+        await self.load()
+
+    async def _migrate_legacy_tables(self):
+        cursor = await self.db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        existing = {row[0] for row in await cursor.fetchall()}
+        now = time.time()
+        for table, statement in LEGACY_MIGRATIONS.items():
+            if table not in existing:
+                continue
+            try:
+                cursor = await self.db.execute(statement, {'now': now})
+                await self.db.execute(f"DROP TABLE {table}")
+                await self.db.commit()
+                logger.info(f"Migrated {cursor.rowcount} rows from {table} into effects")
+            except Exception as e:
+                await self.db.rollback()
+                logger.error(f"Error migrating {table} into effects: {e}")
+
+    async def load(self):
+        """Reload every live effect from the table"""
+        cursor = await self.db.execute(
+            """SELECT id, user_id, kind, magnitude, charges, target, expires_at FROM effects
+               WHERE (expires_at IS NULL OR expires_at > ?) AND (charges IS NULL OR charges > 0)
+               ORDER BY expires_at IS NULL, expires_at""",
+            (time.time(),)
+        )
+        self._by_user = {}
+        for row in await cursor.fetchall():
+            self._by_user.setdefault(row[1], []).append(Effect(*row))
+        logger.info(f"Loaded effects for {len(self._by_user)} players")
+
+    def active(self, user_id: int, kind: Optional[str] = None, now: Optional[float] = None) -> List[Effect]:
+        """Live effects of a player, soonest expiry first"""
+        now = now or time.time()
+        return [
+            effect for effect in self._by_user.get(user_id, ())
+            if effect.is_active(now) and (kind is None or effect.kind == kind)
+        ]
+
+    async def grant(self, user_id: int, kind: str, magnitude: float = 1.0,
+                    duration: Optional[float] = None, charges: Optional[int] = None,
+                    target: Optional[str] = None) -> Effect:
+        """Add an effect lasting duration seconds and/or charges uses"""
+        expires_at = time.time() + duration if duration else None
+        cursor = await self.db.execute(
+            "INSERT INTO effects (user_id, kind, magnitude, charges, target, expires_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (user_id, kind, magnitude, charges, target, expires_at)
+        )
+        await self.db.commit()
+        effect = Effect(cursor.lastrowid, user_id, kind, magnitude, charges, target, expires_at)
+        effects = self._by_user.setdefault(user_id, [])
+        effects.append(effect)
+        effects.sort(key=lambda e: float('inf') if e.expires_at is None else e.expires_at)
+        return effect
+
+    def charges(self, user_id: int, kind: str) -> int:
+        """Uses left across a player's effects of one kind"""
+        return sum(effect.charges or 0 for effect in self.active(user_id, kind))
+
+    async def consume(self, user_id: int, kind: str) -> Optional[Effect]:
+        """Spend one charge of the soonest-expiring effect of a kind; None when there is none"""
+        for effect in self.active(user_id, kind):
+            if effect.charges is None:
+                continue
+            effect.charges -= 1
+            if effect.charges > 0:
+                await self.db.execute("UPDATE effects SET charges = ? WHERE id = ?", (effect.charges, effect.id))
+            else:
+                await self.db.execute("DELETE FROM effects WHERE id = ?", (effect.id,))
+                self._by_user[user_id].remove(effect)
+            await self.db.commit()
+            return effect
+        return None
+
+    def rarity_multipliers(self, user_id: int) -> Dict[str, float]:
+        """Combined potion multiplier per rarity (Rare to Mythic)"""
+        multipliers = {rarity: 1.0 for rarity in POTION_RARITIES}
+        for effect in self.active(user_id):
+            if effect.kind in ADDITIVE_BOOSTS:
+                for rarity in ADDITIVE_BOOSTS[effect.kind]:
+                    multipliers[rarity] *= (1 + effect.magnitude)
+            elif effect.kind in MULTIPLIER_BOOSTS:
+                for rarity in MULTIPLIER_BOOSTS[effect.kind]:
+                    multipliers[rarity] *= effect.magnitude
+        return multipliers
+
+    def apply_to_weights(self, user_id: int, weights: Dict[str, float]) -> Dict[str, float]:
+        """Rarity weights with the player's potions applied"""
+        for rarity, multiplier in self.rarity_multipliers(user_id).items():
+            if rarity in weights:
+                weights[rarity] *= multiplier
+        return weights
+
+    async def apply_guarantee(self, user_id: int, weights: Dict[str, float]) -> Dict[str, float]:
+        """Spend a rarity guarantee, if any, by dropping every rarity below its target"""
+        guarantees = self.active(user_id, GUARANTEE)
+        if not guarantees:
+            return weights
+        floor = rarity_tiers.rank(guarantees[0].target)
+        guaranteed = {rarity: weight for rarity, weight in weights.items() if rarity_tiers.rank(rarity) >= floor}
+        if sum(guaranteed.values()) <= 0:
+            return weights
+        await self.consume(user_id, GUARANTEE)
+        return guaranteed
+
+    async def sweep(self) -> int:
+        """Delete expired or spent effects from the table and from memory"""
+        now = time.time()
+        cursor = await self.db.execute(
+            "DELETE FROM effects WHERE expires_at <= ? OR charges <= 0", (now,)
+        )
+        await self.db.commit()
+        for user_id in list(self._by_user.keys()):
+            live = [effect for effect in self._by_user[user_id] if effect.is_active(now)]
+            if live:
+                self._by_user[user_id] = live
+            else:
+                del self._by_user[user_id]
+        return cursor.rowcount
+
+    async def clear(self, user_id: int):
+        """Remove every effect of a player (admin wipe)"""
+        await self.db.execute("DELETE FROM effects WHERE user_id = ?", (user_id,))
+        await self.db.commit()
+        self._by_user.pop(user_id, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'players': len(self._by_user),
+            'effects': sum(len(effects) for effects in self._by_user.values())
+        }
+
+
+# Global effects engine instance
+effects_engine = EffectsEngine()
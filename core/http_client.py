@@ -0,0 +1,334 @@
+"""
+Shared HTTP client for Shadow Roll Bot
+One pooled aiohttp session for image search, heartbeats and image tools
+"""
+
+import asyncio
+import logging
+import random
+import struct
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import aiohttp
+from multidict import CIMultiDict
+
+from core.cache import bot_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+
+# Status codes worth retrying (rate limits and transient upstream errors)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Methods retried by default; others (POST, PATCH) only when the caller passes retries
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+# Client errors worth retrying; the rest (invalid URL, bad redirects...) fail at once
+TRANSIENT_ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+
+class ResponseTooLarge(Exception):
+    """Raised when a response body exceeds the configured size cap"""
+
+
+@dataclass
+class HttpResponse:
+    """Fully read HTTP response detached from the connection"""
+    status: int
+    headers: Mapping[str, str] = field(default_factory=CIMultiDict)
+    body: bytes = b''
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def text(self, encoding: str = 'utf-8') -> str:
+        return self.body.decode(encoding, errors='replace')
+
+    def json(self) -> Any:
+        import json
+        return json.loads(self.body.decode('utf-8'))
+
+
+def parse_image_header(data: bytes) -> Optional[Tuple[str, int, int]]:
+    """Read (format, width, height) from the first bytes of an image"""
+    if len(data) >= 24 and data.startswith(b'\x89PNG\r\n\x1a\n'):
+        width, height = struct.unpack('>II', data[16:24])
+        return 'png', width, height
+
+    if len(data) >= 10 and data[:6] in (b'GIF87a', b'GIF89a'):
+        width, height = struct.unpack('<HH', data[6:10])
+        return 'gif', width, height
+
+    if len(data) >= 30 and data.startswith(b'RIFF') and data[8:12] == b'WEBP':
+        chunk = data[12:16]
+        if chunk == b'VP8 ':
+            width, height = struct.unpack('<HH', data[26:30])
+            return 'webp', width & 0x3fff, height & 0x3fff
+        if chunk == b'VP8L':
+            bits = int.from_bytes(data[21:25], 'little')
+            return 'webp', (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+        if chunk == b'VP8X':
+            width = int.from_bytes(data[24:27], 'little') + 1
+            height = int.from_bytes(data[27:30], 'little') + 1
+            return 'webp', width, height
+        return None
+
+    if data.startswith(b'\xff\xd8'):
+        # Walk JPEG segments until a start-of-frame marker
+        index = 2
+        while index + 9 < len(data):
+            if data[index] != 0xff:
+                index += 1
+                continue
+            marker = data[index + 1]
+            if marker in (0xd8, 0x01) or 0xd0 <= marker <= 0xd7:
+                index += 2
+                continue
+            segment_length = struct.unpack('>H', data[index + 2:index + 4])[0]
+            if marker in (0xc0, 0xc1, 0xc2, 0xc3, 0xc5, 0xc6, 0xc7,
+                          0xc9, 0xca, 0xcb, 0xcd, 0xce, 0xcf):
+                height, width = struct.unpack('>HH', data[index + 5:index + 9])
+                return 'jpeg', width, height
+            index += 2 + segment_length
+        return None
+
+    return None
+
+
+class HttpClient:
+    """Pooled HTTP client with retries, size caps and partial reads"""
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 8,
+                 dns_cache_ttl: int = 300, timeout: float = 30,
+                 max_retries: int = 3, backoff_base: float = 0.5,
+                 max_response_bytes: int = 15 * 1024 * 1024,
+                 sniff_bytes: int = 64 * 1024,
+                 headers: Optional[Dict[str, str]] = None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_response_bytes = max_response_bytes
+        self.sniff_bytes = sniff_bytes
+        self.headers = headers or dict(DEFAULT_HEADERS)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0, 'too_large': 0}
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Standalone scripts may run several event loops in sequence
+            if self._session is not None and not self._session.closed:
+                await self._close_stale_session(self._session, self._loop)
+            self._loop = loop
+            self._session = None
+            self._session_lock = asyncio.Lock()
+        elif self._session is not None and not self._session.closed:
+            return self._session
+
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                    use_dns_cache=True
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    headers=self.headers
+                )
+        return self._session
+
+    @staticmethod
+    async def _close_stale_session(session: aiohttp.ClientSession,
+                                   loop: Optional[asyncio.AbstractEventLoop]):
+        """Close a session created on another event loop"""
+        if loop is not None and loop.is_running():
+            # Still serving another thread: close it there
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        try:
+            # Once its loop is closed the sockets are gone and there is nothing left to wait for
+            await session.close()
+        except Exception as e:
+            logger.debug(f"Error closing HTTP session from a previous event loop: {e}")
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Exponential backoff with jitter, honouring Retry-After when given"""
+        if retry_after:
+            try:
+                return min(float(retry_after), 30.0)
+            except ValueError:
+                pass
+        return self.backoff_base * (2 ** attempt) + random.uniform(0, self.backoff_base)
+
+    async def _read_capped(self, response: aiohttp.ClientResponse, max_bytes: int,
+                           truncate: bool) -> bytes:
+        """Read the body in chunks, stopping at max_bytes"""
+        content_length = response.headers.get('Content-Length')
+        if not truncate and content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            raise ResponseTooLarge(f"{response.url} announced {content_length} bytes")
+
+        chunks = []
+        received = 0
+        async for chunk in response.content.iter_chunked(16 * 1024):
+            chunks.append(chunk)
+            received += len(chunk)
+            if truncate and received >= max_bytes:
+                break
+            if received > max_bytes:
+                raise ResponseTooLarge(f"{response.url} exceeded {max_bytes} bytes")
+        body = b''.join(chunks)
+        return body[:max_bytes] if truncate else body
+
+    async def request(self, method: str, url: str, *, max_bytes: Optional[int] = None,
+                      truncate: bool = False, retries: Optional[int] = None,
+                      **kwargs) -> HttpResponse:
+        """Perform a request with retry/backoff and return the capped body
+
+        Non-idempotent methods are sent once unless retries is given explicitly.
+        """
+        session = await self.get_session()
+        max_bytes = max_bytes or self.max_response_bytes
+        if retries is None:
+            retries = self.max_retries if method.upper() in IDEMPOTENT_METHODS else 0
+
+        attempt = 0
+        while True:
+            self.stats['requests'] += 1
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    if response.status in RETRY_STATUSES and attempt < retries:
+                        delay = self._backoff_delay(attempt, response.headers.get('Retry-After'))
+                        attempt += 1
+                        self.stats['retries'] += 1
+                        logger.debug(f"HTTP {response.status} on {url}, retry {attempt} in {delay:.2f}s")
+                        await asyncio.sleep(delay)
+                        continue
+
+                    body = b''
+                    if method.upper() != 'HEAD':
+                        body = await self._read_capped(response, max_bytes, truncate)
+                    return HttpResponse(response.status, CIMultiDict(response.headers), body)
+
+            except ResponseTooLarge:
+                self.stats['too_large'] += 1
+                raise
+            except TRANSIENT_ERRORS as e:
+                if attempt >= retries:
+                    self.stats['failures'] += 1
+                    raise
+                delay = self._backoff_delay(attempt)
+                attempt += 1
+                self.stats['retries'] += 1
+                logger.debug(f"HTTP error on {url} ({e}), retry {attempt} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+            except aiohttp.ClientError:
+                self.stats['failures'] += 1
+                raise
+
+    async def get_bytes(self, url: str, **kwargs) -> Optional[bytes]:
+        """GET a URL and return its body, or None on failure"""
+        try:
+            response = await self.request('GET', url, **kwargs)
+            return response.body if response.status == 200 else None
+        except Exception as e:
+            logger.warning(f"Download failed for {url}: {e}")
+            return None
+
+    async def get_text(self, url: str, **kwargs) -> Optional[str]:
+        """GET a URL and return its decoded text, or None on failure"""
+        body = await self.get_bytes(url, **kwargs)
+        return body.decode('utf-8', errors='replace') if body is not None else None
+
+    async def post_json(self, url: str, payload: Any, **kwargs) -> Optional[Any]:
+        """POST a JSON payload and return the decoded JSON response"""
+        try:
+            response = await self.request('POST', url, json=payload, **kwargs)
+            return response.json() if response.status == 200 else None
+        except Exception as e:
+            logger.warning(f"POST failed for {url}: {e}")
+            return None
+
+    async def _get_prefix(self, url: str, length: int) -> Optional[HttpResponse]:
+        """GET the first length bytes of a URL (ranged, truncated if the server ignores Range)"""
+        try:
+            response = await self.request(
+                'GET', url,
+                headers={'Range': f'bytes=0-{length - 1}'},
+                max_bytes=length,
+                truncate=True
+            )
+        except Exception as e:
+            logger.debug(f"Image sniff failed for {url}: {e}")
+            return None
+        return response if response.status in (200, 206) else None
+
+    async def sniff_image(self, url: str) -> Optional[Dict[str, Any]]:
+        """Read only the first bytes of an image to get its format and size"""
+        response = await self._get_prefix(url, self.sniff_bytes)
+        if response is None:
+            return None
+
+        parsed = parse_image_header(response.body)
+        if not parsed and response.body.startswith(b'\xff\xd8') and len(response.body) >= self.sniff_bytes:
+            # JPEG whose frame header sits after large EXIF/ICC segments: read on, up to the cap
+            response = await self._get_prefix(url, self.max_response_bytes)
+            if response is None:
+                return None
+            parsed = parse_image_header(response.body)
+        if not parsed:
+            return None
+
+        # Content-Range carries the full size for partial responses
+        total_size = None
+        content_range = response.headers.get('Content-Range', '')
+        try:
+            if '/' in content_range and not content_range.endswith('*'):
+                total_size = int(content_range.rsplit('/', 1)[1])
+            elif response.status == 200 and response.headers.get('Content-Length'):
+                total_size = int(response.headers['Content-Length'])
+        except ValueError:
+            # Malformed header from the remote host: the size stays unknown
+            total_size = None
+
+        image_format, width, height = parsed
+        return {
+            'format': image_format,
+            'width': width,
+            'height': height,
+            'size': total_size
+        }
+
+    async def cached(self, cache_key: str, ttl_seconds: int, fetch):
+        """Return a cached provider result or compute it with fetch()"""
+        cached_data = bot_cache.get(cache_key)
+        if cached_data is not None:
+            return cached_data
+
+        result = await fetch()
+        if result is not None:
+            bot_cache.set(cache_key, result, ttl_seconds)
+        return result
+
+    async def close(self):
+        """Close the shared session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+# Global HTTP client instance
+http_client = HttpClient()
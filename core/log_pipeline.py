@@ -0,0 +1,205 @@
+"""
+Logging pipeline for Shadow Roll Bot
+Records are queued on the calling thread and written by a background listener: rotated text log,
+JSON lines with the interaction context, stdout
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from core.config import BotConfig
+from core.tracing import tracer
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def _parse_overrides(raw: Optional[str], cast) -> Dict[str, Any]:
+    """'core.cache=0.1,modules.shop=0.5' -> {'core.cache': 0.1, 'modules.shop': 0.5}"""
+    overrides = {}
+    for part in (raw or '').split(','):
+        name, sep, value = part.partition('=')
+        if sep and name.strip():
+            try:
+                overrides[name.strip()] = cast(value.strip())
+            except ValueError:
+                continue
+    return overrides
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a share of the records below WARNING per logger prefix
+
+    Runs before the record is formatted or queued, so a sampled-out record costs one
+    dict lookup and one random draw.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.dropped = 0
+        self._by_logger: Dict[str, Optional[float]] = {}
+
+    def _rate(self, name: str) -> Optional[float]:
+        rate = self._by_logger.get(name, False)
+        if rate is False:
+            prefix = name
+            rate = None
+            while prefix:
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+                prefix = prefix.rpartition('.')[0]
+            self._by_logger[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate is None or random.random() < rate:
+            return True
+        self.dropped += 1
+        return False
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """Queues a self-contained copy of the record, tagged with the current interaction
+
+    The message and traceback are rendered here because args and exc_info may not
+    outlive the call; everything else is formatted by the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        trace = tracer.current_trace()
+        if trace is not None:
+            record.interaction = trace.name
+            attrs = trace.attrs or {}
+            record.user_id = attrs.get('user_id')
+            record.item = attrs.get('item')
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, interaction context, traceback"""
+
+    CONTEXT_FIELDS = ('interaction', 'item', 'user_id')
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'where': f"{record.module}:{record.lineno}",
+        }
+        for field in self.CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+        if record.exc_text:
+            data['exc'] = record.exc_text
+        if record.stack_info:
+            data['stack'] = record.stack_info
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class LogPipeline:
+    """Root logger -> sampling filter -> bounded queue -> listener thread -> file and stdout handlers"""
+
+    def __init__(self):
+        self.queue: Optional[queue.Queue] = None
+        self.handler: Optional[ContextQueueHandler] = None
+        self.sampler: Optional[SamplingFilter] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+
+    def start(self, level: str = BotConfig.LOG_LEVEL) -> logging.Logger:
+        """Replace the root handlers with the queue; called once at startup (again is a no-op)"""
+        root = logging.getLogger()
+        if self.listener is not None:
+            return root
+
+        directory = os.path.dirname(BotConfig.LOG_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        text_file = logging.handlers.RotatingFileHandler(
+            BotConfig.LOG_FILE, maxBytes=BotConfig.LOG_FILE_MAX_BYTES,
+            backupCount=BotConfig.LOG_BACKUP_COUNT, encoding='utf-8')
+        text_file.setFormatter(logging.Formatter(TEXT_FORMAT))
+        json_file = logging.handlers.TimedRotatingFileHandler(
+            BotConfig.LOG_JSON_FILE, when='midnight',
+            backupCount=BotConfig.LOG_JSON_BACKUP_DAYS, encoding='utf-8')
+        json_file.setFormatter(JsonFormatter())
+        stdout = logging.StreamHandler(sys.stdout)
+        stdout.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+        self.queue = queue.Queue(BotConfig.LOG_QUEUE_SIZE)
+        self.handler = ContextQueueHandler(self.queue)
+        rates = {**BotConfig.LOG_SAMPLING, **_parse_overrides(os.getenv('LOG_SAMPLING'), float)}
+        self.sampler = SamplingFilter(rates)
+        self.handler.addFilter(self.sampler)
+
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            handler.close()
+        root.addHandler(self.handler)
+        root.setLevel(getattr(logging, level.upper(), logging.INFO))
+        levels = {**BotConfig.LOG_LEVELS, **_parse_overrides(os.getenv('LOG_LEVELS'), str.upper)}
+        for name, logger_level in levels.items():
+            logging.getLogger(name).setLevel(logger_level)
+
+        self.listener = logging.handlers.QueueListener(
+            self.queue, text_file, json_file, stdout, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.stop)
+        return root
+
+    def stop(self):
+        """Flush what is queued and close the files"""
+        if self.listener is None:
+            return
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        logging.getLogger().removeHandler(self.handler)
+        self.listener = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'running': self.listener is not None,
+            'queued': self.queue.qsize() if self.queue is not None else 0,
+            'dropped_queue_full': self.handler.dropped if self.handler else 0,
+            'sampled_out': self.sampler.dropped if self.sampler else 0,
+            'sampling': self.sampler.rates if self.sampler else {},
+        }
+
+
+# Global log pipeline instance
+log_pipeline = LogPipeline()
@@ -0,0 +1,236 @@
+"""
+Prometheus metrics for Shadow Roll Bot
+Text exposition of the bot's own counters, rendered on scrape from the live process (served by health_check.py /metrics)
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import weakref
+from typing import Any, Dict, List
+
+from core.cache import bot_cache
+from core.log_pipeline import log_pipeline
+from core.outbound import outbound
+from core.query_stats import query_stats
+from core.tracing import LatencyHistogram, tracer
+from core.user_gate import user_gate
+from core.watchdog import watchdog
+
+logger = logging.getLogger(__name__)
+
+# Fingerprints exported with their histogram, by total time (the rest only count in the totals)
+TOP_FINGERPRINTS = 50
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _bound(bound_ms: float) -> str:
+    return '+Inf' if bound_ms == float('inf') else f"{bound_ms / 1000:g}"
+
+
+class _Exposition:
+    """Builds the text format, one HELP/TYPE header per metric family"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str):
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value: float, **labels):
+        self.lines.append(f"{name}{_labels(labels)} {value!r}")
+
+    def histogram(self, name: str, histogram: LatencyHistogram, **labels):
+        """A millisecond LatencyHistogram as a Prometheus histogram in seconds"""
+        cumulative = 0
+        for bound, count in zip(histogram.bounds, histogram.counts):
+            cumulative += count
+            self.sample(f"{name}_bucket", cumulative, **labels, le=_bound(bound))
+        self.sample(f"{name}_sum", histogram.total_ms / 1000, **labels)
+        self.sample(f"{name}_count", histogram.count, **labels)
+
+    def render(self) -> str:
+        return '\n'.join(self.lines) + '\n'
+
+
+class _RateLimitLogCounter(logging.Handler):
+    """Counts the 429 warnings discord.py logs when it sleeps on a rate limit by itself"""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.counts: Dict[str, int] = {}
+
+    def emit(self, record: logging.LogRecord):
+        if 'rate limit' in str(record.msg).lower():
+            scope = 'global' if 'global' in str(record.msg).lower() else record.name
+            self.counts[scope] = self.counts.get(scope, 0) + 1
+
+
+class Metrics:
+    """Economy counters plus a scrape-time view of the loop, database, cache, tracing and Discord queues"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.rate_limit_logs = _RateLimitLogCounter()
+        self.actions: Dict[str, int] = {}
+        self._bot_ref = None
+        self._installed = False
+
+    def start(self, bot):
+        """Bind the bot (weakly); called from setup_hook"""
+        self._bot_ref = weakref.ref(bot)
+        if not self._installed:
+            self._installed = True
+            for name in ('discord.http', 'discord.webhook.async_'):
+                logging.getLogger(name).addHandler(self.rate_limit_logs)
+
+    @property
+    def bot(self):
+        return self._bot_ref() if self._bot_ref is not None else None
+
+    def count_action(self, action: str, amount: int = 1):
+        """Completed economy action (roll, sell, trade, market_buy)"""
+        self.actions[action] = self.actions.get(action, 0) + amount
+
+    def _active_views(self) -> int:
+        bot = self.bot
+        store = getattr(getattr(bot, '_connection', None), '_view_store', None)
+        if store is None:
+            return 0
+        views = {id(item.view) for items in getattr(store, '_views', {}).values() for item in items.values()}
+        views.update(id(view) for view in getattr(store, '_synced_message_views', {}).values())
+        return len(views)
+
+    def _database(self):
+        bot = self.bot
+        manager = getattr(bot, 'db', None)
+        return getattr(manager, 'db', None)
+
+    def render(self) -> str:
+        out = _Exposition()
+
+        out.family('shadow_roll_uptime_seconds', 'gauge', "Seconds since the process started")
+        out.sample('shadow_roll_uptime_seconds', round(time.time() - self.started_at, 3))
+
+        # ----- event loop -----
+        out.family('shadow_roll_event_loop_lag_seconds', 'histogram',
+                   "Delay of the watchdog heartbeat: time the loop was busy with something else")
+        out.histogram('shadow_roll_event_loop_lag_seconds', watchdog.histogram)
+        out.family('shadow_roll_event_loop_lag_last_seconds', 'gauge', "Most recent event loop lag sample")
+        out.sample('shadow_roll_event_loop_lag_last_seconds', watchdog.last_ms / 1000)
+        out.family('shadow_roll_event_loop_blocked_total', 'counter',
+                   "Times one callback held the loop beyond the watchdog threshold")
+        out.sample('shadow_roll_event_loop_blocked_total', watchdog.stall_count)
+        out.family('shadow_roll_event_loop_blocked_seconds_total', 'counter',
+                   "Time the loop spent in those blocking callbacks")
+        out.sample('shadow_roll_event_loop_blocked_seconds_total', watchdog.stall_total_ms / 1000)
+        out.family('shadow_roll_asyncio_tasks', 'gauge', "Pending asyncio tasks on the bot's loop")
+        try:
+            out.sample('shadow_roll_asyncio_tasks', len(asyncio.all_tasks()))
+        except RuntimeError:
+            out.sample('shadow_roll_asyncio_tasks', 0)
+
+        logging_stats = log_pipeline.get_stats()
+        out.family('shadow_roll_log_queue_depth', 'gauge', "Log records waiting for the writer thread")
+        out.sample('shadow_roll_log_queue_depth', logging_stats['queued'])
+        out.family('shadow_roll_log_records_dropped_total', 'counter', "Log records not written, by reason")
+        out.sample('shadow_roll_log_records_dropped_total', logging_stats['dropped_queue_full'], reason='queue_full')
+        out.sample('shadow_roll_log_records_dropped_total', logging_stats['sampled_out'], reason='sampled')
+
+        # ----- database -----
+        connection = self._database()
+        out.family('shadow_roll_db_in_flight', 'gauge',
+                   "Statements submitted to the single aiosqlite connection and not finished")
+        out.sample('shadow_roll_db_in_flight', getattr(connection, 'in_flight', 0))
+        out.family('shadow_roll_db_queue_depth', 'gauge',
+                   "Requests waiting for the aiosqlite worker thread (the connection's pool wait)")
+        out.sample('shadow_roll_db_queue_depth', getattr(connection, 'queue_depth', 0))
+        self._render_queries(out)
+
+        # ----- cache -----
+        namespaces = bot_cache.namespace_stats()
+        out.family('shadow_roll_cache_requests_total', 'counter', "bot_cache lookups by key namespace and result")
+        for namespace, counts in namespaces.items():
+            out.sample('shadow_roll_cache_requests_total', counts['hits'], namespace=namespace, result='hit')
+            out.sample('shadow_roll_cache_requests_total', counts['misses'], namespace=namespace, result='miss')
+        out.family('shadow_roll_cache_hit_ratio', 'gauge', "bot_cache hit ratio by key namespace since start")
+        for namespace, counts in namespaces.items():
+            total = counts['hits'] + counts['misses']
+            out.sample('shadow_roll_cache_hit_ratio', round(counts['hits'] / total, 4) if total else 0.0,
+                       namespace=namespace)
+        out.family('shadow_roll_cache_entries', 'gauge', "Entries held by bot_cache")
+        out.sample('shadow_roll_cache_entries', len(bot_cache))
+
+        # ----- economy -----
+        out.family('shadow_roll_economy_actions_total', 'counter', "Completed economy actions")
+        for action in sorted(set(self.actions) | {'roll', 'sell', 'trade'}):
+            out.sample('shadow_roll_economy_actions_total', self.actions.get(action, 0), action=action)
+        out.family('shadow_roll_user_gate_total', 'counter', "Economy actions admitted or shed by the per-user gate")
+        for action, counters in sorted(user_gate.by_action.items()):
+            for outcome, value in sorted(counters.items()):
+                out.sample('shadow_roll_user_gate_total', value, action=action, outcome=outcome)
+
+        # ----- Discord -----
+        outbound_stats = outbound.get_stats()
+        out.family('shadow_roll_discord_rate_limited_total', 'counter',
+                   "Discord 429 responses: outbound queue replays and discord.py's own retries")
+        out.sample('shadow_roll_discord_rate_limited_total', outbound_stats['rate_limited'], source='outbound')
+        for scope, value in sorted(self.rate_limit_logs.counts.items()):
+            out.sample('shadow_roll_discord_rate_limited_total', value, source=scope)
+        out.family('shadow_roll_outbound_queue_depth', 'gauge', "Sends and edits waiting in the outbound queue")
+        out.sample('shadow_roll_outbound_queue_depth', outbound_stats['queue_depth'])
+        out.family('shadow_roll_outbound_in_flight', 'gauge', "Outbound requests in flight")
+        out.sample('shadow_roll_outbound_in_flight', outbound_stats['in_flight'])
+        out.family('shadow_roll_active_views', 'gauge', "discord.ui views still listening for interactions")
+        out.sample('shadow_roll_active_views', self._active_views())
+        bot = self.bot
+        out.family('shadow_roll_gateway_latency_seconds', 'gauge', "Discord gateway heartbeat latency")
+        latency = getattr(bot, 'latency', None)
+        out.sample('shadow_roll_gateway_latency_seconds',
+                   float(latency) if isinstance(latency, (int, float)) and latency == latency else 0.0)
+
+        # ----- interactions -----
+        out.family('shadow_roll_interaction_duration_seconds', 'histogram',
+                   "Button click or slash command, from dispatch to the end of the callback")
+        for name, histogram in sorted(tracer.histograms.items()):
+            out.histogram('shadow_roll_interaction_duration_seconds', histogram, view=name)
+
+        return out.render()
+
+    def _render_queries(self, out: _Exposition):
+        entries = query_stats.entries()
+        out.family('shadow_roll_db_statements_total', 'counter', "Statements run on the shared connection")
+        out.sample('shadow_roll_db_statements_total', sum(stats.calls for stats in entries))
+        out.family('shadow_roll_db_slow_statements_total', 'counter', "Statements above the slow query threshold")
+        out.sample('shadow_roll_db_slow_statements_total', sum(stats.slow for stats in entries))
+
+        top = sorted(entries, key=lambda stats: stats.total_ms, reverse=True)[:TOP_FINGERPRINTS]
+        ids = [(stats, hashlib.sha1(stats.fingerprint.encode()).hexdigest()[:12]) for stats in top]
+        out.family('shadow_roll_db_query_info', 'gauge', "Fingerprint text of each exported query_id")
+        for stats, query_id in ids:
+            out.sample('shadow_roll_db_query_info', 1, query_id=query_id, fingerprint=stats.fingerprint[:300])
+        out.family('shadow_roll_db_query_duration_seconds', 'histogram',
+                   f"Execution time per statement fingerprint (top {TOP_FINGERPRINTS} by total time, fetches excluded)")
+        for stats, query_id in ids:
+            out.histogram('shadow_roll_db_query_duration_seconds', stats.histogram, query_id=query_id)
+        out.family('shadow_roll_db_query_rows_total', 'counter', "Rows fetched per statement fingerprint")
+        for stats, query_id in ids:
+            out.sample('shadow_roll_db_query_rows_total', stats.rows, query_id=query_id)
+        out.family('shadow_roll_db_query_errors_total', 'counter', "Failed statements per fingerprint")
+        for stats, query_id in ids:
+            out.sample('shadow_roll_db_query_errors_total', stats.errors, query_id=query_id)
+
+
+# Global metrics instance
+metrics = Metrics()
@@ -0,0 +1,390 @@
+"""
+Outbound Discord message queue for Shadow Roll Bot
+Rate-limit-aware sends and edits shared by commands, animations and games
+"""
+
+import asyncio
+import contextvars
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+import discord
+
+from core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Lower value is sent first
+PRIORITY_INTERACTION = 0  # Replies the user is waiting for
+PRIORITY_NORMAL = 1       # Regular edits (game rounds, trade updates)
+PRIORITY_COSMETIC = 2     # Animation frames, safe to collapse
+PRIORITIES = (PRIORITY_INTERACTION, PRIORITY_NORMAL, PRIORITY_COSMETIC)
+
+# Seconds between sweeps of idle route buckets (a full bucket is the same as a new one)
+BUCKET_SWEEP_INTERVAL = 60.0
+
+
+class TokenBucket:
+    """Token bucket mirroring a Discord rate limit"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+            self.updated_at = now
+
+    def available(self, now: float) -> float:
+        """Tokens currently available (0 while blocked by a 429)"""
+        if now < self.blocked_until:
+            return 0.0
+        self._refill(now)
+        return self.tokens
+
+    def try_acquire(self, now: float, reserve: float = 0) -> bool:
+        """Take a token if one is available beyond the reserve"""
+        if self.available(now) >= 1 + reserve:
+            self.tokens -= 1
+            return True
+        return False
+
+    def release(self):
+        """Give back a token taken by try_acquire"""
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def time_until_token(self, now: float, reserve: float = 0) -> float:
+        """Delay before a token is available beyond the reserve"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        missing = 1 + reserve - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.refill_per_second
+
+    def penalize(self, retry_after: float, now: float):
+        """Block the bucket after a 429; a single token is available once it expires"""
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        self.tokens = min(1, self.capacity)
+        self.updated_at = self.blocked_until
+
+
+@dataclass
+class OutboundJob:
+    """A pending send or edit"""
+    route: Hashable
+    key: Hashable
+    priority: int
+    send: Callable[[], Awaitable[Any]]
+    future: asyncio.Future
+    on_missing: Optional[Callable] = None
+    queued_at: float = 0.0
+    # Context of the submitting interaction, so the send lands in its trace
+    context: Optional[contextvars.Context] = None
+
+
+def route_for(target) -> Hashable:
+    """Rate-limit route of a message, channel or interaction (one bucket per channel)"""
+    channel = getattr(target, 'channel', None)
+    channel_id = getattr(channel, 'id', None)
+    if channel_id is None:
+        channel_id = getattr(target, 'channel_id', None)
+    if channel_id is None:
+        channel_id = getattr(target, 'id', 0)
+    return ('channel', channel_id)
+
+
+class OutboundQueue:
+    """Prioritized outbound queue with per-route buckets and last-write-wins edits"""
+
+    def __init__(self, route_capacity: int = 5, route_refill: float = 1.0,
+                 global_rate: float = 40.0, max_in_flight: int = 50,
+                 cosmetic_reserve: int = 2, hot_threshold: float = 2.0):
+        self.route_capacity = route_capacity
+        self.route_refill = route_refill
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.max_in_flight = max_in_flight
+        # Cosmetic frames leave this many tokens for interaction replies
+        self.cosmetic_reserve = cosmetic_reserve
+        self.hot_threshold = hot_threshold
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._swept_at = time.monotonic()
+        self._pending: Dict[int, "OrderedDict[Hashable, OutboundJob]"] = {p: OrderedDict() for p in PRIORITIES}
+        self._pending_priority: Dict[Hashable, int] = {}
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.notify: Optional[Callable] = None  # Called whenever a job completes
+        self.stats = {
+            'queued': 0, 'coalesced': 0, 'collapsed': 0, 'sent': 0,
+            'rate_limited': 0, 'failed': 0, 'missing': 0, 'buckets_evicted': 0
+        }
+
+    # ----- buckets -----
+
+    def _bucket_for(self, route: Hashable) -> TokenBucket:
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            bucket = TokenBucket(self.route_capacity, self.route_refill)
+            self._buckets[route] = bucket
+        return bucket
+
+    def _evict_idle_buckets(self, now: float):
+        """Forget the buckets of routes with nothing queued that are full and unblocked again"""
+        busy = {job.route for queue in self._pending.values() for job in queue.values()}
+        idle = [
+            route for route, bucket in self._buckets.items()
+            if route not in busy and bucket.available(now) >= bucket.capacity
+        ]
+        for route in idle:
+            del self._buckets[route]
+        self.stats['buckets_evicted'] += len(idle)
+        self._swept_at = now
+
+    def is_hot(self, route: Hashable) -> bool:
+        """True when the route is close to its limit or already has a backlog"""
+        if self.route_depth(route):
+            return True
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            return False
+        return bucket.available(time.monotonic()) < self.hot_threshold
+
+    def route_depth(self, route: Hashable) -> int:
+        return sum(1 for queue in self._pending.values() for job in queue.values() if job.route == route)
+
+    # ----- submission -----
+
+    def _ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    def submit(self, route: Hashable, send: Callable[[], Awaitable[Any]], *,
+               priority: int = PRIORITY_NORMAL, key: Optional[Hashable] = None,
+               on_missing: Optional[Callable] = None) -> asyncio.Future:
+        """Queue a send; jobs sharing a key replace each other (last write wins)"""
+        self._ensure_running()
+        self.stats['queued'] += 1
+        if key is None:
+            key = ('job', next(self._seq))
+
+        future = None
+        previous_priority = self._pending_priority.get(key)
+        queued_at = time.monotonic()
+        if previous_priority is not None:
+            priority = min(priority, previous_priority)
+            previous = self._pending[previous_priority][key]
+            if priority != previous_priority:
+                del self._pending[previous_priority][key]
+            # Waiters of the replaced job receive the result of the newest one
+            future = previous.future
+            queued_at = previous.queued_at
+            self.stats['coalesced'] += 1
+
+        if future is None:
+            future = self._loop.create_future()
+        context = contextvars.copy_context() if tracer.current() is not None else None
+        job = OutboundJob(route, key, priority, send, future, on_missing, queued_at, context)
+        # A replaced job keeps its position so frequently edited messages are not starved
+        self._pending[priority][key] = job
+        self._pending_priority[key] = priority
+        self._wakeup.set()
+        return future
+
+    def edit(self, message, *, priority: int = PRIORITY_NORMAL,
+             on_missing: Optional[Callable] = None, **kwargs) -> asyncio.Future:
+        """Queue a message edit, replacing any edit of that message still pending"""
+        return self.submit(
+            route_for(message), lambda: message.edit(**kwargs),
+            priority=priority, key=('edit', message.id), on_missing=on_missing
+        )
+
+    def followup(self, interaction: discord.Interaction, *,
+                 priority: int = PRIORITY_INTERACTION, **kwargs) -> asyncio.Future:
+        """Queue an interaction followup; resolves to the sent message"""
+        kwargs.setdefault('wait', True)
+        return self.submit(
+            route_for(interaction), lambda: interaction.followup.send(**kwargs),
+            priority=priority
+        )
+
+    def note_collapsed(self, frames: int = 1):
+        """Count animation frames skipped because their route was hot"""
+        self.stats['collapsed'] += frames
+
+    # ----- draining -----
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending_priority)
+
+    def flush(self, now: float) -> Optional[float]:
+        """Start every job the buckets allow; return the delay before the next attempt"""
+        next_retry = None
+        for priority in PRIORITIES:
+            reserve = 0
+            if priority == PRIORITY_COSMETIC:
+                reserve = min(self.cosmetic_reserve, self.route_capacity - 1)
+            queue = self._pending[priority]
+            for key in list(queue.keys()):
+                if len(self._in_flight) >= self.max_in_flight:
+                    return 0.05
+                if key in self._in_flight:
+                    continue  # Keep edits of one message in order
+
+                job = queue[key]
+                bucket = self._bucket_for(job.route)
+                if not bucket.try_acquire(now, reserve):
+                    wait = bucket.time_until_token(now, reserve)
+                    next_retry = wait if next_retry is None else min(next_retry, wait)
+                    continue
+                if not self.global_bucket.try_acquire(now):
+                    bucket.release()
+                    return self.global_bucket.time_until_token(now)
+
+                del queue[key]
+                del self._pending_priority[key]
+                self._in_flight[key] = asyncio.create_task(self._send(job), context=job.context)
+        return next_retry
+
+    @staticmethod
+    def _settle(future: asyncio.Future, result: Any = None, error: Optional[BaseException] = None):
+        if future.done():
+            return
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+            future.exception()  # Fire-and-forget callers never await: don't warn about it
+
+    def _hand_over(self, job: OutboundJob) -> bool:
+        """True when a newer job with this key was queued during the flight
+
+        A job submitted while its key is in flight gets its own future; the waiters of
+        the in-flight one then receive the newer job's result (last write wins).
+        """
+        priority = self._pending_priority.get(job.key)
+        if priority is None:
+            return False
+        newer = self._pending[priority][job.key]
+        if newer.future is not job.future:
+            newer.future.add_done_callback(lambda done: self._chain(done, job.future))
+        return True
+
+    def _chain(self, done: asyncio.Future, future: asyncio.Future):
+        if done.cancelled():
+            future.cancel()
+            return
+        error = done.exception()
+        self._settle(future, None if error is not None else done.result(), error)
+
+    async def _send(self, job: OutboundJob):
+        if job.context is not None:
+            waited = time.monotonic() - job.queued_at
+            tracer.record('discord', 'outbound.queue', time.perf_counter() - waited, priority=job.priority)
+        try:
+            result = await job.send()
+            self.stats['sent'] += 1
+            if not self._hand_over(job):
+                self._settle(job.future, result)
+        except discord.NotFound:
+            self.stats['missing'] += 1
+            self._drop(job.key)
+            self._settle(job.future, None)
+            if job.on_missing:
+                try:
+                    job.on_missing()
+                except Exception as e:
+                    logger.error(f"Error in on_missing callback: {e}")
+        except discord.HTTPException as e:
+            if e.status == 429:
+                self.stats['rate_limited'] += 1
+                retry_after = getattr(e, 'retry_after', None) or 1.0
+                self._bucket_for(job.route).penalize(retry_after, time.monotonic())
+                # Replay unless a newer job replaced this one meanwhile
+                if not self._hand_over(job):
+                    self._pending[job.priority][job.key] = job
+                    self._pending_priority[job.key] = job.priority
+            else:
+                self.stats['failed'] += 1
+                logger.warning(f"Outbound request failed ({e.status}): {e}")
+                if not self._hand_over(job):
+                    self._settle(job.future, error=e)
+        except Exception as e:
+            self.stats['failed'] += 1
+            logger.warning(f"Outbound request failed: {e}")
+            if not self._hand_over(job):
+                self._settle(job.future, error=e)
+        finally:
+            self._in_flight.pop(job.key, None)
+            if self._wakeup is not None:
+                self._wakeup.set()
+            if self.notify:
+                self.notify()
+
+    def _drop(self, key: Hashable):
+        """Forget the pending job of a key whose target is gone; its waiters get None"""
+        priority = self._pending_priority.pop(key, None)
+        if priority is not None:
+            job = self._pending[priority].pop(key, None)
+            if job is not None:
+                self._settle(job.future, None)
+
+    async def _run(self):
+        while True:
+            now = time.monotonic()
+            if now - self._swept_at >= BUCKET_SWEEP_INTERVAL:
+                self._evict_idle_buckets(now)
+            delay = self.flush(now)
+            self._wakeup.clear()
+            timeout = None if delay is None else max(delay, 0.01)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth per priority, in-flight count and 429 counters"""
+        now = time.monotonic()
+        oldest = min((job.queued_at for queue in self._pending.values() for job in queue.values()),
+                     default=None)
+        return {
+            **self.stats,
+            'queue_depth': self.pending_count,
+            'depth_interaction': len(self._pending[PRIORITY_INTERACTION]),
+            'depth_normal': len(self._pending[PRIORITY_NORMAL]),
+            'depth_cosmetic': len(self._pending[PRIORITY_COSMETIC]),
+            'in_flight': len(self._in_flight),
+            'routes': len(self._buckets),
+            'oldest_wait_ms': (now - oldest) * 1000 if oldest is not None else 0.0,
+            'blocked_routes': sum(1 for b in self._buckets.values() if b.blocked_until > now)
+        }
+
+    async def stop(self):
+        """Stop the drain loop (pending jobs are dropped)"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global outbound queue instance
+outbound = OutboundQueue()
@@ -0,0 +1,300 @@
+"""
+Ownership index for Shadow Roll Bot
+The catalog is held in display order with one bitmask per anime and per rarity;
+each player's owned set is a bitmask over the same positions, so filtered index pages are bitwise ops.
+Per-anime and per-rarity totals are computed with the partitions, once per catalog version
+"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Version counters bumped by triggers: a stale bitmap costs one primary key read to notice
+VERSION_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS catalog_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL DEFAULT 0
+    )""",
+    "INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)",
+    """CREATE TABLE IF NOT EXISTS inventory_versions (
+        user_id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS catalog_version_ai AFTER INSERT ON characters BEGIN
+        UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS catalog_version_au AFTER UPDATE ON characters BEGIN
+        UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS catalog_version_ad AFTER DELETE ON characters BEGIN
+        UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS inventory_version_ai AFTER INSERT ON inventory BEGIN
+        INSERT INTO inventory_versions (user_id, version) VALUES (new.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS inventory_version_au AFTER UPDATE ON inventory BEGIN
+        INSERT INTO inventory_versions (user_id, version) VALUES (old.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+        INSERT INTO inventory_versions (user_id, version) VALUES (new.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS inventory_version_ad AFTER DELETE ON inventory BEGIN
+        INSERT INTO inventory_versions (user_id, version) VALUES (old.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+    END""",
+]
+
+VERSIONS_QUERY = """SELECT (SELECT version FROM catalog_version WHERE id = 1),
+                           (SELECT version FROM inventory_versions WHERE user_id = ?)"""
+
+
+def bit_positions(mask: int, skip: int = 0, limit: Optional[int] = None) -> List[int]:
+    """Positions of the set bits of mask, ascending, after the first skip ones"""
+    bits = format(mask, 'b')[::-1]
+    # Skip whole chunks by counting their bits, then walk bit by bit
+    offset = 0
+    while offset < len(bits):
+        ones = bits.count('1', offset, offset + 4096)
+        if ones > skip:
+            break
+        skip -= ones
+        offset += 4096
+    positions = []
+    position = bits.find('1', offset)
+    while position != -1 and (limit is None or len(positions) < limit):
+        if skip:
+            skip -= 1
+        else:
+            positions.append(position)
+        position = bits.find('1', position + 1)
+    return positions
+
+
+@dataclass
+class CatalogTotals:
+    """Character count and value of one anime or rarity"""
+    count: int = 0
+    value: int = 0
+    min_value: Optional[int] = None
+    max_value: Optional[int] = None
+
+    def add(self, value: Optional[int]):
+        self.count += 1
+        if value is None:
+            return
+        self.value += value
+        self.min_value = value if self.min_value is None else min(self.min_value, value)
+        self.max_value = value if self.max_value is None else max(self.max_value, value)
+
+
+@dataclass
+class CatalogEntry:
+    """One character of the catalog"""
+    id: int
+    name: str
+    anime: str
+    rarity: str
+    value: int
+    image_url: Optional[str]
+
+
+class CatalogPartitions:
+    """The catalog in index order (rarity, value, name), partitioned into bitmasks"""
+
+    def __init__(self, version: Optional[int] = None, rows: Sequence[Tuple] = ()):
+        self.version = version
+        self.entries: List[CatalogEntry] = [CatalogEntry(*row) for row in rows]
+        self.position: Dict[int, int] = {entry.id: i for i, entry in enumerate(self.entries)}
+        self.all_mask = (1 << len(self.entries)) - 1
+        self.by_anime: Dict[str, int] = {}
+        self.by_rarity: Dict[str, int] = {}
+        self.anime_totals: Dict[str, CatalogTotals] = {}
+        self.rarity_totals: Dict[str, CatalogTotals] = {}
+        for i, entry in enumerate(self.entries):
+            bit = 1 << i
+            self.by_anime[entry.anime] = self.by_anime.get(entry.anime, 0) | bit
+            self.by_rarity[entry.rarity] = self.by_rarity.get(entry.rarity, 0) | bit
+            self.anime_totals.setdefault(entry.anime, CatalogTotals()).add(entry.value)
+            self.rarity_totals.setdefault(entry.rarity, CatalogTotals()).add(entry.value)
+        # Named series, largest first
+        self.series: List[Tuple[str, int]] = sorted(
+            ((anime, totals.count) for anime, totals in self.anime_totals.items() if anime),
+            key=lambda item: (-item[1], item[0])
+        )
+
+    def mask(self, anime: Optional[str] = None, rarity: Optional[str] = None) -> int:
+        """Positions of the characters matching the filters"""
+        mask = self.all_mask
+        if anime:
+            mask &= self.by_anime.get(anime, 0)
+        if rarity:
+            mask &= self.by_rarity.get(rarity, 0)
+        return mask
+
+    def mask_of(self, character_ids) -> int:
+        mask = 0
+        for character_id in character_ids:
+            position = self.position.get(character_id)
+            if position is not None:
+                mask |= 1 << position
+        return mask
+
+
+class Ownership:
+    """A player's owned set over the current catalog positions"""
+    __slots__ = ('inventory_version', 'mask', 'counts', 'collection')
+
+    def __init__(self, inventory_version: Optional[int], mask: int, counts: Dict[int, int]):
+        self.inventory_version = inventory_version
+        self.mask = mask
+        self.counts = counts
+        # Per-anime stats, derived once per inventory version
+        self.collection: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+class OwnershipIndex:
+    """Catalog partitions plus per-player ownership bitmasks, kept in a bounded LRU"""
+
+    def __init__(self, max_users: int = 10000):
+        self.max_users = max_users
+        self.catalog = CatalogPartitions()
+        self._users: "OrderedDict[int, Ownership]" = OrderedDict()
+        self.db = None
+        self.stats = {'catalog_loads': 0, 'user_loads': 0, 'hits': 0}
+
+    async def initialize(self, db):
+        """Create the version counters and their triggers; the catalog loads on first use"""
+        self.db = db
+        for statement in VERSION_SCHEMA:
+            await db.execute(statement)
+        await db.commit()
+
+    async def _load_catalog(self, version: int):
+        cursor = await self.db.execute(
+            """SELECT id, name, anime, rarity, value, image_url FROM characters
+               ORDER BY rarity_rank DESC, value DESC, name, id"""
+        )
+        self.catalog = CatalogPartitions(version, await cursor.fetchall())
+        # Bit positions moved: every player's mask is rebuilt on next use
+        self._users.clear()
+        self.stats['catalog_loads'] += 1
+        logger.info(f"Ownership index: catalog v{version} partitioned "
+                    f"({len(self.catalog.entries)} characters, {len(self.catalog.by_anime)} animes)")
+
+    async def current_catalog(self) -> CatalogPartitions:
+        """Partitions and totals of the current catalog version"""
+        cursor = await self.db.execute("SELECT version FROM catalog_version WHERE id = 1")
+        catalog_version = (await cursor.fetchone())[0]
+        if catalog_version != self.catalog.version:
+            await self._load_catalog(catalog_version)
+        return self.catalog
+
+    async def ownership(self, user_id: int) -> Ownership:
+        """The player's owned set, reloaded only if the catalog or their inventory changed"""
+        cursor = await self.db.execute(VERSIONS_QUERY, (user_id,))
+        catalog_version, inventory_version = await cursor.fetchone()
+        if catalog_version != self.catalog.version:
+            await self._load_catalog(catalog_version)
+
+        owned = self._users.get(user_id)
+        if owned is not None and owned.inventory_version == inventory_version:
+            self._users.move_to_end(user_id)
+            self.stats['hits'] += 1
+            return owned
+
+        cursor = await self.db.execute(
+            "SELECT character_id, count FROM inventory WHERE user_id = ?", (user_id,)
+        )
+        counts = {row[0]: row[1] for row in await cursor.fetchall()}
+        owned = Ownership(inventory_version, self.catalog.mask_of(counts), counts)
+        self._users[user_id] = owned
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+        self.stats['user_loads'] += 1
+        return owned
+
+    async def page(self, user_id: int, page: int, per_page: int,
+                   anime: Optional[str] = None, rarity: Optional[str] = None,
+                   ranked_ids: Optional[Sequence[int]] = None) -> Dict[str, Any]:
+        """One page of the index with ownership; ranked_ids (search results) replace index order"""
+        owned = await self.ownership(user_id)
+        catalog = self.catalog
+        mask = catalog.mask(anime, rarity)
+
+        if ranked_ids is None:
+            total = mask.bit_count()
+            start = (page - 1) * per_page
+            # Only the page's slice of set bits is turned into characters
+            positions = bit_positions(mask, start, per_page)
+        else:
+            mask &= catalog.mask_of(ranked_ids)
+            matching = [catalog.position[character_id] for character_id in ranked_ids
+                        if character_id in catalog.position and mask >> catalog.position[character_id] & 1]
+            total = len(matching)
+            start = (page - 1) * per_page
+            positions = matching[start:start + per_page]
+
+        characters = []
+        for position in positions:
+            entry = catalog.entries[position]
+            characters.append({
+                'id': entry.id,
+                'name': entry.name,
+                'anime': entry.anime,
+                'rarity': entry.rarity,
+                'value': entry.value,
+                'image_url': entry.image_url,
+                'owned': bool(owned.mask >> position & 1),
+                'count': owned.counts.get(entry.id, 0)
+            })
+        return {
+            'characters': characters,
+            'total': total,
+            'owned': (mask & owned.mask).bit_count()
+        }
+
+    async def collection_stats(self, user_id: int) -> Dict[str, Dict[str, Any]]:
+        """Per-anime completion of a player, most owned first: catalog totals combined with the owned mask"""
+        owned = await self.ownership(user_id)
+        if owned.collection is not None:
+            return owned.collection
+        catalog = self.catalog
+        owned_by_anime: Dict[str, List[int]] = {}
+        for position in bit_positions(owned.mask):
+            entry = catalog.entries[position]
+            counted = owned_by_anime.setdefault(entry.anime, [0, 0])
+            counted[0] += 1
+            counted[1] += entry.value or 0
+
+        stats = {}
+        for anime, totals in catalog.anime_totals.items():
+            owned_characters, owned_value = owned_by_anime.get(anime, (0, 0))
+            stats[anime] = {
+                'total_characters': totals.count,
+                'owned_characters': owned_characters,
+                'completion_percentage': owned_characters / totals.count * 100 if totals.count > 0 else 0,
+                'total_value': totals.value,
+                'owned_value': owned_value,
+                'value_percentage': owned_value / totals.value * 100 if totals.value > 0 else 0
+            }
+        # Same order as before: most owned first, then by name (unnamed series first)
+        ordered = sorted(stats, key=lambda anime: (-stats[anime]['owned_characters'], anime is not None, anime or ''))
+        owned.collection = {anime: stats[anime] for anime in ordered}
+        return owned.collection
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            **self.stats,
+            'catalog_version': self.catalog.version,
+            'characters': len(self.catalog.entries),
+            'tracked_users': len(self._users)
+        }
+
+
+# Global ownership index instance
+ownership_index = OwnershipIndex()
@@ -19,55 +19,26 @@ class PerformanceOptimizer:
         self._query_cache = {}
         self._batch_operations = []
         
-    async def optimize_inventory_query(self, user_id: int, page: int = 1, limit: int = 10) -> List[Dict]:
+    async def optimize_inventory_query(self, user_id: int, page: int = 1, limit: int = 10,
+                                       after: Optional[tuple] = None) -> List[Dict]:
         """Optimized inventory query with smart caching"""
-        cache_key = f"opt_inventory_{user_id}_{page}_{limit}"
+        cache_key = f"opt_inventory_{user_id}_{page}_{limit}_{after}"
         cached_data = bot_cache.get(cache_key)
         
         if cached_data is not None:
             return cached_data
             
-        offset = (page - 1) * limit
-        
-        # Optimized query with pre-joined data
-        cursor = await self.db_manager.db.execute("""
-            SELECT 
-                i.id, i.character_id, i.count, i.is_equipped, i.equipped_slot,
-                c.name, c.anime, c.rarity, c.value, c.image_url
-            FROM inventory i
-            INNER JOIN characters c ON i.character_id = c.id
-            WHERE i.user_id = ?
-            ORDER BY 
-                CASE c.rarity 
-                    WHEN 'Secret' THEN 7
-                    WHEN 'Fusion' THEN 6
-                    WHEN 'Titan' THEN 5
-                    WHEN 'Mythic' THEN 4
-                    WHEN 'Legendary' THEN 3
-                    WHEN 'Epic' THEN 2
-                    WHEN 'Rare' THEN 1
-                    ELSE 0
-                END DESC,
-                c.value DESC, c.name ASC
-            LIMIT ? OFFSET ?
-        """, (user_id, limit, offset))
-        
-        items = await cursor.fetchall()
-        
-        inventory = []
-        for item in items:
-            inventory.append({
-                'id': item[0],
-                'character_id': item[1],
-                'count': item[2],
-                'is_equipped': item[3],
-                'equipped_slot': item[4],
-                'name': item[5],
-                'anime': item[6],
-                'rarity': item[7],
-                'value': item[8],
-                'image_url': item[9]
-            })
+        inventory = await self.db_manager.get_player_inventory(user_id, page, limit, after=after)
+        if inventory:
+            # Equipment lives in its own table, keyed by inventory row
+            ids = [item['inventory_id'] for item in inventory]
+            cursor = await self.db_manager.db.execute(
+                f"SELECT inventory_id, slot_number FROM equipment WHERE inventory_id IN ({','.join('?' * len(ids))})",
+                ids)
+            slots = dict(await cursor.fetchall())
+            for item in inventory:
+                item['is_equipped'] = item['inventory_id'] in slots
+                item['equipped_slot'] = slots.get(item['inventory_id'])
         
         # Cache for 60 seconds to balance freshness and performance
         bot_cache.set(cache_key, inventory, 60)
@@ -232,7 +203,7 @@ class PerformanceOptimizer:
                 SELECT id, name, anime, rarity, value, image_url
                 FROM characters
                 WHERE rarity IN ('Mythic', 'Legendary', 'Epic', 'Titan', 'Fusion', 'Secret')
-                ORDER BY rarity DESC, value DESC
+                ORDER BY rarity_rank DESC, value DESC
                 LIMIT 50
             """)
             
@@ -0,0 +1,117 @@
+"""
+Profile read model for Shadow Roll Bot
+inventory_summary keeps per-rarity collection counts up to date through triggers,
+so a profile is one indexed lookup whatever the size of the collection
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds a profile snapshot stays cached; the player's own writes drop it sooner
+PROFILE_TTL = 15
+
+# Rarity of an inventory row; characters deleted from the catalog count under ''
+_ROW_RARITY = "COALESCE((SELECT rarity FROM characters WHERE id = {row}.character_id), '')"
+
+_ADD_ROW = f"""
+        INSERT INTO inventory_summary (user_id, rarity, unique_characters, total_characters)
+        SELECT new.user_id, {_ROW_RARITY.format(row='new')}, 1, COALESCE(new.count, 0) WHERE true
+        ON CONFLICT(user_id, rarity) DO UPDATE SET
+            unique_characters = unique_characters + 1,
+            total_characters = total_characters + excluded.total_characters;"""
+
+_REMOVE_ROW = f"""
+        UPDATE inventory_summary SET
+            unique_characters = unique_characters - 1,
+            total_characters = total_characters - COALESCE(old.count, 0)
+        WHERE user_id = old.user_id AND rarity = {_ROW_RARITY.format(row='old')};"""
+
+# Move every copy of a character from old.rarity to {rarity}
+_MOVE_CHARACTER = """
+        UPDATE inventory_summary SET
+            unique_characters = unique_characters - (
+                SELECT COUNT(*) FROM inventory i
+                WHERE i.user_id = inventory_summary.user_id AND i.character_id = old.id),
+            total_characters = total_characters - (
+                SELECT COALESCE(SUM(i.count), 0) FROM inventory i
+                WHERE i.user_id = inventory_summary.user_id AND i.character_id = old.id)
+        WHERE rarity = old.rarity AND user_id IN (SELECT user_id FROM inventory WHERE character_id = old.id);
+        INSERT INTO inventory_summary (user_id, rarity, unique_characters, total_characters)
+        SELECT user_id, {rarity}, COUNT(*), COALESCE(SUM(count), 0)
+        FROM inventory WHERE character_id = old.id GROUP BY user_id
+        ON CONFLICT(user_id, rarity) DO UPDATE SET
+            unique_characters = unique_characters + excluded.unique_characters,
+            total_characters = total_characters + excluded.total_characters;"""
+
+SUMMARY_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS inventory_summary (
+        user_id INTEGER NOT NULL,
+        rarity TEXT NOT NULL,
+        unique_characters INTEGER NOT NULL DEFAULT 0,
+        total_characters INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, rarity)
+    ) WITHOUT ROWID""",
+    "DROP TRIGGER IF EXISTS inventory_summary_ai",
+    "DROP TRIGGER IF EXISTS inventory_summary_ad",
+    "DROP TRIGGER IF EXISTS inventory_summary_au",
+    "DROP TRIGGER IF EXISTS inventory_summary_rarity_au",
+    "DROP TRIGGER IF EXISTS inventory_summary_character_ad",
+    f"CREATE TRIGGER inventory_summary_ai AFTER INSERT ON inventory BEGIN {_ADD_ROW} END",
+    f"CREATE TRIGGER inventory_summary_ad AFTER DELETE ON inventory BEGIN {_REMOVE_ROW} END",
+    f"""CREATE TRIGGER inventory_summary_au AFTER UPDATE OF user_id, character_id, count ON inventory
+        BEGIN {_REMOVE_ROW} {_ADD_ROW} END""",
+    f"""CREATE TRIGGER inventory_summary_rarity_au AFTER UPDATE OF rarity ON characters
+        WHEN old.rarity IS NOT new.rarity BEGIN {_MOVE_CHARACTER.format(rarity='new.rarity')} END""",
+    f"""CREATE TRIGGER inventory_summary_character_ad AFTER DELETE ON characters
+        BEGIN {_MOVE_CHARACTER.format(rarity="''")} END""",
+]
+
+# Rebuilt on every start: writes made while the triggers did not exist yet are folded in
+SUMMARY_REBUILD = [
+    "DELETE FROM inventory_summary",
+    """INSERT INTO inventory_summary (user_id, rarity, unique_characters, total_characters)
+        SELECT i.user_id, COALESCE(c.rarity, ''), COUNT(*), COALESCE(SUM(i.count), 0)
+        FROM inventory i LEFT JOIN characters c ON c.id = i.character_id
+        GROUP BY i.user_id, COALESCE(c.rarity, '')""",
+]
+
+# One row: player, selected title, collection counts and equipped characters
+PROFILE_SNAPSHOT_QUERY = """
+    WITH player AS (
+        SELECT p.user_id, p.username, p.coins, p.total_rerolls,
+               t.id AS title_id, t.name, t.display_name, t.icon,
+               t.bonus_type, t.bonus_value, t.bonus_description
+        FROM players p
+        LEFT JOIN titles t ON t.id = p.selected_title_id
+        WHERE p.user_id = :user_id
+    ),
+    collection AS (
+        SELECT COALESCE(SUM(unique_characters), 0) AS unique_characters,
+               COALESCE(SUM(total_characters), 0) AS total_characters,
+               json_group_object(rarity, total_characters) AS rarity_counts
+        FROM inventory_summary
+        WHERE user_id = :user_id AND unique_characters > 0
+    ),
+    equipped AS (
+        SELECT json_group_array(json_object(
+                   'equipment_id', e.id, 'slot_number', e.slot_number, 'inventory_id', i.id,
+                   'name', c.name, 'anime', c.anime, 'rarity', c.rarity, 'value', c.value)) AS characters
+        FROM equipment e
+        JOIN inventory i ON e.inventory_id = i.id
+        JOIN characters c ON i.character_id = c.id
+        WHERE e.user_id = :user_id
+    )
+    SELECT player.*, collection.unique_characters, collection.total_characters,
+           collection.rarity_counts, equipped.characters
+    FROM player, collection, equipped
+"""
+
+
+async def initialize_inventory_summary(db):
+    """Create inventory_summary and its triggers, then rebuild it from inventory"""
+    for statement in SUMMARY_SCHEMA + SUMMARY_REBUILD:
+        await db.execute(statement)
+    await db.commit()
+    cursor = await db.execute("SELECT COUNT(DISTINCT user_id) FROM inventory_summary")
+    logger.info(f"Inventory summary rebuilt for {(await cursor.fetchone())[0]} players")
@@ -0,0 +1,385 @@
+"""
+Query instrumentation for Shadow Roll Bot
+Every statement on the shared connection is timed per fingerprint, slow ones are logged with their caller
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.config import BotConfig
+from core.tracing import LatencyHistogram, tracer
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_SPACES = re.compile(r"\s+")
+
+# Frames in these files are skipped when looking for the code that ran a statement
+_INTERNAL_FILES = (os.path.abspath(__file__), os.path.join('aiosqlite', ''), os.path.join('asyncio', ''))
+
+# Upper bounds (ms) of the per-fingerprint execution time histogram
+QUERY_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000, float('inf'))
+
+# Statements that only make sense to EXPLAIN
+_EXPLAINABLE = ('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT', 'REPLACE')
+
+
+def fingerprint(sql: str) -> str:
+    """Statement shape: literals become ?, IN lists and multi-row VALUES collapse, whitespace is normalized"""
+    shape = _STRING.sub('?', sql)
+    shape = _NUMBER.sub('?', shape)
+    shape = _IN_LIST.sub('IN (?...)', shape)
+    shape = _VALUES_LIST.sub(')', shape)
+    return _SPACES.sub(' ', shape).strip()
+
+
+def _caller() -> str:
+    """module:line of the first frame outside the instrumentation, aiosqlite and asyncio"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not any(part in filename for part in _INTERNAL_FILES):
+            module = frame.f_globals.get('__name__', filename)
+            return f"{module}:{frame.f_lineno}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+class FingerprintStats:
+    """Counters of one statement fingerprint"""
+
+    __slots__ = ('fingerprint', 'calls', 'total_ms', 'max_ms', 'rows', 'errors', 'slow', 'last_caller', 'plan',
+                 'histogram')
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.errors = 0
+        self.slow = 0
+        self.last_caller: Optional[str] = None
+        self.plan: Optional[List[str]] = None
+        # Execution time only: fetches are not observed, they are added to total_ms
+        self.histogram = LatencyHistogram(QUERY_BOUNDS_MS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'fingerprint': self.fingerprint,
+            'calls': self.calls,
+            'total_ms': round(self.total_ms, 3),
+            'avg_ms': round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'rows': self.rows,
+            'errors': self.errors,
+            'slow': self.slow,
+            'last_slow_caller': self.last_caller,
+            'plan': self.plan,
+        }
+
+
+class QueryStats:
+    """Per-fingerprint timings of the statements run through InstrumentedConnection"""
+
+    SORT_KEYS = ('total_ms', 'avg_ms', 'max_ms', 'calls', 'rows', 'slow')
+
+    def __init__(self, slow_query_ms: float = BotConfig.SLOW_QUERY_MS,
+                 explain_slow: bool = BotConfig.SLOW_QUERY_EXPLAIN):
+        self.slow_query_ms = slow_query_ms
+        self.explain_slow = explain_slow
+        self.enabled = True
+        self.started_at = datetime.now()
+        self._fingerprints: Dict[str, FingerprintStats] = {}
+        # Raw SQL text -> stats entry, so repeated statements skip the regexes
+        self._by_sql: 'OrderedDict[str, FingerprintStats]' = OrderedDict()
+        self._by_sql_limit = 4096
+
+    def entry(self, sql: str) -> FingerprintStats:
+        stats = self._by_sql.get(sql)
+        if stats is not None:
+            self._by_sql.move_to_end(sql)
+            return stats
+        shape = fingerprint(sql)
+        stats = self._fingerprints.get(shape)
+        if stats is None:
+            stats = self._fingerprints[shape] = FingerprintStats(shape)
+        self._by_sql[sql] = stats
+        if len(self._by_sql) > self._by_sql_limit:
+            self._by_sql.popitem(last=False)
+        return stats
+
+    def record(self, stats: FingerprintStats, elapsed_ms: float, failed: bool = False):
+        """Add one execution"""
+        stats.calls += 1
+        stats.total_ms += elapsed_ms
+        stats.histogram.observe(elapsed_ms)
+        if elapsed_ms > stats.max_ms:
+            stats.max_ms = elapsed_ms
+        if failed:
+            stats.errors += 1
+
+    def add_fetch(self, stats: FingerprintStats, elapsed_ms: float, rows: int, statement_ms: float):
+        """Time and rows of a fetch, counted against the statement that opened the cursor
+
+        statement_ms is the execution plus every fetch so far on that cursor
+        """
+        stats.total_ms += elapsed_ms
+        stats.rows += rows
+        if statement_ms > stats.max_ms:
+            stats.max_ms = statement_ms
+
+    def report_slow(self, stats: FingerprintStats, elapsed_ms: float):
+        """Log a statement that crossed the threshold, with the code that ran it"""
+        stats.slow += 1
+        stats.last_caller = _caller()
+        logger.warning(f"Slow query ({elapsed_ms:.1f} ms) from {stats.last_caller}: {stats.fingerprint[:500]}")
+
+    def needs_plan(self, stats: FingerprintStats, sql: str) -> bool:
+        return (self.explain_slow and stats.plan is None
+                and sql.lstrip()[:7].upper().startswith(_EXPLAINABLE))
+
+    def entries(self) -> List[FingerprintStats]:
+        return list(self._fingerprints.values())
+
+    def top(self, limit: int = 10, sort: str = 'total_ms') -> List[Dict[str, Any]]:
+        rows = [stats.to_dict() for stats in self._fingerprints.values()]
+        rows.sort(key=lambda row: row[sort], reverse=True)
+        return rows[:limit]
+
+    def reset(self):
+        self._fingerprints.clear()
+        self._by_sql.clear()
+        self.started_at = datetime.now()
+
+    def get_stats(self, limit: int = 5) -> Dict[str, Any]:
+        entries = self._fingerprints.values()
+        return {
+            'enabled': self.enabled,
+            'since': self.started_at.isoformat(),
+            'fingerprints': len(self._fingerprints),
+            'statements': sum(stats.calls for stats in entries),
+            'total_ms': round(sum(stats.total_ms for stats in entries), 3),
+            'slow': sum(stats.slow for stats in entries),
+            'slow_query_ms': self.slow_query_ms,
+            'top': self.top(limit),
+        }
+
+    def dump(self, path: Optional[str] = None) -> str:
+        """Write every fingerprint to a JSON file and return its path"""
+        if path is None:
+            os.makedirs('logs', exist_ok=True)
+            path = os.path.join('logs', f"query_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({**self.get_stats(0), 'queries': self.top(len(self._fingerprints))},
+                      f, indent=2, ensure_ascii=False)
+        return path
+
+
+# Global query stats instance
+query_stats = QueryStats()
+
+
+class InstrumentedCursor:
+    """Cursor proxy that counts fetched rows and fetch time against the statement
+
+    A statement is slow on its execution plus fetches, so the check runs again after each fetch
+    """
+
+    def __init__(self, cursor, stats: FingerprintStats, connection: 'InstrumentedConnection',
+                 sql: str, parameters, elapsed_ms: float, span=None):
+        self._cursor = cursor
+        self._stats = stats
+        self._span = span
+        self._connection = connection
+        self._sql = sql
+        self._parameters = parameters
+        self._elapsed_ms = elapsed_ms
+        self._reported = False
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    async def _check_slow(self):
+        if self._reported or self._elapsed_ms < query_stats.slow_query_ms:
+            return
+        self._reported = True
+        query_stats.report_slow(self._stats, self._elapsed_ms)
+        if query_stats.needs_plan(self._stats, self._sql):
+            await self._connection.explain(self._stats, self._sql, self._parameters)
+
+    async def _fetched(self, start: float, rows: int):
+        end = time.perf_counter()
+        elapsed_ms = (end - start) * 1000
+        if self._span is not None:
+            # The statement's trace span covers its fetches too
+            self._span.end = end
+        self._elapsed_ms += elapsed_ms
+        query_stats.add_fetch(self._stats, elapsed_ms, rows, self._elapsed_ms)
+        await self._check_slow()
+
+    async def fetchone(self):
+        start = time.perf_counter()
+        row = await self._cursor.fetchone()
+        await self._fetched(start, row is not None)
+        return row
+
+    async def fetchall(self):
+        start = time.perf_counter()
+        rows = await self._cursor.fetchall()
+        await self._fetched(start, len(rows))
+        return rows
+
+    async def fetchmany(self, size: Optional[int] = None):
+        start = time.perf_counter()
+        rows = await (self._cursor.fetchmany() if size is None else self._cursor.fetchmany(size))
+        await self._fetched(start, len(rows))
+        return rows
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        while True:
+            rows = await self.fetchmany(self._cursor.arraysize)
+            if not rows:
+                return
+            for row in rows:
+                yield row
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._cursor.close()
+
+
+class _CursorResult:
+    """What execute returns: awaitable, or usable as `async with` like aiosqlite's own result"""
+
+    __slots__ = ('_coro', '_cursor')
+
+    def __init__(self, coro):
+        self._coro = coro
+        self._cursor = None
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self):
+        self._cursor = await self._coro
+        return self._cursor
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._cursor.close()
+
+
+class InstrumentedConnection:
+    """aiosqlite connection proxy: statements and commits are timed, everything else passes through"""
+
+    def __init__(self, connection):
+        self._connection = connection
+        # Statements submitted and not finished yet: all share one aiosqlite worker thread
+        self.in_flight = 0
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    @property
+    def connection(self):
+        """The wrapped aiosqlite connection"""
+        return self._connection
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests waiting for the aiosqlite worker thread (statements, fetches, commits)"""
+        queue = getattr(self._connection, '_tx', None)
+        return queue.qsize() if queue is not None else 0
+
+    def execute(self, sql: str, parameters: Iterable[Any] = None) -> _CursorResult:
+        return _CursorResult(self._execute(sql, parameters))
+
+    async def _execute(self, sql: str, parameters):
+        if not query_stats.enabled:
+            return await self._connection.execute(sql, parameters)
+        stats = query_stats.entry(sql)
+        start = time.perf_counter()
+        self.in_flight += 1
+        try:
+            cursor = await self._connection.execute(sql, parameters)
+        except Exception as e:
+            query_stats.record(stats, (time.perf_counter() - start) * 1000, failed=True)
+            tracer.record('db', stats.fingerprint, start, error=type(e).__name__)
+            raise
+        finally:
+            self.in_flight -= 1
+        end = time.perf_counter()
+        elapsed_ms = (end - start) * 1000
+        query_stats.record(stats, elapsed_ms)
+        span = tracer.record('db', stats.fingerprint, start, end)
+        cursor = InstrumentedCursor(cursor, stats, self, sql, parameters, elapsed_ms, span)
+        await cursor._check_slow()
+        return cursor
+
+    async def execute_fetchall(self, sql: str, parameters: Iterable[Any] = None):
+        cursor = await self._execute(sql, parameters)
+        try:
+            return await cursor.fetchall()
+        finally:
+            await cursor.close()
+
+    async def _timed(self, stats: FingerprintStats, call):
+        start = time.perf_counter()
+        self.in_flight += 1
+        try:
+            result = await call
+        except Exception as e:
+            query_stats.record(stats, (time.perf_counter() - start) * 1000, failed=True)
+            tracer.record('db', stats.fingerprint, start, error=type(e).__name__)
+            raise
+        finally:
+            self.in_flight -= 1
+        end = time.perf_counter()
+        elapsed_ms = (end - start) * 1000
+        query_stats.record(stats, elapsed_ms)
+        tracer.record('db', stats.fingerprint, start, end)
+        if elapsed_ms >= query_stats.slow_query_ms:
+            query_stats.report_slow(stats, elapsed_ms)
+        return result
+
+    async def executemany(self, sql: str, parameters: Iterable[Iterable[Any]]):
+        if not query_stats.enabled:
+            return await self._connection.executemany(sql, parameters)
+        return await self._timed(query_stats.entry(sql), self._connection.executemany(sql, parameters))
+
+    async def executescript(self, sql_script: str):
+        if not query_stats.enabled:
+            return await self._connection.executescript(sql_script)
+        # A script is one entry: its statements are not split
+        return await self._timed(query_stats.entry(sql_script), self._connection.executescript(sql_script))
+
+    async def commit(self):
+        if not query_stats.enabled:
+            return await self._connection.commit()
+        return await self._timed(query_stats.entry('COMMIT'), self._connection.commit())
+
+    async def explain(self, stats: FingerprintStats, sql: str, parameters):
+        """Keep the EXPLAIN QUERY PLAN of a slow fingerprint (once per fingerprint)"""
+        stats.plan = []
+        try:
+            cursor = await self._connection.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)
+            stats.plan = [row[-1] for row in await cursor.fetchall()]
+            await cursor.close()
+            logger.warning(f"Query plan for slow query: {' | '.join(stats.plan)}")
+        except Exception as e:
+            logger.debug(f"EXPLAIN QUERY PLAN failed for {stats.fingerprint[:200]}: {e}")
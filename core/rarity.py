@@ -0,0 +1,157 @@
+"""
+Rarity tiers for Shadow Roll Bot
+The rarity_tiers table is the single source of rank, weight, color, emoji and cooldown
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from core.config import BotConfig
+
+logger = logging.getLogger(__name__)
+
+# Rarities with the long roll cooldown when no table row says otherwise
+RARE_COOLDOWN_RARITIES = ('Mythic', 'Evolve', 'Titan', 'Fusion', 'Secret')
+
+TIER_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS rarity_tiers (
+        name TEXT PRIMARY KEY,
+        rank INTEGER NOT NULL,
+        weight REAL NOT NULL DEFAULT 0,
+        color INTEGER NOT NULL DEFAULT 0,
+        emoji TEXT NOT NULL DEFAULT '◆',
+        cooldown REAL NOT NULL DEFAULT 0
+    )""",
+    # characters.rarity_rank is a denormalized copy of rarity_tiers.rank
+    "DROP TRIGGER IF EXISTS characters_rarity_rank_ai",
+    "DROP TRIGGER IF EXISTS characters_rarity_rank_au",
+    """CREATE TRIGGER characters_rarity_rank_ai AFTER INSERT ON characters BEGIN
+        UPDATE characters SET rarity_rank = COALESCE(
+            (SELECT rank FROM rarity_tiers WHERE name = new.rarity), 0) WHERE id = new.id;
+    END""",
+    """CREATE TRIGGER characters_rarity_rank_au AFTER UPDATE OF rarity ON characters BEGIN
+        UPDATE characters SET rarity_rank = COALESCE(
+            (SELECT rank FROM rarity_tiers WHERE name = new.rarity), 0) WHERE id = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS rarity_tiers_rank_au AFTER UPDATE OF rank ON rarity_tiers BEGIN
+        UPDATE characters SET rarity_rank = new.rank WHERE rarity = new.name;
+    END""",
+]
+
+
+@dataclass
+class RarityTier:
+    """One row of rarity_tiers"""
+    name: str
+    rank: int
+    weight: float
+    color: int
+    emoji: str
+    cooldown: float
+
+
+def default_tiers() -> List[RarityTier]:
+    """Tiers seeded from BotConfig on first start"""
+    tiers = []
+    for name, rank in BotConfig.RARITY_RANKS.items():
+        cooldown = BotConfig.REROLL_COOLDOWN_RARE if name in RARE_COOLDOWN_RARITIES else BotConfig.REROLL_COOLDOWN
+        tiers.append(RarityTier(
+            name, rank,
+            BotConfig.RARITY_WEIGHTS.get(name, 0),
+            BotConfig.RARITY_COLORS.get(name, 0x808080),
+            BotConfig.RARITY_EMOJIS.get(name, '◆'),
+            cooldown
+        ))
+    return tiers
+
+
+class RarityTiers:
+    """In-memory copy of rarity_tiers; edits are written through and applied to BotConfig"""
+
+    def __init__(self):
+        self.tiers: Dict[str, RarityTier] = {tier.name: tier for tier in default_tiers()}
+        self.db = None
+
+    async def initialize(self, db):
+        """Create and seed the table, install rank triggers and backfill characters.rarity_rank"""
+        self.db = db
+        for statement in TIER_SCHEMA:
+            await db.execute(statement)
+        # Existing rows win: weights edited live survive restarts
+        await db.executemany(
+            "INSERT OR IGNORE INTO rarity_tiers (name, rank, weight, color, emoji, cooldown) VALUES (?, ?, ?, ?, ?, ?)",
+            [(t.name, t.rank, t.weight, t.color, t.emoji, t.cooldown) for t in default_tiers()]
+        )
+        await db.execute("""
+            UPDATE characters SET rarity_rank = COALESCE(
+                (SELECT rank FROM rarity_tiers WHERE name = characters.rarity), 0)
+            WHERE rarity_rank != COALESCE(
+                (SELECT rank FROM rarity_tiers WHERE name = characters.rarity), 0)
+        """)
+        await db.commit()
+        await self.load()
+
+    async def load(self):
+        """Reload tiers from the table"""
+        cursor = await self.db.execute(
+            "SELECT name, rank, weight, color, emoji, cooldown FROM rarity_tiers ORDER BY rank"
+        )
+        rows = await cursor.fetchall()
+        if rows:
+            self.tiers = {row[0]: RarityTier(*row) for row in rows}
+        self._apply_to_config()
+        logger.info(f"Loaded {len(self.tiers)} rarity tiers")
+
+    def _apply_to_config(self):
+        # Update the BotConfig dicts in place so every module reading them sees live edits
+        for attribute, field in (('RARITY_RANKS', 'rank'), ('RARITY_WEIGHTS', 'weight'),
+                                 ('RARITY_COLORS', 'color'), ('RARITY_EMOJIS', 'emoji')):
+            mapping = getattr(BotConfig, attribute)
+            mapping.clear()
+            mapping.update({name: getattr(tier, field) for name, tier in self.ordered(ascending=True)})
+
+    def ordered(self, ascending: bool = False):
+        """(name, tier) pairs, rarest first unless ascending"""
+        return sorted(self.tiers.items(), key=lambda item: item[1].rank, reverse=not ascending)
+
+    def names(self) -> List[str]:
+        """Rarity names, rarest first"""
+        return [name for name, _ in self.ordered()]
+
+    def get(self, name: str) -> Optional[RarityTier]:
+        return self.tiers.get(name)
+
+    def rank(self, name: str) -> int:
+        tier = self.tiers.get(name)
+        return tier.rank if tier else 0
+
+    def cooldown(self, name: str) -> float:
+        tier = self.tiers.get(name)
+        return tier.cooldown if tier else BotConfig.REROLL_COOLDOWN
+
+    async def update(self, name: str, **fields) -> RarityTier:
+        """Edit one tier live (weight, rank, color, emoji, cooldown)"""
+        tier = self.tiers.get(name)
+        if tier is None:
+            raise KeyError(name)
+        allowed = {'rank', 'weight', 'color', 'emoji', 'cooldown'}
+        unknown = set(fields) - allowed
+        if unknown:
+            raise ValueError(f"Unknown rarity tier fields: {', '.join(sorted(unknown))}")
+
+        if self.db is not None and fields:
+            assignments = ', '.join(f"{field} = ?" for field in fields)
+            await self.db.execute(
+                f"UPDATE rarity_tiers SET {assignments} WHERE name = ?",
+                list(fields.values()) + [name]
+            )
+            await self.db.commit()
+        for field, value in fields.items():
+            setattr(tier, field, value)
+        self._apply_to_config()
+        return tier
+
+
+# Global rarity tiers instance
+rarity_tiers = RarityTiers()
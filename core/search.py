@@ -0,0 +1,254 @@
+"""
+Character search for Shadow Roll Bot
+FTS5 trigram index over character names and animes, kept in sync by triggers
+"""
+
+import difflib
+import logging
+import unicodedata
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Match tiers, best first
+MATCH_EXACT = 'exact'
+MATCH_PREFIX = 'prefix'
+MATCH_NAME = 'name'
+MATCH_ANIME = 'anime'
+MATCH_FUZZY = 'fuzzy'
+_TIER_ORDER = {MATCH_EXACT: 0, MATCH_PREFIX: 1, MATCH_NAME: 2, MATCH_ANIME: 3, MATCH_FUZZY: 4}
+# A close anime spelling ranks below an equally close character name
+ANIME_WEIGHT = 0.9
+
+FTS_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS characters_fts USING fts5(
+        name, anime,
+        content='characters', content_rowid='id',
+        tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS characters_fts_ai AFTER INSERT ON characters BEGIN
+        INSERT INTO characters_fts(rowid, name, anime) VALUES (new.id, new.name, new.anime);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS characters_fts_ad AFTER DELETE ON characters BEGIN
+        INSERT INTO characters_fts(characters_fts, rowid, name, anime)
+        VALUES ('delete', old.id, old.name, old.anime);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS characters_fts_au AFTER UPDATE OF name, anime ON characters BEGIN
+        INSERT INTO characters_fts(characters_fts, rowid, name, anime)
+        VALUES ('delete', old.id, old.name, old.anime);
+        INSERT INTO characters_fts(rowid, name, anime) VALUES (new.id, new.name, new.anime);
+    END""",
+]
+
+CHARACTER_COLUMNS = "c.id, c.name, c.anime, c.rarity, c.value, c.image_url"
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents for comparisons"""
+    normalized = unicodedata.normalize('NFKD', text or '')
+    return ''.join(ch for ch in normalized if not unicodedata.combining(ch)).casefold().strip()
+
+
+def _quote(term: str) -> str:
+    """Quote a string as an FTS5 phrase"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def trigrams(text: str) -> List[str]:
+    """Distinct trigrams of a folded string, in order"""
+    seen = []
+    for i in range(len(text) - 2):
+        gram = text[i:i + 3]
+        if gram not in seen:
+            seen.append(gram)
+    return seen
+
+
+class CharacterSearch:
+    """Ranked character search: exact, prefix, substring, then typo-tolerant matches"""
+
+    # Fuzzy candidates are pulled from the trigram index then scored in Python
+    FUZZY_CANDIDATES = 200
+    FUZZY_MIN_SCORE = 0.55
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.fts_available = False
+
+    @property
+    def db(self):
+        return self.db_manager.db
+
+    async def initialize(self):
+        """Create the FTS index and triggers, rebuilding the index if it is out of date"""
+        try:
+            cursor = await self.db.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'characters_fts'"
+            )
+            existed = await cursor.fetchone() is not None
+            for statement in FTS_SCHEMA:
+                await self.db.execute(statement)
+
+            if not existed or not await self._index_is_consistent():
+                await self.db.execute("INSERT INTO characters_fts(characters_fts) VALUES ('rebuild')")
+                logger.info("Character search index rebuilt")
+            await self.db.commit()
+            self.fts_available = True
+        except Exception as e:
+            # SQLite built without FTS5/trigram: fall back to LIKE scans
+            logger.warning(f"FTS5 character search unavailable, using LIKE fallback: {e}")
+            self.fts_available = False
+
+    async def _index_is_consistent(self) -> bool:
+        try:
+            await self.db.execute(
+                "INSERT INTO characters_fts(characters_fts, rank) VALUES ('integrity-check', 1)"
+            )
+            return True
+        except Exception:
+            return False
+
+    async def rebuild(self):
+        """Rebuild the index from the characters table"""
+        if self.fts_available:
+            await self.db.execute("INSERT INTO characters_fts(characters_fts) VALUES ('rebuild')")
+            await self.db.commit()
+
+    # ----- query -----
+
+    @staticmethod
+    def _filter_clause(filters: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        """SQL conditions on characters c for anime/rarity/value filters"""
+        if not filters:
+            return "", []
+        clauses, params = [], []
+        for column in ('anime', 'rarity'):
+            value = filters.get(column)
+            if not value:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                values = list(value)
+                clauses.append(f"c.{column} IN ({','.join('?' * len(values))})")
+                params.extend(values)
+            else:
+                clauses.append(f"c.{column} = ?")
+                params.append(value)
+        if filters.get('min_value') is not None:
+            clauses.append("c.value >= ?")
+            params.append(filters['min_value'])
+        if filters.get('max_value') is not None:
+            clauses.append("c.value <= ?")
+            params.append(filters['max_value'])
+        return "".join(f" AND {clause}" for clause in clauses), params
+
+    async def _fetch(self, sql: str, params: Sequence[Any]) -> List[Dict[str, Any]]:
+        cursor = await self.db.execute(sql, params)
+        rows = await cursor.fetchall()
+        return [
+            {'id': r[0], 'name': r[1], 'anime': r[2], 'rarity': r[3], 'value': r[4], 'image_url': r[5]}
+            for r in rows
+        ]
+
+    async def _substring_candidates(self, term: str, filter_sql: str,
+                                    filter_params: List[Any]) -> List[Dict[str, Any]]:
+        if self.fts_available and len(term) >= 3:
+            return await self._fetch(f"""
+                SELECT {CHARACTER_COLUMNS}
+                FROM characters_fts f JOIN characters c ON c.id = f.rowid
+                WHERE characters_fts MATCH ?{filter_sql}
+                ORDER BY f.rank
+            """, [_quote(term)] + filter_params)
+
+        # Trigrams need three characters; short queries only match prefixes
+        if len(term) < 3:
+            return await self._fetch(f"""
+                SELECT {CHARACTER_COLUMNS} FROM characters c
+                WHERE (c.name LIKE ? OR c.anime LIKE ?){filter_sql}
+                ORDER BY c.name
+            """, [f"{term}%", f"{term}%"] + filter_params)
+
+        return await self._fetch(f"""
+            SELECT {CHARACTER_COLUMNS} FROM characters c
+            WHERE (c.name LIKE ? OR c.anime LIKE ?){filter_sql}
+            ORDER BY c.name
+        """, [f"%{term}%", f"%{term}%"] + filter_params)
+
+    async def _fuzzy_candidates(self, term: str, folded: str, filter_sql: str,
+                                filter_params: List[Any]) -> List[Dict[str, Any]]:
+        # Accented and folded spellings both feed the candidate set
+        grams = trigrams(term) + [gram for gram in trigrams(folded) if gram not in trigrams(term)]
+        if not self.fts_available or not grams:
+            return []
+        match = ' OR '.join(_quote(gram) for gram in grams)
+        return await self._fetch(f"""
+            SELECT {CHARACTER_COLUMNS}
+            FROM characters_fts f JOIN characters c ON c.id = f.rowid
+            WHERE characters_fts MATCH ?{filter_sql}
+            ORDER BY f.rank
+            LIMIT ?
+        """, [match] + filter_params + [self.FUZZY_CANDIDATES])
+
+    @staticmethod
+    def _classify(folded: str, character: Dict[str, Any]) -> Tuple[Optional[str], float]:
+        """Match tier and similarity of one character against the folded query"""
+        name = fold(character['name'])
+        anime = fold(character['anime'])
+        if name == folded:
+            return MATCH_EXACT, 1.0
+        similarity = difflib.SequenceMatcher(None, folded, name).ratio()
+        if name.startswith(folded) or any(word.startswith(folded) for word in name.split()):
+            return MATCH_PREFIX, similarity
+        if folded in name:
+            return MATCH_NAME, similarity
+        if folded in anime:
+            return MATCH_ANIME, difflib.SequenceMatcher(None, folded, anime).ratio()
+
+        # Typo tolerance: best of whole-name and per-word similarity, anime weighs less
+        best = similarity
+        for word in name.split():
+            best = max(best, difflib.SequenceMatcher(None, folded, word).ratio())
+        best = max(best, ANIME_WEIGHT * difflib.SequenceMatcher(None, folded, anime).ratio())
+        if best >= CharacterSearch.FUZZY_MIN_SCORE:
+            return MATCH_FUZZY, best
+        return None, best
+
+    async def search(self, query: str, filters: Optional[Dict[str, Any]] = None,
+                     limit: int = 25, fuzzy: bool = True) -> List[Dict[str, Any]]:
+        """Ranked search over names and animes
+
+        filters: optional anime / rarity (value or list), min_value / max_value.
+        Each result carries 'match' (exact, prefix, name, anime, fuzzy) and 'score'."""
+        term = (query or '').strip().lower()
+        folded = fold(query)
+        if not folded or self.db is None:
+            return []
+
+        filter_sql, filter_params = self._filter_clause(filters)
+        try:
+            candidates = await self._substring_candidates(term, filter_sql, filter_params)
+            seen = {c['id'] for c in candidates}
+            exact_hit = any(fold(c['name']) == folded for c in candidates)
+            if fuzzy and not exact_hit and len(candidates) < limit:
+                for candidate in await self._fuzzy_candidates(term, folded, filter_sql, filter_params):
+                    if candidate['id'] not in seen:
+                        seen.add(candidate['id'])
+                        candidates.append(candidate)
+        except Exception as e:
+            logger.error(f"Character search failed for '{query}': {e}")
+            return []
+
+        ranked = []
+        for position, character in enumerate(candidates):
+            tier, score = self._classify(folded, character)
+            if tier is None:
+                continue
+            character['match'] = tier
+            character['score'] = round(score, 3)
+            ranked.append((_TIER_ORDER[tier], -score, position, character))
+        ranked.sort(key=lambda item: item[:3])
+        return [item[3] for item in ranked[:limit]]
+
+    async def search_ids(self, query: str, filters: Optional[Dict[str, Any]] = None,
+                         limit: int = 500) -> List[int]:
+        """Ids of matching characters, best first"""
+        return [c['id'] for c in await self.search(query, filters, limit)]
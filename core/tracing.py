@@ -0,0 +1,370 @@
+"""
+Interaction tracing for Shadow Roll Bot
+A span tree per button click or slash command, with child spans for DB statements, cache lookups and Discord API calls
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+import discord
+
+from core.config import BotConfig
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets, the last one catches everything above
+HISTOGRAM_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+
+_DIGITS = re.compile(r'\d+')
+
+
+class Span:
+    """One timed step; children are the steps it awaited"""
+
+    __slots__ = ('name', 'kind', 'start', 'end', 'attrs', 'children', 'dropped')
+
+    def __init__(self, name: str, kind: str, start: float, attrs: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.kind = kind
+        self.start = start
+        self.end: Optional[float] = None
+        self.attrs = attrs
+        self.children: List['Span'] = []
+        self.dropped = 0
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start) * 1000
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        data = {
+            'name': self.name,
+            'kind': self.kind,
+            'start_ms': round((self.start - origin) * 1000, 3),
+            'duration_ms': round(self.duration_ms, 3),
+        }
+        if self.attrs:
+            data['attrs'] = self.attrs
+        if self.children:
+            data['children'] = [child.to_dict(origin) for child in self.children]
+        if self.dropped:
+            data['dropped_children'] = self.dropped
+        return data
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar('shadow_roll_span', default=None)
+_current_trace: ContextVar[Optional[Span]] = ContextVar('shadow_roll_trace', default=None)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (of one view or command by default)"""
+
+    __slots__ = ('bounds', 'counts', 'count', 'total_ms', 'max_ms')
+
+    def __init__(self, bounds=HISTOGRAM_BOUNDS_MS):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float):
+        self.counts[bisect.bisect_left(self.bounds, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (the max for the overflow bucket)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'p50_ms': round(self.quantile(0.50), 3),
+            'p95_ms': round(self.quantile(0.95), 3),
+            'p99_ms': round(self.quantile(0.99), 3),
+            'max_ms': round(self.max_ms, 3),
+            'buckets': {('+Inf' if bound == float('inf') else str(bound)): count
+                        for bound, count in zip(self.bounds, self.counts)},
+        }
+
+
+class _SpanScope:
+    """Context manager opening a child span under the current one"""
+
+    __slots__ = ('_span', '_token')
+
+    def __init__(self, span: Span):
+        self._span = span
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        self._span.end = time.perf_counter()
+        if exc_type is not None:
+            self._span.attrs = {**(self._span.attrs or {}), 'error': exc_type.__name__}
+        _current_span.reset(self._token)
+
+
+class _NoSpan:
+    """Returned by Tracer.span outside a trace: nothing is recorded"""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _TraceScope(_SpanScope):
+    """Root span: finishing it feeds the histogram and maybe the sample file"""
+
+    __slots__ = ('_tracer', '_trace_token')
+
+    def __init__(self, tracer: 'Tracer', span: Span):
+        super().__init__(span)
+        self._tracer = tracer
+        self._trace_token = None
+
+    def __enter__(self) -> Span:
+        self._trace_token = _current_trace.set(self._span)
+        return super().__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        super().__exit__(exc_type, exc, tb)
+        _current_trace.reset(self._trace_token)
+        self._tracer.finish(self._span)
+
+
+class Tracer:
+    """Span trees for interactions, per-view latency histograms and tail sampling to JSONL"""
+
+    def __init__(self, path: str = BotConfig.TRACE_FILE, slow_ms: float = BotConfig.TRACE_SLOW_MS,
+                 sample_rate: float = BotConfig.TRACE_SAMPLE_RATE,
+                 max_per_minute: int = BotConfig.TRACE_MAX_PER_MINUTE,
+                 max_file_bytes: int = BotConfig.TRACE_FILE_MAX_BYTES,
+                 max_spans: int = 500, min_tail_samples: int = 50):
+        self.path = path
+        self.slow_ms = slow_ms
+        self.sample_rate = sample_rate
+        self.max_per_minute = max_per_minute
+        self.max_file_bytes = max_file_bytes
+        self.max_spans = max_spans
+        # A view needs this many traces before its own p95 decides what counts as tail
+        self.min_tail_samples = min_tail_samples
+        self.enabled = True
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.stats = {'traces': 0, 'sampled': 0, 'rate_limited': 0, 'write_errors': 0}
+        self._window_start = 0.0
+        self._window_count = 0
+        self._write_lock = threading.Lock()
+        self._installed = False
+
+    # ----- spans -----
+
+    @staticmethod
+    def current() -> Optional[Span]:
+        return _current_span.get()
+
+    @staticmethod
+    def current_trace() -> Optional[Span]:
+        """Root span of the interaction being handled (its name and user_id tag log records)"""
+        return _current_trace.get()
+
+    def trace(self, name: str, **attrs) -> Any:
+        """Root span of one interaction (nested calls become plain child spans)"""
+        if not self.enabled:
+            return _NO_SPAN
+        parent = _current_span.get()
+        if parent is not None:
+            return self.span('view', name, **attrs)
+        return _TraceScope(self, Span(name, 'interaction', time.perf_counter(), attrs or None))
+
+    def span(self, kind: str, name: str, **attrs) -> Any:
+        """Child span of the current one; does nothing outside a trace"""
+        parent = _current_span.get()
+        if parent is None:
+            return _NO_SPAN
+        span = Span(name, kind, time.perf_counter(), attrs or None)
+        self._attach(parent, span)
+        return _SpanScope(span)
+
+    def record(self, kind: str, name: str, start: float, end: Optional[float] = None,
+               **attrs) -> Optional[Span]:
+        """Add an already timed child span (hot paths that do not need a context manager)"""
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        span = Span(name, kind, start, attrs or None)
+        span.end = end if end is not None else time.perf_counter()
+        self._attach(parent, span)
+        return span
+
+    def _attach(self, parent: Span, span: Span):
+        if len(parent.children) < self.max_spans:
+            parent.children.append(span)
+        else:
+            parent.dropped += 1
+
+    # ----- roll-up and sampling -----
+
+    def finish(self, root: Span):
+        duration_ms = root.duration_ms
+        self.stats['traces'] += 1
+        histogram = self.histograms.get(root.name)
+        if histogram is None:
+            histogram = self.histograms[root.name] = LatencyHistogram()
+        # Tail threshold from the view's history before this trace
+        tail_ms = histogram.quantile(0.95) if histogram.count >= self.min_tail_samples else None
+        histogram.observe(duration_ms)
+
+        if duration_ms >= self.slow_ms:
+            reason = 'slow'
+        elif tail_ms is not None and duration_ms > tail_ms:
+            reason = 'tail'
+        elif random.random() < self.sample_rate:
+            reason = 'baseline'
+        else:
+            return
+        self._sample(root, duration_ms, reason)
+
+    def _sample(self, root: Span, duration_ms: float, reason: str):
+        now = time.monotonic()
+        if now - self._window_start >= 60:
+            self._window_start = now
+            self._window_count = 0
+        if self._window_count >= self.max_per_minute:
+            self.stats['rate_limited'] += 1
+            return
+        self._window_count += 1
+        self.stats['sampled'] += 1
+
+        record = {
+            'ts': time.time(),
+            'trace': root.name,
+            'reason': reason,
+            'duration_ms': round(duration_ms, 3),
+            'spans_by_kind': self._time_by_kind(root),
+            'root': root.to_dict(root.start),
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        try:
+            asyncio.get_running_loop().run_in_executor(None, self._write, line)
+        except RuntimeError:
+            self._write(line)
+
+    @staticmethod
+    def _time_by_kind(root: Span) -> Dict[str, float]:
+        """Total time of direct and nested children per kind (overlapping spans add up)"""
+        totals: Dict[str, float] = {}
+        stack = list(root.children)
+        while stack:
+            span = stack.pop()
+            totals[span.kind] = totals.get(span.kind, 0.0) + span.duration_ms
+            stack.extend(span.children)
+        return {kind: round(total, 3) for kind, total in totals.items()}
+
+    def _write(self, line: str):
+        with self._write_lock:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_file_bytes:
+                    os.replace(self.path, self.path + '.1')
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+            except OSError as e:
+                self.stats['write_errors'] += 1
+                logger.error(f"Error writing trace sample: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'views': {name: histogram.to_dict()
+                      for name, histogram in sorted(self.histograms.items(),
+                                                    key=lambda item: item[1].quantile(0.95), reverse=True)},
+        }
+
+    def reset(self):
+        self.histograms.clear()
+
+    # ----- hooks -----
+
+    def install(self):
+        """Wrap view dispatch, slash command dispatch and Discord HTTP requests (once per process)"""
+        if self._installed:
+            return
+        self._installed = True
+        tracer = self
+
+        view_dispatch = discord.ui.View._scheduled_task
+
+        async def traced_view_dispatch(view, item, interaction):
+            label = getattr(item, 'custom_id', None) or getattr(item, 'label', None) or type(item).__name__
+            with tracer.trace(type(view).__name__, item=str(label), user_id=interaction.user.id):
+                return await view_dispatch(view, item, interaction)
+
+        discord.ui.View._scheduled_task = traced_view_dispatch
+
+        command_dispatch = discord.app_commands.CommandTree._call
+
+        async def traced_command_dispatch(tree, interaction):
+            name = (interaction.data or {}).get('name', 'unknown')
+            with tracer.trace(f"/{name}", user_id=interaction.user.id):
+                return await command_dispatch(tree, interaction)
+
+        discord.app_commands.CommandTree._call = traced_command_dispatch
+
+        http_request = discord.http.HTTPClient.request
+
+        async def traced_http_request(client, route, **kwargs):
+            with tracer.span('discord', f"{route.method} {route.path}"):
+                return await http_request(client, route, **kwargs)
+
+        discord.http.HTTPClient.request = traced_http_request
+
+        # Interaction responses and followups go through the webhook adapter, not HTTPClient
+        webhook_request = discord.webhook.async_.AsyncWebhookAdapter.request
+
+        async def traced_webhook_request(adapter, route, *args, **kwargs):
+            with tracer.span('discord', f"{route.method} {route.path}"):
+                return await webhook_request(adapter, route, *args, **kwargs)
+
+        discord.webhook.async_.AsyncWebhookAdapter.request = traced_webhook_request
+        logger.info("Interaction tracing installed")
+
+
+def cache_span_name(key: str) -> str:
+    """Cache key without its ids, so spans of one lookup kind group together"""
+    return _DIGITS.sub('#', key)
+
+
+# Global tracer instance
+tracer = Tracer()
@@ -0,0 +1,160 @@
+"""
+Per-user gate for economy actions in Shadow Roll Bot
+Token bucket + asyncio.Lock per user, kept in a bounded LRU: sheds spam before any database work
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Union
+
+import discord
+
+from core.config import BotConfig
+from core.outbound import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+class _UserState:
+    __slots__ = ('bucket', 'lock', 'waiters')
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.bucket = TokenBucket(capacity, refill_per_second)
+        self.lock = asyncio.Lock()
+        self.waiters = 0
+
+    @property
+    def idle(self) -> bool:
+        return not self.lock.locked() and self.waiters == 0
+
+
+class UserGate:
+    """Serializes each user's economy mutations and sheds excess clicks"""
+
+    def __init__(self, capacity: float = 5, refill_per_second: float = 1.0,
+                 max_waiters: int = 1, wait_timeout: float = 10.0, max_users: int = 10000):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        # Clicks allowed to queue behind a running action; more are shed
+        self.max_waiters = max_waiters
+        self.wait_timeout = wait_timeout
+        self.max_users = max_users
+        self._users: "OrderedDict[int, _UserState]" = OrderedDict()
+        self.stats = {'admitted': 0, 'waited': 0, 'shed_rate': 0, 'shed_busy': 0,
+                      'shed_timeout': 0, 'evicted': 0}
+        self.by_action: Dict[str, Dict[str, int]] = {}
+
+    def _state(self, user_id: int) -> _UserState:
+        state = self._users.get(user_id)
+        if state is None:
+            state = _UserState(self.capacity, self.refill_per_second)
+            self._users[user_id] = state
+            self._evict()
+        else:
+            self._users.move_to_end(user_id)
+        return state
+
+    def _evict(self):
+        # Least recently used first; users with a running or queued action are kept
+        for user_id in list(self._users.keys()):
+            if len(self._users) <= self.max_users:
+                return
+            if self._users[user_id].idle:
+                del self._users[user_id]
+                self.stats['evicted'] += 1
+
+    def _count(self, action: str, outcome: str):
+        self.stats[outcome] += 1
+        counters = self.by_action.setdefault(action, {})
+        counters[outcome] = counters.get(outcome, 0) + 1
+
+    @asynccontextmanager
+    async def guard(self, user_ids: Union[int, Iterable[int]], action: str) -> AsyncIterator[bool]:
+        """Run an economy action for one or more users (trades lock both sides)
+
+        Yields True once the users' locks are held, False when the call was shed."""
+        ids: List[int] = sorted({user_ids} if isinstance(user_ids, int) else set(user_ids))
+        states = [self._state(user_id) for user_id in ids]
+
+        now = time.monotonic()
+        if not all(state.bucket.available(now) >= 1 for state in states):
+            self._count(action, 'shed_rate')
+            yield False
+            return
+        if any(state.lock.locked() and state.waiters >= self.max_waiters for state in states):
+            self._count(action, 'shed_busy')
+            yield False
+            return
+        for state in states:
+            state.bucket.try_acquire(now)
+
+        acquired: List[_UserState] = []
+        try:
+            # Sorted ids: two trades between the same players cannot deadlock
+            for state in states:
+                if not state.lock.locked():
+                    # Free lock: take it without suspending so the next click sees it held
+                    await state.lock.acquire()
+                    acquired.append(state)
+                    continue
+                self.stats['waited'] += 1
+                state.waiters += 1
+                try:
+                    await asyncio.wait_for(state.lock.acquire(), self.wait_timeout)
+                except asyncio.TimeoutError:
+                    self._count(action, 'shed_timeout')
+                    yield False
+                    return
+                finally:
+                    state.waiters -= 1
+                acquired.append(state)
+
+            self._count(action, 'admitted')
+            yield True
+        finally:
+            for state in reversed(acquired):
+                state.lock.release()
+
+    def is_busy(self, user_id: int) -> bool:
+        state = self._users.get(user_id)
+        return state is not None and state.lock.locked()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Admission and shedding counters, overall and per action"""
+        return {
+            **self.stats,
+            'tracked_users': len(self._users),
+            'busy_users': sum(1 for state in self._users.values() if state.lock.locked()),
+            'by_action': {action: dict(counters) for action, counters in self.by_action.items()}
+        }
+
+
+# Global economy gate instance
+user_gate = UserGate()
+
+
+async def reject_interaction(interaction: discord.Interaction):
+    """Tell the user their click was shed"""
+    message = BotConfig.MESSAGES['action_throttled']
+    if interaction.response.is_done():
+        await interaction.followup.send(message, ephemeral=True)
+    else:
+        await interaction.response.send_message(message, ephemeral=True)
+
+
+def gated(action: str):
+    """Run a button or modal callback through the gate of the interacting user"""
+    def decorator(callback):
+        @functools.wraps(callback)
+        async def wrapper(*args, **kwargs):
+            interaction = next(arg for arg in args if isinstance(arg, discord.Interaction))
+            async with user_gate.guard(interaction.user.id, action) as admitted:
+                if not admitted:
+                    await reject_interaction(interaction)
+                    return None
+                return await callback(*args, **kwargs)
+        return wrapper
+    return decorator
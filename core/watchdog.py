@@ -0,0 +1,180 @@
+"""
+Event loop watchdog for Shadow Roll Bot
+Continuous loop lag measurement, plus the stack of whatever blocks the loop beyond a threshold
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from core.config import BotConfig
+from core.tracing import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the event-loop lag histogram
+LAG_BOUNDS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float('inf'))
+
+# Frames kept from the blocked stack (innermost last, like a traceback)
+STACK_DEPTH = 30
+
+
+class Stall:
+    """One period where the loop did not run its callbacks for longer than the threshold"""
+
+    __slots__ = ('started_at', 'duration_ms', 'task', 'stack', 'ongoing')
+
+    def __init__(self, started_at: float, task: Optional[str], stack: List[str]):
+        self.started_at = started_at
+        self.duration_ms = 0.0
+        self.task = task
+        self.stack = stack
+        self.ongoing = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'started_at': self.started_at,
+            'duration_ms': round(self.duration_ms, 1),
+            'ongoing': self.ongoing,
+            'task': self.task,
+            'stack': self.stack,
+        }
+
+
+class LoopWatchdog:
+    """Heartbeat callback on the loop, checked from a daemon thread
+
+    The heartbeat is rescheduled every interval and records how late it ran (the lag
+    histogram). When the last heartbeat is older than the threshold, the loop is stuck in
+    one callback: the thread grabs that thread's current frames, which point at the
+    blocking call, and logs them once per stall. The full duration is logged when the
+    heartbeat comes back.
+    """
+
+    def __init__(self, interval_ms: float = BotConfig.LOOP_WATCHDOG_INTERVAL_MS,
+                 threshold_ms: float = BotConfig.LOOP_BLOCK_THRESHOLD_MS,
+                 history: int = BotConfig.LOOP_STALL_HISTORY):
+        self.interval = interval_ms / 1000
+        self.threshold_ms = threshold_ms
+        self.histogram = LatencyHistogram(LAG_BOUNDS_MS)
+        self.last_ms = 0.0
+        self.stalls: deque = deque(maxlen=history)
+        self.stall_count = 0
+        self.stall_total_ms = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._expected = 0.0
+        self._last_beat = 0.0
+        self._current: Optional[Stall] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ----- lifecycle -----
+
+    def start(self):
+        """Start on the running loop; called from setup_hook (again is a no-op)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._last_beat = time.monotonic()
+        self._schedule()
+        self._thread = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        self._thread.start()
+        logger.info(f"Event loop watchdog started (block threshold {self.threshold_ms:g} ms)")
+
+    def stop(self):
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    # ----- loop side -----
+
+    def _schedule(self):
+        self._expected = self._loop.time() + self.interval
+        self._handle = self._loop.call_at(self._expected, self._beat)
+
+    def _beat(self):
+        now = time.monotonic()
+        self.last_ms = max(0.0, (self._loop.time() - self._expected) * 1000)
+        self.histogram.observe(self.last_ms)
+        with self._lock:
+            # The block started somewhere after the previous beat: within one interval of this
+            since_last_ms = (now - self._last_beat) * 1000
+            self._last_beat = now
+            stall, self._current = self._current, None
+        if stall is not None:
+            self._end_stall(stall, since_last_ms)
+        if not self._stop.is_set():
+            self._schedule()
+
+    def _end_stall(self, stall: Stall, duration_ms: float):
+        stall.duration_ms = duration_ms
+        stall.ongoing = False
+        self.stall_total_ms += duration_ms
+        logger.warning(f"Event loop blocked for {duration_ms:.0f} ms (task: {stall.task or '-'}, "
+                       f"at {stall.stack[-1].strip() if stall.stack else '?'})")
+
+    # ----- watchdog thread -----
+
+    def _watch(self):
+        period = min(self.interval, self.threshold_ms / 2000)
+        while not self._stop.wait(period):
+            with self._lock:
+                blocked_ms = (time.monotonic() - self._last_beat) * 1000
+                if blocked_ms - self.interval * 1000 < self.threshold_ms or self._current is not None:
+                    continue
+                stall = self._current = Stall(time.time() - blocked_ms / 1000, self._running_task(),
+                                              self._capture_stack())
+                self.stalls.append(stall)
+                self.stall_count += 1
+            logger.warning(f"Event loop blocked for more than {blocked_ms:.0f} ms "
+                           f"(task: {stall.task or '-'}), stack:\n{''.join(stall.stack)}")
+
+    def _capture_stack(self) -> List[str]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return []
+        return traceback.format_list(traceback.extract_stack(frame)[-STACK_DEPTH:])
+
+    def _running_task(self) -> Optional[str]:
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            return None
+        if task is None:
+            return None
+        coro = task.get_coro()
+        return f"{task.get_name()} ({getattr(coro, '__qualname__', coro)})"
+
+    # ----- reporting -----
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'threshold_ms': self.threshold_ms,
+            'lag_ms': round(self.last_ms, 3),
+            'lag': self.histogram.to_dict(),
+            'stalls': self.stall_count,
+            'stalled_ms': round(self.stall_total_ms, 1),
+            'recent_stalls': [stall.to_dict() for stall in reversed(self.stalls)],
+        }
+
+    def reset(self):
+        with self._lock:
+            self.histogram = LatencyHistogram(LAG_BOUNDS_MS)
+            self.stalls.clear()
+            self.stall_count = 0
+            self.stall_total_ms = 0.0
+
+
+# Global watchdog instance
+watchdog = LoopWatchdog()
@@ -6,24 +6,17 @@ import asyncio
 import aiosqlite
 import logging
 
+from core.effects import COIN_MULTIPLIER, EFFECTS_SCHEMA
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 async def create_missing_tables():
     """Créer toutes les tables manquantes pour le sac à dos"""
     async with aiosqlite.connect('shadow_roll.db') as db:
-        # Table pour les effets temporaires (buffs)
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS temporary_buffs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                buff_type TEXT NOT NULL,
-                buff_value REAL NOT NULL,
-                start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                end_time TIMESTAMP NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        # Table des effets temporaires (moteur d'effets)
+        for statement in EFFECTS_SCHEMA:
+            await db.execute(statement)
         
         # Table pour les équipements de joueur
         await db.execute('''
@@ -128,9 +121,9 @@ async def add_sample_data_for_testing():
         
         # Ajouter un effet temporaire
         await db.execute('''
-            INSERT OR IGNORE INTO temporary_buffs (user_id, buff_type, buff_value, end_time)
-            VALUES (?, 'coin_multiplier', 1.5, datetime('now', '+1 hour'))
-        ''', (test_user_id,))
+            INSERT INTO effects (user_id, kind, magnitude, expires_at)
+            VALUES (?, ?, 1.5, strftime('%s', 'now') + 3600)
+        ''', (test_user_id, COIN_MULTIPLIER))
         
         await db.commit()
         logger.info("✅ Données d'exemple ajoutées pour le test")
@@ -156,7 +149,7 @@ async def verify_backpack_data():
         print(f"🧪 Potions stockées: {potions_count[0]}")
         
         # Vérifier les effets actifs
-        cursor = await db.execute('SELECT COUNT(*) FROM temporary_buffs WHERE end_time > datetime("now")')
+        cursor = await db.execute("SELECT COUNT(*) FROM effects WHERE expires_at > strftime('%s', 'now')")
         effects_count = await cursor.fetchone()
         print(f"✨ Effets actifs: {effects_count[0]}")
         
@@ -6,6 +6,8 @@ import asyncio
 import aiosqlite
 import logging
 
+from core.effects import COIN_MULTIPLIER, EFFECTS_SCHEMA
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -57,20 +59,10 @@ async def create_missing_backpack_tables():
             ''')
             logger.info("✅ Table player_potions vérifiée/créée")
             
-            # Table des effets actifs
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS active_effects (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    effect_name TEXT NOT NULL,
-                    effect_type TEXT NOT NULL,
-                    effect_value REAL DEFAULT 1.0,
-                    expires_at INTEGER NOT NULL,
-                    is_active BOOLEAN DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            logger.info("✅ Table active_effects vérifiée/créée")
+            # Table des effets actifs (moteur d'effets)
+            for statement in EFFECTS_SCHEMA:
+                await db.execute(statement)
+            logger.info("✅ Table effects vérifiée/créée")
             
             await db.commit()
             logger.info("🎒 Toutes les tables du sac à dos sont prêtes!")
@@ -96,10 +88,9 @@ async def add_sample_data_for_testing():
             import time
             expires_at = int(time.time()) + 3600  # 1 heure
             await db.execute('''
-                INSERT OR IGNORE INTO temporary_buffs_fixed 
-                (user_id, buff_type, buff_value, expires_at)
-                VALUES (123456789, 'coin_multiplier', 2.0, ?)
-            ''', (expires_at,))
+                INSERT INTO effects (user_id, kind, magnitude, expires_at)
+                VALUES (123456789, ?, 2.0, ?)
+            ''', (COIN_MULTIPLIER, expires_at))
             
             await db.commit()
             logger.info("📦 Données de test ajoutées")
@@ -120,7 +111,7 @@ async def verify_backpack_functionality():
             'Potions': 'SELECT COUNT(*) FROM player_potions_fixed',
             'Titres': 'SELECT COUNT(*) FROM titles',
             'Équipement': 'SELECT COUNT(*) FROM player_equipment',
-            'Effets': 'SELECT COUNT(*) FROM temporary_buffs_fixed'
+            'Effets': "SELECT COUNT(*) FROM effects WHERE expires_at > strftime('%s', 'now')"
         }
         
         for category, query in categories.items():
@@ -8,6 +8,8 @@ import aiosqlite
 import logging
 from datetime import datetime
 
+from core.effects import EFFECTS_SCHEMA
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -68,39 +70,9 @@ async def fix_shop_database():
             )
         ''')
         
-        # Table des buffs temporaires
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS temporary_buffs_fixed (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                buff_type TEXT NOT NULL,
-                buff_value REAL DEFAULT 1.0,
-                expires_at INTEGER NOT NULL,
-                is_active BOOLEAN DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Table des invocations gratuites
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS free_rolls_fixed (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                rolls_remaining INTEGER DEFAULT 0,
-                granted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Table des garanties
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS guaranteed_rarities_fixed (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                rarity TEXT NOT NULL,
-                uses_remaining INTEGER DEFAULT 1,
-                granted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        # Buffs, invocations gratuites et garanties: table effects du moteur d'effets
+        for statement in EFFECTS_SCHEMA:
+            await db.execute(statement)
         
         # 3. Ajouter les articles par défaut
         logger.info("Ajout des articles par défaut...")
@@ -131,8 +103,6 @@ async def fix_shop_database():
         logger.info("Création des index de performance...")
         await db.execute("CREATE INDEX IF NOT EXISTS idx_purchases_user ON player_purchases_fixed(user_id)")
         await db.execute("CREATE INDEX IF NOT EXISTS idx_potions_user ON player_potions_fixed(user_id)")
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_buffs_user ON temporary_buffs_fixed(user_id)")
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_buffs_expires ON temporary_buffs_fixed(expires_at)")
         
         await db.commit()
         await db.close()
@@ -3,13 +3,22 @@ Health check endpoint pour l'hébergement externe
 Permet aux plateformes de vérifier que le bot fonctionne
 """
 import asyncio
-import aiohttp
 from aiohttp import web
 import logging
 import os
 from datetime import datetime
 import json
 
+from core.http_client import http_client
+from core.log_pipeline import log_pipeline
+from core.metrics import metrics
+from core.outbound import outbound
+from core.ownership import ownership_index
+from core.query_stats import query_stats
+from core.tracing import tracer
+from core.user_gate import user_gate
+from core.watchdog import watchdog
+
 logger = logging.getLogger('health_check')
 
 class HealthCheckServer:
@@ -28,6 +37,7 @@ class HealthCheckServer:
         self.app.router.add_get('/', self.health_check)
         self.app.router.add_get('/health', self.health_check)
         self.app.router.add_get('/status', self.detailed_status)
+        self.app.router.add_get('/metrics', self.metrics)
         self.app.router.add_post('/heartbeat', self.heartbeat)
     
     async def health_check(self, request):
@@ -48,6 +58,13 @@ class HealthCheckServer:
             "uptime": str(datetime.now() - self.start_time),
             "bot_status": self.bot_status,
             "last_heartbeat": self.last_heartbeat.isoformat() if self.last_heartbeat else None,
+            "outbound": outbound.get_stats(),
+            "user_gate": user_gate.get_stats(),
+            "ownership_index": ownership_index.get_stats(),
+            "queries": query_stats.get_stats(),
+            "traces": tracer.get_stats(),
+            "event_loop": watchdog.get_stats(),
+            "logging": log_pipeline.get_stats(),
             "environment": {
                 "python_version": os.sys.version,
                 "discord_token_set": bool(os.getenv('DISCORD_TOKEN')),
@@ -56,6 +73,16 @@ class HealthCheckServer:
             }
         })
     
+    async def metrics(self, request):
+        """Endpoint Prometheus (format texte), calculé à la demande dans le processus du bot"""
+        try:
+            body = metrics.render()
+        except Exception as e:
+            logger.error(f"Erreur métriques: {e}")
+            return web.Response(status=500, text=f"# erreur: {e}\n")
+        return web.Response(body=body.encode('utf-8'),
+                            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'})
+    
     async def heartbeat(self, request):
         """Endpoint pour recevoir les heartbeats du bot"""
         try:
@@ -88,11 +115,11 @@ class HealthCheckServer:
 async def send_heartbeat(status="running"):
     """Envoyer un heartbeat au serveur de health check"""
     try:
-        async with aiohttp.ClientSession() as session:
-            await session.post('http://localhost:8080/heartbeat', json={
-                "status": status,
-                "timestamp": datetime.now().isoformat()
-            })
+        # Heartbeats are best-effort: no retries, the next one comes in 30s
+        await http_client.request('POST', 'http://localhost:8080/heartbeat', json={
+            "status": status,
+            "timestamp": datetime.now().isoformat()
+        }, retries=0)
     except Exception as e:
         logger.debug(f"Erreur envoi heartbeat: {e}")
 
@@ -111,6 +138,7 @@ async def main():
         print(f"  - http://localhost:{port}/")
         print(f"  - http://localhost:{port}/health")
         print(f"  - http://localhost:{port}/status")
+        print(f"  - http://localhost:{port}/metrics")
         
         # Garder le serveur en marche
         while True:
@@ -6,26 +6,16 @@ import asyncio
 import logging
 import os
 import sys
-from pathlib import Path
 from core.bot import ShadowRollBot
 from core.config import BotConfig
+from core.log_pipeline import log_pipeline
 
 def setup_logging():
     """Configure logging for external hosting"""
-    log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
+    log_level = os.getenv('LOG_LEVEL', BotConfig.LOG_LEVEL).upper()
     
-    # Créer le dossier de logs s'il n'existe pas
-    Path('logs').mkdir(exist_ok=True)
-    
-    # Configuration du logging optimisée
-    logging.basicConfig(
-        level=getattr(logging, log_level, logging.INFO),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('logs/bot.log'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    # File d'attente + thread d'écriture : aucun accès disque sur la boucle d'événements
+    log_pipeline.start(log_level)
     
     return logging.getLogger('shadow_roll_main')
 
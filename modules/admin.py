@@ -9,6 +9,7 @@ from typing import Optional
 import asyncio
 
 from core.config import BotConfig
+from core.effects import effects_engine
 from modules.utils import format_number, get_display_name
 
 logger = logging.getLogger(__name__)
@@ -297,6 +298,7 @@ class AdminManager:
                 await self.bot.db.db.execute("DELETE FROM inventory WHERE user_id = ?", (user.id,))
                 await self.bot.db.db.execute("DELETE FROM player_achievements WHERE user_id = ?", (user.id,))
                 await self.bot.db.db.execute("DELETE FROM player_items WHERE user_id = ?", (user.id,))
+                await effects_engine.clear(user.id)
                 await self.bot.db.db.execute("DELETE FROM marketplace_listings WHERE seller_id = ?", (user.id,))
                 await self.bot.db.db.execute("DELETE FROM players WHERE user_id = ?", (user.id,))
                 await self.bot.db.db.commit()
@@ -908,18 +910,20 @@ class GifSuggestView(discord.ui.View):
         char_id, name, anime, _ = self.characters[self.current_index]
         
         # Validate and update image
+        from core.http_client import http_client
         import aiohttp
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.head(image_url, timeout=10) as response:
-                    if response.status != 200:
-                        await interaction.followup.send(f"❌ L'URL de l'image n'est pas accessible (status {response.status})", ephemeral=True)
-                        return False
-                    
-                    content_type = response.headers.get('content-type', '').lower()
-                    if 'image' not in content_type:
-                        await interaction.followup.send(f"❌ L'URL ne semble pas pointer vers une image valide", ephemeral=True)
-                        return False
+            response = await http_client.request(
+                'HEAD', image_url, timeout=aiohttp.ClientTimeout(total=10), retries=1
+            )
+            if response.status != 200:
+                await interaction.followup.send(f"❌ L'URL de l'image n'est pas accessible (status {response.status})", ephemeral=True)
+                return False
+            
+            content_type = response.headers.get('Content-Type', '').lower()
+            if 'image' not in content_type:
+                await interaction.followup.send(f"❌ L'URL ne semble pas pointer vers une image valide", ephemeral=True)
+                return False
         except Exception as e:
             await interaction.followup.send(f"❌ Impossible de valider l'URL de l'image: {str(e)}", ephemeral=True)
             return False
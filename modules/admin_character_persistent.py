@@ -4,12 +4,16 @@ Intègre le gestionnaire centralisé avec les commandes admin existantes
 """
 
 import discord
+from discord import app_commands
 from discord.ext import commands
 import logging
 from typing import Optional
 import asyncio
 
+from core.autocomplete import name_index
 from core.config import BotConfig
+from core.rarity import rarity_tiers
+from modules.embed_templates import embed_templates
 from modules.utils import format_number, get_display_name
 from character_manager import CharacterManager, add_character_with_persistence
 
@@ -135,7 +139,7 @@ async def setup_persistent_admin_commands(bot):
             
             # Statistiques par rareté
             rarity_stats = []
-            for rarity in ['Common', 'Rare', 'Epic', 'Legendary', 'Mythic', 'Titan', 'Fusion', 'Secret', 'Evolve']:
+            for rarity in reversed(rarity_tiers.names()):
                 count = stats['by_rarity'].get(rarity, 0)
                 emoji = BotConfig.RARITY_EMOJIS.get(rarity, "◆")
                 if count > 0:
@@ -171,6 +175,66 @@ async def setup_persistent_admin_commands(bot):
             await ctx.send(f"❌ Erreur lors de la récupération des statistiques: {e}")
             logger.error(f"Erreur de statistiques: {e}")
     
+    @bot.command(name='raritytiers', aliases=['tiers'])
+    async def show_rarity_tiers(ctx):
+        """Afficher la table des raretés (rang, poids, cooldown) - Admin seulement"""
+        if not BotConfig.is_admin(ctx.author.id):
+            await ctx.send("❌ Vous n'avez pas la permission d'utiliser cette commande.")
+            return
+
+        total_weight = sum(tier.weight for tier in rarity_tiers.tiers.values()) or 1
+        lines = []
+        for name, tier in rarity_tiers.ordered():
+            lines.append(f"{tier.emoji} **{name}** • rang {tier.rank} • poids {tier.weight:g} "
+                         f"({tier.weight / total_weight * 100:.3f}%) • cooldown {tier.cooldown:g}s")
+        embed = discord.Embed(
+            title="💎 Table des Raretés",
+            description="\n".join(lines),
+            color=BotConfig.RARITY_COLORS.get('Legendary', 0xffa500)
+        )
+        embed.set_footer(text="Modifier: !setrarity <rareté> <weight|rank|cooldown|color|emoji> <valeur>")
+        await ctx.send(embed=embed)
+
+    @bot.command(name='setrarity', aliases=['settier'])
+    async def set_rarity_tier(ctx, rarity: str, field: str, *, value: str):
+        """Modifier une rareté à chaud (poids, rang, cooldown, couleur, emoji) - Admin seulement"""
+        if not BotConfig.is_admin(ctx.author.id):
+            await ctx.send("❌ Vous n'avez pas la permission d'utiliser cette commande.")
+            return
+
+        if rarity_tiers.get(rarity) is None:
+            await ctx.send(f"❌ Rareté invalide. Utilisez: {', '.join(rarity_tiers.names())}")
+            return
+
+        field = field.lower()
+        try:
+            if field in ('weight', 'cooldown'):
+                parsed = float(value)
+                if parsed < 0:
+                    raise ValueError(value)
+            elif field == 'rank':
+                parsed = int(value)
+            elif field == 'color':
+                parsed = int(value.lstrip('#').replace('0x', ''), 16)
+            elif field == 'emoji':
+                parsed = value.strip()
+            else:
+                await ctx.send("❌ Champ invalide. Utilisez: weight, rank, cooldown, color, emoji")
+                return
+        except ValueError:
+            await ctx.send(f"❌ Valeur invalide pour {field}: {value}")
+            return
+
+        try:
+            tier = await rarity_tiers.update(rarity, **{field: parsed})
+            # Les couleurs de rareté sont figées dans les embeds précompilés
+            embed_templates.invalidate()
+            await ctx.send(f"✅ {tier.emoji} **{rarity}**: {field} = {getattr(tier, field)} (appliqué immédiatement)")
+            logger.info(f"Rarity tier {rarity}.{field} set to {parsed} by {ctx.author.id}")
+        except Exception as e:
+            await ctx.send(f"❌ Erreur lors de la modification: {e}")
+            logger.error(f"Erreur de modification de rareté: {e}")
+
     @bot.command(name='backupchars', aliases=['backup'])
     async def backup_characters(ctx, backup_name: Optional[str] = None):
         """Créer une sauvegarde des personnages - Admin seulement"""
@@ -214,7 +278,7 @@ async def setup_persistent_admin_commands(bot):
             return
             
         try:
-            results = await character_manager.search_characters(search_term)
+            results = await bot.db.search_characters(search_term, limit=50)
             
             if not results:
                 await ctx.send(f"❌ Aucun personnage trouvé pour '{search_term}'")
@@ -431,7 +495,7 @@ async def setup_persistent_admin_commands(bot):
             
         try:
             # Rechercher le personnage
-            characters = await character_manager.search_characters(character_name)
+            characters = prefer_exact_name(await character_manager.search_characters(character_name), character_name)
             
             if not characters:
                 await ctx.send(f"❌ Aucun personnage trouvé pour '{character_name}'")
@@ -626,16 +690,45 @@ async def setup_persistent_admin_commands(bot):
             await ctx.send(f"❌ Erreur lors du don du personnage: {e}")
             logger.error(f"Erreur lors du don de personnage par ID: {e}")
 
+    setup_give_slash_commands(bot)
     logger.info("Commandes d'administration persistante configurées")
 
 
 # ═══════════════════ FONCTIONS AUTONOMES POUR INTERFACE ADMIN ═══════════════════
 
+def prefer_exact_name(characters, character_name: str):
+    """Garder uniquement le nom exact quand il fait partie des résultats"""
+    exact = [char for char in characters if char['name'].lower() == character_name.strip().lower()]
+    return exact[:1] if exact else characters
+
+
+def setup_give_slash_commands(bot):
+    """Commande /givechar avec autocomplétion des noms de personnages"""
+    
+    @bot.tree.command(name="givechar", description="Donner un personnage à un joueur (admin)")
+    @app_commands.describe(joueur="Joueur qui reçoit le personnage", personnage="Nom du personnage")
+    @app_commands.default_permissions(administrator=True)
+    async def give_character_slash(interaction: discord.Interaction, joueur: discord.Member, personnage: str):
+        if not BotConfig.is_admin(interaction.user.id):
+            await interaction.response.send_message("❌ Vous n'avez pas la permission d'utiliser cette commande.", ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        success, message = await give_character_to_user(bot, interaction.user.id, str(joueur.id), personnage)
+        await interaction.followup.send(f"{'✅' if success else '❌'} {message}", ephemeral=True)
+    
+    @give_character_slash.autocomplete('personnage')
+    async def give_character_autocomplete(interaction: discord.Interaction, current: str):
+        if not BotConfig.is_admin(interaction.user.id):
+            return []
+        return await name_index.character_choices(bot.db, current)
+
+
 async def give_character_to_user(bot, admin_id: int, user_identifier: str, character_name: str):
     """Fonction autonome pour donner un personnage à un utilisateur par nom"""
     try:
         # Rechercher le personnage
-        characters = await character_manager.search_characters(character_name)
+        characters = prefer_exact_name(await character_manager.search_characters(character_name), character_name)
         
         if not characters:
             return False, f"Aucun personnage trouvé pour '{character_name}'"
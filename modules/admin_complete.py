@@ -160,16 +160,7 @@ class AdminCompleteView(discord.ui.View):
                 SELECT rarity, COUNT(*) FROM characters 
                 GROUP BY rarity 
                 ORDER BY 
-                    CASE rarity
-                        WHEN 'Secret' THEN 8
-                        WHEN 'Fusion' THEN 7
-                        WHEN 'Titan' THEN 6
-                        WHEN 'Mythic' THEN 5
-                        WHEN 'Legendary' THEN 4
-                        WHEN 'Epic' THEN 3
-                        WHEN 'Rare' THEN 2
-                        WHEN 'Common' THEN 1
-                    END DESC
+                    MAX(rarity_rank) DESC
             """)
             rarity_stats = await cursor.fetchall()
             
@@ -377,16 +368,7 @@ class CharacterManagementView(discord.ui.View):
             cursor = await self.bot.db.db.execute("""
                 SELECT id, name, anime, rarity, value FROM characters 
                 ORDER BY 
-                    CASE rarity
-                        WHEN 'Secret' THEN 8
-                        WHEN 'Fusion' THEN 7
-                        WHEN 'Titan' THEN 6
-                        WHEN 'Mythic' THEN 5
-                        WHEN 'Legendary' THEN 4
-                        WHEN 'Epic' THEN 3
-                        WHEN 'Rare' THEN 2
-                        WHEN 'Common' THEN 1
-                    END DESC, name
+                    rarity_rank DESC, name
                 LIMIT 15 OFFSET ?
             """, (offset,))
             
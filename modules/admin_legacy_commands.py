@@ -16,6 +16,46 @@ from modules.admin_character_sync import sync_admin_characters
 
 logger = logging.getLogger(__name__)
 
+def create_character_card_embed(character, user, footer: str = "Shadow Roll • Consultation de Personnage"):
+    """Carte de consultation d'un personnage (lookcard)"""
+    username = get_display_name(user)
+    embed = discord.Embed(
+        title="🌌 ═══════〔 C A R T E   P E R S O N N A G E 〕═══════ 🌌",
+        description=f"```\n◆ Consultation par: {username} ◆\n```",
+        color=character.get_rarity_color()
+    )
+    
+    embed.add_field(
+        name=f"🌑 ═══〔 {character.get_rarity_emoji()} {character.name} 〕═══ 🌑",
+        value=(f"```\n"
+               f"Anime: {character.anime}\n"
+               f"Rareté: {character.rarity}\n"
+               f"Valeur: {format_number(character.value)} Shadow Coins\n"
+               f"```"),
+        inline=False
+    )
+    
+    # Ajouter les chances d'obtention
+    rarity_chance = BotConfig.RARITY_WEIGHTS.get(character.rarity, 0)
+    embed.add_field(
+        name="📊 Informations d'Invocation",
+        value=(f"```\n"
+               f"Invocation: Disponible\n"
+               f"Fréquence: {rarity_chance}%\n"
+               f"Roll Standard: Oui\n"
+               f"```"),
+        inline=True
+    )
+    
+    if character.image_url and not character.image_url.startswith('https://i.imgur.com/example'):
+        embed.set_image(url=character.image_url)
+    
+    embed.set_footer(
+        text=footer,
+        icon_url=user.avatar.url if user.avatar else None
+    )
+    return embed
+
 # Character selection view for lookcard command
 class LookcardSelectionView(discord.ui.View):
     def __init__(self, characters, user_id, bot):
@@ -51,44 +91,7 @@ class LookcardSelectionView(discord.ui.View):
                 image_url=row[5]
             )
             
-            username = get_display_name(interaction.user)
-            
-            # Créer la carte avec le style Shadow amélioré
-            embed = discord.Embed(
-                title="🌌 ═══════〔 C A R T E   P E R S O N N A G E 〕═══════ 🌌",
-                description=f"```\n◆ Consultation par: {username} ◆\n```",
-                color=character.get_rarity_color()
-            )
-            
-            embed.add_field(
-                name=f"🌑 ═══〔 {character.get_rarity_emoji()} {character.name} 〕═══ 🌑",
-                value=(f"```\n"
-                       f"Anime: {character.anime}\n"
-                       f"Rareté: {character.rarity}\n"
-                       f"Valeur: {format_number(character.value)} Shadow Coins\n"
-                       f"```"),
-                inline=False
-            )
-            
-            # Ajouter les chances d'obtention
-            rarity_chance = BotConfig.RARITY_WEIGHTS.get(character.rarity, 0)
-            embed.add_field(
-                name="📊 Informations d'Invocation",
-                value=(f"```\n"
-                       f"Invocation: Disponible\n"
-                       f"Fréquence: {rarity_chance}%\n"
-                       f"Roll Standard: Oui\n"
-                       f"```"),
-                inline=True
-            )
-            
-            if character.image_url and not character.image_url.startswith('https://i.imgur.com/example'):
-                embed.set_image(url=character.image_url)
-            
-            embed.set_footer(
-                text="Shadow Roll • Consultation de Personnage",
-                icon_url=interaction.user.avatar.url if interaction.user.avatar else None
-            )
+            embed = create_character_card_embed(character, interaction.user)
             
             await interaction.response.edit_message(embed=embed, view=None)
         
@@ -310,20 +313,14 @@ async def setup_legacy_admin_commands(bot):
         # Commande accessible à tous les utilisateurs
         
         try:
-            # Recherche du personnage - exact match first, then partial
-            cursor = await bot.db.db.execute(
-                "SELECT id, name, anime, rarity, value, image_url FROM characters WHERE LOWER(name) = LOWER(?) ORDER BY name",
-                (character_name,)
-            )
-            char_rows = await cursor.fetchall()
-            
-            # If no exact match, try partial match
-            if not char_rows:
-                cursor = await bot.db.db.execute(
-                    "SELECT id, name, anime, rarity, value, image_url FROM characters WHERE LOWER(name) LIKE LOWER(?) ORDER BY name",
-                    (f"%{character_name}%",)
-                )
-                char_rows = await cursor.fetchall()
+            # Recherche classée: correspondance exacte seule, sinon préfixes, sous-chaînes et fautes de frappe
+            results = await bot.db.search_characters(character_name, limit=10)
+            if results and results[0]['match'] == 'exact':
+                results = results[:1]
+            char_rows = [
+                (c['id'], c['name'], c['anime'], c['rarity'], c['value'], c['image_url'])
+                for c in results
+            ]
             
             if not char_rows:
                 await ctx.send(f"❌ Aucun personnage trouvé pour '{character_name}'")
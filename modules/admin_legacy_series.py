@@ -343,17 +343,7 @@ async def setup_legacy_series_commands(bot):
                 SELECT name, rarity, value FROM characters 
                 WHERE anime = ?
                 ORDER BY 
-                    CASE rarity 
-                        WHEN 'Secret' THEN 1
-                        WHEN 'Fusion' THEN 2
-                        WHEN 'Titan' THEN 3
-                        WHEN 'Mythic' THEN 4
-                        WHEN 'Legendary' THEN 5
-                        WHEN 'Epic' THEN 6
-                        WHEN 'Rare' THEN 7
-                        WHEN 'Common' THEN 8
-                        ELSE 9
-                    END, name
+                    rarity_rank DESC, name
             """, (series_name,)) as cursor:
                 characters = await cursor.fetchall()
             
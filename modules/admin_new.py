@@ -12,6 +12,7 @@ import json
 from datetime import datetime, timedelta
 import aiosqlite
 
+from core.autocomplete import name_index
 from core.config import BotConfig
 from modules.utils import format_number, get_display_name
 
@@ -452,17 +453,7 @@ class PlayerInventoryView(discord.ui.View):
                    JOIN characters c ON i.character_id = c.id
                    WHERE i.user_id = ?
                    ORDER BY 
-                       CASE c.rarity
-                           WHEN 'Secret' THEN 8
-                           WHEN 'Fusion' THEN 7
-                           WHEN 'Titan' THEN 6
-                           WHEN 'Evolve' THEN 5.5
-                           WHEN 'Mythic' THEN 5
-                           WHEN 'Legendary' THEN 4
-                           WHEN 'Epic' THEN 3
-                           WHEN 'Rare' THEN 2
-                           WHEN 'Common' THEN 1
-                       END DESC,
+                       c.rarity_rank DESC,
                        c.value DESC, c.name
                    LIMIT ? OFFSET ?''',
                 (self.target_user_id, self.items_per_page, offset)
@@ -881,7 +872,7 @@ class CharactersManagementView(discord.ui.View):
                     SELECT id, name, anime, rarity, value, image_url
                     FROM characters 
                     WHERE name LIKE ? OR anime LIKE ?
-                    ORDER BY rarity, name
+                    ORDER BY rarity_rank DESC, name
                     LIMIT ? OFFSET ?
                 """, (f"%{self.search_query}%", f"%{self.search_query}%", self.characters_per_page, offset))
                 
@@ -892,7 +883,7 @@ class CharactersManagementView(discord.ui.View):
                 cursor = await self.bot.db.db.execute("""
                     SELECT id, name, anime, rarity, value, image_url
                     FROM characters 
-                    ORDER BY rarity, name
+                    ORDER BY rarity_rank DESC, name
                     LIMIT ? OFFSET ?
                 """, (self.characters_per_page, offset))
                 
@@ -1312,6 +1303,7 @@ class EditCharacterModal(discord.ui.Modal, title='✏️ Modifier un Personnage'
                 f"UPDATE characters SET {field} = ? WHERE id = ?", (new_value, char_id)
             )
             await self.parent_view.bot.db.db.commit()
+            name_index.mark_stale()
             
             await interaction.followup.send(
                 f"✅ Personnage modifié avec succès!\n"
@@ -2260,6 +2252,7 @@ async def setup_new_admin_system(bot):
             """, (name, anime, rarity, value, image_url))
             
             await bot.db.db.commit()
+            name_index.mark_stale()
             
             rarity_emoji = BotConfig.RARITY_EMOJIS.get(rarity, "◆")
             await ctx.send(
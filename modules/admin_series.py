@@ -728,7 +728,7 @@ class SeriesDetailsView(discord.ui.View):
             async with self.bot.db.db.execute("""
                 SELECT name, rarity FROM characters 
                 WHERE anime = ?
-                ORDER BY rarity DESC, name
+                ORDER BY rarity_rank DESC, name
             """, (series_name,)) as cursor:
                 characters = await cursor.fetchall()
             
@@ -9,7 +9,8 @@ import logging
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from core.config import BotConfig
-from modules.utils import format_number, get_display_name
+from core.rarity import rarity_tiers
+from modules.utils import format_number, get_display_name, KeysetPager
 from modules.equipment_fix import fix_equipment_before_operation
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,7 @@ class BackpackView(discord.ui.View):
         self.user_id = user_id
         self.current_category = category
         self.current_page = page
+        self.character_pager = KeysetPager()  # Characters page by cursor, other categories by index
         self.items_per_page = self.get_items_per_page()
 
     def get_items_per_page(self) -> int:
@@ -75,9 +77,9 @@ class BackpackView(discord.ui.View):
     async def create_characters_embed(self) -> discord.Embed:
         """Create characters section of backpack"""
         player = await self.bot.db.get_or_create_player(self.user_id, "Unknown")
-        inventory = await self.bot.db.get_player_inventory(
-            self.user_id, 
-            page=self.current_page, 
+        inventory, self.character_pager.next_cursor = await self.bot.db.get_inventory_page(
+            self.user_id,
+            after=self.character_pager.cursor,
             limit=self.items_per_page
         )
         
@@ -113,7 +115,7 @@ class BackpackView(discord.ui.View):
                 rarity_groups[rarity].append(item)
 
             # Display by rarity order
-            rarity_order = ['Secret', 'Fusion', 'Titan', 'Evolve', 'Mythic', 'Legendary', 'Epic', 'Rare', 'Common']
+            rarity_order = rarity_tiers.names()
             for rarity in rarity_order:
                 if rarity in rarity_groups:
                     characters = rarity_groups[rarity]
@@ -132,7 +134,7 @@ class BackpackView(discord.ui.View):
                         value="```\n" + "\n".join(char_list) + "\n```",
                         inline=True)
 
-        embed.set_footer(text=f"Shadow Roll • Page {self.current_page}/{total_pages}")
+        embed.set_footer(text=f"Shadow Roll • Page {self.character_pager.page}/{total_pages}")
         return embed
 
     async def create_potions_embed(self) -> discord.Embed:
@@ -465,6 +467,7 @@ class BackpackView(discord.ui.View):
     async def view_characters(self, interaction: discord.Interaction, button: discord.ui.Button):
         self.current_category = 'characters'
         self.current_page = 1
+        self.character_pager.reset()
         self.items_per_page = self.get_items_per_page()
         await interaction.response.defer()
         embed = await self.create_backpack_embed()
@@ -510,8 +513,15 @@ class BackpackView(discord.ui.View):
     # Navigation buttons (Row 2)
     @discord.ui.button(label='◀️ Précédent', style=discord.ButtonStyle.secondary, row=2)
     async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.current_page > 1:
+        if self.current_category == 'characters':
+            moved = self.character_pager.back()
+        elif self.current_page > 1:
             self.current_page -= 1
+            moved = True
+        else:
+            moved = False
+
+        if moved:
             await interaction.response.defer()
             embed = await self.create_backpack_embed()
             await interaction.edit_original_response(embed=embed, view=self)
@@ -520,11 +530,18 @@ class BackpackView(discord.ui.View):
 
     @discord.ui.button(label='▶️ Suivant', style=discord.ButtonStyle.secondary, row=2)
     async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
-        # Calculate total pages based on current category
         if self.current_category == 'characters':
-            stats = await self.bot.db.get_inventory_stats(self.user_id)
-            total_items = stats.get('total_characters', 0)
-        elif self.current_category == 'potions':
+            # The cursor from the last page fetch tells whether more characters follow
+            if self.character_pager.advance():
+                await interaction.response.defer()
+                embed = await self.create_backpack_embed()
+                await interaction.edit_original_response(embed=embed, view=self)
+            else:
+                await interaction.response.send_message("Déjà à la dernière page!", ephemeral=True)
+            return
+
+        # Calculate total pages based on current category
+        if self.current_category == 'potions':
             if hasattr(self.bot.db, 'get_player_shop_items'):
                 shop_items = await self.bot.db.get_player_shop_items(self.user_id)
                 total_items = len(shop_items)
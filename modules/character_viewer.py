@@ -10,6 +10,7 @@ from typing import Optional, List
 import asyncio
 
 from core.config import BotConfig
+from core.rarity import rarity_tiers
 from modules.utils import format_number, get_display_name
 from modules.text_styling import style_section
 
@@ -57,7 +58,7 @@ class CharacterListView(discord.ui.View):
             rarity_groups[rarity].append((name, anime, quantity))
         
         # Trier les raretés par ordre de valeur
-        rarity_order = ['Secret', 'Evolve', 'Fusion', 'Titan', 'Mythic', 'Legendary', 'Epic', 'Rare', 'Common']
+        rarity_order = rarity_tiers.names()
         
         for rarity in rarity_order:
             if rarity in rarity_groups:
@@ -302,17 +303,7 @@ class CharacterSearchModal(discord.ui.Modal):
             INNER JOIN inventory i ON c.id = i.character_id
             WHERE i.user_id = ? AND LOWER(c.name) LIKE LOWER(?) 
             ORDER BY 
-                CASE c.rarity 
-                    WHEN 'Secret' THEN 1
-                    WHEN 'Evolve' THEN 2
-                    WHEN 'Fusion' THEN 3
-                    WHEN 'Titan' THEN 4
-                    WHEN 'Mythic' THEN 5
-                    WHEN 'Legendary' THEN 6
-                    WHEN 'Epic' THEN 7
-                    WHEN 'Rare' THEN 8
-                    WHEN 'Common' THEN 9
-                END,
+                c.rarity_rank DESC,
                 c.name
             LIMIT 25
         """, (self.user_id, f"%{search_term}%",))
@@ -369,17 +360,7 @@ class CharacterViewerView(discord.ui.View):
             WHERE i.user_id = ?
             GROUP BY c.id, c.name, c.anime, c.rarity
             ORDER BY 
-                CASE c.rarity 
-                    WHEN 'Secret' THEN 1
-                    WHEN 'Evolve' THEN 2
-                    WHEN 'Fusion' THEN 3
-                    WHEN 'Titan' THEN 4
-                    WHEN 'Mythic' THEN 5
-                    WHEN 'Legendary' THEN 6
-                    WHEN 'Epic' THEN 7
-                    WHEN 'Rare' THEN 8
-                    WHEN 'Common' THEN 9
-                END,
+                c.rarity_rank DESC,
                 c.name
         """, (interaction.user.id,))
         
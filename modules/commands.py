@@ -11,122 +11,87 @@ from datetime import datetime
 from typing import Optional
 
 from core.config import BotConfig
-from modules.utils import format_number, get_cooldown_remaining, get_display_name
+from core.autocomplete import name_index
+from core.cooldowns import roll_cooldowns
+from core.user_gate import reject_interaction, user_gate
+from core.rarity import rarity_tiers
+from core.outbound import PRIORITY_COSMETIC, PRIORITY_INTERACTION, outbound, route_for
+from modules.utils import format_number, get_display_name
 from modules.achievements import AchievementManager
 
 logger = logging.getLogger(__name__)
 
 
+# Animation frames per rarity: color, then (title, description, multiple description, delay)
+SUMMONING_ANIMATIONS = {
+    "Legendary": (0xFFD700, [
+        ("⚡ Invocation Légendaire", "L'air devient électrique...", None, 1.5),
+        ("🔥 Invocation Légendaire", "Une force ancestrale approche...",
+         "Des forces ancestrales approchent...", 1.5),
+        ("🔶 Invocation Légendaire", "Un héros légendaire surgit des ténèbres !",
+         "Des héros légendaires surgissent des ténèbres !", 1),
+    ]),
+    "Mythic": (0x9400D3, [
+        ("🌌 Invocation Mythique", "Les dimensions s'effondrent autour de vous...", None, 1.5),
+        ("✨ Invocation Mythique", "Une énergie mythique consume l'espace...", None, 1.5),
+        ("💥 🌠 Invocation Mythique", "Une entité d'un autre monde se matérialise !",
+         "Plusieurs entités d'un autre monde se matérialisent !", 1),
+    ]),
+    "Titan": (0xdc143c, [
+        ("🔱 Invocation Titanesque", "La réalité tremble sous une force colossale...", None, 2),
+        ("⚡ Invocation Titanesque", "Des énergies titanesques percent les dimensions...", None, 2),
+        ("🪙 🔱 Invocation Titanesque", "Un titan légendaire émerge des abysses du pouvoir !",
+         "Des titans légendaires émergent des abysses du pouvoir !", 1.5),
+    ]),
+    "Fusion": (0xff1493, [
+        ("⭐ Invocation Ultime", "L'univers entier s'arrête de respirer...", None, 2.5),
+        ("💫 Invocation Ultime", "Une confrontation épique transcende toute existence...", None, 2.5),
+        ("✨ ⭐ Invocation Ultime", "Un duel légendaire se matérialise dans toute sa gloire !",
+         "Plusieurs duels légendaires se matérialisent dans toute sa gloire !", 2),
+    ]),
+    "Secret": (0x000000, [
+        ("🌑 Invocation Secrète", "Le vide absolu avale la réalité elle-même...", None, 3),
+        ("🖤 Invocation Secrète", "Les secrets oubliés de l'existence se révèlent...", None, 3),
+        ("💀 🌑 Invocation Secrète", "Un être transcendant toute comprehension émerge des ténèbres éternelles !",
+         "Des êtres transcendants toute comprehension émergent des ténèbres éternelles !", 2.5),
+    ]),
+}
+
+
 async def play_summoning_animation(interaction_or_ctx, character_rarity: str, is_multiple: bool = False):
-    """Play dramatic animation for legendary, mythical, titan and duo character summons"""
-    if character_rarity == "Legendary":
-        # Stage 1
-        embed1 = discord.Embed(title="⚡ Invocation Légendaire", 
-                              description="L'air devient électrique...", 
-                              color=0xFFD700)
-        await interaction_or_ctx.followup.send(embed=embed1, ephemeral=False)
-        await asyncio.sleep(1.5)
-        
-        # Stage 2  
-        embed2 = discord.Embed(title="🔥 Invocation Légendaire", 
-                              description=f"{'Des forces ancestrales approchent' if is_multiple else 'Une force ancestrale approche'}...", 
-                              color=0xFFD700)
-        await interaction_or_ctx.followup.send(embed=embed2, ephemeral=False)
-        await asyncio.sleep(1.5)
-        
-        # Stage 3
-        embed3 = discord.Embed(title="🔶 Invocation Légendaire", 
-                              description=f"{'Des héros légendaires surgissent' if is_multiple else 'Un héros légendaire surgit'} des ténèbres !", 
-                              color=0xFFD700)
-        await interaction_or_ctx.followup.send(embed=embed3, ephemeral=False)
-        await asyncio.sleep(1)
-    elif character_rarity == "Mythic":
-        # Stage 1
-        embed1 = discord.Embed(title="🌌 Invocation Mythique", 
-                              description="Les dimensions s'effondrent autour de vous...", 
-                              color=0x9400D3)
-        await interaction_or_ctx.followup.send(embed=embed1, ephemeral=False)
-        await asyncio.sleep(1.5)
-        
-        # Stage 2
-        embed2 = discord.Embed(title="✨ Invocation Mythique", 
-                              description="Une énergie mythique consume l'espace...", 
-                              color=0x9400D3)
-        await interaction_or_ctx.followup.send(embed=embed2, ephemeral=False)
-        await asyncio.sleep(1.5)
-        
-        # Stage 3
-        embed3 = discord.Embed(title="💥 🌠 Invocation Mythique", 
-                              description=f"{'Plusieurs entités' if is_multiple else 'Une entité'} d'un autre monde se matérialise{'nt' if is_multiple else ''} !", 
-                              color=0x9400D3)
-        await interaction_or_ctx.followup.send(embed=embed3, ephemeral=False)
-        await asyncio.sleep(1)
-    elif character_rarity == "Titan":
-        # Stage 1
-        embed1 = discord.Embed(title="🔱 Invocation Titanesque", 
-                              description="La réalité tremble sous une force colossale...", 
-                              color=0xdc143c)
-        await interaction_or_ctx.followup.send(embed=embed1, ephemeral=False)
-        await asyncio.sleep(2)
-        
-        # Stage 2
-        embed2 = discord.Embed(title="⚡ Invocation Titanesque", 
-                              description="Des énergies titanesques percent les dimensions...", 
-                              color=0xdc143c)
-        await interaction_or_ctx.followup.send(embed=embed2, ephemeral=False)
-        await asyncio.sleep(2)
-        
-        # Stage 3
-        embed3 = discord.Embed(title="🪙 🔱 Invocation Titanesque", 
-                              description=f"{'Des titans légendaires' if is_multiple else 'Un titan légendaire'} émerge{'nt' if is_multiple else ''} des abysses du pouvoir !", 
-                              color=0xdc143c)
-        await interaction_or_ctx.followup.send(embed=embed3, ephemeral=False)
-        await asyncio.sleep(1.5)
-    elif character_rarity == "Fusion":
-        # Stage 1
-        embed1 = discord.Embed(title="⭐ Invocation Ultime", 
-                              description="L'univers entier s'arrête de respirer...", 
-                              color=0xff1493)
-        await interaction_or_ctx.followup.send(embed=embed1, ephemeral=False)
-        await asyncio.sleep(2.5)
-        
-        # Stage 2
-        embed2 = discord.Embed(title="💫 Invocation Ultime", 
-                              description="Une confrontation épique transcende toute existence...", 
-                              color=0xff1493)
-        await interaction_or_ctx.followup.send(embed=embed2, ephemeral=False)
-        await asyncio.sleep(2.5)
-        
-        # Stage 3
-        embed3 = discord.Embed(title="✨ ⭐ Invocation Ultime", 
-                              description=f"{'Plusieurs duels' if is_multiple else 'Un duel'} légendaire{'s' if is_multiple else ''} se matérialise{'nt' if is_multiple else ''} dans toute sa gloire !", 
-                              color=0xff1493)
-        await interaction_or_ctx.followup.send(embed=embed3, ephemeral=False)
-        await asyncio.sleep(2)
-    elif character_rarity == "Secret":
-        # Stage 1
-        embed1 = discord.Embed(title="🌑 Invocation Secrète", 
-                              description="Le vide absolu avale la réalité elle-même...", 
-                              color=0x000000)
-        await interaction_or_ctx.followup.send(embed=embed1, ephemeral=False)
-        await asyncio.sleep(3)
-        
-        # Stage 2
-        embed2 = discord.Embed(title="🖤 Invocation Secrète", 
-                              description="Les secrets oubliés de l'existence se révèlent...", 
-                              color=0x000000)
-        await interaction_or_ctx.followup.send(embed=embed2, ephemeral=False)
-        await asyncio.sleep(3)
-        
-        # Stage 3
-        embed3 = discord.Embed(title="💀 🌑 Invocation Secrète", 
-                              description=f"{'Des êtres' if is_multiple else 'Un être'} transcendant{'s' if is_multiple else ''} toute comprehension émerge{'nt' if is_multiple else ''} des ténèbres éternelles !", 
-                              color=0x000000)
-        await interaction_or_ctx.followup.send(embed=embed3, ephemeral=False)
-        await asyncio.sleep(2.5)
-    else:
+    """Play dramatic animation for legendary, mythical, titan and duo character summons
+
+    Frames edit a single message through the outbound queue; when the channel is
+    close to its rate limit the intermediate frames are skipped."""
+    animation = SUMMONING_ANIMATIONS.get(character_rarity)
+    if not animation:
         # Small delay for other rarities to maintain smooth flow
         await asyncio.sleep(0.5)
+        return
+
+    color, frames = animation
+    route = route_for(interaction_or_ctx)
+    message = None
+    for index, (title, description, multiple_description, delay) in enumerate(frames):
+        is_last = index == len(frames) - 1
+        if not is_last and outbound.is_hot(route):
+            outbound.note_collapsed()
+            continue
+
+        if is_multiple and multiple_description:
+            description = multiple_description
+        embed = discord.Embed(title=title, description=description, color=color)
+
+        if message is None:
+            try:
+                message = await outbound.followup(interaction_or_ctx, embed=embed, ephemeral=False,
+                                                  priority=PRIORITY_COSMETIC)
+            except discord.HTTPException as e:
+                logger.warning(f"Summoning animation frame failed: {e}")
+        else:
+            # Not awaited: the result embed must not wait behind a cosmetic frame
+            outbound.edit(message, embed=embed, priority=PRIORITY_COSMETIC)
+        await asyncio.sleep(delay)
 
 
 async def setup_slash_commands(bot):
@@ -161,8 +126,16 @@ async def setup_slash_commands(bot):
     async def roll_slash(interaction: discord.Interaction,
                          amount: Optional[int] = 1):
         """Slash command for rolling characters"""
+        async with user_gate.guard(interaction.user.id, 'roll') as admitted:
+            if not admitted:
+                await reject_interaction(interaction)
+                return
+            await roll_characters(interaction, amount)
+
+    async def roll_characters(interaction: discord.Interaction, amount: Optional[int]):
+        user_id = interaction.user.id
+        claimed = rolled = False
         try:
-            user_id = interaction.user.id
             username = get_display_name(interaction.user)
 
             # Validate amount
@@ -174,6 +147,15 @@ async def setup_slash_commands(bot):
                     ephemeral=True)
                 return
 
+            # Cooldown check in memory, before any database access
+            cooldown_remaining = roll_cooldowns.try_acquire(user_id)
+            if cooldown_remaining > 0:
+                await interaction.response.send_message(
+                    f"⏰ Invocation en recharge! Réessayez dans {cooldown_remaining:.1f} secondes.",
+                    ephemeral=True)
+                return
+            claimed = True
+
             # Get player
             player = await bot.db.get_or_create_player(user_id, username)
 
@@ -183,33 +165,6 @@ async def setup_slash_commands(bot):
                     "❌ Vous êtes banni du bot.", ephemeral=True)
                 return
 
-            # Check cooldown - use the last character's rarity if available
-            if player.last_reroll:
-                from modules.utils import get_rarity_cooldown
-                
-                # Get the last rolled character's rarity to determine cooldown
-                cursor = await bot.db.db.execute("""
-                    SELECT c.rarity FROM inventory i
-                    JOIN characters c ON i.character_id = c.id
-                    WHERE i.user_id = ?
-                    ORDER BY i.id DESC LIMIT 1
-                """, (user_id,))
-                last_char = await cursor.fetchone()
-                
-                if last_char:
-                    last_rarity = last_char[0]
-                    cooldown_time = get_rarity_cooldown(last_rarity)
-                else:
-                    cooldown_time = BotConfig.REROLL_COOLDOWN
-                
-                cooldown_remaining = get_cooldown_remaining(
-                    player.last_reroll, int(cooldown_time))
-                if cooldown_remaining > 0:
-                    await interaction.response.send_message(
-                        f"⏰ Invocation en recharge! Réessayez dans {cooldown_remaining:.1f} secondes.",
-                        ephemeral=True)
-                    return
-
             # Check coins
             cost = BotConfig.REROLL_COST * amount
             if player.coins < cost:
@@ -243,7 +198,10 @@ async def setup_slash_commands(bot):
             new_coins = player.coins - cost
             current_time = datetime.now().isoformat()
             await bot.db.update_player_coins(user_id, new_coins)
-            await bot.db.update_player_reroll_stats(user_id, current_time)
+            # The rarest character of the batch sets the cooldown
+            rarest = max(rolled_characters, key=lambda c: rarity_tiers.rank(c.rarity))
+            await bot.db.update_player_reroll_stats(user_id, current_time, rarest.rarity)
+            rolled = True
             
             # Check for newly completed sets
             newly_completed_sets = await bot.db.check_and_complete_sets(user_id)
@@ -383,7 +341,7 @@ async def setup_slash_commands(bot):
 
             embed.set_footer(text=f"Shadow Roll • {BotConfig.VERSION}")
 
-            await interaction.followup.send(embed=embed)
+            await outbound.followup(interaction, embed=embed, priority=PRIORITY_INTERACTION)
 
         except Exception as e:
             logger.error(f"Error in roll slash command: {e}")
@@ -393,6 +351,9 @@ async def setup_slash_commands(bot):
             else:
                 await interaction.followup.send(
                     "❌ Erreur lors de l'invocation.")
+        finally:
+            if claimed and not rolled:
+                roll_cooldowns.release(user_id)
 
     @bot.tree.command(name="profile",
                       description="Afficher votre profil Shadow Roll")
@@ -407,14 +368,12 @@ async def setup_slash_commands(bot):
 
             await interaction.response.defer()
 
-            # Sync stats and get player data
-            await bot.db.sync_player_stats(target_user_id)
-            player = await bot.db.get_or_create_player(target_user_id,
-                                                       username)
-            inventory_stats = await bot.db.get_inventory_stats(target_user_id)
+            # Player, collection and title in one read
+            snapshot = await bot.db.get_profile_snapshot(target_user_id, username)
+            inventory_stats = snapshot['inventory_stats']
 
             # Get selected title
-            selected_title = await bot.db.get_selected_title(target_user_id)
+            selected_title = snapshot['selected_title']
             title_display = ""
             if selected_title:
                 title_display = f"{selected_title['icon']} {selected_title['display_name']}\n"
@@ -428,12 +387,12 @@ async def setup_slash_commands(bot):
 
             embed.add_field(
                 name="🪙 ═══〔 Richesse des Ombres 〕═══ 🪙",
-                value=f"```\n{format_number(player.coins)} Shadow Coins\n```",
+                value=f"```\n{format_number(snapshot['coins'])} Shadow Coins\n```",
                 inline=True)
 
             embed.add_field(
                 name="🎲 ═══〔 Invocations 〕═══ 🎲",
-                value=f"```\n{format_number(player.total_rerolls)} total\n```",
+                value=f"```\n{format_number(snapshot['total_rerolls'])} total\n```",
                 inline=True)
 
             embed.add_field(
@@ -638,6 +597,7 @@ async def setup_slash_commands(bot):
             await interaction.response.defer()
             from modules.patch_notes import PatchNotesView
             view = PatchNotesView(bot, interaction.user.id)
+            await view.load()
             embed = await view.create_patch_notes_embed()
             await interaction.followup.send(embed=embed, view=view)
             
@@ -672,12 +632,16 @@ async def setup_slash_commands(bot):
 
     @bot.tree.command(name="recherche",
                       description="Système de recherche de personnages")
-    async def hunt_slash(interaction: discord.Interaction):
+    @app_commands.describe(personnage="Personnage à chercher dans la liste (optionnel)")
+    async def hunt_slash(interaction: discord.Interaction,
+                         personnage: Optional[str] = None):
         """Slash command for character hunt system"""
         try:
             await interaction.response.defer()
             from modules.hunt_system import CharacterHuntView
             view = CharacterHuntView(interaction.user.id, bot.db)
+            if personnage:
+                view.search_term = personnage
             await view.update_hunt_display(interaction)
             
         except Exception as e:
@@ -689,6 +653,41 @@ async def setup_slash_commands(bot):
                 await interaction.followup.send(
                     "❌ Erreur lors du chargement du système de recherche.")
 
+    @hunt_slash.autocomplete('personnage')
+    async def hunt_character_autocomplete(interaction: discord.Interaction, current: str):
+        return await name_index.character_choices(bot.db, current)
+
+    @bot.tree.command(name="lookcard",
+                      description="Afficher la carte d'un personnage")
+    @app_commands.describe(personnage="Nom du personnage")
+    async def lookcard_slash(interaction: discord.Interaction, personnage: str):
+        """Slash command for character card preview"""
+        try:
+            results = await bot.db.search_characters(personnage, limit=1)
+            if not results:
+                await interaction.response.send_message(
+                    f"❌ Aucun personnage trouvé pour '{personnage}'", ephemeral=True)
+                return
+
+            from core.models import Character
+            from modules.admin_legacy_commands import create_character_card_embed
+            row = results[0]
+            character = Character(id=row['id'], name=row['name'], anime=row['anime'],
+                                  rarity=row['rarity'], value=row['value'],
+                                  image_url=row['image_url'])
+            embed = create_character_card_embed(character, interaction.user)
+            await interaction.response.send_message(embed=embed)
+
+        except Exception as e:
+            logger.error(f"Error in lookcard slash command: {e}")
+            if not interaction.response.is_done():
+                await interaction.response.send_message(
+                    "❌ Erreur lors de l'affichage de la carte.", ephemeral=True)
+
+    @lookcard_slash.autocomplete('personnage')
+    async def lookcard_autocomplete(interaction: discord.Interaction, current: str):
+        return await name_index.character_choices(bot.db, current)
+
     @bot.tree.command(name="titres",
                       description="Gérer vos titres personnalisés et leurs bonus")
     async def titles_slash(interaction: discord.Interaction):
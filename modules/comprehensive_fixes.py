@@ -224,17 +224,11 @@ def enhanced_get_cooldown_remaining(last_action_time: Optional[str], cooldown_se
 # Correcteur de rareté
 def get_rarity_cooldown_safe(rarity: str) -> float:
     """Obtenir le cooldown de rareté de manière sécurisée"""
-    rare_cooldowns = {
-        'Mythic': 0.5,
-        'Titan': 0.5,
-        'Fusion': 0.5,
-        'Secret': 0.5
-    }
-    
-    if rarity in rare_cooldowns:
-        return rare_cooldowns[rarity]
-    
-    return BotConfig.REROLL_COOLDOWN
+    try:
+        from modules.utils import get_rarity_cooldown
+        return get_rarity_cooldown(rarity)
+    except Exception:
+        return BotConfig.REROLL_COOLDOWN
 
 async def setup_comprehensive_fixes(bot):
     """Configurer le système de corrections complètes"""
@@ -10,6 +10,7 @@ from typing import Optional, List, Dict, Any, Tuple
 import asyncio
 
 from core.config import BotConfig
+from core.user_gate import gated
 from modules.utils import format_number, get_display_name
 
 logger = logging.getLogger(__name__)
@@ -397,6 +398,7 @@ class CraftConfirmView(discord.ui.View):
         return interaction.user.id == self.user_id
     
     @discord.ui.button(label="✅ Confirmer", style=discord.ButtonStyle.success)
+    @gated('craft')
     async def confirm_craft(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Confirmer et effectuer l'évolution"""
         await interaction.response.defer()
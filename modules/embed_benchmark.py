@@ -0,0 +1,93 @@
+"""
+Microbenchmark of the menu embed templates
+Compares rebuilding each menu embed from scratch with rendering its precompiled template
+
+Usage: python -m modules.embed_benchmark --iterations 2000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from modules import text_styling
+from modules.embed_templates import EmbedTemplate
+from modules.menu import (classic_menu_template, index_characters_template, main_menu_template,
+                          profile_template, rankings_template)
+
+# Vue -> (builder, valeurs dynamiques d'un joueur type)
+VIEWS = {
+    'main_menu': (main_menu_template, {'username': 'ShadowMaster', 'coins': '12,450'}),
+    'classic_menu': (classic_menu_template, {'username': 'ShadowMaster', 'coins': '12,450'}),
+    'profile': (profile_template, {
+        'title_display': "◆ Maître des Ténèbres ◆\n",
+        'username': text_styling.style_username('ShadowMaster'),
+        'coins': '12,450', 'rerolls': '1,337', 'unique': 212, 'total': 845,
+        'rarity_text': "⬢ Mythic: 4\n◉ Legendary: 19\n◈ Epic: 57\n◇ Rare: 130\n◆ Common: 635\n",
+    }),
+    'rankings': (rankings_template('coins'), {}),
+    'index': (index_characters_template, {'owned': 212, 'total': 1480, 'percentage': '14.3'}),
+}
+
+STYLED_TEXTS = ["PROFIL DE L'OMBRE", "RICHESSE DES OMBRES", "INVOCATIONS", "COLLECTION",
+                "Satoru Gojo", "Jujutsu Kaisen", "Legendary", "ShadowMaster"]
+
+
+def _char_loop(text: str, style: str) -> str:
+    """The previous per-character transform, kept as the baseline"""
+    table = text_styling._TABLES[style]
+    result = ""
+    for char in text:
+        result += chr(table[ord(char)]) if ord(char) in table else char
+    return result
+
+
+def _measure(render, iterations: int) -> dict:
+    render()  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    render()
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return {'us_per_render': round(elapsed / iterations * 1e6, 2), 'peak_bytes': peak}
+
+
+def run_benchmark(iterations: int) -> dict:
+    results = {}
+    for name, (build, values) in VIEWS.items():
+        def rebuild():
+            # Ce que coûtait chaque clic: styles recalculés et embed reconstruit
+            text_styling._transform.cache_clear()
+            return EmbedTemplate(build).render(**values)
+
+        template = EmbedTemplate(build)
+        template.compile()
+        results[name] = {
+            'rebuild': _measure(rebuild, iterations),
+            'template': _measure(lambda: template.render(**values), iterations),
+        }
+
+    results['text_styling'] = {
+        'char_loop': _measure(lambda: [_char_loop(t, 'sans_serif_bold') for t in STYLED_TEXTS], iterations),
+        'translate': _measure(lambda: [text_styling._transform.__wrapped__('sans_serif_bold', t)
+                                       for t in STYLED_TEXTS], iterations),
+        'memoized': _measure(lambda: [text_styling.AnimeTextStyles.sans_serif_bold(t)
+                                      for t in STYLED_TEXTS], iterations),
+    }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark des templates d'embeds du menu")
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.iterations), indent=2))
+
+
+if __name__ == '__main__':
+    main()
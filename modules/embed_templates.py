@@ -0,0 +1,94 @@
+"""
+Embed templates for the Shadow Roll menus
+Static embed parts are compiled once; each render copies them and fills the per-user placeholders
+"""
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Embed keys whose text may hold {placeholders}
+_TEXT_KEYS = ('title', 'description', 'url')
+
+
+class EmbedTemplate:
+    """An embed built once by a builder; str.format placeholders are filled at render time"""
+
+    def __init__(self, build: Callable[[], discord.Embed]):
+        self._build = build
+        self._base: Optional[Dict[str, Any]] = None
+        self._slots: List[Tuple[Tuple[Any, ...], str]] = []
+
+    def compile(self):
+        """Run the builder and record where the placeholders are"""
+        base = self._build().to_dict()
+        slots = []
+        for key in _TEXT_KEYS:
+            if '{' in base.get(key, ''):
+                slots.append(((key,), base[key]))
+        for section in ('footer', 'author'):
+            text_key = 'text' if section == 'footer' else 'name'
+            if '{' in base.get(section, {}).get(text_key, ''):
+                slots.append(((section, text_key), base[section][text_key]))
+        for index, field in enumerate(base.get('fields', [])):
+            for key in ('name', 'value'):
+                if '{' in field[key]:
+                    slots.append((('fields', index, key), field[key]))
+        self._base = base
+        self._slots = slots
+
+    def render(self, **values) -> discord.Embed:
+        """A fresh embed with the placeholders filled; safe to add fields or set a footer on"""
+        if self._base is None:
+            self.compile()
+        data = dict(self._base)
+        # from_dict keeps references: copy what add_field/set_field_at would mutate
+        if 'fields' in data:
+            data['fields'] = [dict(field) for field in data['fields']]
+        for section in ('footer', 'author'):
+            if section in data:
+                data[section] = dict(data[section])
+        for path, text in self._slots:
+            target = data
+            for key in path[:-1]:
+                target = target[key]
+            target[path[-1]] = text.format_map(values)
+        return discord.Embed.from_dict(data)
+
+
+class EmbedTemplateCache:
+    """Named embed templates, compiled on first use"""
+
+    def __init__(self):
+        self._templates: Dict[str, EmbedTemplate] = {}
+        self.stats = {'compiled': 0, 'rendered': 0}
+
+    def template(self, key: str, build: Callable[[], discord.Embed]) -> EmbedTemplate:
+        template = self._templates.get(key)
+        if template is None:
+            template = EmbedTemplate(build)
+            template.compile()
+            self._templates[key] = template
+            self.stats['compiled'] += 1
+        return template
+
+    def render(self, key: str, build: Callable[[], discord.Embed], **values) -> discord.Embed:
+        """Render the template registered under key, compiling it with build the first time"""
+        self.stats['rendered'] += 1
+        return self.template(key, build).render(**values)
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one template, or all of them (e.g. after a rarity color edit)"""
+        if key is None:
+            self._templates.clear()
+        else:
+            self._templates.pop(key, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, 'templates': len(self._templates)}
+
+
+# Global embed template cache
+embed_templates = EmbedTemplateCache()
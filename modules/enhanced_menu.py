@@ -10,6 +10,7 @@ import random
 from typing import Dict, List, Optional
 from datetime import datetime
 from core.config import BotConfig
+from core.effects import effects_engine
 from modules.utils import format_number, get_display_name
 from modules.utils import get_display_name
 
@@ -80,20 +81,17 @@ class EnhancedMenuView(discord.ui.View):
             # Vérifier les effets actifs
             try:
                 active_effects = []
-                if hasattr(self.bot.db, 'db'):
-                    cursor = await self.bot.db.db.execute(
-                        "SELECT buff_type, expires_at FROM temporary_buffs WHERE user_id = ? AND expires_at > ?",
-                        (self.user_id, int(datetime.now().timestamp()))
-                    )
-                    buffs = await cursor.fetchall()
-                    for buff in buffs:
-                        remaining_time = buff[1] - int(datetime.now().timestamp())
-                        if remaining_time > 0:
-                            hours = remaining_time // 3600
-                            minutes = (remaining_time % 3600) // 60
-                            time_str = f"{hours}h{minutes:02d}m" if hours > 0 else f"{minutes}m"
-                            effect_name = buff[0].replace('_', ' ').title()
-                            active_effects.append(f"✨ {effect_name} ({time_str})")
+                now = int(datetime.now().timestamp())
+                for buff in effects_engine.active(self.user_id):
+                    if buff.expires_at is None:
+                        continue
+                    remaining_time = int(buff.expires_at) - now
+                    if remaining_time > 0:
+                        hours = remaining_time // 3600
+                        minutes = (remaining_time % 3600) // 60
+                        time_str = f"{hours}h{minutes:02d}m" if hours > 0 else f"{minutes}m"
+                        effect_name = buff.kind.replace('_', ' ').title()
+                        active_effects.append(f"✨ {effect_name} ({time_str})")
                 
                 if active_effects:
                     effects_text = "```ansi\n\u001b[1;32m🪙 EFFETS MAGIQUES ACTIFS:\u001b[0m\n"
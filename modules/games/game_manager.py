@@ -9,6 +9,8 @@ from typing import Dict, Optional
 
 from .would_you_rather import WouldYouRatherGame
 from .game_stats import GameStatsManager
+from .question_bank import QuestionBank
+from .scheduler import game_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +20,11 @@ class GameManager:
     def __init__(self, bot):
         self.bot = bot
         self.active_games: Dict[int, WouldYouRatherGame] = {}  # channel_id -> game
-        self.stats_manager = GameStatsManager()
+        # Statistiques partagées par toutes les parties, sur la connexion du bot
+        self.stats_manager = GameStatsManager(getattr(bot, 'db', None))
+        self.question_bank = QuestionBank(getattr(bot, 'db', None))
+        # Toutes les parties sont pilotées par le même ordonnanceur
+        self.scheduler = game_scheduler
         
     async def setup_commands(self):
         """Configuration des commandes de jeu"""
@@ -274,5 +280,8 @@ class ThemeSelectionView(discord.ui.View):
 async def setup_game_manager(bot):
     """Initialiser le gestionnaire de jeu"""
     game_manager = GameManager(bot)
+    await game_manager.stats_manager.initialize_database()
+    await game_manager.question_bank.initialize()
     await game_manager.setup_commands()
+    bot.game_manager = game_manager
     return game_manager
\ No newline at end of file
@@ -0,0 +1,218 @@
+"""
+Test de charge de l'ordonnanceur des jeux
+Lance des centaines de parties "Tu préfères" sur des salons Discord simulés
+
+Usage: python -m modules.games.load_test --games 500 --rounds 3 --voting-time 2
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from collections import deque
+
+import discord
+
+from core.outbound import OutboundQueue
+
+from .game_manager import GameManager
+from .game_stats import GameStatsManager
+from .scheduler import GameScheduler
+from .would_you_rather import WouldYouRatherGame
+
+_ids = itertools.count(1)
+
+
+class FakeMember:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.display_name = f"Player{user_id}"
+        self.mention = f"<@{user_id}>"
+
+
+class FakeGuild:
+    def __init__(self):
+        self.members = {}
+
+    def get_member(self, user_id: int):
+        return self.members.setdefault(user_id, FakeMember(user_id))
+
+
+class FakeRateLimit(discord.HTTPException):
+    """429 simulé sans objet réponse aiohttp"""
+
+    def __init__(self, retry_after: float):
+        Exception.__init__(self, "429 Too Many Requests")
+        self.status = 429
+        self.code = 0
+        self.text = "rate limited"
+        self.retry_after = retry_after
+
+
+class FakeChannel:
+    """Salon simulé qui applique la limite Discord de 5 éditions / 5 secondes"""
+
+    def __init__(self, latency: float):
+        self.id = next(_ids)
+        self.guild = FakeGuild()
+        self.latency = latency
+        self.edit_times = deque()
+        self.edits = 0
+        self.rate_limited = 0
+
+    def check_rate_limit(self):
+        now = time.monotonic()
+        while self.edit_times and now - self.edit_times[0] > 5:
+            self.edit_times.popleft()
+        if len(self.edit_times) >= 5:
+            self.rate_limited += 1
+            raise FakeRateLimit(5 - (now - self.edit_times[0]))
+        self.edit_times.append(now)
+
+
+class FakeMessage:
+    def __init__(self, channel: FakeChannel):
+        self.id = next(_ids)
+        self.channel = channel
+
+    async def edit(self, **kwargs):
+        self.channel.check_rate_limit()
+        await asyncio.sleep(self.channel.latency * random.uniform(0.5, 1.5))
+        self.channel.edits += 1
+
+
+class FakeResponse:
+    def __init__(self, interaction):
+        self.interaction = interaction
+
+    async def send_message(self, **kwargs):
+        self.interaction.message = FakeMessage(self.interaction.channel)
+
+
+class FakeInteraction:
+    def __init__(self, channel: FakeChannel, user: FakeMember):
+        self.channel = channel
+        self.user = user
+        self.message = None
+        self.response = FakeResponse(self)
+
+    async def original_response(self):
+        return self.message
+
+
+class SyntheticQuestionBank:
+    """Banque de questions en mémoire, sans réseau"""
+
+    def __init__(self, size: int = 50):
+        self.questions = [
+            (f"Girl {i}A", f"Girl {i}B", f"https://example.invalid/{i}a.png",
+             f"https://example.invalid/{i}b.png", f"Anime {i % 7}", f"Anime {(i + 3) % 7}")
+            for i in range(size)
+        ]
+
+    async def get_questions(self, theme, banned_animes=()):
+        return list(self.questions)
+
+    async def validate_question(self, question):
+        await asyncio.sleep(0.005)
+        return question
+
+
+class FakeBot:
+    db = None
+
+
+async def _voter(game: WouldYouRatherGame, players: int):
+    """Simuler des joueurs qui cliquent pendant chaque fenêtre de vote"""
+    voters = [game.channel.guild.get_member(next(_ids)) for _ in range(players)]
+    voted_round = 0
+    while not game.is_game_stopped:
+        if game.phase == "voting" and game.is_active and voted_round != game.round_number:
+            voted_round = game.round_number
+            for voter in voters:
+                await game.vote(voter, random.choice(("left", "right")))
+        await asyncio.sleep(0.2)
+
+
+async def run_load_test(games: int, rounds: int, voting_time: int, players: int,
+                        latency: float, start_delay: float, results_delay: float) -> dict:
+    """Lancer les parties et retourner les statistiques de l'ordonnanceur"""
+    db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    db_file.close()
+
+    manager = GameManager(FakeBot())
+    manager.stats_manager = GameStatsManager(db_path=db_file.name)
+    manager.question_bank = SyntheticQuestionBank()
+    manager.scheduler = GameScheduler(OutboundQueue())
+    await manager.stats_manager.initialize_database()
+
+    WouldYouRatherGame.START_DELAY = start_delay
+    WouldYouRatherGame.RESULTS_DELAY = results_delay
+
+    started_at = time.monotonic()
+    channels = []
+    voters = []
+    for _ in range(games):
+        channel = FakeChannel(latency)
+        host = channel.guild.get_member(next(_ids))
+        game = WouldYouRatherGame(
+            game_manager=manager, channel=channel, host=host, theme="anime_girl",
+            custom_rounds=rounds, custom_voting_time=voting_time
+        )
+        manager.active_games[channel.id] = game
+        await game.start_game(FakeInteraction(channel, host))
+        channels.append(channel)
+        voters.append(asyncio.create_task(_voter(game, players)))
+
+    # Mesurer le retard de la boucle pendant la charge
+    loop_lag = []
+    while manager.active_games or manager.scheduler.outbound.pending_count:
+        before = time.monotonic()
+        await asyncio.sleep(0.1)
+        loop_lag.append(time.monotonic() - before - 0.1)
+
+    await asyncio.gather(*voters)
+    elapsed = time.monotonic() - started_at
+    stats = manager.scheduler.get_stats()
+    await manager.scheduler.stop()
+    await manager.scheduler.outbound.stop()
+    await manager.stats_manager.close()
+    os.unlink(db_file.name)
+
+    loop_lag.sort()
+    stats.update({
+        'games': games,
+        'rounds': rounds,
+        'elapsed_s': round(elapsed, 2),
+        'discord_edits': sum(c.edits for c in channels),
+        'discord_429': sum(c.rate_limited for c in channels),
+        'loop_lag_p99_ms': loop_lag[int(len(loop_lag) * 0.99)] * 1000 if loop_lag else 0.0,
+    })
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge de l'ordonnanceur des jeux")
+    parser.add_argument('--games', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--voting-time', type=int, default=2)
+    parser.add_argument('--players', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.05, help="latence simulée d'une édition (s)")
+    parser.add_argument('--start-delay', type=float, default=1.0)
+    parser.add_argument('--results-delay', type=float, default=1.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    stats = asyncio.run(run_load_test(
+        args.games, args.rounds, args.voting_time, args.players,
+        args.latency, args.start_delay, args.results_delay
+    ))
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Banque de questions du jeu "Tu préfères"
+Questions stockées en base, indexées par thème et par anime
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import aiosqlite
+
+from core.cache import bot_cache
+
+logger = logging.getLogger(__name__)
+
+# (option_a, option_b, image_a, image_b, anime_a, anime_b)
+Question = Tuple[str, str, Optional[str], Optional[str], str, str]
+
+# Questions de départ, synchronisées dans la table wyr_questions au démarrage.
+# Format: ("Personnage A", "Personnage B", "URL image A", "URL image B")
+# L'anime de chaque personnage est retrouvé dans la table characters.
+SEED_QUESTIONS = {
+    "anime_girl": [
+        # ========================================
+        # PERSONNAGES FÉMININS - SYNCHRONISATION FINALE
+        # Images récupérées depuis la base de données Shadow Roll
+        # 23 matchups de haute qualité
+        # 22 animes représentés
+        # ========================================
+        # Question 1: Oshi no Ko vs Blue Lock
+        ("Ai Hoshino", "Anri Teieri", "https://cdn.discordapp.com/attachments/1391191728261824552/1391207429835985008/Carte_-_Shadow_Roll7.png?ex=686b0e62&is=6869bce2&hm=4acca556fc88e3a5040e785bac82ac75ea423d890e810266ed4ffbf31516febb&", "https://media.discordapp.net/attachments/1389028777195212922/1389068911324037261/Carte_-_Shadow_Roll20.png?ex=6867e3fc&is=6866927c&hm=2b636ca95fb7908458f3690f342fab20283546a34d7070cd5a42a36265779eea&=&format=webp&quality=lossless&width=910&height=512"),
+        # Question 2: My Deer Friend Nekotan vs Death Note
+        ("Torako Koshi", "Misa Amane", "https://cdn.discordapp.com/attachments/1391191728261824552/1391204482163150868/Carte_-_Shadow_Roll5.png?ex=686b0ba3&is=6869ba23&hm=0e2e4f09b536186cbc5ab3d9def8242d2aa19a476d74a9370bf6dff4713f2480&", "https://cdn.discordapp.com/attachments/1390081153226113124/1390413761910800604/Carte_-_Shadow_Roll_43.png?ex=6868d3f9&is=68678279&hm=a464006119c585dad5a9328195a4e9b9715235d182192ab6a95eb2472696bc51&"),
+        # Question 3: Chainsaw Man vs Fairy Tail
+        ("Makima", "Erza Scarlet", "https://cdn.discordapp.com/attachments/1390074934142828574/1390417188556374057/Carte_-_Shadow_Roll_36.gif?ex=6868d72a&is=686785aa&hm=4807807c19c727aea13bb38493a748978ae54367a482f3f57054df4ace9f361f&", "https://cdn.discordapp.com/attachments/1390082622134292551/1390409355928666172/Carte_-_Shadow_Roll_38.png?ex=6868cfdf&is=68677e5f&hm=29e1e9a58043e46aedc7228b5877b550f1307a0c288e84056cf53003a243e0fb&"),
+        # Question 4: My Deer Friend Nekotan vs Re Zero
+        ("Anko Koshi", "Emilia", "https://cdn.discordapp.com/attachments/1391191728261824552/1391204797037936661/Carte_-_Shadow_Roll6.png?ex=686b0bee&is=6869ba6e&hm=39c2ea2bb514401d9d2fa130a86c159edd480489052182b28609f353620c7300&", "https://cdn.discordapp.com/attachments/1391191728261824552/1391570243863838871/Carte_-_Shadow_Roll9.png?ex=686d0908&is=686bb788&hm=f83db4d274e717d5625960617f58e3609c81cf605286096be031bb16d4a0799d&"),
+        # Question 5: JoJo's Bizarre Adventure vs My Deer Friend Nekotan
+        ("Jolyne Cujoh", "Noko Shikanoko", "https://media.discordapp.net/attachments/1389008376385634425/1389018314054832138/Carte_-_Shadow_Roll_3.png?ex=6863179c&is=6861c61c&hm=55ae8e942a760d9289bb9a66f47955a167c1987a67a7b7aafdf251a7eae73cc4&=&format=webp&quality=lossless&width=1635&height=920", "https://cdn.discordapp.com/attachments/1391191728261824552/1391204199294959780/Carte_-_Shadow_Roll4.png?ex=686b0b60&is=6869b9e0&hm=d999007ba54088f26a8132c495de87d7cb04f6c9af596f23b9d22339215117b6&"),
+        # Question 6: Black Clover vs Demon Slayer
+        ("Noelle Silva", "Shinobu Kocho", "https://cdn.discordapp.com/attachments/1390074451290493099/1390422774471725166/Carte_-_Shadow_Roll_50.png?ex=6868dc5e&is=68678ade&hm=1c7694db4423e130e18c6f0c400a2c2144f9371f869283d2d4b5cae0561e0f15&", "https://cdn.discordapp.com/attachments/1389031039879610408/1391137505901809824/Carte_-_Shadow_Roll_72.png?ex=686acd43&is=68697bc3&hm=520584e8257d991ed5f26f9fd809770ab2c98603a8dd1b1f722aadd541c29427&"),
+        # Question 7: Sword Art Online vs Demon Slayer
+        ("Sinon", "Mitsuri Kanroji", "https://cdn.discordapp.com/attachments/1389030937710563358/1389073763798224958/Carte_-_Shadow_Roll25.png?ex=68669701&is=68654581&hm=f6264fb0ebccdfc293913bd45d453455b737310c5271687aba00edeb62d56974&", "https://cdn.discordapp.com/attachments/1389031039879610408/1391135731547635856/Carte_-_Shadow_Roll_70.png?ex=686acb9c&is=68697a1c&hm=7e1f8fe35736b17e5671a0e717b2c5f8a1571b2b969491df94af1fe7e35286af&"),
+        # Question 8: Chainsaw Man vs Sword Art Online
+        ("Power", "Asuna", "https://cdn.discordapp.com/attachments/1390074934142828574/1390416599466508390/Carte_-_Shadow_Roll_45.png?ex=6868d69e&is=6867851e&hm=50ffcd134719790f261b8d89dae067ee4faeef670c30db3b150b2867b1491432&", "Asuna"),
+        # Question 9: Naruto vs Demon Slayer
+        ("Sakura Haruno", "Nezuko Kamado", "https://cdn.discordapp.com/attachments/1389031204539465846/1390805413921820732/Carte_-_Shadow_Roll6.png?ex=686a40ba&is=6868ef3a&hm=899804f1e77aee58b2d35d998c14bd62730328780bb6a780452d5196a3adc589&", "https://cdn.discordapp.com/attachments/1389031039879610408/1391137359973711872/Carte_-_Shadow_Roll_71.png?ex=686acd20&is=68697ba0&hm=9e6c95394384c1dbb04d779ddb8d3a5b63bdac78de3a0983654afef26c0b9ed5&"),
+        # Question 10: Oshi no Ko vs One Punch Man
+        ("Ruby Hoshino", "Fubuki", "https://cdn.discordapp.com/attachments/1391191728261824552/1391208352138133704/Carte_-_Shadow_Roll14.gif?ex=686b0f3e&is=6869bdbe&hm=3b6c59cfba47288c952209de95742c1744408086ab08cdf6ce2dee00dd3e5ab4&", "https://cdn.discordapp.com/attachments/1391191728261824552/1391193994205335605/Carte_-_Shadow_Roll2.png?ex=686b01df&is=6869b05f&hm=dc174c1c4fe1440f839ea6943a2b8cc56ed9f6a1ae5680b8914bdbb58c90be32&"),
+        # Question 11: The Eminence in Shadow vs Call Of The Night
+        ("Alexia Midgar", "Midori Kohakobe", "https://cdn.discordapp.com/attachments/1389124349189161071/1391132961591791667/Carte_-_Shadow_Roll_66.png?ex=686ac908&is=68697788&hm=e3eb2415c5293ac8380de26e055b09cdc3ff52a8ce989f246e7b120d3e195e2b&", "https://cdn.discordapp.com/attachments/1391191728261824552/1391574918692339842/Carte_-_Shadow_Roll15.png?ex=686d0d62&is=686bbbe2&hm=0dbb461d616bd71f7c1230cb57438b95ea09dc753328c89c04090e02b97fe6d1&"),
+        # Question 12: The Eminence in Shadow vs Spy x Family
+        ("Iris Midgar", "Anya Forger", "https://cdn.discordapp.com/attachments/1389124349189161071/1391126498856927272/Carte_-_Shadow_Roll_61.png?ex=686ac303&is=68697183&hm=d09abe1034463f0492e2019722851b659c14027135361974d6ab6c0f4a8aa882&", "https://media.discordapp.net/attachments/1390074865280876615/1390298557789114378/Carte_-_Shadow_Roll_30.png?ex=6867bfee&is=68666e6e&hm=3993a5c8e35c23ca8bc9d0731d6e29e158dde1927a899ba907d4918f0fec6a38&=&format=webp&quality=lossless&width=910&height=512"),
+        # Question 13: Naruto vs Zenless Zone Zero
+        ("Hinata Hyuga", "Ellen Joe", "https://cdn.discordapp.com/attachments/1389031204539465846/1390758741921497249/image.png?ex=686a1543&is=6868c3c3&hm=a0855131f81b5d72b7716399aba47b4a42185c13c1474a635c80262703111085&", "https://cdn.discordapp.com/attachments/1389125558893412513/1390403280600830185/Carte_-_Shadow_Roll.gif?ex=68682176&is=6866cff6&hm=5f89e09e1559973942e8c32c56f9f625512486d101693cb41dd7c85921527532&"),
+        # Question 14: Re Zero vs Oshi no Ko
+        ("Rem", "Akane Kurokawa", "https://cdn.discordapp.com/attachments/1391191728261824552/1391569162589044859/Carte_-_Shadow_Roll19.gif?ex=686d0806&is=686bb686&hm=900c4690f8d522519d6d6e2f12c84b3e33b130c17c4e3a99b8fb0f6d42d7acee&", "https://media0.giphy.com/media/v1.Y2lkPTc5MGI3NjExbXd1YW41MWNzY3R0MjZrZHV5MWdnN3FqbTdqeXhyeGRwM2Y3dmN0NCZlcD12MV9pbnRlcm5hbF9naWZfYnlfaWQmY3Q9Zw/sHCifHTVkCqLmuMsww/giphy.gif"),
+        # Question 15: One Piece vs Konosuba
+        ("Boa Hancock", "Megumin", "https://cdn.discordapp.com/attachments/1390081108347191336/1391526713124454520/Carte_-_Shadow_Roll.png?ex=686c37bd&is=686ae63d&hm=dfb4cc30a521f6ab0ad7d287032634cc42a988df6620a27cb88c7d30108927e0&", "https://media.discordapp.net/attachments/1390072193463091200/1390297023806177301/Carte_-_Shadow_Roll_26.png?ex=6867be80&is=68666d00&hm=beb04c1b885daa5a60a1df0de484e1b19ae83f972d46724c03d31034dc51a92a&=&format=webp&quality=lossless&width=910&height=512"),
+        # Question 16: My Hero Academia vs Re Zero
+        ("Momo Yaoyorozu", "Ram", "https://cdn.discordapp.com/attachments/1389124669029875782/1390084533495398520/Carte_-_Shadow_Roll_24.png?ex=6866f89b&is=6865a71b&hm=7fe34120343ff96254795b595b7c476de98023cd0792be8a94366ebe8a3fc59e&", "https://cdn.discordapp.com/attachments/1391191728261824552/1391569269220839514/Carte_-_Shadow_Roll20.gif?ex=686d081f&is=686bb69f&hm=3f7b4f493538d576dbff84ec50bcdb345a133990c08ce9c442352b7c3f550ba9&"),
+        # Question 17: Call Of The Night vs Naruto
+        ("Seri Kikyo", "Tsunade", "https://cdn.discordapp.com/attachments/1391191728261824552/1391574574302232607/Carte_-_Shadow_Roll14.png?ex=686d0d10&is=686bbb90&hm=a2877d4a4712d0550c6729526c94e569bbfc6008ffaafaa20c5ad3e921f5a498&", "https://cdn.discordapp.com/attachments/1389031204539465846/1390806629666001036/Carte_-_Shadow_Roll9.png?ex=686a41dc&is=6868f05c&hm=7b1f73416591fcf051c1659bc576c13978d340658011b2502e340bc5f46b3696&"),
+        # Question 18: Call Of The Night vs One Piece
+        ("Nazuna Nanakusa", "Nami", "https://cdn.discordapp.com/attachments/1391191728261824552/1391205728601116742/Carte_-_Shadow_Roll12.gif?ex=686b0ccd&is=6869bb4d&hm=88e2396b0bb7ef0b8f01d5072132c1457f3aea5c381417550398a97898a981af&", "https://cdn.discordapp.com/attachments/1390081108347191336/1391146834407194624/Carte_-_Shadow_Roll_86.png?ex=686ad5f3&is=68698473&hm=c35e5bdff40bc8b537e21acee59faa1c3d1a2ab70443bdd503a877011a64b864&"),
+        # Question 19: My Hero Academia vs Fairy Tail
+        ("Tsuyu Asui", "Lucy Heartfilia", "https://cdn.discordapp.com/attachments/1389124669029875782/1390084613417865338/Carte_-_Shadow_Roll_25.png?ex=6866f8ae&is=6865a72e&hm=db7182258c9f84a8b2c8e92ba794501a2eaeec863f332c6105db516eb3c1e1f2&", "https://cdn.discordapp.com/attachments/1390082622134292551/1390409540767453284/Carte_-_Shadow_Roll_40.png?ex=6868d00b&is=68677e8b&hm=e185b34ee2ab4c48526ce22c31387b53462b46f77700c6cf60062e8ee158cbf9&"),
+        # Question 20: My Hero Academia vs Jujutsu Kaisen
+        ("Ochaco Uraraka", "Kasumi Miwa", "https://cdn.discordapp.com/attachments/1389124669029875782/1389151313408954439/Carte_-_Shadow_Roll_8.png?ex=6866367a&is=6864e4fa&hm=099b6299db0362b74cec390f12810a4c686d250ddd4bf09621c2dfbc75c014e1&", "https://cdn.discordapp.com/attachments/1391191728261824552/1391194913470943322/Carte_-_Shadow_Roll3.png?ex=686b02ba&is=6869b13a&hm=a5d9ce0ebb549ad9ccf057a6696772a9aaba671be637bc2ee3cbb97d73491e68&"),
+        # Question 21: Jujutsu Kaisen vs Attack on Titan
+        ("Nobara Kugisaki", "Historia Reiss", "https://cdn.discordapp.com/attachments/1390071426467500174/1390401699876700190/Carte_-_Shadow_Roll_36.png?ex=6868c8bd&is=6867773d&hm=b21a01f36516249629cf9c301f6fd3dbfcb591953a4e461c16a6e079c351b29f&", "https://cdn.discordapp.com/attachments/1389030758609584350/1389040743510704288/Carte_-_Shadow_Roll7.png?ex=68667840&is=686526c0&hm=105e409657055978515860dde7b65cdb10c8ee8b39a797490d668571b4800ce4&"),
+        # Question 22: Attack on Titan vs One Punch Man
+        ("Mikasa Ackerman", "Tatsumaki", "https://cdn.discordapp.com/attachments/1389030758609584350/1389035072937791528/Carte_-_Shadow_Roll2.png?ex=686672f8&is=68652178&hm=a5590e63d6c3a7d8ef9dd2649eed0c2798b14ad4015cc14fa4148739dd5ac293&", "https://cdn.discordapp.com/attachments/1391191728261824552/1391193591371792504/Carte_-_Shadow_Roll3.gif?ex=686b017f&is=6869afff&hm=8ad3fa91bd93af7e7ef820c97d72c3ae371af38d46eb6901a1bfa405f228d821&"),
+        # Question 23: Attack on Titan vs Spy x Family
+        ("Sasha Blouse", "Yor Forger", "https://cdn.discordapp.com/attachments/1389030758609584350/1389041311423795260/Carte_-_Shadow_Roll8.png?ex=686678c7&is=68652747&hm=08ca53f68faabdb5fa8cf8bdb0658cb02ddf55815a81f63603f8bd359e39d61e&", "https://media.discordapp.net/attachments/1390074865280876615/1390298568501235792/Carte_-_Shadow_Roll_31.png?ex=6867bff1&is=68666e71&hm=87101bee7469b1aa73186d0b3793fb73cdafcd9c2e4907e001463cde540f9c06&=&format=webp&quality=lossless&width=910&height=512"),
+    ]
+}
+
+IMAGE_CHECK_TTL = 600  # Les URLs du CDN Discord expirent, on revalide régulièrement
+
+
+def normalize_anime(anime: str) -> str:
+    """Clé de comparaison d'un nom d'anime (minuscules, sans espaces superflus)"""
+    return (anime or "").lower().strip()
+
+
+class QuestionBank:
+    """Questions du jeu en base, filtrées par requête ensembliste"""
+    
+    def __init__(self, db_manager=None, db_path: str = "shadow_roll.db", http=None):
+        self.db_manager = db_manager
+        self.db_path = db_path
+        self._own_db = None
+        self._http = http
+        self._initialized = False
+        self._anime_keys: Dict[str, List[str]] = {}  # theme -> clés d'anime connues
+        
+    async def _get_db(self) -> aiosqlite.Connection:
+        """Retourner la connexion partagée du bot, ou une connexion persistante"""
+        if self.db_manager is not None and self.db_manager.db is not None:
+            return self.db_manager.db
+        if self._own_db is None:
+            self._own_db = await aiosqlite.connect(self.db_path)
+        return self._own_db
+    
+    async def initialize(self):
+        """Créer les tables et synchroniser les questions de départ"""
+        if self._initialized:
+            return
+        
+        db = await self._get_db()
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS wyr_questions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                theme TEXT NOT NULL,
+                option_a TEXT NOT NULL,
+                option_b TEXT NOT NULL,
+                image_a TEXT,
+                image_b TEXT,
+                anime_a TEXT DEFAULT '',
+                anime_b TEXT DEFAULT '',
+                is_active INTEGER DEFAULT 1,
+                UNIQUE (theme, option_a, option_b)
+            )
+        ''')
+        # Un anime par ligne pour filtrer par index plutôt que par LIKE
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS wyr_question_animes (
+                theme TEXT NOT NULL,
+                anime_key TEXT NOT NULL,
+                question_id INTEGER NOT NULL,
+                PRIMARY KEY (theme, anime_key, question_id),
+                FOREIGN KEY (question_id) REFERENCES wyr_questions(id)
+            )
+        ''')
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_wyr_questions_theme ON wyr_questions(theme, is_active)")
+        
+        await self._sync_seed_questions(db)
+        await db.commit()
+        self._initialized = True
+        
+    async def _lookup_animes(self, db, names: Sequence[str]) -> Dict[str, str]:
+        """Retrouver l'anime de chaque personnage dans le catalogue"""
+        if not names:
+            return {}
+        try:
+            placeholders = ','.join('?' for _ in names)
+            cursor = await db.execute(
+                f"SELECT name, anime FROM characters WHERE name IN ({placeholders})",
+                list(names)
+            )
+            return {name: anime for name, anime in await cursor.fetchall()}
+        except Exception as e:
+            logger.warning(f"Could not resolve question animes from catalog: {e}")
+            return {}
+    
+    async def _sync_seed_questions(self, db):
+        """Insérer ou mettre à jour les questions de départ"""
+        for theme, questions in SEED_QUESTIONS.items():
+            names = {q[0] for q in questions} | {q[1] for q in questions}
+            animes = await self._lookup_animes(db, sorted(names))
+            
+            rows = [
+                (theme, q[0], q[1], q[2], q[3], animes.get(q[0], ''), animes.get(q[1], ''))
+                for q in questions
+            ]
+            await db.executemany('''
+                INSERT INTO wyr_questions (theme, option_a, option_b, image_a, image_b, anime_a, anime_b)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(theme, option_a, option_b) DO UPDATE SET
+                    image_a = excluded.image_a,
+                    image_b = excluded.image_b,
+                    anime_a = CASE WHEN excluded.anime_a != '' THEN excluded.anime_a ELSE anime_a END,
+                    anime_b = CASE WHEN excluded.anime_b != '' THEN excluded.anime_b ELSE anime_b END
+            ''', rows)
+        
+        await self._rebuild_anime_index(db)
+    
+    async def _rebuild_anime_index(self, db):
+        """Reconstruire la table d'index anime -> question"""
+        await db.execute("DELETE FROM wyr_question_animes")
+        await db.execute('''
+            INSERT OR IGNORE INTO wyr_question_animes (theme, anime_key, question_id)
+            SELECT theme, LOWER(TRIM(anime_a)), id FROM wyr_questions WHERE anime_a != ''
+            UNION
+            SELECT theme, LOWER(TRIM(anime_b)), id FROM wyr_questions WHERE anime_b != ''
+        ''')
+        self._anime_keys.clear()
+    
+    async def add_question(self, theme: str, option_a: str, option_b: str,
+                           image_a: str = None, image_b: str = None,
+                           anime_a: str = '', anime_b: str = '') -> int:
+        """Ajouter une question à la banque"""
+        db = await self._get_db()
+        cursor = await db.execute('''
+            INSERT INTO wyr_questions (theme, option_a, option_b, image_a, image_b, anime_a, anime_b)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (theme, option_a, option_b, image_a, image_b, anime_a, anime_b))
+        question_id = cursor.lastrowid
+        await db.executemany(
+            "INSERT OR IGNORE INTO wyr_question_animes (theme, anime_key, question_id) VALUES (?, ?, ?)",
+            [(theme, normalize_anime(anime), question_id) for anime in (anime_a, anime_b) if anime]
+        )
+        await db.commit()
+        self._anime_keys.pop(theme, None)
+        return question_id
+    
+    async def _known_anime_keys(self, theme: str) -> List[str]:
+        """Clés d'anime présentes pour un thème (petite liste, gardée en mémoire)"""
+        if theme not in self._anime_keys:
+            db = await self._get_db()
+            cursor = await db.execute(
+                "SELECT DISTINCT anime_key FROM wyr_question_animes WHERE theme = ?",
+                (theme,)
+            )
+            self._anime_keys[theme] = [row[0] for row in await cursor.fetchall()]
+        return self._anime_keys[theme]
+    
+    async def resolve_banned(self, theme: str, banned_animes: Sequence[str]) -> List[str]:
+        """Associer les noms saisis par l'utilisateur aux clés d'anime connues"""
+        banned_normalized = [normalize_anime(anime) for anime in banned_animes if anime.strip()]
+        if not banned_normalized:
+            return []
+        
+        known = await self._known_anime_keys(theme)
+        # Correspondance partielle dans les deux sens, comme "naruto" pour "naruto shippuden"
+        return [
+            key for key in known
+            if any(banned in key or key in banned for banned in banned_normalized)
+        ]
+    
+    async def get_questions(self, theme: str, banned_animes: Sequence[str] = ()) -> List[Question]:
+        """Questions du thème moins celles qui touchent un anime banni"""
+        await self.initialize()
+        db = await self._get_db()
+        banned_keys = await self.resolve_banned(theme, banned_animes or [])
+        
+        columns = "option_a, option_b, image_a, image_b, anime_a, anime_b"
+        if banned_keys:
+            placeholders = ','.join('?' for _ in banned_keys)
+            cursor = await db.execute(f'''
+                SELECT {columns} FROM wyr_questions
+                WHERE id IN (
+                    SELECT id FROM wyr_questions WHERE theme = ? AND is_active = 1
+                    EXCEPT
+                    SELECT question_id FROM wyr_question_animes
+                    WHERE theme = ? AND anime_key IN ({placeholders})
+                )
+                ORDER BY id
+            ''', (theme, theme, *banned_keys))
+        else:
+            cursor = await db.execute(
+                f"SELECT {columns} FROM wyr_questions WHERE theme = ? AND is_active = 1 ORDER BY id",
+                (theme,)
+            )
+        
+        return [tuple(row) for row in await cursor.fetchall()]
+    
+    async def is_image_alive(self, url: Optional[str]) -> bool:
+        """Vérifier qu'une image répond et se décode, avec cache court"""
+        if not url:
+            return False
+        
+        cache_key = f"wyr_image_{url}"
+        cached = bot_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        if self._http is None:
+            from core.http_client import http_client
+            self._http = http_client
+        
+        info = await self._http.sniff_image(url)
+        alive = info is not None
+        bot_cache.set(cache_key, alive, IMAGE_CHECK_TTL)
+        return alive
+    
+    async def validate_question(self, question: Question) -> Question:
+        """Retirer les images mortes d'une question pour ne jamais bloquer une manche"""
+        image_a_ok, image_b_ok = await asyncio.gather(
+            self.is_image_alive(question[2]),
+            self.is_image_alive(question[3])
+        )
+        if image_a_ok and image_b_ok:
+            return question
+        
+        logger.info(f"Dead image in question {question[0]} vs {question[1]}")
+        return (
+            question[0], question[1],
+            question[2] if image_a_ok else None,
+            question[3] if image_b_ok else None,
+            question[4], question[5]
+        )
+    
+    async def close(self):
+        """Fermer la connexion persistante si elle n'appartient pas au bot"""
+        if self._own_db is not None:
+            await self._own_db.close()
+            self._own_db = None
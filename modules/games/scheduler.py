@@ -0,0 +1,152 @@
+"""
+Ordonnanceur des jeux pour Shadow Roll Bot
+Une seule boucle pilote toutes les parties actives via un tas d'échéances
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from core.outbound import PRIORITY_NORMAL, OutboundQueue, outbound
+
+logger = logging.getLogger(__name__)
+
+
+class GameScheduler:
+    """Pilote toutes les parties depuis un seul tick: tas d'échéances partagé, éditions via la file sortante"""
+
+    def __init__(self, outbound_queue: Optional[OutboundQueue] = None, max_tick_interval: float = 1.0):
+        self.outbound = outbound_queue or outbound
+        self.max_tick_interval = max_tick_interval
+        self._heap = []  # (deadline, seq, game_key)
+        self._deadlines: Dict[int, float] = {}  # game_key -> échéance valide
+        self._games: Dict[int, Any] = {}
+        self._running_steps: Dict[int, asyncio.Task] = {}
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.tick_lag = deque(maxlen=10000)  # retard entre l'échéance et le déclenchement
+        self.steps_run = 0
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    def schedule(self, game, delay: float):
+        """Programmer la prochaine étape d'une partie (remplace l'échéance précédente)"""
+        self._ensure_running()
+        key = id(game)
+        deadline = time.monotonic() + delay
+        self._games[key] = game
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._seq), key))
+        self._wakeup.set()
+
+    def cancel(self, game):
+        """Retirer une partie de l'ordonnanceur (les entrées du tas sont ignorées paresseusement)"""
+        key = id(game)
+        self._deadlines.pop(key, None)
+        self._games.pop(key, None)
+
+    def edit(self, message, on_missing: Optional[Callable] = None, **kwargs):
+        """Mettre en file une édition de message (la dernière en attente gagne)"""
+        return self.outbound.edit(message, priority=PRIORITY_NORMAL, on_missing=on_missing, **kwargs)
+
+    @property
+    def active_games(self) -> int:
+        return len(self._deadlines)
+
+    async def _step(self, key: int, game):
+        try:
+            await game.on_deadline()
+        except Exception as e:
+            logger.error(f"Game step failed: {e}")
+            await self._abort(game)
+        finally:
+            self._running_steps.pop(key, None)
+            self.steps_run += 1
+
+    async def _abort(self, game):
+        """Terminer une partie dont l'étape a échoué: elle n'est plus reprogrammée et bloquerait son salon"""
+        self.cancel(game)
+        try:
+            await game.end_game()
+        except Exception as e:
+            logger.error(f"Error ending failed game: {e}")
+        finally:
+            game_manager = getattr(game, 'game_manager', None)
+            channel = getattr(game, 'channel', None)
+            if game_manager is not None and channel is not None \
+                    and game_manager.active_games.get(channel.id) is game:
+                del game_manager.active_games[channel.id]
+
+    def _pop_due(self, now: float):
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, key = heapq.heappop(self._heap)
+            if self._deadlines.get(key) != deadline:
+                continue  # Échéance remplacée ou partie annulée
+            del self._deadlines[key]
+            due.append((deadline, key))
+        return due
+
+    async def _run(self):
+        while True:
+            now = time.monotonic()
+
+            for deadline, key in self._pop_due(now):
+                game = self._games.get(key)
+                if game is None:
+                    continue
+                self.tick_lag.append(now - deadline)
+                # Chaque étape tourne dans sa propre tâche pour ne pas bloquer le tick
+                self._running_steps[key] = asyncio.create_task(self._step(key, game))
+
+            timeout = self.max_tick_interval
+            if self._heap:
+                timeout = min(timeout, max(0.0, self._heap[0][0] - time.monotonic()))
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistiques de l'ordonnanceur (retard de tick en millisecondes)"""
+        lags = sorted(self.tick_lag)
+
+        def percentile(p: float) -> float:
+            if not lags:
+                return 0.0
+            return lags[min(len(lags) - 1, int(len(lags) * p))] * 1000
+
+        return {
+            'active_games': self.active_games,
+            'heap_size': len(self._heap),
+            'running_steps': len(self._running_steps),
+            'steps_run': self.steps_run,
+            'tick_lag_p50_ms': percentile(0.50),
+            'tick_lag_p95_ms': percentile(0.95),
+            'tick_lag_p99_ms': percentile(0.99),
+            'tick_lag_max_ms': lags[-1] * 1000 if lags else 0.0,
+            'outbound': self.outbound.get_stats()
+        }
+
+    async def stop(self):
+        """Arrêter la boucle de l'ordonnanceur"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Ordonnanceur global partagé par toutes les parties
+game_scheduler = GameScheduler()
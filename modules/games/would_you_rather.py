@@ -13,6 +13,8 @@ if TYPE_CHECKING:
     from .game_manager import GameManager
 
 from .game_stats import GameStatsManager
+from .question_bank import QuestionBank
+from .scheduler import game_scheduler
 
 class GameConfigModal(ui.Modal, title="Configuration de la partie"):
     """Modal pour configurer une partie personnalisée"""
@@ -236,12 +238,12 @@ class StartGameView(ui.View):
         
         # Créer le jeu avec la configuration personnalisée
         game = WouldYouRatherGame(
-            interaction.channel, 
-            interaction.user.id, 
-            game_manager,
-            max_rounds=self.configured_rounds,
-            voting_time=self.configured_voting_time,
-            theme="anime_girl"
+            game_manager=game_manager,
+            channel=interaction.channel,
+            host=interaction.user,
+            theme="anime_girl",
+            custom_rounds=self.configured_rounds,
+            custom_voting_time=self.configured_voting_time
         )
         
         # Ajouter le jeu à la liste des jeux actifs
@@ -389,12 +391,12 @@ class ThemeStartGameView(ui.View):
         
         # Créer le jeu avec la configuration personnalisée du thème
         game = WouldYouRatherGame(
-            interaction.channel, 
-            interaction.user.id, 
-            game_manager,
-            max_rounds=self.configured_rounds,
-            voting_time=self.configured_voting_time,
+            game_manager=game_manager,
+            channel=interaction.channel,
+            host=interaction.user,
             theme="anime_girl",
+            custom_rounds=self.configured_rounds,
+            custom_voting_time=self.configured_voting_time,
             banned_animes=self.banned_animes
         )
         
@@ -429,66 +431,19 @@ class ThemeStartGameView(ui.View):
         await interaction.response.edit_message(embed=embed, view=self)
 
 class WouldYouRatherGame:
-    """Jeu Tu préfères avec système de votes et scoring"""
+    """Jeu Tu préfères avec système de votes et scoring
+    
+    La partie est une machine à états (countdown -> voting -> results -> ... -> ended)
+    avancée par l'ordonnanceur partagé à chaque échéance, sans coroutine endormie.
+    """
+    
+    START_DELAY = 15  # secondes avant la première manche
+    RESULTS_DELAY = 3  # secondes d'affichage des résultats
     
-    # Base de données des questions par thème avec métadonnées
+    # Métadonnées des thèmes (les questions sont dans la table wyr_questions)
     THEMES = {
         "anime_girl": {
             "name": "👧 Anime Girl",
-            "questions": [
-                # ========================================
-                # PERSONNAGES FÉMININS - SYNCHRONISATION FINALE
-                # Images récupérées depuis la base de données Shadow Roll
-                # 23 matchups de haute qualité
-                # 22 animes représentés
-                # ========================================
-                # Question 1: Oshi no Ko vs Blue Lock
-                ("Ai Hoshino", "Anri Teieri", "https://cdn.discordapp.com/attachments/1391191728261824552/1391207429835985008/Carte_-_Shadow_Roll7.png?ex=686b0e62&is=6869bce2&hm=4acca556fc88e3a5040e785bac82ac75ea423d890e810266ed4ffbf31516febb&", "https://media.discordapp.net/attachments/1389028777195212922/1389068911324037261/Carte_-_Shadow_Roll20.png?ex=6867e3fc&is=6866927c&hm=2b636ca95fb7908458f3690f342fab20283546a34d7070cd5a42a36265779eea&=&format=webp&quality=lossless&width=910&height=512"),
-                # Question 2: My Deer Friend Nekotan vs Death Note
-                ("Torako Koshi", "Misa Amane", "https://cdn.discordapp.com/attachments/1391191728261824552/1391204482163150868/Carte_-_Shadow_Roll5.png?ex=686b0ba3&is=6869ba23&hm=0e2e4f09b536186cbc5ab3d9def8242d2aa19a476d74a9370bf6dff4713f2480&", "https://cdn.discordapp.com/attachments/1390081153226113124/1390413761910800604/Carte_-_Shadow_Roll_43.png?ex=6868d3f9&is=68678279&hm=a464006119c585dad5a9328195a4e9b9715235d182192ab6a95eb2472696bc51&"),
-                # Question 3: Chainsaw Man vs Fairy Tail
-                ("Makima", "Erza Scarlet", "https://cdn.discordapp.com/attachments/1390074934142828574/1390417188556374057/Carte_-_Shadow_Roll_36.gif?ex=6868d72a&is=686785aa&hm=4807807c19c727aea13bb38493a748978ae54367a482f3f57054df4ace9f361f&", "https://cdn.discordapp.com/attachments/1390082622134292551/1390409355928666172/Carte_-_Shadow_Roll_38.png?ex=6868cfdf&is=68677e5f&hm=29e1e9a58043e46aedc7228b5877b550f1307a0c288e84056cf53003a243e0fb&"),
-                # Question 4: My Deer Friend Nekotan vs Re Zero
-                ("Anko Koshi", "Emilia", "https://cdn.discordapp.com/attachments/1391191728261824552/1391204797037936661/Carte_-_Shadow_Roll6.png?ex=686b0bee&is=6869ba6e&hm=39c2ea2bb514401d9d2fa130a86c159edd480489052182b28609f353620c7300&", "https://cdn.discordapp.com/attachments/1391191728261824552/1391570243863838871/Carte_-_Shadow_Roll9.png?ex=686d0908&is=686bb788&hm=f83db4d274e717d5625960617f58e3609c81cf605286096be031bb16d4a0799d&"),
-                # Question 5: JoJo's Bizarre Adventure vs My Deer Friend Nekotan
-                ("Jolyne Cujoh", "Noko Shikanoko", "https://media.discordapp.net/attachments/1389008376385634425/1389018314054832138/Carte_-_Shadow_Roll_3.png?ex=6863179c&is=6861c61c&hm=55ae8e942a760d9289bb9a66f47955a167c1987a67a7b7aafdf251a7eae73cc4&=&format=webp&quality=lossless&width=1635&height=920", "https://cdn.discordapp.com/attachments/1391191728261824552/1391204199294959780/Carte_-_Shadow_Roll4.png?ex=686b0b60&is=6869b9e0&hm=d999007ba54088f26a8132c495de87d7cb04f6c9af596f23b9d22339215117b6&"),
-                # Question 6: Black Clover vs Demon Slayer
-                ("Noelle Silva", "Shinobu Kocho", "https://cdn.discordapp.com/attachments/1390074451290493099/1390422774471725166/Carte_-_Shadow_Roll_50.png?ex=6868dc5e&is=68678ade&hm=1c7694db4423e130e18c6f0c400a2c2144f9371f869283d2d4b5cae0561e0f15&", "https://cdn.discordapp.com/attachments/1389031039879610408/1391137505901809824/Carte_-_Shadow_Roll_72.png?ex=686acd43&is=68697bc3&hm=520584e8257d991ed5f26f9fd809770ab2c98603a8dd1b1f722aadd541c29427&"),
-                # Question 7: Sword Art Online vs Demon Slayer
-                ("Sinon", "Mitsuri Kanroji", "https://cdn.discordapp.com/attachments/1389030937710563358/1389073763798224958/Carte_-_Shadow_Roll25.png?ex=68669701&is=68654581&hm=f6264fb0ebccdfc293913bd45d453455b737310c5271687aba00edeb62d56974&", "https://cdn.discordapp.com/attachments/1389031039879610408/1391135731547635856/Carte_-_Shadow_Roll_70.png?ex=686acb9c&is=68697a1c&hm=7e1f8fe35736b17e5671a0e717b2c5f8a1571b2b969491df94af1fe7e35286af&"),
-                # Question 8: Chainsaw Man vs Sword Art Online
-                ("Power", "Asuna", "https://cdn.discordapp.com/attachments/1390074934142828574/1390416599466508390/Carte_-_Shadow_Roll_45.png?ex=6868d69e&is=6867851e&hm=50ffcd134719790f261b8d89dae067ee4faeef670c30db3b150b2867b1491432&", "Asuna"),
-                # Question 9: Naruto vs Demon Slayer
-                ("Sakura Haruno", "Nezuko Kamado", "https://cdn.discordapp.com/attachments/1389031204539465846/1390805413921820732/Carte_-_Shadow_Roll6.png?ex=686a40ba&is=6868ef3a&hm=899804f1e77aee58b2d35d998c14bd62730328780bb6a780452d5196a3adc589&", "https://cdn.discordapp.com/attachments/1389031039879610408/1391137359973711872/Carte_-_Shadow_Roll_71.png?ex=686acd20&is=68697ba0&hm=9e6c95394384c1dbb04d779ddb8d3a5b63bdac78de3a0983654afef26c0b9ed5&"),
-                # Question 10: Oshi no Ko vs One Punch Man
-                ("Ruby Hoshino", "Fubuki", "https://cdn.discordapp.com/attachments/1391191728261824552/1391208352138133704/Carte_-_Shadow_Roll14.gif?ex=686b0f3e&is=6869bdbe&hm=3b6c59cfba47288c952209de95742c1744408086ab08cdf6ce2dee00dd3e5ab4&", "https://cdn.discordapp.com/attachments/1391191728261824552/1391193994205335605/Carte_-_Shadow_Roll2.png?ex=686b01df&is=6869b05f&hm=dc174c1c4fe1440f839ea6943a2b8cc56ed9f6a1ae5680b8914bdbb58c90be32&"),
-                # Question 11: The Eminence in Shadow vs Call Of The Night
-                ("Alexia Midgar", "Midori Kohakobe", "https://cdn.discordapp.com/attachments/1389124349189161071/1391132961591791667/Carte_-_Shadow_Roll_66.png?ex=686ac908&is=68697788&hm=e3eb2415c5293ac8380de26e055b09cdc3ff52a8ce989f246e7b120d3e195e2b&", "https://cdn.discordapp.com/attachments/1391191728261824552/1391574918692339842/Carte_-_Shadow_Roll15.png?ex=686d0d62&is=686bbbe2&hm=0dbb461d616bd71f7c1230cb57438b95ea09dc753328c89c04090e02b97fe6d1&"),
-                # Question 12: The Eminence in Shadow vs Spy x Family
-                ("Iris Midgar", "Anya Forger", "https://cdn.discordapp.com/attachments/1389124349189161071/1391126498856927272/Carte_-_Shadow_Roll_61.png?ex=686ac303&is=68697183&hm=d09abe1034463f0492e2019722851b659c14027135361974d6ab6c0f4a8aa882&", "https://media.discordapp.net/attachments/1390074865280876615/1390298557789114378/Carte_-_Shadow_Roll_30.png?ex=6867bfee&is=68666e6e&hm=3993a5c8e35c23ca8bc9d0731d6e29e158dde1927a899ba907d4918f0fec6a38&=&format=webp&quality=lossless&width=910&height=512"),
-                # Question 13: Naruto vs Zenless Zone Zero
-                ("Hinata Hyuga", "Ellen Joe", "https://cdn.discordapp.com/attachments/1389031204539465846/1390758741921497249/image.png?ex=686a1543&is=6868c3c3&hm=a0855131f81b5d72b7716399aba47b4a42185c13c1474a635c80262703111085&", "https://cdn.discordapp.com/attachments/1389125558893412513/1390403280600830185/Carte_-_Shadow_Roll.gif?ex=68682176&is=6866cff6&hm=5f89e09e1559973942e8c32c56f9f625512486d101693cb41dd7c85921527532&"),
-                # Question 14: Re Zero vs Oshi no Ko
-                ("Rem", "Akane Kurokawa", "https://cdn.discordapp.com/attachments/1391191728261824552/1391569162589044859/Carte_-_Shadow_Roll19.gif?ex=686d0806&is=686bb686&hm=900c4690f8d522519d6d6e2f12c84b3e33b130c17c4e3a99b8fb0f6d42d7acee&", "https://media0.giphy.com/media/v1.Y2lkPTc5MGI3NjExbXd1YW41MWNzY3R0MjZrZHV5MWdnN3FqbTdqeXhyeGRwM2Y3dmN0NCZlcD12MV9pbnRlcm5hbF9naWZfYnlfaWQmY3Q9Zw/sHCifHTVkCqLmuMsww/giphy.gif"),
-                # Question 15: One Piece vs Konosuba
-                ("Boa Hancock", "Megumin", "https://cdn.discordapp.com/attachments/1390081108347191336/1391526713124454520/Carte_-_Shadow_Roll.png?ex=686c37bd&is=686ae63d&hm=dfb4cc30a521f6ab0ad7d287032634cc42a988df6620a27cb88c7d30108927e0&", "https://media.discordapp.net/attachments/1390072193463091200/1390297023806177301/Carte_-_Shadow_Roll_26.png?ex=6867be80&is=68666d00&hm=beb04c1b885daa5a60a1df0de484e1b19ae83f972d46724c03d31034dc51a92a&=&format=webp&quality=lossless&width=910&height=512"),
-                # Question 16: My Hero Academia vs Re Zero
-                ("Momo Yaoyorozu", "Ram", "https://cdn.discordapp.com/attachments/1389124669029875782/1390084533495398520/Carte_-_Shadow_Roll_24.png?ex=6866f89b&is=6865a71b&hm=7fe34120343ff96254795b595b7c476de98023cd0792be8a94366ebe8a3fc59e&", "https://cdn.discordapp.com/attachments/1391191728261824552/1391569269220839514/Carte_-_Shadow_Roll20.gif?ex=686d081f&is=686bb69f&hm=3f7b4f493538d576dbff84ec50bcdb345a133990c08ce9c442352b7c3f550ba9&"),
-                # Question 17: Call Of The Night vs Naruto
-                ("Seri Kikyo", "Tsunade", "https://cdn.discordapp.com/attachments/1391191728261824552/1391574574302232607/Carte_-_Shadow_Roll14.png?ex=686d0d10&is=686bbb90&hm=a2877d4a4712d0550c6729526c94e569bbfc6008ffaafaa20c5ad3e921f5a498&", "https://cdn.discordapp.com/attachments/1389031204539465846/1390806629666001036/Carte_-_Shadow_Roll9.png?ex=686a41dc&is=6868f05c&hm=7b1f73416591fcf051c1659bc576c13978d340658011b2502e340bc5f46b3696&"),
-                # Question 18: Call Of The Night vs One Piece
-                ("Nazuna Nanakusa", "Nami", "https://cdn.discordapp.com/attachments/1391191728261824552/1391205728601116742/Carte_-_Shadow_Roll12.gif?ex=686b0ccd&is=6869bb4d&hm=88e2396b0bb7ef0b8f01d5072132c1457f3aea5c381417550398a97898a981af&", "https://cdn.discordapp.com/attachments/1390081108347191336/1391146834407194624/Carte_-_Shadow_Roll_86.png?ex=686ad5f3&is=68698473&hm=c35e5bdff40bc8b537e21acee59faa1c3d1a2ab70443bdd503a877011a64b864&"),
-                # Question 19: My Hero Academia vs Fairy Tail
-                ("Tsuyu Asui", "Lucy Heartfilia", "https://cdn.discordapp.com/attachments/1389124669029875782/1390084613417865338/Carte_-_Shadow_Roll_25.png?ex=6866f8ae&is=6865a72e&hm=db7182258c9f84a8b2c8e92ba794501a2eaeec863f332c6105db516eb3c1e1f2&", "https://cdn.discordapp.com/attachments/1390082622134292551/1390409540767453284/Carte_-_Shadow_Roll_40.png?ex=6868d00b&is=68677e8b&hm=e185b34ee2ab4c48526ce22c31387b53462b46f77700c6cf60062e8ee158cbf9&"),
-                # Question 20: My Hero Academia vs Jujutsu Kaisen
-                ("Ochaco Uraraka", "Kasumi Miwa", "https://cdn.discordapp.com/attachments/1389124669029875782/1389151313408954439/Carte_-_Shadow_Roll_8.png?ex=6866367a&is=6864e4fa&hm=099b6299db0362b74cec390f12810a4c686d250ddd4bf09621c2dfbc75c014e1&", "https://cdn.discordapp.com/attachments/1391191728261824552/1391194913470943322/Carte_-_Shadow_Roll3.png?ex=686b02ba&is=6869b13a&hm=a5d9ce0ebb549ad9ccf057a6696772a9aaba671be637bc2ee3cbb97d73491e68&"),
-                # Question 21: Jujutsu Kaisen vs Attack on Titan
-                ("Nobara Kugisaki", "Historia Reiss", "https://cdn.discordapp.com/attachments/1390071426467500174/1390401699876700190/Carte_-_Shadow_Roll_36.png?ex=6868c8bd&is=6867773d&hm=b21a01f36516249629cf9c301f6fd3dbfcb591953a4e461c16a6e079c351b29f&", "https://cdn.discordapp.com/attachments/1389030758609584350/1389040743510704288/Carte_-_Shadow_Roll7.png?ex=68667840&is=686526c0&hm=105e409657055978515860dde7b65cdb10c8ee8b39a797490d668571b4800ce4&"),
-                # Question 22: Attack on Titan vs One Punch Man
-                ("Mikasa Ackerman", "Tatsumaki", "https://cdn.discordapp.com/attachments/1389030758609584350/1389035072937791528/Carte_-_Shadow_Roll2.png?ex=686672f8&is=68652178&hm=a5590e63d6c3a7d8ef9dd2649eed0c2798b14ad4015cc14fa4148739dd5ac293&", "https://cdn.discordapp.com/attachments/1391191728261824552/1391193591371792504/Carte_-_Shadow_Roll3.gif?ex=686b017f&is=6869afff&hm=8ad3fa91bd93af7e7ef820c97d72c3ae371af38d46eb6901a1bfa405f228d821&"),
-                # Question 23: Attack on Titan vs Spy x Family
-                ("Sasha Blouse", "Yor Forger", "https://cdn.discordapp.com/attachments/1389030758609584350/1389041311423795260/Carte_-_Shadow_Roll8.png?ex=686678c7&is=68652747&hm=08ca53f68faabdb5fa8cf8bdb0658cb02ddf55815a81f63603f8bd359e39d61e&", "https://media.discordapp.net/attachments/1390074865280876615/1390298568501235792/Carte_-_Shadow_Roll_31.png?ex=6867bff1&is=68666e71&hm=87101bee7469b1aa73186d0b3793fb73cdafcd9c2e4907e001463cde540f9c06&=&format=webp&quality=lossless&width=910&height=512"),
-            ]
         }
     }
     
@@ -505,11 +460,17 @@ class WouldYouRatherGame:
         self.max_rounds = custom_rounds if custom_rounds else 5
         self.voting_time = custom_voting_time if custom_voting_time else 10
         self.banned_animes = banned_animes if banned_animes else []
-        self.filtered_questions = self._filter_questions()
+        self.filtered_questions = []  # Chargées depuis la banque de questions au démarrage
+        self._question_deck = []
+        self._next_question_task = None  # Préchargement de la question de la manche suivante
         self.is_game_stopped = False  # Flag pour arrêt complet du jeu
+        self.phase = "setup"
+        self.scheduler = getattr(game_manager, 'scheduler', None) or game_scheduler
+        self.current_view = None
         
         # Initialize stats manager and related attributes
-        self.stats_manager = GameStatsManager()
+        self.stats_manager = getattr(game_manager, 'stats_manager', None) or GameStatsManager()
+        self.question_bank = getattr(game_manager, 'question_bank', None) or QuestionBank()
         self.session_id = None
         self.player_scores = {}  # user_id -> {"username": str, "correct_votes": int, "total_votes": int}
         self.round_results = []  # Liste des résultats de chaque manche
@@ -518,30 +479,52 @@ class WouldYouRatherGame:
         self.cleanup_callback = None
         self.main_message = None  # Message principal qui sera mis à jour
         
-    def _filter_questions(self):
-        """Filtrer les questions selon les animes bannis"""
-        if not self.banned_animes:
-            return self.THEMES[self.theme]['questions']
-        
-        # Normaliser les noms d'animes bannis (minuscules, pas d'espaces)
-        banned_normalized = [anime.lower().strip() for anime in self.banned_animes]
-        
-        filtered = []
-        for question in self.THEMES[self.theme]['questions']:
-            # Pour chaque question, vérifier si un des animes est banni
-            if len(question) >= 6:  # Questions avec métadonnées d'anime
-                anime1 = question[4].lower().strip()
-                anime2 = question[5].lower().strip()
-                
-                # Vérifier si aucun des animes n'est banni
-                if not any(banned in anime1 or anime1 in banned for banned in banned_normalized) and \
-                   not any(banned in anime2 or anime2 in banned for banned in banned_normalized):
-                    filtered.append(question)
-            else:
-                # Questions sans métadonnées - les garder par défaut
-                filtered.append(question)
-        
-        return filtered if filtered else self.THEMES[self.theme]['questions']  # Fallback si tout est banni
+    async def _load_questions(self):
+        """Charger les questions du thème sans les animes bannis"""
+        questions = await self.question_bank.get_questions(self.theme, self.banned_animes)
+        if not questions and self.banned_animes:
+            questions = await self.question_bank.get_questions(self.theme)  # Fallback si tout est banni
+        return questions
+    
+    def _draw_question(self):
+        """Tirer une question sans remise, le paquet est remélangé une fois épuisé"""
+        if not self._question_deck:
+            self._question_deck = list(self.filtered_questions)
+            random.shuffle(self._question_deck)
+        return self._question_deck.pop()
+    
+    async def _prepare_question(self):
+        """Tirer une question et valider ses images avant qu'elle soit affichée"""
+        attempts = min(3, len(self.filtered_questions))
+        question = self._draw_question()
+        for _ in range(attempts):
+            question = await self.question_bank.validate_question(question)
+            if question[2] and question[3]:
+                return question
+            if len(self.filtered_questions) > 1:
+                question = self._draw_question()
+        # Aucune question entièrement valide: on joue sans les images mortes
+        return await self.question_bank.validate_question(question)
+    
+    def _prefetch_next_question(self):
+        """Précharger la question suivante pendant que la manche en cours est votée"""
+        if self.filtered_questions and self._next_question_task is None:
+            self._next_question_task = asyncio.create_task(self._prepare_question())
+    
+    async def _take_prefetched_question(self):
+        """Récupérer la question préchargée, ou en préparer une tout de suite"""
+        task, self._next_question_task = self._next_question_task, None
+        if task is not None:
+            try:
+                return await task
+            except Exception as e:
+                logger.warning(f"Question prefetch failed: {e}")
+        return await self._prepare_question()
+    
+    def _cancel_prefetch(self):
+        if self._next_question_task is not None:
+            self._next_question_task.cancel()
+            self._next_question_task = None
         
     async def start_game(self, interaction: discord.Interaction):
         """Démarrer le jeu avec initialisation des statistiques"""
@@ -560,8 +543,8 @@ class WouldYouRatherGame:
         # Obtenir l'hôte du jeu
         self.host = interaction.user
         
-        # Filtrer les questions selon les animes bannis
-        self.filtered_questions = self._filter_questions()
+        # Filtrer les questions selon les animes bannis (requête ensembliste en base)
+        self.filtered_questions = await self._load_questions()
         
         banned_info = f"\n🚫 **Animes bannis:** {', '.join(self.banned_animes)}" if self.banned_animes else ""
         available_questions = f"\n📊 **Questions disponibles:** {len(self.filtered_questions)}"
@@ -583,7 +566,7 @@ class WouldYouRatherGame:
         
         embed.add_field(
             name="⏳ Statut",
-            value="⏰ **Le jeu commence dans 15 secondes...**",
+            value=f"⏰ **Le jeu commence dans {self.START_DELAY} secondes...**",
             inline=False
         )
         
@@ -591,14 +574,48 @@ class WouldYouRatherGame:
         self.main_message = await interaction.original_response()
         # print(f"DEBUG: Message principal créé avec ID: {self.main_message.id if self.main_message else 'None'}")
         
-        # Attendre 15 secondes avec vérification d'arrêt
-        for _ in range(15):
-            if self.is_game_stopped:
-                return
-            await asyncio.sleep(1)
+        # Valider les images de la première manche pendant le compte à rebours
+        self._prefetch_next_question()
         
-        # Démarrer la première manche
-        await self.start_round()
+        # La première manche démarre à l'échéance du compte à rebours
+        self._schedule_phase("countdown", self.START_DELAY)
+    
+    async def on_deadline(self):
+        """Avancer la machine à états quand l'échéance de la phase courante est atteinte"""
+        if self.is_game_stopped:
+            return
+        
+        if self.phase == "countdown":
+            await self.start_round()
+        elif self.phase == "voting":
+            await self.show_results()
+        elif self.phase == "results":
+            self.round_number += 1
+            await self.start_round()
+    
+    def _schedule_phase(self, phase: str, delay: float):
+        """Passer à une phase et programmer son échéance, sauf si la partie a été arrêtée entre-temps"""
+        if self.is_game_stopped:
+            return
+        self.phase = phase
+        self.scheduler.schedule(self, delay)
+    
+    def _edit_main_message(self, **kwargs):
+        """Mettre en file une édition du message principal (éditions groupées par salon)"""
+        if self.main_message:
+            self.scheduler.edit(self.main_message, on_missing=self._on_main_message_deleted, **kwargs)
+    
+    def _on_main_message_deleted(self):
+        """Le message principal a été supprimé: arrêter la partie sans rien renvoyer"""
+        logger.info(f"Main game message deleted in channel {self.channel.id}, stopping game")
+        self.is_active = False
+        self.is_game_stopped = True
+        self.phase = "ended"
+        self.scheduler.cancel(self)
+        self._cancel_prefetch()
+        self.stats_manager.discard_round(self.session_id, self.round_number)
+        if self.game_manager.active_games.get(self.channel.id) is self:
+            del self.game_manager.active_games[self.channel.id]
     
     async def start_round(self):
         """Démarrer une nouvelle manche"""
@@ -618,12 +635,11 @@ class WouldYouRatherGame:
                 description="**Aucune question disponible avec les animes bannis !**",
                 color=0xe74c3c
             )
-            if self.main_message:
-                await self.main_message.edit(embed=error_embed, view=None)
+            self._edit_main_message(embed=error_embed, view=None)
             await self.end_game()
             return
             
-        self.current_question = random.choice(self.filtered_questions)
+        self.current_question = await self._take_prefetched_question()
         
         # Réinitialiser les votes
         if not hasattr(self, 'votes_left'):
@@ -679,11 +695,13 @@ class WouldYouRatherGame:
                 inline=False
             )
             
-            # Ajouter l'image principale (option A)
-            embed.set_image(url=self.current_question[2])
+            # Ajouter l'image principale (option A), absente si l'URL est morte
+            if self.current_question[2]:
+                embed.set_image(url=self.current_question[2])
             
             # Ajouter l'image de l'option B en thumbnail
-            embed.set_thumbnail(url=self.current_question[3])
+            if self.current_question[3]:
+                embed.set_thumbnail(url=self.current_question[3])
         else:  # Sans images (fallback)
             # Récupérer les noms des animes si disponibles
             anime_a = self.current_question[4] if len(self.current_question) > 4 else ""
@@ -723,44 +741,32 @@ class WouldYouRatherGame:
         view = VotingView(self)
         
         # Éditer le message principal au lieu d'en créer un nouveau
-        # print(f"DEBUG: Tentative d'édition du message principal (ID: {self.main_message.id if self.main_message else 'None'})")
-        if self.main_message:
-            try:
-                await self.main_message.edit(embed=embed, view=view)
-                # print(f"DEBUG: Message principal édité avec succès pour la manche {self.round_number}")
-            except discord.NotFound:
-                print("DEBUG: Message principal supprimé")
-                return
-            except Exception as e:
-                print(f"Erreur lors de l'édition du message de round: {e}")
-                return
-        else:
-            print("ERREUR: Message principal non trouvé lors du round")
+        if not self.main_message:
+            logger.error("Main game message missing when starting round")
             return
+        self.current_view = view
+        self._edit_main_message(embed=embed, view=view)
         
-        # Attendre le temps de vote configuré avec vérification d'arrêt
-        try:
-            for _ in range(self.voting_time):
-                if self.is_game_stopped:  # Le jeu a été arrêté
-                    return
-                await asyncio.sleep(1)
-        except asyncio.CancelledError:
-            return
-        
-        # Vérifier à nouveau si le jeu n'a pas été arrêté
-        if self.is_game_stopped:
-            return
-            
-        # Arrêter les votes pour cette manche et afficher les résultats
-        view.stop()
+        # Préparer la manche suivante pendant le vote
+        if self.round_number < self.max_rounds:
+            self._prefetch_next_question()
         
-        await self.show_results()
+        # Les résultats s'affichent à l'échéance du vote
+        self._schedule_phase("voting", self.voting_time)
     
     async def show_results(self):
         """Afficher les résultats de la manche avec système de score"""
+        # Arrêter les votes pour cette manche
+        self.is_active = False
+        if self.current_view:
+            self.current_view.stop()
+            self.current_view = None
+        
         total_votes = len(self.votes_left) + len(self.votes_right)
         
         if total_votes == 0:
+            self.stats_manager.discard_round(self.session_id, self.round_number)
+            
             # Créer embed pour aucun vote
             embed = discord.Embed(
                 title=f"😴 MANCHE {self.round_number}/{self.max_rounds} - AUCUN VOTE",
@@ -775,23 +781,19 @@ class WouldYouRatherGame:
             )
             
             # Mettre à jour le message principal
-            if self.main_message:
-                await self.main_message.edit(embed=embed, view=None)
+            self._edit_main_message(embed=embed, view=None)
         else:
             left_percentage = (len(self.votes_left) / total_votes) * 100
             right_percentage = (len(self.votes_right) / total_votes) * 100
             
             # Déterminer l'option majoritaire
             if len(self.votes_left) > len(self.votes_right):
-                majority_option = "A"
                 winner_text = f"⬅️ **{self.current_question[0]}** remporte cette manche !"
                 majority_voters = self.votes_left
             elif len(self.votes_right) > len(self.votes_left):
-                majority_option = "B"
                 winner_text = f"➡️ **{self.current_question[1]}** remporte cette manche !"
                 majority_voters = self.votes_right
             else:
-                majority_option = "TIE"
                 winner_text = "🤝 **Égalité parfaite !**"
                 majority_voters = self.votes_left.union(self.votes_right)  # Tous gagnent en cas d'égalité
             
@@ -828,26 +830,15 @@ class WouldYouRatherGame:
                 if user_id in self.player_scores:
                     self.player_scores[user_id]["total_votes"] += 1
             
-            # Enregistrer les résultats de la manche dans les statistiques
-            await self.stats_manager.record_round_result(
+            # Enregistrer la manche, ses votes et les scores en une seule transaction
+            await self.stats_manager.flush_round(
                 self.session_id, self.round_number,
-                self.current_question[0], self.current_question[1],
-                len(self.votes_left), len(self.votes_right)
+                self.current_question[0], self.current_question[1]
             )
             
-            # Enregistrer chaque vote individuel
-            for user_id, option in self.votes.items():
-                user = self.channel.guild.get_member(user_id)
-                username = user.display_name if user else f"User_{user_id}"
-                
-                was_majority = (option == "A" and majority_option == "A") or \
-                              (option == "B" and majority_option == "B") or \
-                              (majority_option == "TIE")
-                
-                await self.stats_manager.record_player_vote(
-                    self.session_id, self.round_number,
-                    user_id, username, option, was_majority
-                )
+            # Partie arrêtée pendant l'écriture: ne pas écraser l'embed final de end_game
+            if self.is_game_stopped:
+                return
             
             # Créer l'embed des résultats
             embed = discord.Embed(
@@ -916,42 +907,29 @@ class WouldYouRatherGame:
                 )
             
             # Mettre à jour le message principal
-            if self.main_message:
-                await self.main_message.edit(embed=embed, view=None)
+            self._edit_main_message(embed=embed, view=None)
         
-        # Attendre 3 secondes avant la prochaine manche avec vérification d'arrêt
-        try:
-            for _ in range(3):
-                if self.is_game_stopped:  # Le jeu a été arrêté
-                    return
-                await asyncio.sleep(1)
-        except asyncio.CancelledError:
-            return
-        
-        # Vérifier à nouveau si le jeu n'a pas été arrêté
-        if self.is_game_stopped:
-            return
-            
-        self.round_number += 1
-        await self.start_round()
+        # La manche suivante démarre à l'échéance de l'affichage des résultats
+        self._schedule_phase("results", self.RESULTS_DELAY)
     
     async def end_game(self, stopped_by_user=False):
         """Terminer le jeu avec classement final et statistiques"""
         self.is_game_stopped = True
+        self.phase = "ended"
+        self.scheduler.cancel(self)
+        self._cancel_prefetch()
+        if self.current_view:
+            self.current_view.stop()
+            self.current_view = None
         
         # Calculer le classement final
         if self.player_scores:
             final_ranking = await self.stats_manager.calculate_session_scores(self.session_id)
             
-            # Mettre à jour les statistiques globales des joueurs
-            for user_id, data in self.player_scores.items():
-                await self.stats_manager.update_player_global_stats(
-                    user_id=user_id,
-                    username=data["username"],
-                    wins_gained=data["correct_votes"],
-                    games_played=1,
-                    rounds_played=data["total_votes"]
-                )
+            # Victoires et manches sont déjà comptées à chaque flush de manche
+            await self.stats_manager.record_games_played({
+                user_id: data["username"] for user_id, data in self.player_scores.items()
+            })
             
             # Déterminer le gagnant
             winner_id = None
@@ -1038,16 +1016,8 @@ class WouldYouRatherGame:
         embed.set_footer(text="Tapez !game pour rejouer • Utilisez !mystats pour voir vos statistiques globales !")
         
         # Mettre à jour le message principal avec le classement final
-        if self.main_message:
-            try:
-                await self.main_message.edit(embed=embed, view=None)
-            except discord.NotFound:
-                # Le message a été supprimé, on ne fait rien
-                pass
-            except Exception as e:
-                # En cas d'erreur, log mais ne pas créer de nouveau message
-                print(f"Erreur lors de l'édition du message final: {e}")
         # Note: Pas de fallback pour éviter de créer plusieurs messages
+        self._edit_main_message(embed=embed, view=None)
         
         # Retirer le jeu de la liste des jeux actifs
         if self.channel.id in self.game_manager.active_games:
@@ -1061,6 +1031,7 @@ class WouldYouRatherGame:
         # Arrêter complètement le jeu avec les deux flags
         self.is_active = False
         self.is_game_stopped = True
+        self.stats_manager.discard_round(self.session_id, self.round_number)
         
         # Retirer immédiatement le jeu de la liste des jeux actifs
         if self.channel.id in self.game_manager.active_games:
@@ -1089,13 +1060,20 @@ class WouldYouRatherGame:
             self.votes_right.add(user_id)
             self.votes[user_id] = "B"
         
+        # Vote gardé en mémoire, écrit en base à la fermeture de la manche
+        self.stats_manager.buffer_vote(
+            self.session_id, self.round_number,
+            user_id, getattr(user, 'display_name', f"User_{user_id}"), self.votes[user_id]
+        )
+        
         return True
 
 class VotingView(discord.ui.View):
     """Vue avec boutons de vote et bouton d'arrêt"""
     
     def __init__(self, game: WouldYouRatherGame):
-        super().__init__(timeout=10)
+        # Les boutons restent actifs toute la fenêtre de vote configurée
+        super().__init__(timeout=game.voting_time + game.RESULTS_DELAY)
         self.game = game
     
     @discord.ui.button(label="⬅️ OPTION A", style=discord.ButtonStyle.primary, row=0)
@@ -255,7 +255,8 @@ class CharacterHuntView(discord.ui.View):
     async def get_filtered_characters(self) -> List[Dict]:
         """Obtenir la liste filtrée des personnages"""
         if self.search_term:
-            characters = await self.db.search_characters_by_name(self.search_term)
+            filters = {'rarity': self.selected_rarity} if self.selected_rarity else None
+            characters = await self.db.search_characters(self.search_term, filters, limit=100)
         else:
             characters = await self.db.get_all_characters()
         
@@ -284,6 +285,9 @@ class CharacterHuntView(discord.ui.View):
         # Exclure les raretés non chassables
         char_list = [c for c in char_list if c['rarity'] != 'Evolve']
         
+        # Les résultats de recherche gardent leur ordre de pertinence
+        if self.search_term:
+            return char_list
         return sorted(char_list, key=lambda x: (x['rarity'], x['name']))
     
     async def update_hunt_display(self, interaction: discord.Interaction):
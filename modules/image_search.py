@@ -3,34 +3,37 @@ Advanced Image Search Module for Shadow Roll Bot
 Uses multiple APIs and scraping methods to find high-quality character images
 """
 import asyncio
-import aiohttp
 import json
 import re
 import urllib.parse
 from typing import List, Optional, Dict
 import logging
-from PIL import Image
-import io
+
+from core.http_client import http_client, HttpClient
 
 logger = logging.getLogger(__name__)
 
+# Provider results change rarely, cache them to spare the upstream APIs
+PROVIDER_CACHE_TTL = 3600
+MAX_IMAGE_BYTES = 15 * 1024 * 1024
+
 class ImageSearchEngine:
-    def __init__(self):
-        self.session = None
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
+    def __init__(self, client: Optional[HttpClient] = None):
+        self.http = client or http_client
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            headers=self.headers
-        )
+        await self.http.get_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        # The pooled session is shared with the rest of the bot, keep it open
+        pass
+            
+    async def _cached_search(self, provider: str, query: str, fetch) -> List[str]:
+        """Run a provider search through the TTL cache"""
+        cache_key = f"image_search_{provider}_{query.lower()}"
+        results = await self.http.cached(cache_key, PROVIDER_CACHE_TTL, fetch)
+        return list(results or [])
             
     async def search_character_images(self, character_name: str, anime_name: str, limit: int = 10) -> List[str]:
         """Search for character images using multiple sources"""
@@ -77,6 +80,9 @@ class ImageSearchEngine:
         
     async def _search_google_images(self, query: str) -> List[str]:
         """Search Google Images through scraping"""
+        return await self._cached_search('google', query, lambda: self._fetch_google_images(query))
+            
+    async def _fetch_google_images(self, query: str) -> Optional[List[str]]:
         try:
             search_url = "https://www.google.com/search"
             params = {
@@ -86,35 +92,36 @@ class ImageSearchEngine:
                 'safe': 'active'
             }
             
-            async with self.session.get(search_url, params=params) as response:
-                if response.status != 200:
-                    return []
+            html = await self.http.get_text(search_url, params=params)
+            if html is None:
+                return None
+            
+            # Extract image URLs from Google Images results
+            image_urls = []
+            
+            # Look for image data in script tags
+            script_pattern = r'"ou":"([^"]+)"'
+            matches = re.findall(script_pattern, html)
+            
+            for match in matches[:10]:
+                try:
+                    url = urllib.parse.unquote(match)
+                    if self._is_valid_image_url(url):
+                        image_urls.append(url)
+                except:
+                    continue
                     
-                html = await response.text()
-                
-                # Extract image URLs from Google Images results
-                image_urls = []
-                
-                # Look for image data in script tags
-                script_pattern = r'"ou":"([^"]+)"'
-                matches = re.findall(script_pattern, html)
-                
-                for match in matches[:10]:
-                    try:
-                        url = urllib.parse.unquote(match)
-                        if self._is_valid_image_url(url):
-                            image_urls.append(url)
-                    except:
-                        continue
-                        
-                return image_urls
-                
+            return image_urls
+            
         except Exception as e:
             logger.warning(f"Google Images search failed: {e}")
-            return []
+            return None
             
     async def _search_bing_images(self, query: str) -> List[str]:
         """Search Bing Images through scraping"""
+        return await self._cached_search('bing', query, lambda: self._fetch_bing_images(query))
+            
+    async def _fetch_bing_images(self, query: str) -> Optional[List[str]]:
         try:
             search_url = "https://www.bing.com/images/search"
             params = {
@@ -123,65 +130,64 @@ class ImageSearchEngine:
                 'FORM': 'IRFLTR'
             }
             
-            async with self.session.get(search_url, params=params) as response:
-                if response.status != 200:
-                    return []
+            html = await self.http.get_text(search_url, params=params)
+            if html is None:
+                return None
+            
+            # Extract image URLs from Bing results
+            image_urls = []
+            
+            # Look for murl data
+            murl_pattern = r'"murl":"([^"]+)"'
+            matches = re.findall(murl_pattern, html)
+            
+            for match in matches[:10]:
+                try:
+                    url = match.replace('\\u002f', '/').replace('\\', '')
+                    if self._is_valid_image_url(url):
+                        image_urls.append(url)
+                except:
+                    continue
                     
-                html = await response.text()
-                
-                # Extract image URLs from Bing results
-                image_urls = []
-                
-                # Look for murl data
-                murl_pattern = r'"murl":"([^"]+)"'
-                matches = re.findall(murl_pattern, html)
-                
-                for match in matches[:10]:
-                    try:
-                        url = match.replace('\\u002f', '/').replace('\\', '')
-                        if self._is_valid_image_url(url):
-                            image_urls.append(url)
-                    except:
-                        continue
-                        
-                return image_urls
-                
+            return image_urls
+            
         except Exception as e:
             logger.warning(f"Bing Images search failed: {e}")
-            return []
+            return None
             
     async def _search_pinterest(self, query: str) -> List[str]:
         """Search Pinterest for anime character images"""
+        return await self._cached_search('pinterest', query, lambda: self._fetch_pinterest(query))
+            
+    async def _fetch_pinterest(self, query: str) -> Optional[List[str]]:
         try:
             search_url = "https://www.pinterest.com/search/pins/"
             params = {'q': query + ' anime character'}
             
-            async with self.session.get(search_url, params=params) as response:
-                if response.status != 200:
-                    return []
+            html = await self.http.get_text(search_url, params=params)
+            if html is None:
+                return None
+            
+            # Pinterest uses a lot of JavaScript, look for image data
+            image_urls = []
+            
+            # Look for Pinterest image URLs
+            pin_pattern = r'"url":"([^"]*\.(?:jpg|jpeg|png|webp)[^"]*)"'
+            matches = re.findall(pin_pattern, html, re.IGNORECASE)
+            
+            for match in matches[:8]:
+                try:
+                    url = match.replace('\\/', '/')
+                    if self._is_valid_image_url(url) and 'pinimg.com' in url:
+                        image_urls.append(url)
+                except:
+                    continue
                     
-                html = await response.text()
-                
-                # Pinterest uses a lot of JavaScript, look for image data
-                image_urls = []
-                
-                # Look for Pinterest image URLs
-                pin_pattern = r'"url":"([^"]*\.(?:jpg|jpeg|png|webp)[^"]*)"'
-                matches = re.findall(pin_pattern, html, re.IGNORECASE)
-                
-                for match in matches[:8]:
-                    try:
-                        url = match.replace('\\/', '/')
-                        if self._is_valid_image_url(url) and 'pinimg.com' in url:
-                            image_urls.append(url)
-                    except:
-                        continue
-                        
-                return image_urls
-                
+            return image_urls
+            
         except Exception as e:
             logger.warning(f"Pinterest search failed: {e}")
-            return []
+            return None
             
     async def _search_anime_databases(self, character_name: str, anime_name: str) -> List[str]:
         """Search anime-specific databases"""
@@ -199,6 +205,10 @@ class ImageSearchEngine:
         
     async def _search_anilist(self, character_name: str, anime_name: str) -> List[str]:
         """Search AniList GraphQL API"""
+        search = f"{character_name} {anime_name}"
+        return await self._cached_search('anilist', search, lambda: self._fetch_anilist(search))
+            
+    async def _fetch_anilist(self, search: str) -> Optional[List[str]]:
         try:
             query = '''
             query ($search: String) {
@@ -216,30 +226,31 @@ class ImageSearchEngine:
             }
             '''
             
-            variables = {'search': f"{character_name} {anime_name}"}
+            variables = {'search': search}
             
-            async with self.session.post(
+            # Read-only GraphQL query: safe to replay, so opt in to retries
+            data = await self.http.post_json(
                 'https://graphql.anilist.co',
-                json={'query': query, 'variables': variables}
-            ) as response:
-                if response.status != 200:
-                    return []
+                {'query': query, 'variables': variables},
+                retries=self.http.max_retries
+            )
+            if data is None:
+                return None
+
+            characters = data.get('data', {}).get('Page', {}).get('characters', [])
+            
+            image_urls = []
+            for char in characters:
+                if char.get('image', {}).get('large'):
+                    image_urls.append(char['image']['large'])
+                elif char.get('image', {}).get('medium'):
+                    image_urls.append(char['image']['medium'])
                     
-                data = await response.json()
-                characters = data.get('data', {}).get('Page', {}).get('characters', [])
-                
-                image_urls = []
-                for char in characters:
-                    if char.get('image', {}).get('large'):
-                        image_urls.append(char['image']['large'])
-                    elif char.get('image', {}).get('medium'):
-                        image_urls.append(char['image']['medium'])
-                        
-                return image_urls
-                
+            return image_urls
+            
         except Exception as e:
             logger.warning(f"AniList search failed: {e}")
-            return []
+            return None
             
     async def _search_anime_characters_db(self, character_name: str, anime_name: str) -> List[str]:
         """Search Anime Characters Database"""
@@ -282,43 +293,16 @@ class ImageSearchEngine:
         return any(domain in url for domain in image_domains)
         
     async def _validate_image_quality(self, url: str) -> bool:
-        """Validate image quality and accessibility"""
-        try:
-            async with self.session.head(url) as response:
-                if response.status != 200:
-                    return False
-                    
-                # Check content type
-                content_type = response.headers.get('content-type', '')
-                if not any(fmt in content_type.lower() for fmt in ['image/jpeg', 'image/jpg', 'image/png', 'image/webp']):
-                    return False
-                    
-                # Check file size (max 15MB)
-                content_length = response.headers.get('content-length')
-                if content_length and int(content_length) > 15 * 1024 * 1024:
-                    return False
-                    
-                return True
-                
-        except Exception:
-            # If HEAD fails, try a quick GET request
-            try:
-                async with self.session.get(url) as response:
-                    if response.status != 200:
-                        return False
-                        
-                    # Read first chunk to check if it's an image
-                    chunk = await response.content.read(1024)
-                    
-                    # Check image magic bytes
-                    if chunk.startswith(b'\xff\xd8\xff'):  # JPEG
-                        return True
-                    elif chunk.startswith(b'\x89PNG\r\n\x1a\n'):  # PNG
-                        return True
-                    elif chunk.startswith(b'RIFF') and b'WEBP' in chunk[:20]:  # WebP
-                        return True
-                        
-                    return False
-                    
-            except Exception:
-                return False
\ No newline at end of file
+        """Validate image quality and accessibility from its first bytes only"""
+        info = await self.http.sniff_image(url)
+        if not info:
+            return False
+            
+        if info['format'] not in ('jpeg', 'png', 'webp'):
+            return False
+            
+        # Check file size (max 15MB) when the server reports it
+        if info['size'] and info['size'] > MAX_IMAGE_BYTES:
+            return False
+            
+        return True
@@ -6,6 +6,7 @@ import discord
 import logging
 from typing import List, Dict, Optional
 from core.config import BotConfig
+from core.ownership import ownership_index
 from modules.utils import get_display_name, format_number
 
 logger = logging.getLogger(__name__)
@@ -28,6 +29,13 @@ class IndexView(discord.ui.View):
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         return interaction.user.id == self.user_id
     
+    async def get_search_clause(self):
+        """SQL filter restricting the index to characters matching the search query"""
+        ids = await self.bot.db.character_search.search_ids(self.search_query)
+        if not ids:
+            return " AND 0", []
+        return f" AND id IN ({','.join('?' * len(ids))})", ids
+
     async def create_index_embed(self) -> discord.Embed:
         """Create the main index embed"""
         user = self.bot.get_user(self.user_id)
@@ -56,15 +64,11 @@ class IndexView(discord.ui.View):
             color=0x9932cc
         )
         
-        # Get statistics
-        async with self.bot.db.db.execute("SELECT COUNT(*) FROM characters") as cursor:
-            total_chars = (await cursor.fetchone())[0]
-            
-        async with self.bot.db.db.execute("SELECT COUNT(DISTINCT anime) FROM characters WHERE anime IS NOT NULL") as cursor:
-            total_series = (await cursor.fetchone())[0]
-            
-        async with self.bot.db.db.execute("SELECT COUNT(DISTINCT rarity) FROM characters") as cursor:
-            total_rarities = (await cursor.fetchone())[0]
+        # Get statistics (catalog totals, recomputed only when the catalog changes)
+        catalog = await ownership_index.current_catalog()
+        total_chars = len(catalog.entries)
+        total_series = sum(1 for anime in catalog.anime_totals if anime is not None)
+        total_rarities = sum(1 for rarity in catalog.rarity_totals if rarity is not None)
         
         embed.add_field(
             name="📊 ═══〔 Statistiques Globales 〕═══ 📊",
@@ -86,14 +90,7 @@ class IndexView(discord.ui.View):
         )
         
         # Get series data with character counts
-        async with self.bot.db.db.execute("""
-            SELECT anime, COUNT(*) as count 
-            FROM characters 
-            WHERE anime IS NOT NULL AND anime != ''
-            GROUP BY anime 
-            ORDER BY count DESC, anime
-        """) as cursor:
-            all_series = await cursor.fetchall()
+        all_series = (await ownership_index.current_catalog()).series
         
         # Pagination
         start_idx = (self.current_page - 1) * self.items_per_page
@@ -139,8 +136,9 @@ class IndexView(discord.ui.View):
             
         if self.search_query:
             title_suffix += f" - Recherche: {self.search_query}"
-            where_clause += " AND (name LIKE ? OR anime LIKE ?)"
-            params.extend([f"%{self.search_query}%", f"%{self.search_query}%"])
+            search_clause, search_params = await self.get_search_clause()
+            where_clause += search_clause
+            params.extend(search_params)
         
         embed = discord.Embed(
             description=f"""🌌 ═══════〔 I N D E X   P E R S O N N A G E S{title_suffix} 〕═══════ 🌌
@@ -156,18 +154,7 @@ class IndexView(discord.ui.View):
             FROM characters 
             {where_clause}
             ORDER BY 
-                CASE rarity 
-                    WHEN 'Secret' THEN 1
-                    WHEN 'Evolve' THEN 2
-                    WHEN 'Fusion' THEN 3
-                    WHEN 'Titan' THEN 4
-                    WHEN 'Mythic' THEN 5
-                    WHEN 'Legendary' THEN 6
-                    WHEN 'Epic' THEN 7
-                    WHEN 'Rare' THEN 8
-                    WHEN 'Common' THEN 9
-                    ELSE 10
-                END,
+                rarity_rank DESC,
                 value DESC, 
                 name
         """
@@ -213,13 +200,11 @@ class IndexView(discord.ui.View):
         )
         
         # Get rarity statistics
-        async with self.bot.db.db.execute("""
-            SELECT rarity, COUNT(*) as count, AVG(value) as avg_value, MIN(value) as min_value, MAX(value) as max_value
-            FROM characters 
-            GROUP BY rarity 
-            ORDER BY AVG(value) DESC
-        """) as cursor:
-            rarity_stats = await cursor.fetchall()
+        catalog = await ownership_index.current_catalog()
+        rarity_stats = sorted(
+            ((rarity, totals.count, totals.value / totals.count, totals.min_value, totals.max_value)
+             for rarity, totals in catalog.rarity_totals.items()),
+            key=lambda stat: stat[2], reverse=True)
         
         if rarity_stats:
             rarity_list = ""
@@ -285,8 +270,7 @@ class IndexView(discord.ui.View):
     async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Check if there's a next page
         if self.view_mode == "series":
-            async with self.bot.db.db.execute("SELECT COUNT(DISTINCT anime) FROM characters WHERE anime IS NOT NULL") as cursor:
-                total_items = (await cursor.fetchone())[0]
+            total_items = len((await ownership_index.current_catalog()).series)
         elif self.view_mode == "characters":
             where_clause = "WHERE 1=1"
             params = []
@@ -297,8 +281,9 @@ class IndexView(discord.ui.View):
                 where_clause += " AND rarity = ?"
                 params.append(self.selected_rarity)
             if self.search_query:
-                where_clause += " AND (name LIKE ? OR anime LIKE ?)"
-                params.extend([f"%{self.search_query}%", f"%{self.search_query}%"])
+                search_clause, search_params = await self.get_search_clause()
+                where_clause += search_clause
+                params.extend(search_params)
             
             async with self.bot.db.db.execute(f"SELECT COUNT(*) FROM characters {where_clause}", params) as cursor:
                 total_items = (await cursor.fetchone())[0]
@@ -9,6 +9,7 @@ import logging
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from core.config import BotConfig
+from core.rarity import rarity_tiers
 from modules.utils import format_number
 
 logger = logging.getLogger(__name__)
@@ -97,7 +98,7 @@ class EnhancedInventoryView(discord.ui.View):
                 rarity_groups[rarity].append(item)
 
             # Display by rarity order like menu style
-            rarity_order = ['Secret', 'Fusion', 'Titan', 'Evolve', 'Mythic', 'Legendary', 'Epic', 'Rare', 'Common']
+            rarity_order = rarity_tiers.names()
             for rarity in rarity_order:
                 if rarity in rarity_groups:
                     characters = rarity_groups[rarity]
@@ -11,25 +11,23 @@ from typing import Dict, Optional
 import random
 
 from core.config import BotConfig
-from modules.utils import format_number, get_display_name
+from core.cooldowns import roll_cooldowns
+from core.ownership import ownership_index
+from core.user_gate import reject_interaction, user_gate
+from modules.utils import format_number, get_display_name, KeysetPager
 from modules.achievements import AchievementManager
 from modules.text_styling import style_main_title, style_section, style_username, style_character, style_anime, style_rarity
+from modules.embed_templates import embed_templates
 
 logger = logging.getLogger(__name__)
 
 
-async def create_main_menu_embed(bot, user_id: int) -> discord.Embed:
-    """Create main menu embed for Shadow Roll bot - standalone function"""
-    try:
-        user = bot.get_user(user_id)
-        username = get_display_name(user) if user else f"User {user_id}"
-        player = await bot.db.get_or_create_player(user_id, username)
-
-        # Créer le nouveau style de menu élégant
-        embed = discord.Embed(
-            description=f"""🌌 ═══════〔 S H A D O W   R O L L 〕═══════ 🌌
+def main_menu_template() -> discord.Embed:
+    """Static part of the main menu; {username} and {coins} are filled per player"""
+    return discord.Embed(
+        description="""🌌 ═══════〔 S H A D O W   R O L L 〕═══════ 🌌
 ◆ Bienvenue dans les ténèbres, {username} ◆
-🪙 {format_number(player.coins)} Shadow Coins disponibles
+🪙 {coins} Shadow Coins disponibles
 
 〔 Navigation 〕═══ 🌑
 👤 Profil      ◆ Vos statistiques
@@ -45,8 +43,20 @@ async def create_main_menu_embed(bot, user_id: int) -> discord.Embed:
 ❓ Guide       ◆ Aide et informations
 📚 Index       ◆ Base de données complète
 🎴 Voir Carte  ◆ Explorer les personnages""",
-            color=0x9932cc
-        )
+        color=0x9932cc
+    )
+
+
+async def create_main_menu_embed(bot, user_id: int) -> discord.Embed:
+    """Create main menu embed for Shadow Roll bot - standalone function"""
+    try:
+        user = bot.get_user(user_id)
+        username = get_display_name(user) if user else f"User {user_id}"
+        player = await bot.db.get_or_create_player(user_id, username)
+
+        # Créer le nouveau style de menu élégant (partie statique précompilée)
+        embed = embed_templates.render('main_menu', main_menu_template,
+                                       username=username, coins=format_number(player.coins))
         
         # Footer avec seulement le nom du joueur
         embed.set_footer(
@@ -301,6 +311,55 @@ class ShadowMenuView(discord.ui.View):
 
 
 
+def profile_template() -> discord.Embed:
+    """Static part of the profile: styled section titles and field layout"""
+    embed = discord.Embed(
+        title=style_section("PROFIL DE L'OMBRE", "🌌"),
+        description="```\n{title_display}{username}\n```",
+        color=BotConfig.RARITY_COLORS['Epic'])
+    embed.add_field(
+        name=style_section("RICHESSE DES OMBRES", "🪙"),
+        value="```\n{coins} Shadow Coins\n```",
+        inline=True)
+    embed.add_field(
+        name=style_section("INVOCATIONS", "🎲"),
+        value="```\n{rerolls} total\n```",
+        inline=True)
+    embed.add_field(
+        name=style_section("COLLECTION", "🎒"),
+        value="```\n{unique} uniques\n{total} total\n```",
+        inline=True)
+    embed.add_field(
+        name=style_section("RÉPARTITION PAR RARETÉ", "🌫️"),
+        value="```\n{rarity_text}```",
+        inline=False)
+    return embed
+
+
+def classic_menu_template() -> discord.Embed:
+    """Static part of the !menu / profile main menu"""
+    embed = discord.Embed(
+        title="🌌 ═══════〔 S H A D O W   R O L L 〕═══════ 🌌",
+        description="```\n◆ Bienvenue dans les ténèbres, {username} ◆\n{coins} Shadow Coins disponibles\n```",
+        color=BotConfig.RARITY_COLORS['Epic'])
+    embed.add_field(
+        name="🌑 ═══〔 Navigation 〕═══ 🌑",
+        value=("```\n"
+               "👤 Profil      ◆ Vos statistiques\n"
+               "🎲 Invocation  ◆ Invoquer des personnages\n"
+               "🧪 Recherche   ◆ Traquer un personnage\n"
+               "🎒 Collection  ◆ Voir vos personnages\n"
+               "🔮 Craft       ◆ Évolution des personnages\n"
+               "🎁 Bénédiction ◆ Récompense quotidienne\n"
+               "🛒 Vente        ◆ Revendre vos personnages\n"
+               "🎖️ Succès      ◆ Récompenses d’exploits\n"
+               "🏆 Classement  ◆ Tableau des maîtres\n"
+               "❓ Guide       ◆ Aide et informations\n"
+               "```"),
+        inline=False)
+    return embed
+
+
 class ProfileView(discord.ui.View):
     """Profile display view"""
 
@@ -320,41 +379,17 @@ class ProfileView(discord.ui.View):
             username = get_display_name(
                 user) if user else f"User {self.user_id}"
 
-            await self.bot.db.sync_player_stats(self.user_id)
-            player = await self.bot.db.get_or_create_player(
-                self.user_id, username)
-            inventory_stats = await self.bot.db.get_inventory_stats(
-                self.user_id)
+            snapshot = await self.bot.db.get_profile_snapshot(self.user_id, username)
+            inventory_stats = snapshot['inventory_stats']
 
             # Get selected title
-            selected_title = await self.bot.db.get_selected_title(self.user_id)
+            selected_title = snapshot['selected_title']
             title_display = ""
             if selected_title:
                 title_display = f"{selected_title['icon']} {selected_title['display_name']}\n"
             else:
                 title_display = "◆ Maître des Ténèbres ◆\n"
 
-            embed = discord.Embed(
-                title=style_section("PROFIL DE L'OMBRE", "🌌"),
-                description=f"```\n{title_display}{style_username(username)}\n```",
-                color=BotConfig.RARITY_COLORS['Epic'])
-
-            embed.add_field(
-                name=style_section("RICHESSE DES OMBRES", "🪙"),
-                value=f"```\n{format_number(player.coins)} Shadow Coins\n```",
-                inline=True)
-
-            embed.add_field(
-                name=style_section("INVOCATIONS", "🎲"),
-                value=f"```\n{format_number(player.total_rerolls)} total\n```",
-                inline=True)
-
-            embed.add_field(
-                name=style_section("COLLECTION", "🎒"),
-                value=
-                f"```\n{inventory_stats.get('unique_characters', 0)} uniques\n{inventory_stats.get('total_characters', 0)} total\n```",
-                inline=True)
-
             # Rarity breakdown
             rarity_counts = inventory_stats.get('rarity_counts', {})
             rarity_text = ""
@@ -367,12 +402,18 @@ class ProfileView(discord.ui.View):
             if not rarity_text:
                 rarity_text = "Aucun personnage"
 
-            embed.add_field(name=style_section("RÉPARTITION PAR RARETÉ", "🌫️"),
-                            value=f"```\n{rarity_text}```",
-                            inline=False)
+            embed = embed_templates.render(
+                'profile', profile_template,
+                title_display=title_display,
+                username=style_username(username),
+                coins=format_number(snapshot['coins']),
+                rerolls=format_number(snapshot['total_rerolls']),
+                unique=inventory_stats.get('unique_characters', 0),
+                total=inventory_stats.get('total_characters', 0),
+                rarity_text=rarity_text)
 
             # Show equipped characters and bonuses
-            equipped_chars = await self.bot.db.get_equipped_characters(self.user_id)
+            equipped_chars = snapshot['equipped']
             if equipped_chars:
                 equipped_text = ""
                 for char in equipped_chars[:3]:  # Show max 3
@@ -380,7 +421,7 @@ class ProfileView(discord.ui.View):
                     equipped_text += f"{rarity_emoji} {char['name']}\n"
                 
                 # Calculate total bonuses
-                bonuses = await self.bot.db.calculate_equipment_bonuses(self.user_id)
+                bonuses = snapshot['bonuses']
                 bonus_text = ""
                 if bonuses.get('rarity_boost', 0) > 0:
                     bonus_text += f"🎲 +{bonuses['rarity_boost']:.0f}% chances\n"
@@ -426,27 +467,8 @@ class ProfileView(discord.ui.View):
             player = await self.bot.db.get_or_create_player(
                 self.user_id, username)
 
-            embed = discord.Embed(
-                title="🌌 ═══════〔 S H A D O W   R O L L 〕═══════ 🌌",
-                description=
-                f"```\n◆ Bienvenue dans les ténèbres, {username} ◆\n{format_number(player.coins)} Shadow Coins disponibles\n```",
-                color=BotConfig.RARITY_COLORS['Epic'])
-
-            embed.add_field(
-                name="🌑 ═══〔 Navigation 〕═══ 🌑",
-                value=("```\n"
-                       "👤 Profil      ◆ Vos statistiques\n"
-                       "🎲 Invocation  ◆ Invoquer des personnages\n"
-                       "🧪 Recherche   ◆ Traquer un personnage\n"
-                       "🎒 Collection  ◆ Voir vos personnages\n"
-                       "🔮 Craft       ◆ Évolution des personnages\n"
-                       "🎁 Bénédiction ◆ Récompense quotidienne\n"
-                       "🛒 Vente        ◆ Revendre vos personnages\n"
-                       "🎖️ Succès      ◆ Récompenses d’exploits\n"
-                       "🏆 Classement  ◆ Tableau des maîtres\n"
-                       "❓ Guide       ◆ Aide et informations\n"
-                       "```"),
-                inline=False)
+            embed = embed_templates.render('classic_menu', classic_menu_template,
+                                           username=username, coins=format_number(player.coins))
 
             embed.set_footer(
                 text=f"Shadow Roll • Utilisez les boutons pour naviguer • {username}",
@@ -476,7 +498,25 @@ class RollView(discord.ui.View):
         return interaction.user.id == self.user_id
 
     async def perform_roll(self) -> tuple[discord.Embed, bool]:
-        """Perform a character roll"""
+        """Perform a character roll (one economy action at a time per player)"""
+        async with user_gate.guard(self.user_id, 'roll') as admitted:
+            if not admitted:
+                return discord.Embed(
+                    title="⏳ Action en Cours",
+                    description=BotConfig.MESSAGES['action_throttled'],
+                    color=0xff9900), False
+            return await self._roll_character()
+
+    async def _roll_character(self) -> tuple[discord.Embed, bool]:
+        # Cooldown check in memory, before any database access
+        cooldown_remaining = roll_cooldowns.try_acquire(self.user_id)
+        if cooldown_remaining > 0:
+            return discord.Embed(
+                title="⏰ Invocation en Recharge",
+                description=f"Réessayez dans {cooldown_remaining:.1f} secondes",
+                color=0xff9900), False
+
+        rolled = False
         try:
             user = self.bot.get_user(self.user_id)
             username = get_display_name(
@@ -490,33 +530,6 @@ class RollView(discord.ui.View):
                                      description="Vous êtes banni du bot.",
                                      color=0xff0000), False
 
-            # Check cooldown - use the last character's rarity if available
-            from modules.utils import get_cooldown_remaining, get_rarity_cooldown
-            if player.last_reroll:
-                # Get the last rolled character's rarity to determine cooldown
-                cursor = await self.bot.db.db.execute("""
-                    SELECT c.rarity FROM inventory i
-                    JOIN characters c ON i.character_id = c.id
-                    WHERE i.user_id = ?
-                    ORDER BY i.id DESC LIMIT 1
-                """, (self.user_id,))
-                last_char = await cursor.fetchone()
-                
-                if last_char:
-                    last_rarity = last_char[0]
-                    cooldown_time = get_rarity_cooldown(last_rarity)
-                else:
-                    cooldown_time = BotConfig.REROLL_COOLDOWN
-                
-                cooldown_remaining = get_cooldown_remaining(
-                    player.last_reroll, int(cooldown_time))
-                if cooldown_remaining > 0:
-                    return discord.Embed(
-                        title="⏰ Invocation en Recharge",
-                        description=
-                        f"Réessayez dans {cooldown_remaining:.1f} secondes",
-                        color=0xff9900), False
-
             # Check coins
             if player.coins < BotConfig.REROLL_COST:
                 return discord.Embed(
@@ -574,12 +587,11 @@ class RollView(discord.ui.View):
             if hunt_system and not hunt_completed:
                 hunt_progress_info = await hunt_system.process_hunt_progress(self.user_id)
             
-            # Use rarity-based cooldown
-            from modules.utils import get_rarity_cooldown
-            cooldown_duration = get_rarity_cooldown(character.rarity)
+            # Start the cooldown of the rarity obtained
             current_time = datetime.now().isoformat()
             await self.bot.db.update_player_reroll_stats(
-                self.user_id, current_time)
+                self.user_id, current_time, character.rarity)
+            rolled = True
             
             # Check for newly completed sets
             await self.bot.db.check_and_complete_sets(self.user_id)
@@ -677,6 +689,9 @@ class RollView(discord.ui.View):
                 title="❌ Erreur d'Invocation",
                 description="Une erreur s'est produite lors de l'invocation",
                 color=0xff0000), False
+        finally:
+            if not rolled:
+                roll_cooldowns.release(self.user_id)
 
     @discord.ui.button(label='🎲 Invoquer Encore',
                        style=discord.ButtonStyle.primary,
@@ -702,11 +717,11 @@ class RollView(discord.ui.View):
 class CollectionView(discord.ui.View):
     """Character collection view with pagination"""
 
-    def __init__(self, bot, user_id: int, page: int = 1):
+    def __init__(self, bot, user_id: int):
         super().__init__(timeout=300)
         self.bot = bot
         self.user_id = user_id
-        self.current_page = page
+        self.pager = KeysetPager()
 
     async def interaction_check(self,
                                 interaction: discord.Interaction) -> bool:
@@ -719,9 +734,9 @@ class CollectionView(discord.ui.View):
             username = get_display_name(
                 user) if user else f"User {self.user_id}"
 
-            inventory = await self.bot.db.get_player_inventory(
+            inventory, self.pager.next_cursor = await self.bot.db.get_inventory_page(
                 self.user_id,
-                page=self.current_page,
+                after=self.pager.cursor,
                 limit=BotConfig.INVENTORY_ITEMS_PER_PAGE)
             inventory_stats = await self.bot.db.get_inventory_stats(
                 self.user_id)
@@ -749,7 +764,7 @@ class CollectionView(discord.ui.View):
                     collection_text += f"   🪙 {format_number(item['value'])} pièces\n\n"
 
                 embed.add_field(
-                    name=f"🎭 Personnages (Page {self.current_page})",
+                    name=f"🎭 Personnages (Page {self.pager.page})",
                     value=collection_text,
                     inline=False)
 
@@ -759,7 +774,7 @@ class CollectionView(discord.ui.View):
                 f"**Uniques:** {inventory_stats.get('unique_characters', 0)}\n**Total:** {inventory_stats.get('total_characters', 0)}\n**Valeur:** {format_number(inventory_stats.get('total_value', 0))} pièces",
                 inline=True)
 
-            embed.set_footer(text=f"Shadow Roll • Page {self.current_page}")
+            embed.set_footer(text=f"Shadow Roll • Page {self.pager.page}")
 
             return embed
 
@@ -776,8 +791,7 @@ class CollectionView(discord.ui.View):
                        row=0)
     async def previous_page(self, interaction: discord.Interaction,
                             button: discord.ui.Button):
-        if self.current_page > 1:
-            self.current_page -= 1
+        if self.pager.back():
             await interaction.response.defer()
             embed = await self.create_collection_embed()
             await interaction.edit_original_response(embed=embed, view=self)
@@ -790,14 +804,8 @@ class CollectionView(discord.ui.View):
                        row=0)
     async def next_page(self, interaction: discord.Interaction,
                         button: discord.ui.Button):
-        # Check if there are more items
-        next_inventory = await self.bot.db.get_player_inventory(
-            self.user_id,
-            page=self.current_page + 1,
-            limit=BotConfig.INVENTORY_ITEMS_PER_PAGE)
-
-        if next_inventory:
-            self.current_page += 1
+        # The last page fetch already told us whether more items follow
+        if self.pager.advance():
             await interaction.response.defer()
             embed = await self.create_collection_embed()
             await interaction.edit_original_response(embed=embed, view=self)
@@ -817,6 +825,22 @@ class CollectionView(discord.ui.View):
         await interaction.edit_original_response(embed=embed, view=view)
 
 
+def index_characters_template() -> discord.Embed:
+    """Static header of the character index"""
+    return discord.Embed(
+        title="📚 ═══════〔 I N D E X   D E S   P E R S O N N A G E S 〕═══════ 📚",
+        description="```\n◆ Collection Mondiale: {owned}/{total} ({percentage}%) ◆\n```",
+        color=BotConfig.RARITY_COLORS['Epic'])
+
+
+def index_series_template() -> discord.Embed:
+    """Static header of the per-series statistics"""
+    return discord.Embed(
+        title="📊 ═══════〔 S T A T I S T I Q U E S   P A R   S É R I E 〕═══════ 📊",
+        description="```\n◆ Progression de collection par anime ◆\n```",
+        color=BotConfig.RARITY_COLORS['Legendary'])
+
+
 class IndexView(discord.ui.View):
     """Enhanced character index with ownership tracking and collection stats"""
 
@@ -852,26 +876,21 @@ class IndexView(discord.ui.View):
 
     async def create_characters_embed(self) -> discord.Embed:
         """Create character list with ownership status"""
-        characters = await self.get_filtered_characters_with_ownership()
-        total_characters = len(characters)
+        result = await self.get_ownership_page()
+        total_characters = result['total']
         
         # Pagination
         start_idx = (self.current_page - 1) * self.characters_per_page
-        end_idx = start_idx + self.characters_per_page
-        page_characters = characters[start_idx:end_idx]
+        page_characters = result['characters']
         total_pages = max(1, (total_characters + self.characters_per_page - 1) // self.characters_per_page)
 
-        # Dynamic title
-        title_parts = ["📚 ═══════〔 I N D E X   D E S   P E R S O N N A G E S 〕═══════ 📚"]
-        
         # Ownership stats
-        owned_count = sum(1 for char in characters if char['owned'])
+        owned_count = result['owned']
         completion_percentage = (owned_count / total_characters * 100) if total_characters > 0 else 0
         
-        embed = discord.Embed(
-            title=" ".join(title_parts),
-            description=f"```\n◆ Collection Mondiale: {owned_count}/{total_characters} ({completion_percentage:.1f}%) ◆\n```",
-            color=BotConfig.RARITY_COLORS['Epic'])
+        embed = embed_templates.render(
+            'index_characters', index_characters_template,
+            owned=owned_count, total=total_characters, percentage=f"{completion_percentage:.1f}")
 
         if not page_characters:
             embed.add_field(
@@ -881,6 +900,7 @@ class IndexView(discord.ui.View):
             return embed
 
         # Character entries with ownership status
+        total_weight = sum(BotConfig.RARITY_WEIGHTS.values())
         for i, char in enumerate(page_characters):
             rarity_emoji = BotConfig.RARITY_EMOJIS.get(char['rarity'], '◆')
             
@@ -895,7 +915,6 @@ class IndexView(discord.ui.View):
                 name_format = f"~~{char['name']}~~"
             
             # Get drop rate
-            total_weight = sum(BotConfig.RARITY_WEIGHTS.values())
             drop_rate = (BotConfig.RARITY_WEIGHTS.get(char['rarity'], 0) / total_weight) * 100
             
             card_content = (
@@ -933,10 +952,7 @@ class IndexView(discord.ui.View):
         """Create series completion statistics"""
         stats = await self.bot.db.get_collection_stats_by_anime(self.user_id)
         
-        embed = discord.Embed(
-            title="📊 ═══════〔 S T A T I S T I Q U E S   P A R   S É R I E 〕═══════ 📊",
-            description="```\n◆ Progression de collection par anime ◆\n```",
-            color=BotConfig.RARITY_COLORS['Legendary'])
+        embed = embed_templates.render('index_series', index_series_template)
 
         if not stats:
             embed.add_field(
@@ -995,27 +1011,15 @@ class IndexView(discord.ui.View):
         embed.set_footer(text="Shadow Roll • Mode: Statistiques par Série")
         return embed
 
-    async def get_filtered_characters_with_ownership(self):
-        """Get characters with ownership status based on current filters"""
-        all_characters = await self.bot.db.get_all_characters_with_ownership(self.user_id)
-        
-        # Apply anime filter
-        if self.anime_filter:
-            all_characters = [char for char in all_characters if char['anime'] == self.anime_filter]
-        
-        # Apply rarity filter
-        if self.rarity_filter:
-            all_characters = [char for char in all_characters if char['rarity'] == self.rarity_filter]
-        
-        # Apply search filter
+    async def get_ownership_page(self):
+        """Current page of characters with ownership status, filtered on the ownership index bitmasks"""
+        # Search results keep their ranking: exact, prefix, substring, then close spellings
+        ranked_ids = None
         if self.search_query:
-            query_lower = self.search_query.lower()
-            all_characters = [
-                char for char in all_characters 
-                if query_lower in char['name'].lower() or query_lower in char['anime'].lower()
-            ]
-        
-        return all_characters
+            ranked_ids = await self.bot.db.character_search.search_ids(self.search_query)
+        return await ownership_index.page(
+            self.user_id, self.current_page, self.characters_per_page,
+            anime=self.anime_filter, rarity=self.rarity_filter, ranked_ids=ranked_ids)
 
     # Navigation buttons for IndexView
     @discord.ui.button(label='⬅️ Précédent', style=discord.ButtonStyle.secondary, row=0)
@@ -1031,8 +1035,8 @@ class IndexView(discord.ui.View):
     @discord.ui.button(label='➡️ Suivant', style=discord.ButtonStyle.secondary, row=0)
     async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
         if self.view_mode == "characters":
-            characters = await self.get_filtered_characters_with_ownership()
-            total_pages = max(1, (len(characters) + self.characters_per_page - 1) // self.characters_per_page)
+            total_characters = (await self.get_ownership_page())['total']
+            total_pages = max(1, (total_characters + self.characters_per_page - 1) // self.characters_per_page)
         else:
             total_pages = 1  # Series view has only one page
             
@@ -1206,6 +1210,36 @@ class DailyView(discord.ui.View):
         await interaction.edit_original_response(embed=embed, view=view)
 
 
+# Catégorie -> (titre, description, nom du champ, footer)
+RANKING_HEADERS = {
+    'coins': ("🌌 ═══════〔 C L A S S E M E N T   R I C H E S S E S 〕═══════ 🌌",
+              "```\n◆ Les maîtres des Shadow Coins ◆\n```",
+              "🏆 Top Richesses",
+              "Shadow Roll • Classement par Shadow Coins"),
+    'collection_value': ("🌌 ═══════〔 C L A S S E M E N T   C O L L E C T I O N S 〕═══════ 🌌",
+                         "```\n◆ Les collections les plus précieuses ◆\n```",
+                         "💎 Top Collections",
+                         "Shadow Roll • Classement par valeur totale de collection"),
+    'rerolls': ("🌌 ═══════〔 C L A S S E M E N T   I N V O C A T I O N S 〕═══════ 🌌",
+                "```\n◆ Les maîtres des invocations ◆\n```",
+                "🎲 Top Invocations",
+                "Shadow Roll • Classement par nombre d'invocations"),
+}
+
+
+def rankings_template(category: str):
+    """Builder of the static header of one rankings category"""
+    title, description, _, footer_text = RANKING_HEADERS[category]
+
+    def build() -> discord.Embed:
+        embed = discord.Embed(title=title,
+                              description=description,
+                              color=BotConfig.RARITY_COLORS['Epic'])
+        embed.set_footer(text=footer_text)
+        return embed
+    return build
+
+
 class RankingsView(discord.ui.View):
     """Rankings/leaderboard view with multiple categories"""
 
@@ -1226,25 +1260,9 @@ class RankingsView(discord.ui.View):
                 self.current_category, BotConfig.LEADERBOARD_ITEMS_PER_PAGE)
 
             # Configure embed based on category
-            if self.current_category == 'coins':
-                title = "🌌 ═══════〔 C L A S S E M E N T   R I C H E S S E S 〕═══════ 🌌"
-                description = "```\n◆ Les maîtres des Shadow Coins ◆\n```"
-                field_name = "🏆 Top Richesses"
-                footer_text = "Shadow Roll • Classement par Shadow Coins"
-            elif self.current_category == 'collection_value':
-                title = "🌌 ═══════〔 C L A S S E M E N T   C O L L E C T I O N S 〕═══════ 🌌"
-                description = "```\n◆ Les collections les plus précieuses ◆\n```"
-                field_name = "💎 Top Collections"
-                footer_text = "Shadow Roll • Classement par valeur totale de collection"
-            else:
-                title = "🌌 ═══════〔 C L A S S E M E N T   I N V O C A T I O N S 〕═══════ 🌌"
-                description = "```\n◆ Les maîtres des invocations ◆\n```"
-                field_name = "🎲 Top Invocations"
-                footer_text = "Shadow Roll • Classement par nombre d'invocations"
-
-            embed = discord.Embed(title=title,
-                                  description=description,
-                                  color=BotConfig.RARITY_COLORS['Epic'])
+            category = self.current_category if self.current_category in RANKING_HEADERS else 'rerolls'
+            field_name = RANKING_HEADERS[category][2]
+            embed = embed_templates.render(f'rankings_{category}', rankings_template(category))
 
             if not leaderboard:
                 embed.add_field(name="📊 Classement Vide",
@@ -1278,7 +1296,6 @@ class RankingsView(discord.ui.View):
                                 value=rankings_text,
                                 inline=False)
 
-            embed.set_footer(text=footer_text)
             return embed
 
         except Exception as e:
@@ -1788,46 +1805,52 @@ class MarketplaceView(discord.ui.View):
         try:
             if self.view_mode == "browse":
                 # Buying mode
-                listings = await self.bot.db.get_marketplace_listings(
-                    self.current_page, self.listings_per_page)
-
-                if selection_number > len(listings):
-                    await interaction.followup.send("Sélection invalide!",
-                                                    ephemeral=True)
-                    return
-
-                selected_listing = listings[selection_number - 1]
-
-                # Prevent self-purchase
-                if selected_listing['seller_id'] == self.user_id:
-                    await interaction.followup.send(
-                        "Vous ne pouvez pas acheter votre propre annonce!",
-                        ephemeral=True)
-                    return
+                # One purchase at a time per buyer (double clicks are shed)
+                async with user_gate.guard(self.user_id, 'buy') as admitted:
+                    if not admitted:
+                        await reject_interaction(interaction)
+                        return
 
-                # Check if player has enough coins
-                player = await self.bot.db.get_or_create_player(
-                    self.user_id, interaction.user.display_name)
-                if player.coins < selected_listing['price']:
-                    needed = selected_listing['price'] - player.coins
-                    await interaction.followup.send(
-                        f"Fonds insuffisants! Il vous manque {format_number(needed)} {BotConfig.CURRENCY_EMOJI}",
-                        ephemeral=True)
-                    return
+                    listings = await self.bot.db.get_marketplace_listings(
+                        self.current_page, self.listings_per_page)
 
-                # Attempt purchase
-                if await self.bot.db.purchase_marketplace_item(
-                        self.user_id, selected_listing['id']):
-                    embed = await self.create_marketplace_embed()
-                    await interaction.edit_original_response(embed=embed,
-                                                             view=self)
-                    await interaction.followup.send(
-                        f"🎉 Achat réussi! Vous avez acheté **{selected_listing['character_name']}** pour {format_number(selected_listing['price'])} {BotConfig.CURRENCY_EMOJI}",
-                        ephemeral=True)
-                else:
-                    await interaction.followup.send(
-                        "Erreur lors de l'achat. L'annonce n'est peut-être plus disponible.",
-                        ephemeral=True)
+                    if selection_number > len(listings):
+                        await interaction.followup.send("Sélection invalide!",
+                                                        ephemeral=True)
+                        return
+
+                    selected_listing = listings[selection_number - 1]
+
+                    # Prevent self-purchase
+                    if selected_listing['seller_id'] == self.user_id:
+                        await interaction.followup.send(
+                            "Vous ne pouvez pas acheter votre propre annonce!",
+                            ephemeral=True)
+                        return
+
+                    # Check if player has enough coins
+                    player = await self.bot.db.get_or_create_player(
+                        self.user_id, interaction.user.display_name)
+                    if player.coins < selected_listing['price']:
+                        needed = selected_listing['price'] - player.coins
+                        await interaction.followup.send(
+                            f"Fonds insuffisants! Il vous manque {format_number(needed)} {BotConfig.CURRENCY_EMOJI}",
+                            ephemeral=True)
+                        return
+
+                    # Attempt purchase
+                    if await self.bot.db.purchase_marketplace_item(
+                            self.user_id, selected_listing['id']):
+                        embed = await self.create_marketplace_embed()
+                        await interaction.edit_original_response(embed=embed,
+                                                                 view=self)
+                        await interaction.followup.send(
+                            f"🎉 Achat réussi! Vous avez acheté **{selected_listing['character_name']}** pour {format_number(selected_listing['price'])} {BotConfig.CURRENCY_EMOJI}",
+                            ephemeral=True)
+                    else:
+                        await interaction.followup.send(
+                            "Erreur lors de l'achat. L'annonce n'est peut-être plus disponible.",
+                            ephemeral=True)
 
             else:
                 # Cancel listing mode
@@ -2665,27 +2688,8 @@ class ShadowMenuManager:
             username = get_display_name(ctx.author)
             player = await self.bot.db.get_or_create_player(user_id, username)
 
-            embed = discord.Embed(
-                title="🌌 ═══════〔 S H A D O W   R O L L 〕═══════ 🌌",
-                description=
-                f"```\n◆ Bienvenue dans les ténèbres, {username} ◆\n{format_number(player.coins)} Shadow Coins disponibles\n```",
-                color=BotConfig.RARITY_COLORS['Epic'])
-
-            embed.add_field(
-                name="🌑 ═══〔 Navigation 〕═══ 🌑",
-                value=("```\n"
-                       "👤 Profil      ◆ Vos statistiques\n"
-                       "🎲 Invocation  ◆ Invoquer des personnages\n"
-                       "🧪 Recherche   ◆ Traquer un personnage\n"
-                       "🎒 Collection  ◆ Voir vos personnages\n"
-                       "🔮 Craft       ◆ Évolution des personnages\n"
-                       "🎁 Bénédiction ◆ Récompense quotidienne\n"
-                       "🛒 Vente        ◆ Revendre vos personnages\n"
-                       "🎖️ Succès      ◆ Récompenses d’exploits\n"
-                       "🏆 Classement  ◆ Tableau des maîtres\n"
-                       "❓ Guide       ◆ Aide et informations\n"
-                       "```"),
-                inline=False)
+            embed = embed_templates.render('classic_menu', classic_menu_template,
+                                           username=username, coins=format_number(player.coins))
 
             embed.set_footer(
                 text="Shadow Roll • Utilisez les boutons pour naviguer",
@@ -7,13 +7,84 @@ from discord.ext import commands
 import logging
 from typing import List, Dict
 import re
-from pathlib import Path
 
 from core.config import BotConfig
+from core.content_store import ContentStore
 from modules.utils import get_display_name
 
 logger = logging.getLogger(__name__)
 
+VERSIONS_PER_PAGE = 3
+
+_VERSION_HEADER = re.compile(r'^## (v[\d\.]+.*?) - (.*?) \((.*?)\)$')
+_BOLD_LABEL = re.compile(r'\*\*(.*?)\*\*:')
+
+
+class PatchNotesIndex:
+    """Parsed patch notes: versions in file order, already formatted and split into pages"""
+
+    __slots__ = ('versions', 'pages')
+
+    def __init__(self, versions: List[Dict]):
+        self.versions = versions
+        self.pages = [versions[i:i + VERSIONS_PER_PAGE] for i in range(0, len(versions), VERSIONS_PER_PAGE)]
+
+
+def _format_version(version: Dict) -> Dict:
+    """Embed field of one version, built once per parse instead of per page view"""
+    content = version['content']
+
+    # Limit content length for Discord embed
+    if len(content) > 1000:
+        content = content[:997] + "..."
+
+    # Clean up markdown formatting for Discord
+    content = content.replace('###', '**')
+    content = _BOLD_LABEL.sub(r'**\1:**', content)
+
+    version['field_name'] = f"🎯 {version['version']} - {version['title']}"
+    version['field_value'] = f"```\n📅 {version['date']}\n```\n{content}"
+    return version
+
+
+def parse_patch_notes(content: str) -> PatchNotesIndex:
+    """Split the markdown into versions (## vX - title (date) headers)"""
+    versions = []
+    current_version = None
+    current_content = []
+
+    for line in content.split('\n'):
+        # Check for version header (## v...)
+        version_match = _VERSION_HEADER.match(line)
+        if version_match:
+            # Save previous version if exists
+            if current_version:
+                current_version['content'] = '\n'.join(current_content).strip()
+                versions.append(_format_version(current_version))
+
+            # Start new version
+            current_version = {
+                'version': version_match.group(1),
+                'title': version_match.group(2),
+                'date': version_match.group(3)
+            }
+            current_content = []
+        elif current_version and line.strip():
+            # Add content to current version (skip architecture section)
+            if not line.startswith('## Architecture'):
+                current_content.append(line)
+
+    # Add the last version
+    if current_version:
+        current_version['content'] = '\n'.join(current_content).strip()
+        versions.append(_format_version(current_version))
+
+    return PatchNotesIndex(versions)
+
+
+# Global patch notes store (parsed at startup, reparsed when the file changes)
+patch_notes_store = ContentStore('docs/PATCH_NOTES.md', parse_patch_notes, PatchNotesIndex([]))
+
 
 class PatchNotesView(discord.ui.View):
     """Patch Notes display view with navigation"""
@@ -23,73 +94,20 @@ class PatchNotesView(discord.ui.View):
         self.bot = bot
         self.user_id = user_id
         self.current_page = 1
-        self.versions_per_page = 3
-        self.versions = self._load_patch_notes()
+        self.notes = patch_notes_store.default
+
+    async def load(self, force: bool = False):
+        """Take the store's current index (rechecking the file first when forced)"""
+        self.notes = await (patch_notes_store.reload() if force else patch_notes_store.get())
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """Ensure only the command user can interact"""
         return interaction.user.id == self.user_id
 
-    def _load_patch_notes(self) -> List[Dict]:
-        """Load and parse patch notes from markdown file"""
-        try:
-            patch_file = Path("docs/PATCH_NOTES.md")
-            if not patch_file.exists():
-                return []
-
-            with open(patch_file, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            versions = []
-            current_version = None
-            current_content = []
-            
-            lines = content.split('\n')
-            
-            for line in lines:
-                # Check for version header (## v...)
-                version_match = re.match(r'^## (v[\d\.]+.*?) - (.*?) \((.*?)\)$', line)
-                if version_match:
-                    # Save previous version if exists
-                    if current_version:
-                        versions.append({
-                            'version': current_version['version'],
-                            'title': current_version['title'],
-                            'date': current_version['date'],
-                            'content': '\n'.join(current_content).strip()
-                        })
-                    
-                    # Start new version
-                    current_version = {
-                        'version': version_match.group(1),
-                        'title': version_match.group(2),
-                        'date': version_match.group(3)
-                    }
-                    current_content = []
-                elif current_version and line.strip():
-                    # Add content to current version (skip architecture section)
-                    if not line.startswith('## Architecture'):
-                        current_content.append(line)
-            
-            # Add the last version
-            if current_version:
-                versions.append({
-                    'version': current_version['version'],
-                    'title': current_version['title'],
-                    'date': current_version['date'],
-                    'content': '\n'.join(current_content).strip()
-                })
-
-            return versions
-
-        except Exception as e:
-            logger.error(f"Error loading patch notes: {e}")
-            return []
-
     async def create_patch_notes_embed(self) -> discord.Embed:
         """Create patch notes embed with current page"""
         try:
-            if not self.versions:
+            if not self.notes.versions:
                 embed = discord.Embed(
                     title="📜 ═══════〔 N O T E S   D E   V E R S I O N 〕═══════ 📜",
                     description="```\nAucune note de version disponible\n```",
@@ -97,16 +115,13 @@ class PatchNotesView(discord.ui.View):
                 )
                 return embed
 
-            total_pages = (len(self.versions) + self.versions_per_page - 1) // self.versions_per_page
+            total_pages = len(self.notes.pages)
             
             # Ensure current_page is within bounds
             if self.current_page > total_pages:
                 self.current_page = total_pages
             if self.current_page < 1:
                 self.current_page = 1
-
-            start_idx = (self.current_page - 1) * self.versions_per_page
-            end_idx = min(start_idx + self.versions_per_page, len(self.versions))
             
             embed = discord.Embed(
                 title="📜 ═══════〔 N O T E S   D E   V E R S I O N 〕═══════ 📜",
@@ -115,30 +130,13 @@ class PatchNotesView(discord.ui.View):
             )
 
             # Add versions for current page
-            for i in range(start_idx, end_idx):
-                version = self.versions[i]
-                
-                # Format version content
-                content = version['content']
-                
-                # Limit content length for Discord embed
-                if len(content) > 1000:
-                    content = content[:997] + "..."
-                
-                # Clean up markdown formatting for Discord
-                content = content.replace('###', '**').replace('**', '**')
-                content = re.sub(r'\*\*(.*?)\*\*:', r'**\1:**', content)
-                
-                embed.add_field(
-                    name=f"🎯 {version['version']} - {version['title']}",
-                    value=f"```\n📅 {version['date']}\n```\n{content}",
-                    inline=False
-                )
+            for version in self.notes.pages[self.current_page - 1]:
+                embed.add_field(name=version['field_name'], value=version['field_value'], inline=False)
 
             # Add navigation info
             if total_pages > 1:
                 embed.set_footer(
-                    text=f"Shadow Roll • Page {self.current_page}/{total_pages} • {len(self.versions)} versions total"
+                    text=f"Shadow Roll • Page {self.current_page}/{total_pages} • {len(self.notes.versions)} versions total"
                 )
             else:
                 embed.set_footer(text="Shadow Roll • Notes de Version")
@@ -164,8 +162,7 @@ class PatchNotesView(discord.ui.View):
 
     @discord.ui.button(label='➡️ Suivant', style=discord.ButtonStyle.secondary, row=0)
     async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        total_pages = (len(self.versions) + self.versions_per_page - 1) // self.versions_per_page
-        if self.current_page < total_pages:
+        if self.current_page < len(self.notes.pages):
             self.current_page += 1
             embed = await self.create_patch_notes_embed()
             await interaction.response.edit_message(embed=embed, view=self)
@@ -175,7 +172,7 @@ class PatchNotesView(discord.ui.View):
     @discord.ui.button(label='🔄 Actualiser', style=discord.ButtonStyle.success, row=0)
     async def refresh_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Refresh patch notes from file"""
-        self.versions = self._load_patch_notes()
+        await self.load(force=True)
         embed = await self.create_patch_notes_embed()
         await interaction.response.edit_message(embed=embed, view=self)
 
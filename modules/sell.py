@@ -6,6 +6,8 @@ Allows players to sell their characters for coins
 import discord
 from discord.ext import commands
 from core.config import BotConfig
+from core.user_gate import gated
+from modules.utils import KeysetPager
 from typing import List, Dict
 import logging
 
@@ -25,11 +27,12 @@ def truncate_field_value(text: str, max_length: int = 1000) -> str:
 class SellView(discord.ui.View):
     """Sell interface view with character selection"""
     
-    def __init__(self, bot, user_id: int, page: int = 1):
+    def __init__(self, bot, user_id: int):
         super().__init__(timeout=300)
         self.bot = bot
         self.user_id = user_id
-        self.current_page = page
+        self.pager = KeysetPager()
+        self.page_items: List[Dict] = []
         self.selected_item = None
         
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
@@ -45,8 +48,9 @@ class SellView(discord.ui.View):
         """Create sell interface embed"""
         try:
             # Get player's sellable inventory
-            inventory_items = await self.bot.db.get_player_sellable_inventory(
-                self.user_id, self.current_page, 10)
+            inventory_items, self.pager.next_cursor = await self.bot.db.get_inventory_page(
+                self.user_id, after=self.pager.cursor, limit=10, sellable_only=True)
+            self.page_items = inventory_items
             
             # Get player info for coins display
             player = await self.bot.db.get_or_create_player(
@@ -88,14 +92,14 @@ class SellView(discord.ui.View):
                 # Create character list with sell prices
                 char_list = []
                 select_options = []
+                set_bonuses = await self.bot.db.get_active_set_bonuses(self.user_id)
+                coin_multiplier = set_bonuses.get('coin_boost', 1.0)
                 
                 for i, item in enumerate(inventory_items[:10]):
                     rarity_emoji = BotConfig.RARITY_EMOJIS.get(item['rarity'], '◆')
                     
                     # Calculate actual sell price with bonuses
                     base_price = item['value']
-                    set_bonuses = await self.bot.db.get_active_set_bonuses(self.user_id)
-                    coin_multiplier = set_bonuses.get('coin_boost', 1.0)
                     price_with_set_bonus = int(base_price * coin_multiplier)
                     final_price = await self.bot.db.apply_equipment_bonuses_to_coins(self.user_id, price_with_set_bonus)
                     
@@ -129,7 +133,7 @@ class SellView(discord.ui.View):
                 # Prevent embed overflow by truncating character list
                 char_display = "\n".join(char_list) if char_list else "Aucun personnage trouvé"
                 embed.add_field(
-                    name=f"🎭 Vos Personnages (Page {self.current_page})",
+                    name=f"🎭 Vos Personnages (Page {self.pager.page})",
                     value=truncate_field_value(char_display, 1000),
                     inline=False
                 )
@@ -173,12 +177,9 @@ class SellView(discord.ui.View):
         try:
             inventory_id = int(select.values[0])
             
-            # Get character details
-            inventory_items = await self.bot.db.get_player_sellable_inventory(
-                self.user_id, 1, 100)
-            
+            # The selected character is on the page currently displayed
             selected_char = None
-            for item in inventory_items:
+            for item in self.page_items:
                 if item['inventory_id'] == inventory_id:
                     selected_char = item
                     break
@@ -236,8 +237,7 @@ class SellView(discord.ui.View):
     @discord.ui.button(label="◀️ Précédent", style=discord.ButtonStyle.secondary, row=1)
     async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Go to previous page"""
-        if self.current_page > 1:
-            self.current_page -= 1
+        if self.pager.back():
             embed = await self.create_sell_embed()
             await interaction.response.edit_message(embed=embed, view=self)
         else:
@@ -246,16 +246,11 @@ class SellView(discord.ui.View):
     @discord.ui.button(label="Suivant ▶️", style=discord.ButtonStyle.secondary, row=1)
     async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Go to next page"""
-        self.current_page += 1
-        embed = await self.create_sell_embed()
-        # Check if page has content
-        inventory_items = await self.bot.db.get_player_sellable_inventory(
-            self.user_id, self.current_page, 10)
-        if not inventory_items:
-            self.current_page -= 1  # Go back if no content
-            await interaction.response.defer()
-        else:
+        if self.pager.advance():
+            embed = await self.create_sell_embed()
             await interaction.response.edit_message(embed=embed, view=self)
+        else:
+            await interaction.response.defer()  # Already on the last page
     
     @discord.ui.button(label="🔙 Retour au Menu", style=discord.ButtonStyle.primary, row=1)
     async def back_to_menu(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -281,6 +276,7 @@ class SellConfirmView(discord.ui.View):
         return interaction.user.id == self.user_id
     
     @discord.ui.button(label="✅ Confirmer la Vente", style=discord.ButtonStyle.success)
+    @gated('sell')
     async def confirm_sell(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Confirm the sale"""
         try:
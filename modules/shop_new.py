@@ -9,10 +9,18 @@ import logging
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from core.config import BotConfig
+from core.effects import COIN_MULTIPLIER, CRAFT_DISCOUNT, LUCK_BOOST, effects_engine
 from modules.utils import format_number
 
 logger = logging.getLogger(__name__)
 
+# Buffs de la boutique -> (type d'effet, intensité)
+BUFF_EFFECTS = {
+    'luck': (LUCK_BOOST, 1.5),
+    'coin_multiplier': (COIN_MULTIPLIER, 2.0),
+    'craft_discount': (CRAFT_DISCOUNT, 0.5),
+}
+
 class ModernShopView(discord.ui.View):
     """Nouvelle boutique moderne avec système d'achat fonctionnel"""
 
@@ -218,11 +226,11 @@ class ModernShopView(discord.ui.View):
                 
             elif effect == 'epic_guarantee':
                 # Garantir epic sur la prochaine invocation
-                await self.bot.db.add_guaranteed_rarity(player.user_id, 'Epic')
+                await self.bot.db.add_guaranteed_rarity(player.user_id, 'Epic', duration=3600)
                 
             elif effect == 'legendary_guarantee':
                 # Garantir legendary sur la prochaine invocation
-                await self.bot.db.add_guaranteed_rarity(player.user_id, 'Legendary')
+                await self.bot.db.add_guaranteed_rarity(player.user_id, 'Legendary', duration=3600)
                 
             elif effect == 'mega_pack':
                 # Combo pack avec bonus
@@ -242,23 +250,8 @@ class ModernShopView(discord.ui.View):
     async def add_temporary_buff(self, user_id: int, buff_type: str, duration: int):
         """Ajouter un buff temporaire"""
         try:
-            # Créer la table des buffs si elle n'existe pas
-            await self.bot.db.db.execute("""
-                CREATE TABLE IF NOT EXISTS temporary_buffs (
-                    user_id INTEGER,
-                    buff_type TEXT,
-                    expires_at INTEGER,
-                    PRIMARY KEY (user_id, buff_type)
-                )
-            """)
-            
-            # Ajouter le buff
-            expires_at = int(datetime.now().timestamp()) + duration
-            await self.bot.db.db.execute(
-                "INSERT OR REPLACE INTO temporary_buffs (user_id, buff_type, expires_at) VALUES (?, ?, ?)",
-                (user_id, buff_type, expires_at)
-            )
-            await self.bot.db.db.commit()
+            kind, magnitude = BUFF_EFFECTS[buff_type]
+            await effects_engine.grant(user_id, kind, magnitude, duration=duration)
             
         except Exception as e:
             logger.error(f"Error adding temporary buff: {e}")
@@ -389,64 +382,12 @@ class PurchaseModal(discord.ui.Modal, title="🛒 Acheter un Article"):
 async def setup_shop_database(bot):
     """Configurer les tables nécessaires pour la boutique"""
     try:
-        # Table pour les invocations gratuites
-        await bot.db.db.execute("""
-            CREATE TABLE IF NOT EXISTS free_rolls (
-                user_id INTEGER PRIMARY KEY,
-                amount INTEGER DEFAULT 0
-            )
-        """)
-        
-        # Table pour les raretés garanties
-        await bot.db.db.execute("""
-            CREATE TABLE IF NOT EXISTS guaranteed_rarities (
-                user_id INTEGER PRIMARY KEY,
-                rarity TEXT,
-                expires_at INTEGER
-            )
-        """)
-        
-        # Ajouter les méthodes à la classe Database
-        async def add_free_rolls(self, user_id: int, amount: int):
-            """Ajouter des invocations gratuites"""
-            await self.db.execute(
-                "INSERT OR REPLACE INTO free_rolls (user_id, amount) VALUES (?, COALESCE((SELECT amount FROM free_rolls WHERE user_id = ?), 0) + ?)",
-                (user_id, user_id, amount)
-            )
-            await self.db.commit()
-        
-        async def get_free_rolls(self, user_id: int) -> int:
-            """Obtenir le nombre d'invocations gratuites"""
-            cursor = await self.db.execute("SELECT amount FROM free_rolls WHERE user_id = ?", (user_id,))
-            result = await cursor.fetchone()
-            return result[0] if result else 0
-        
-        async def use_free_roll(self, user_id: int) -> bool:
-            """Utiliser une invocation gratuite"""
-            current = await self.get_free_rolls(user_id)
-            if current > 0:
-                await self.db.execute(
-                    "UPDATE free_rolls SET amount = amount - 1 WHERE user_id = ?",
-                    (user_id,)
-                )
-                await self.db.commit()
-                return True
-            return False
-        
+        # Invocations gratuites et raretés garanties: DatabaseManager (moteur d'effets)
         async def reset_all_cooldowns(self, user_id: int):
             """Supprimer tous les cooldowns"""
             await self.db.execute("DELETE FROM cooldowns WHERE user_id = ?", (user_id,))
             await self.db.commit()
         
-        async def add_guaranteed_rarity(self, user_id: int, rarity: str):
-            """Ajouter une rareté garantie pour la prochaine invocation"""
-            expires_at = int(datetime.now().timestamp()) + 3600  # 1 heure
-            await self.db.execute(
-                "INSERT OR REPLACE INTO guaranteed_rarities (user_id, rarity, expires_at) VALUES (?, ?, ?)",
-                (user_id, rarity, expires_at)
-            )
-            await self.db.commit()
-        
         async def add_item_to_inventory(self, user_id: int, item_id: int, quantity: int):
             """Ajouter un objet à l'inventaire du joueur"""
             try:
@@ -500,11 +441,7 @@ async def setup_shop_database(bot):
                 return []
 
         # Attacher les méthodes à la classe Database
-        bot.db.add_free_rolls = add_free_rolls.__get__(bot.db, bot.db.__class__)
-        bot.db.get_free_rolls = get_free_rolls.__get__(bot.db, bot.db.__class__)
-        bot.db.use_free_roll = use_free_roll.__get__(bot.db, bot.db.__class__)
         bot.db.reset_all_cooldowns = reset_all_cooldowns.__get__(bot.db, bot.db.__class__)
-        bot.db.add_guaranteed_rarity = add_guaranteed_rarity.__get__(bot.db, bot.db.__class__)
         bot.db.add_item_to_inventory = add_item_to_inventory.__get__(bot.db, bot.db.__class__)
         bot.db.get_player_shop_items = get_player_shop_items.__get__(bot.db, bot.db.__class__)
         
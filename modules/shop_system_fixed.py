@@ -8,9 +8,10 @@ from discord.ext import commands
 import asyncio
 import logging
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
 import json
 from core.config import BotConfig
+from core.effects import FREE_ROLLS, GUARANTEE, effects_engine
+from core.user_gate import gated
 
 logger = logging.getLogger(__name__)
 
@@ -81,39 +82,7 @@ class ShopDatabase:
                 )
             ''')
             
-            # Table des buffs temporaires
-            await self.db.execute('''
-                CREATE TABLE IF NOT EXISTS temporary_buffs_fixed (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    buff_type TEXT NOT NULL,
-                    buff_value REAL DEFAULT 1.0,
-                    expires_at INTEGER NOT NULL,
-                    is_active BOOLEAN DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Table des invocations gratuites
-            await self.db.execute('''
-                CREATE TABLE IF NOT EXISTS free_rolls_fixed (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    rolls_remaining INTEGER DEFAULT 0,
-                    granted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Table des garanties de rareté
-            await self.db.execute('''
-                CREATE TABLE IF NOT EXISTS guaranteed_rarities_fixed (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    rarity TEXT NOT NULL,
-                    uses_remaining INTEGER DEFAULT 1,
-                    granted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+            # Buffs, invocations gratuites et garanties: table effects (core/effects.py)
             
             await self.db.commit()
             logger.info("Tables de la boutique initialisées avec succès")
@@ -233,14 +202,7 @@ class ShopDatabase:
     async def add_temporary_buff(self, user_id: int, buff_type: str, buff_value: float, duration: int):
         """Ajouter un buff temporaire"""
         try:
-            expires_at = int(datetime.now().timestamp()) + duration
-            
-            await self.db.execute('''
-                INSERT OR REPLACE INTO temporary_buffs_fixed 
-                (user_id, buff_type, buff_value, expires_at)
-                VALUES (?, ?, ?, ?)
-            ''', (user_id, buff_type, buff_value, expires_at))
-            await self.db.commit()
+            await effects_engine.grant(user_id, buff_type, buff_value, duration=duration)
             logger.info(f"Buff temporaire ajouté: {buff_type} pour user {user_id}")
             
         except Exception as e:
@@ -249,24 +211,7 @@ class ShopDatabase:
     async def add_free_rolls(self, user_id: int, amount: int):
         """Ajouter des invocations gratuites"""
         try:
-            cursor = await self.db.execute('''
-                SELECT rolls_remaining FROM free_rolls_fixed WHERE user_id = ?
-            ''', (user_id,))
-            existing = await cursor.fetchone()
-            
-            if existing:
-                await self.db.execute('''
-                    UPDATE free_rolls_fixed 
-                    SET rolls_remaining = rolls_remaining + ?
-                    WHERE user_id = ?
-                ''', (amount, user_id))
-            else:
-                await self.db.execute('''
-                    INSERT INTO free_rolls_fixed (user_id, rolls_remaining)
-                    VALUES (?, ?)
-                ''', (user_id, amount))
-            
-            await self.db.commit()
+            await effects_engine.grant(user_id, FREE_ROLLS, charges=amount)
             logger.info(f"Invocations gratuites ajoutées: {amount} pour user {user_id}")
             
         except Exception as e:
@@ -275,11 +220,7 @@ class ShopDatabase:
     async def add_guaranteed_rarity(self, user_id: int, rarity: str):
         """Ajouter une garantie de rareté"""
         try:
-            await self.db.execute('''
-                INSERT INTO guaranteed_rarities_fixed (user_id, rarity)
-                VALUES (?, ?)
-            ''', (user_id, rarity))
-            await self.db.commit()
+            await effects_engine.grant(user_id, GUARANTEE, charges=1, target=rarity)
             logger.info(f"Garantie de rareté ajoutée: {rarity} pour user {user_id}")
             
         except Exception as e:
@@ -701,6 +642,7 @@ class PurchaseModal(discord.ui.Modal):
         )
         self.add_item(self.item_number)
     
+    @gated('buy')
     async def on_submit(self, interaction: discord.Interaction):
         try:
             # Valider l'entrée
@@ -915,6 +857,7 @@ class SellConfirmationView(discord.ui.View):
         self.shop_view = shop_view
     
     @discord.ui.button(label='✅ Confirmer la Vente', style=discord.ButtonStyle.success)
+    @gated('sell')
     async def confirm_sell(self, interaction: discord.Interaction, button: discord.ui.Button):
         try:
             # Vérifier que le joueur possède toujours le personnage
@@ -14,6 +14,9 @@ import json
 import os
 
 from core.config import BotConfig
+from core.query_stats import query_stats
+from core.tracing import tracer
+from core.watchdog import watchdog
 from modules.utils import format_number, get_display_name
 
 logger = logging.getLogger(__name__)
@@ -411,6 +414,144 @@ async def setup_system_optimizer(bot):
         except Exception as e:
             await ctx.send(f"❌ Erreur lors de la génération du rapport: {e}")
     
+    @bot.command(name='querystats', aliases=['qstats', 'slowqueries'])
+    async def query_stats_command(ctx, action: str = 'total_ms', value: str = None):
+        """Statistiques des requêtes SQL par empreinte - Admin seulement
+
+        !querystats [total_ms|avg_ms|max_ms|calls|rows|slow] : top 8 trié
+        !querystats dump : fichier JSON complet
+        !querystats reset : remise à zéro
+        !querystats seuil <ms> : seuil des requêtes lentes
+        """
+        if not BotConfig.is_admin(ctx.author.id):
+            await ctx.send("❌ Commande réservée aux administrateurs")
+            return
+
+        try:
+            if action == 'reset':
+                query_stats.reset()
+                await ctx.send("✅ Statistiques des requêtes remises à zéro")
+                return
+            if action == 'dump':
+                path = query_stats.dump()
+                await ctx.send(f"📄 Statistiques écrites dans `{path}`", file=discord.File(path))
+                return
+            if action == 'seuil':
+                query_stats.slow_query_ms = float(value)
+                await ctx.send(f"✅ Seuil des requêtes lentes: {query_stats.slow_query_ms:g} ms")
+                return
+            if action not in query_stats.SORT_KEYS:
+                await ctx.send(f"❌ Tri inconnu. Choix: {', '.join(query_stats.SORT_KEYS)}, dump, reset, seuil <ms>")
+                return
+
+            summary = query_stats.get_stats(0)
+            embed = discord.Embed(
+                title="🗄️ Requêtes SQL",
+                description=(f"{summary['statements']:,} requêtes • {summary['fingerprints']} empreintes • "
+                             f"{summary['total_ms'] / 1000:.1f} s au total\n"
+                             f"{summary['slow']} lentes (≥ {summary['slow_query_ms']:g} ms) depuis "
+                             f"{query_stats.started_at.strftime('%d/%m %H:%M')}"),
+                color=BotConfig.RARITY_COLORS['Legendary']
+            )
+            for rank, query in enumerate(query_stats.top(8, action), 1):
+                details = (f"{query['calls']:,} appels • moy {query['avg_ms']:.2f} ms • max {query['max_ms']:.1f} ms • "
+                           f"{query['rows']:,} lignes")
+                if query['slow']:
+                    details += f"\n🐢 {query['slow']} lentes, dernière depuis `{query['last_slow_caller']}`"
+                if query['plan']:
+                    details += f"\n📋 {' | '.join(query['plan'])[:120]}"
+                embed.add_field(
+                    name=f"{rank}. {query['total_ms'] / 1000:.2f} s",
+                    value=f"```sql\n{query['fingerprint'][:350]}\n```{details}"[:600],
+                    inline=False
+                )
+            embed.set_footer(text=f"Shadow Roll • Tri: {action} • {datetime.now().strftime('%H:%M:%S')}")
+            await ctx.send(embed=embed)
+        except Exception as e:
+            logger.error(f"Erreur querystats: {e}")
+            await ctx.send(f"❌ Erreur lors de la génération des statistiques: {e}")
+
+    @bot.command(name='traces', aliases=['latency', 'latence'])
+    async def traces_command(ctx, action: str = None):
+        """Latence par vue / commande (p50/p95/p99) - Admin seulement
+
+        !traces : vues triées par p95
+        !traces reset : remise à zéro des histogrammes
+        """
+        if not BotConfig.is_admin(ctx.author.id):
+            await ctx.send("❌ Commande réservée aux administrateurs")
+            return
+
+        try:
+            if action == 'reset':
+                tracer.reset()
+                await ctx.send("✅ Histogrammes de latence remis à zéro")
+                return
+
+            stats = tracer.get_stats()
+            lines = [f"{'Vue':<24} {'n':>6} {'p50':>6} {'p95':>6} {'p99':>6} {'max':>7}"]
+            for name, view in list(stats['views'].items())[:15]:
+                lines.append(f"{name[:24]:<24} {view['count']:>6} {view['p50_ms']:>6g} {view['p95_ms']:>6g} "
+                             f"{view['p99_ms']:>6g} {view['max_ms']:>7.0f}")
+            embed = discord.Embed(
+                title="⏱️ Latence des interactions (ms)",
+                description=f"```\n{chr(10).join(lines)}\n```"[:4000],
+                color=BotConfig.RARITY_COLORS['Legendary']
+            )
+            embed.add_field(
+                name="🧵 Traces",
+                value=(f"{stats['traces']:,} traces • {stats['sampled']:,} échantillonnées dans "
+                       f"`{tracer.path}` • {stats['rate_limited']:,} ignorées (limite/min)"),
+                inline=False
+            )
+            embed.set_footer(text=f"Shadow Roll • Percentiles par bornes d'histogramme • {datetime.now().strftime('%H:%M:%S')}")
+            await ctx.send(embed=embed)
+        except Exception as e:
+            logger.error(f"Erreur traces: {e}")
+            await ctx.send(f"❌ Erreur lors de la génération des latences: {e}")
+
+    @bot.command(name='watchdog', aliases=['blocages', 'lag'])
+    async def watchdog_command(ctx, action: str = None):
+        """Lag de la boucle et derniers blocages avec leur pile - Admin seulement
+
+        !watchdog : lag (p50/p95/p99) et derniers blocages
+        !watchdog reset : remise à zéro
+        """
+        if not BotConfig.is_admin(ctx.author.id):
+            await ctx.send("❌ Commande réservée aux administrateurs")
+            return
+
+        try:
+            if action == 'reset':
+                watchdog.reset()
+                await ctx.send("✅ Statistiques du watchdog remises à zéro")
+                return
+
+            stats = watchdog.get_stats()
+            lag = stats['lag']
+            embed = discord.Embed(
+                title="🐕 Watchdog de la boucle d'événements",
+                description=(f"```\nLag  p50 {lag['p50_ms']:g} ms • p95 {lag['p95_ms']:g} ms • "
+                             f"p99 {lag['p99_ms']:g} ms • max {lag['max_ms']:.0f} ms\n"
+                             f"Blocages > {stats['threshold_ms']:g} ms : {stats['stalls']:,} "
+                             f"({stats['stalled_ms'] / 1000:.1f} s au total)\n```"),
+                color=BotConfig.RARITY_COLORS['Legendary']
+            )
+            for stall in stats['recent_stalls'][:3]:
+                when = datetime.fromtimestamp(stall['started_at']).strftime('%H:%M:%S')
+                duration = "en cours" if stall['ongoing'] else f"{stall['duration_ms']:.0f} ms"
+                stack = ''.join(stall['stack'][-4:]) or "pile indisponible"
+                embed.add_field(
+                    name=f"⛔ {when} • {duration} • {(stall['task'] or '-')[:60]}",
+                    value=f"```\n{stack[-950:]}\n```",
+                    inline=False
+                )
+            embed.set_footer(text=f"Shadow Roll • Piles complètes dans les logs • {datetime.now().strftime('%H:%M:%S')}")
+            await ctx.send(embed=embed)
+        except Exception as e:
+            logger.error(f"Erreur watchdog: {e}")
+            await ctx.send(f"❌ Erreur lors de la lecture du watchdog: {e}")
+
     # Optimisation automatique au démarrage
     try:
         await optimizer.run_complete_optimization()
@@ -2,6 +2,32 @@
 Text styling system for Shadow Roll Bot
 Anime-inspired font effects and text formatting
 """
+from functools import lru_cache
+
+
+# Alphabets styled by each transform; translation tables are built once at import
+LOWERCASE = "abcdefghijklmnopqrstuvwxyz"
+LATIN = "ABCDEFGHIJKLMNOPQRSTUVWXYZ" + LOWERCASE
+DIGITS = "0123456789"
+
+_TABLES = {
+    'vaporwave': str.maketrans(LATIN + DIGITS, "ＡＢＣＤＥＦＧＨＩＪＫＬＭＮＯＰＱＲＳＴＵＶＷＸＹＺａｂｃｄｅｆｇｈｉｊｋｌｍｎｏｐｑｒｓｔｕｖｗｘｙｚ０１２３４５６７８９"),
+    'small_caps': str.maketrans(LOWERCASE, "ᴀʙᴄᴅᴇꜰɢʜɪᴊᴋʟᴍɴᴏᴘǫʀꜱᴛᴜᴠᴡxʏᴢ"),
+    'bold_italic': str.maketrans(LATIN, "𝑨𝑩𝑪𝑫𝑬𝑭𝑮𝑯𝑰𝑱𝑲𝑳𝑴𝑵𝑶𝑷𝑸𝑹𝑺𝑻𝑼𝑽𝑾𝑿𝒀𝒁𝒂𝒃𝒄𝒅𝒆𝒇𝒈𝒉𝒊𝒋𝒌𝒍𝒎𝒏𝒐𝒑𝒒𝒓𝒔𝒕𝒖𝒗𝒘𝒙𝒚𝒛"),
+    'serif_bold': str.maketrans(LATIN + DIGITS, "𝐀𝐁𝐂𝐃𝐄𝐅𝐆𝐇𝐈𝐉𝐊𝐋𝐌𝐍𝐎𝐏𝐐𝐑𝐒𝐓𝐔𝐕𝐖𝐗𝐘𝐙𝐚𝐛𝐜𝐝𝐞𝐟𝐠𝐡𝐢𝐣𝐤𝐥𝐦𝐧𝐨𝐩𝐪𝐫𝐬𝐭𝐮𝐯𝐰𝐱𝐲𝐳𝟎𝟏𝟐𝟑𝟒𝟓𝟔𝟕𝟖𝟗"),
+    'double_struck': str.maketrans(LATIN + DIGITS, "𝔸𝔹ℂ𝔻𝔼𝔽𝔾ℍ𝕀𝕁𝕂𝕃𝕄ℕ𝕆ℙℚℝ𝕊𝕋𝕌𝕍𝕎𝕏𝕐ℤ𝕒𝕓𝕔𝕕𝕖𝕗𝕘𝕙𝕚𝕛𝕜𝕝𝕞𝕠𝕠𝕡𝕢𝕣𝕤𝕥𝕦𝕧𝕨𝕩𝕪𝕫𝟘𝟙𝟚𝟛𝟜𝟝𝟞𝟟𝟠𝟡"),
+    'sans_serif_bold': str.maketrans(LATIN + DIGITS, "𝗔𝗕𝗖𝗗𝗘𝗙𝗚𝗛𝗜𝗝𝗞𝗟𝗠𝗡𝗢𝗣𝗤𝗥𝗦𝗧𝗨𝗩𝗪𝗫𝗬𝗭𝗮𝗯𝗰𝗱𝗲𝗳𝗴𝗵𝗶𝗷𝗸𝗹𝗺𝗻𝗼𝗽𝗾𝗿𝘀𝘁𝘂𝘃𝘄𝘅𝘆𝘇𝟬𝟭𝟮𝟯𝟰𝟱𝟲𝟳𝟴𝟵"),
+    'monospace': str.maketrans(LATIN + DIGITS, "𝙰𝙱𝙲𝙳𝙴𝙵𝙶𝙷𝙸𝙹𝙺𝙻𝙼𝙽𝙾𝙿𝚀𝚁𝚂𝚃𝚄𝚅𝚆𝚇𝚈𝚉𝚊𝚋𝚌𝚍𝚎𝚏𝚐𝚑𝚒𝚓𝚔𝚕𝚖𝚗𝚘𝚙𝚚𝚛𝚜𝚝𝚞𝚟𝚠𝚡𝚢𝚣𝟶𝟷𝟸𝟹𝟺𝟻𝟼𝟽𝟾𝟿"),
+}
+
+
+@lru_cache(maxsize=2048)
+def _transform(style: str, text: str) -> str:
+    """Styled text, memoized: menus restyle the same titles and names on every click"""
+    if style == 'small_caps':
+        text = text.lower()
+    return text.translate(_TABLES[style])
+
 
 class AnimeTextStyles:
     """Collection of anime-inspired text styling functions"""
@@ -9,100 +35,37 @@ class AnimeTextStyles:
     @staticmethod
     def vaporwave(text: str) -> str:
         """Convert text to vaporwave style (full-width characters)"""
-        normal = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
-        vaporwave = "ＡＢＣＤＥＦＧＨＩＪＫＬＭＮＯＰＱＲＳＴＵＶＷＸＹＺａｂｃｄｅｆｇｈｉｊｋｌｍｎｏｐｑｒｓｔｕｖｗｘｙｚ０１２３４５６７８９"
-        
-        result = ""
-        for char in text:
-            if char in normal:
-                result += vaporwave[normal.index(char)]
-            else:
-                result += char
-        return result
+        return _transform('vaporwave', text)
     
     @staticmethod
     def small_caps(text: str) -> str:
         """Convert text to small caps style"""
-        normal = "abcdefghijklmnopqrstuvwxyz"
-        small_caps = "ᴀʙᴄᴅᴇꜰɢʜɪᴊᴋʟᴍɴᴏᴘǫʀꜱᴛᴜᴠᴡxʏᴢ"
-        
-        result = ""
-        for char in text.lower():
-            if char in normal:
-                result += small_caps[normal.index(char)]
-            else:
-                result += char
-        return result
+        return _transform('small_caps', text)
     
     @staticmethod
     def bold_italic(text: str) -> str:
         """Convert text to bold italic Unicode style"""
-        normal = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
-        bold_italic = "𝑨𝑩𝑪𝑫𝑬𝑭𝑮𝑯𝑰𝑱𝑲𝑳𝑴𝑵𝑶𝑷𝑸𝑹𝑺𝑻𝑼𝑽𝑾𝑿𝒀𝒁𝒂𝒃𝒄𝒅𝒆𝒇𝒈𝒉𝒊𝒋𝒌𝒍𝒎𝒏𝒐𝒑𝒒𝒓𝒔𝒕𝒖𝒗𝒘𝒙𝒚𝒛"
-        
-        result = ""
-        for char in text:
-            if char in normal:
-                result += bold_italic[normal.index(char)]
-            else:
-                result += char
-        return result
+        return _transform('bold_italic', text)
     
     @staticmethod
     def serif_bold(text: str) -> str:
         """Convert text to serif bold style"""
-        normal = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
-        serif_bold = "𝐀𝐁𝐂𝐃𝐄𝐅𝐆𝐇𝐈𝐉𝐊𝐋𝐌𝐍𝐎𝐏𝐐𝐑𝐒𝐓𝐔𝐕𝐖𝐗𝐘𝐙𝐚𝐛𝐜𝐝𝐞𝐟𝐠𝐡𝐢𝐣𝐤𝐥𝐦𝐧𝐨𝐩𝐪𝐫𝐬𝐭𝐮𝐯𝐰𝐱𝐲𝐳𝟎𝟏𝟐𝟑𝟒𝟓𝟔𝟕𝟖𝟗"
-        
-        result = ""
-        for char in text:
-            if char in normal:
-                result += serif_bold[normal.index(char)]
-            else:
-                result += char
-        return result
+        return _transform('serif_bold', text)
     
     @staticmethod
     def double_struck(text: str) -> str:
         """Convert text to double-struck style"""
-        normal = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
-        double_struck = "𝔸𝔹ℂ𝔻𝔼𝔽𝔾ℍ𝕀𝕁𝕂𝕃𝕄ℕ𝕆ℙℚℝ𝕊𝕋𝕌𝕍𝕎𝕏𝕐ℤ𝕒𝕓𝕔𝕕𝕖𝕗𝕘𝕙𝕚𝕛𝕜𝕝𝕞𝕠𝕠𝕡𝕢𝕣𝕤𝕥𝕦𝕧𝕨𝕩𝕪𝕫𝟘𝟙𝟚𝟛𝟜𝟝𝟞𝟟𝟠𝟡"
-        
-        result = ""
-        for char in text:
-            if char in normal:
-                result += double_struck[normal.index(char)]
-            else:
-                result += char
-        return result
+        return _transform('double_struck', text)
     
     @staticmethod
     def sans_serif_bold(text: str) -> str:
         """Convert text to sans-serif bold style"""
-        normal = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
-        sans_bold = "𝗔𝗕𝗖𝗗𝗘𝗙𝗚𝗛𝗜𝗝𝗞𝗟𝗠𝗡𝗢𝗣𝗤𝗥𝗦𝗧𝗨𝗩𝗪𝗫𝗬𝗭𝗮𝗯𝗰𝗱𝗲𝗳𝗴𝗵𝗶𝗷𝗸𝗹𝗺𝗻𝗼𝗽𝗾𝗿𝘀𝘁𝘂𝘃𝘄𝘅𝘆𝘇𝟬𝟭𝟮𝟯𝟰𝟱𝟲𝟳𝟴𝟵"
-        
-        result = ""
-        for char in text:
-            if char in normal:
-                result += sans_bold[normal.index(char)]
-            else:
-                result += char
-        return result
+        return _transform('sans_serif_bold', text)
     
     @staticmethod
     def monospace(text: str) -> str:
         """Convert text to monospace style"""
-        normal = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
-        monospace = "𝙰𝙱𝙲𝙳𝙴𝙵𝙶𝙷𝙸𝙹𝙺𝙻𝙼𝙽𝙾𝙿𝚀𝚁𝚂𝚃𝚄𝚅𝚆𝚇𝚈𝚉𝚊𝚋𝚌𝚍𝚎𝚏𝚐𝚑𝚒𝚓𝚔𝚕𝚖𝚗𝚘𝚙𝚚𝚛𝚜𝚝𝚞𝚟𝚠𝚡𝚢𝚣𝟶𝟷𝟸𝟹𝟺𝟻𝟼𝟽𝟾𝟿"
-        
-        result = ""
-        for char in text:
-            if char in normal:
-                result += monospace[normal.index(char)]
-            else:
-                result += char
-        return result
+        return _transform('monospace', text)
 
 class ShadowRollTextFormatter:
     """Shadow Roll specific text formatting with anime aesthetics"""
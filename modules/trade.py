@@ -4,8 +4,13 @@ Allows players to safely trade characters with each other
 """
 
 import discord
+from discord import app_commands
 from discord.ext import commands
+from core.autocomplete import name_index
 from core.config import BotConfig
+from core.metrics import metrics
+from core.user_gate import user_gate
+from modules.utils import KeysetPager
 from typing import Dict, List, Optional
 import asyncio
 import logging
@@ -560,16 +565,22 @@ class TradeView(discord.ui.View):
             return False
             
         try:
-            # Transfer characters
-            for char_id in trade.initiator_characters:
-                # Remove from initiator, add to target
-                await self.bot.db.transfer_character(trade.initiator_id, trade.target_id, char_id)
-                
-            for char_id in trade.target_characters:
-                # Remove from target, add to initiator  
-                await self.bot.db.transfer_character(trade.target_id, trade.initiator_id, char_id)
-                
-            return True
+            # Les deux joueurs sont verrouillés: aucune vente ou craft ne peut toucher ces personnages
+            async with user_gate.guard([trade.initiator_id, trade.target_id], 'trade') as admitted:
+                if not admitted:
+                    return False
+
+                # Transfer characters
+                for char_id in trade.initiator_characters:
+                    # Remove from initiator, add to target
+                    await self.bot.db.transfer_character(trade.initiator_id, trade.target_id, char_id)
+
+                for char_id in trade.target_characters:
+                    # Remove from target, add to initiator
+                    await self.bot.db.transfer_character(trade.target_id, trade.initiator_id, char_id)
+
+                metrics.count_action('trade')
+                return True
             
         except Exception as e:
             logger.error(f"Error executing trade: {e}")
@@ -579,16 +590,17 @@ class TradeView(discord.ui.View):
 class CharacterSelectView(discord.ui.View):
     """Character selection for trade"""
     
-    def __init__(self, bot, trade_id: str, user_id: int, page: int = 1):
+    def __init__(self, bot, trade_id: str, user_id: int):
         super().__init__(timeout=60)
         self.bot = bot
         self.trade_id = trade_id
         self.user_id = user_id
-        self.page = page
+        self.pager = KeysetPager()
         
     async def create_selection_embed(self) -> discord.Embed:
         """Create character selection embed"""
-        inventory = await self.bot.db.get_player_inventory(self.user_id, self.page, 10)
+        inventory, self.pager.next_cursor = await self.bot.db.get_inventory_page(
+            self.user_id, after=self.pager.cursor, limit=10)
         
         embed = discord.Embed(
             title="➕ Sélectionner un Personnage",
@@ -611,7 +623,7 @@ class CharacterSelectView(discord.ui.View):
             char_list.append(f"`{i}.` {rarity_emoji} **{item['name']}** ({item['anime']})")
             
         embed.add_field(
-            name="📋 Vos Personnages",
+            name=f"📋 Vos Personnages (Page {self.pager.page})",
             value="\n".join(char_list) if char_list else "Aucun personnage",
             inline=False
         )
@@ -663,6 +675,24 @@ class CharacterSelectView(discord.ui.View):
         
         await interaction.response.send_message("✅ Personnage ajouté au trade!", ephemeral=True)
 
+    @discord.ui.button(label="◀️ Précédent", style=discord.ButtonStyle.secondary, row=1)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Go to previous page"""
+        if self.pager.back():
+            embed = await self.create_selection_embed()
+            await interaction.response.edit_message(embed=embed, view=self)
+        else:
+            await interaction.response.defer()
+
+    @discord.ui.button(label="Suivant ▶️", style=discord.ButtonStyle.secondary, row=1)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Go to next page"""
+        if self.pager.advance():
+            embed = await self.create_selection_embed()
+            await interaction.response.edit_message(embed=embed, view=self)
+        else:
+            await interaction.response.defer()
+
 
 class CharacterRemoveView(discord.ui.View):
     """Character removal from trade"""
@@ -757,7 +787,10 @@ async def setup_trade_commands(bot):
     """Setup trade-related commands"""
     
     @bot.tree.command(name="trade", description="Proposer un échange avec un autre joueur")
-    async def trade_slash(interaction: discord.Interaction, joueur: discord.Member):
+    @app_commands.describe(joueur="Joueur avec qui échanger",
+                           personnage="Personnage à proposer dès l'ouverture (optionnel)")
+    async def trade_slash(interaction: discord.Interaction, joueur: discord.Member,
+                          personnage: Optional[str] = None):
         """Trade command"""
         try:
             await interaction.response.defer()
@@ -789,6 +822,13 @@ async def setup_trade_commands(bot):
             # Create trade offer
             trade_id = trade_manager.create_trade(interaction.user.id, joueur.id)
             
+            # Pre-fill the offer with the character picked through autocomplete
+            if personnage:
+                owned = await name_index.owned_character_ids(bot.db, interaction.user.id)
+                matches = [c for c in await bot.db.search_characters(personnage, limit=10) if c['id'] in owned]
+                if matches:
+                    trade_manager.get_trade(trade_id).initiator_characters.append(matches[0]['id'])
+            
             # Create trade view
             trade_view = TradeView(bot, trade_id, interaction.user.id)
             embed = await trade_view.create_trade_embed()
@@ -810,6 +850,10 @@ async def setup_trade_commands(bot):
             logger.error(f"Error in trade command: {e}")
             await interaction.followup.send("❌ Erreur lors de la création du trade.", ephemeral=True)
             
+    @trade_slash.autocomplete('personnage')
+    async def trade_character_autocomplete(interaction: discord.Interaction, current: str):
+        return await name_index.character_choices(bot.db, current, owner_id=interaction.user.id)
+    
     # Cleanup task
     @bot.event
     async def on_ready():
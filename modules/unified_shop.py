@@ -7,6 +7,7 @@ import discord
 import asyncio
 from datetime import datetime, timedelta
 from core.config import BotConfig
+from core.user_gate import gated
 try:
     from modules.text_styling import apply_font_style
 except ImportError:
@@ -392,6 +393,7 @@ class BuyItemModal(discord.ui.Modal):
         )
         self.add_item(self.item_number)
     
+    @gated('buy')
     async def on_submit(self, interaction: discord.Interaction):
         try:
             item_num = int(self.item_number.value)
@@ -594,6 +596,7 @@ class ConfirmSellView(discord.ui.View):
         self.sell_price = sell_price
     
     @discord.ui.button(label='✅ Confirmer', style=discord.ButtonStyle.success)
+    @gated('sell')
     async def confirm_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         if interaction.user.id != self.user_id:
             await interaction.response.send_message("❌ Vous ne pouvez pas utiliser ce bouton.", ephemeral=True)
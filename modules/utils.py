@@ -37,16 +37,9 @@ def get_display_name(user) -> str:
     return user.global_name or user.display_name or user.name
 
 def get_rarity_cooldown(rarity: str) -> float:
-    """Get cooldown time based on character rarity"""
-    from core.config import BotConfig
-    
-    # Ultra-rare characters get longer cooldown to appreciate the pull
-    ultra_rare_rarities = ['Mythic', 'Evolve', 'Titan', 'Fusion', 'Secret']
-    
-    if rarity in ultra_rare_rarities:
-        return BotConfig.REROLL_COOLDOWN_RARE  # 2.0 seconds
-    else:
-        return BotConfig.REROLL_COOLDOWN  # 0.5 seconds
+    """Get cooldown time based on character rarity (rarity_tiers.cooldown, editable live)"""
+    from core.rarity import rarity_tiers
+    return rarity_tiers.cooldown(rarity)
 
 def parse_duration(duration_str: str) -> int:
     """Parse duration string to seconds"""
@@ -105,3 +98,42 @@ def safe_embed_field(embed, name: str, value: str, inline: bool = False):
     if len(name) > 256:
         name = truncate_field_value(name, 252)
     embed.add_field(name=name, value=value, inline=inline)
+
+
+class KeysetPager:
+    """Pagination par curseur: on garde le curseur de départ de chaque page visitée"""
+
+    def __init__(self):
+        self.starts = [None]  # La première page commence au début
+        self.next_cursor = None  # Renseigné par la dernière lecture, None sur la dernière page
+
+    @property
+    def page(self) -> int:
+        return len(self.starts)
+
+    @property
+    def cursor(self):
+        return self.starts[-1]
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def advance(self) -> bool:
+        """Passer à la page suivante si elle existe"""
+        if self.next_cursor is None:
+            return False
+        self.starts.append(self.next_cursor)
+        self.next_cursor = None
+        return True
+
+    def back(self) -> bool:
+        """Revenir à la page précédente"""
+        if len(self.starts) == 1:
+            return False
+        self.starts.pop()
+        return True
+
+    def reset(self):
+        self.starts = [None]
+        self.next_cursor = None
@@ -3,13 +3,14 @@ Image Resizer for Shadow Roll Bot
 Automatically resize character images to 1920x1080 while preserving aspect ratio
 """
 import asyncio
-import aiohttp
 import aiosqlite
 from PIL import Image, ImageOps
 import io
 import os
 import logging
 
+from core.http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 class ImageResizer:
@@ -22,15 +23,14 @@ class ImageResizer:
         os.makedirs(self.output_dir, exist_ok=True)
     
     async def download_image(self, url: str) -> bytes:
-        """Download image from URL"""
+        """Download image from URL through the shared pooled client"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                    if response.status == 200:
-                        return await response.read()
-                    else:
-                        logger.error(f"Failed to download image: {response.status}")
-                        return None
+            response = await http_client.request('GET', url)
+            if response.status == 200:
+                return response.body
+            else:
+                logger.error(f"Failed to download image: {response.status}")
+                return None
         except Exception as e:
             logger.error(f"Error downloading image from {url}: {e}")
             return None
@@ -162,7 +162,10 @@ async def main():
     print()
     
     resizer = ImageResizer()
-    await resizer.resize_all_character_images()
+    try:
+        await resizer.resize_all_character_images()
+    finally:
+        await http_client.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
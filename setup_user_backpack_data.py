@@ -7,6 +7,8 @@ import aiosqlite
 import time
 import logging
 
+from core.effects import COIN_MULTIPLIER, CRAFT_DISCOUNT, EFFECTS_SCHEMA, LUCK_BOOST
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -52,21 +54,22 @@ async def setup_user_backpack():
                 ''', (user_id, potion_name, effect_type, duration, quantity))
                 logger.info(f"✅ Potion ajoutée: {potion_name} x{quantity}")
             
-            # 3. Ajouter des effets temporaires actifs
+            # 3. Ajouter des effets temporaires actifs (table effects, lue par le bot au démarrage)
+            for statement in EFFECTS_SCHEMA:
+                await db.execute(statement)
             expires_at = int(time.time()) + 7200  # 2 heures
             effects_to_add = [
-                ('coin_multiplier', 1.5, expires_at),
-                ('luck_boost', 1.2, expires_at + 1800),
-                ('craft_discount', 0.5, expires_at + 3600)
+                (COIN_MULTIPLIER, 1.5, expires_at),
+                (LUCK_BOOST, 1.2, expires_at + 1800),
+                (CRAFT_DISCOUNT, 0.5, expires_at + 3600)
             ]
             
-            for buff_type, buff_value, exp_time in effects_to_add:
+            for kind, magnitude, exp_time in effects_to_add:
                 await db.execute('''
-                    INSERT OR REPLACE INTO temporary_buffs_fixed 
-                    (user_id, buff_type, buff_value, expires_at, is_active)
-                    VALUES (?, ?, ?, ?, 1)
-                ''', (user_id, buff_type, buff_value, exp_time))
-                logger.info(f"✅ Effet actif: {buff_type} (x{buff_value})")
+                    INSERT INTO effects (user_id, kind, magnitude, expires_at)
+                    VALUES (?, ?, ?, ?)
+                ''', (user_id, kind, magnitude, exp_time))
+                logger.info(f"✅ Effet actif: {kind} (x{magnitude})")
             
             # 4. Équiper un personnage si possible
             cursor = await db.execute('''
@@ -119,7 +122,7 @@ async def setup_user_backpack():
             print(f"⚔️ Équipement: {equipment_count}")
             
             # Effets
-            cursor = await db.execute("SELECT COUNT(*) FROM temporary_buffs_fixed WHERE user_id = ? AND is_active = 1", (user_id,))
+            cursor = await db.execute("SELECT COUNT(*) FROM effects WHERE user_id = ? AND expires_at > ?", (user_id, time.time()))
             effects_count = (await cursor.fetchone())[0]
             print(f"✨ Effets actifs: {effects_count}")
             
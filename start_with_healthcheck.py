@@ -5,7 +5,7 @@ Démarre le bot et un serveur health check en parallèle
 import asyncio
 import logging
 import os
-from main import main as bot_main
+from main import main as bot_main, setup_logging
 from health_check import HealthCheckServer, send_heartbeat
 
 logger = logging.getLogger('start_with_healthcheck')
@@ -13,11 +13,8 @@ logger = logging.getLogger('start_with_healthcheck')
 async def main():
     """Démarrer le bot avec health check"""
     
-    # Configuration du logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    # Configuration du logging (la même file d'attente que main.py)
+    setup_logging()
     
     logger.info("🚀 Démarrage du bot avec health check...")
     
@@ -21,9 +21,7 @@ async def test_shop_system():
             'shop_items_fixed',
             'player_purchases_fixed', 
             'player_potions_fixed',
-            'temporary_buffs_fixed',
-            'free_rolls_fixed',
-            'guaranteed_rarities_fixed'
+            'effects'
         ]
         
         for table in tables_to_check:
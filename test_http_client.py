@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared HTTP client
+Runs the client against a local aiohttp stub server: retries, size caps, ranged image sniffing
+"""
+import asyncio
+import struct
+
+from aiohttp import web
+
+from core.http_client import HttpClient, ResponseTooLarge
+
+PNG_HEADER = b'\x89PNG\r\n\x1a\n' + b'\x00\x00\x00\rIHDR' + struct.pack('>II', 640, 480)
+
+
+def make_jpeg(width: int, height: int, app_bytes: int) -> bytes:
+    """JPEG header with a large APP1 (EXIF-like) segment before the frame header"""
+    data = b'\xff\xd8'
+    while app_bytes > 0:
+        chunk = min(app_bytes, 65000)
+        data += b'\xff\xe1' + struct.pack('>H', chunk + 2) + b'\x00' * chunk
+        app_bytes -= chunk
+    data += b'\xff\xc0' + struct.pack('>HBHHB', 17, 8, height, width, 3) + b'\x00' * 9
+    return data + b'\x00' * 1024
+
+
+class StubServer:
+    """Local server whose routes misbehave on purpose"""
+
+    def __init__(self):
+        self.hits = {}
+        self.ranges = []
+        self.runner = None
+        self.base_url = None
+
+    def _count(self, name: str) -> int:
+        self.hits[name] = self.hits.get(name, 0) + 1
+        return self.hits[name]
+
+    async def flaky(self, request):
+        # 503, then 429, then OK
+        hit = self._count('flaky')
+        if hit == 1:
+            return web.Response(status=503)
+        if hit == 2:
+            return web.Response(status=429, headers={'Retry-After': '0'})
+        return web.Response(text='ok')
+
+    async def down(self, request):
+        self._count(request.method)
+        return web.Response(status=503)
+
+    async def big_announced(self, request):
+        return web.Response(body=b'x' * 2048)
+
+    async def big_streamed(self, request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for _ in range(8):
+            await response.write(b'x' * 512)
+        await response.write_eof()
+        return response
+
+    def _ranged(self, body: bytes, request, content_range: str = None):
+        range_header = request.headers.get('Range')
+        self.ranges.append(range_header)
+        if not range_header:
+            return web.Response(body=body)
+        start, end = range_header.split('=', 1)[1].split('-')
+        end = min(int(end), len(body) - 1)
+        return web.Response(status=206, body=body[int(start):end + 1], headers={
+            'Content-Range': content_range or f'bytes {start}-{end}/{len(body)}'
+        })
+
+    async def png(self, request):
+        return self._ranged(PNG_HEADER + b'\x00' * 100000, request)
+
+    async def png_bad_range(self, request):
+        return self._ranged(PNG_HEADER + b'\x00' * 1000, request, 'bytes 0-99/garbage')
+
+    async def jpeg_exif(self, request):
+        return self._ranged(make_jpeg(1200, 900, 150 * 1024), request)
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/flaky', self.flaky)
+        app.router.add_route('*', '/down', self.down)
+        app.router.add_get('/big-announced', self.big_announced)
+        app.router.add_get('/big-streamed', self.big_streamed)
+        app.router.add_get('/image.png', self.png)
+        app.router.add_get('/bad-range.png', self.png_bad_range)
+        app.router.add_get('/exif.jpg', self.jpeg_exif)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f'http://127.0.0.1:{port}'
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+async def test_retries(server: StubServer, client: HttpClient):
+    print("\n1. Retry/backoff on 503 and 429...")
+    response = await client.request('GET', f'{server.base_url}/flaky')
+    assert response.status == 200 and response.text() == 'ok', response
+    assert server.hits['flaky'] == 3, server.hits
+    print(f"   ✅ Succeeded after {server.hits['flaky'] - 1} retries")
+
+    response = await client.request('GET', f'{server.base_url}/down')
+    assert response.status == 503 and server.hits['GET'] == client.max_retries + 1, server.hits
+    print(f"   ✅ GET gave up after {server.hits['GET']} attempts")
+
+    await client.post_json(f'{server.base_url}/down', {})
+    assert server.hits['POST'] == 1, server.hits
+    print("   ✅ POST sent once (not idempotent)")
+
+    failures = client.stats['failures']
+    try:
+        await client.request('GET', 'Asuna')
+        raise AssertionError("invalid URL accepted")
+    except ValueError:
+        pass
+    assert client.stats['failures'] == failures + 1
+    print("   ✅ Invalid URL failed without retrying")
+
+
+async def test_size_cap(server: StubServer, client: HttpClient):
+    print("\n2. Response size cap...")
+    for path in ('/big-announced', '/big-streamed'):
+        try:
+            await client.request('GET', f'{server.base_url}{path}', max_bytes=1024)
+            raise AssertionError(f"{path} not capped")
+        except ResponseTooLarge:
+            print(f"   ✅ {path} rejected")
+
+    response = await client.request('GET', f'{server.base_url}/big-streamed', max_bytes=1024, truncate=True)
+    assert len(response.body) == 1024, len(response.body)
+    print("   ✅ Truncated read stops at the cap")
+
+
+async def test_sniff_image(server: StubServer, client: HttpClient):
+    print("\n3. Ranged image sniffing...")
+    info = await client.sniff_image(f'{server.base_url}/image.png')
+    assert info == {'format': 'png', 'width': 640, 'height': 480, 'size': len(PNG_HEADER) + 100000}, info
+    assert server.ranges[-1] == f'bytes=0-{client.sniff_bytes - 1}', server.ranges
+    print(f"   ✅ PNG read from a {client.sniff_bytes} byte range: {info}")
+
+    info = await client.sniff_image(f'{server.base_url}/bad-range.png')
+    assert info and info['size'] is None, info
+    print("   ✅ Malformed Content-Range leaves the size unknown")
+
+    info = await client.sniff_image(f'{server.base_url}/exif.jpg')
+    assert info and (info['format'], info['width'], info['height']) == ('jpeg', 1200, 900), info
+    print("   ✅ JPEG with a large EXIF segment read past the first range")
+
+
+async def main():
+    """Main test function"""
+    server = StubServer()
+    await server.start()
+    client = HttpClient(backoff_base=0.01, sniff_bytes=64 * 1024)
+    try:
+        await test_retries(server, client)
+        await test_size_cap(server, client)
+        await test_sniff_image(server, client)
+        print("\n✅ HTTP client tests passed")
+    finally:
+        await client.close()
+        await server.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
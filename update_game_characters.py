@@ -14,7 +14,7 @@ def update_game_file():
     # Créer le nouveau contenu des questions
     new_questions = []
     for char1, char2, img1, img2 in diverse_matchups:
-        new_questions.append(f'                ("{char1}", "{char2}", "{img1}", "{img2}"),')
+        new_questions.append(f'        ("{char1}", "{char2}", "{img1}", "{img2}"),')
     
     new_questions_str = "\n".join(new_questions)
     
@@ -34,15 +34,15 @@ def update_game_file():
     print(f"   • Animes différents représentés: ~{len(set(char[1] for char in ANIME_GIRLS_LIST))}")
     
     print("\n🔧 Pour appliquer les changements:")
-    print("   1. Copiez le code suivant dans modules/games/would_you_rather.py")
-    print("   2. Remplacez la section 'questions' dans THEMES['anime_girl']")
+    print("   1. Copiez le code suivant dans modules/games/question_bank.py")
+    print("   2. Remplacez la liste SEED_QUESTIONS['anime_girl']")
     
     print("\n" + "="*60)
     print("CODE À COPIER:")
     print("="*60)
-    print('            "questions": [')
+    print('    "anime_girl": [')
     print(new_questions_str)
-    print('            ]')
+    print('    ]')
     print("="*60)
     
     return new_questions_str